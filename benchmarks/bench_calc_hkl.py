@@ -0,0 +1,64 @@
+"""
+Time of generation of reflections by Cell.calc_hkl for different cells
+(without the reflection cache, with the cache, and with the cache at the
+cell changed within the margin of the cache as at cell refinement).
+
+Run from the root of the repository:
+
+    python benchmarks/bench_calc_hkl.py
+"""
+import timeit
+
+import numpy
+
+from cryspy.A_functions_base.function_1_reflection_cache import \
+    get_reflection_cache
+from cryspy.C_item_loop_classes.cl_1_cell import Cell
+from cryspy.C_item_loop_classes.cl_2_space_group import SpaceGroup
+
+N_REPEAT = 5
+
+L_CASE = (
+    # it_number, it_coordinate_system_code, length_a, length_b, length_c,
+    # angle_gamma, sthovl_max
+    (62, "abc", 8.5, 5.4, 7.0, 90., 0.8),
+    (62, "abc", 8.5, 5.4, 7.0, 90., 2.0),
+    (227, "2", 10.1, 10.1, 10.1, 90., 0.8),
+    (227, "2", 10.1, 10.1, 10.1, 90., 2.0),
+    (194, None, 3.2, 3.2, 60.0, 120., 1.0),
+    (14, "b1", 20.0, 15.0, 25.0, 90., 0.8),
+    )
+
+
+def main():
+    for it_number, code, a, b, c, gamma, sthovl_max in L_CASE:
+        space_group = SpaceGroup(it_number=it_number,
+                                 it_coordinate_system_code=code)
+        space_group.form_object()
+        cell = Cell(length_a=a, length_b=b, length_c=c, angle_alpha=90.,
+                    angle_beta=90., angle_gamma=gamma)
+        n_hkl = cell.calc_hkl(space_group, 0., sthovl_max)[0].size
+        reflection_cache = get_reflection_cache()
+
+        def calc_hkl():
+            reflection_cache.clear()
+            cell.calc_hkl(space_group, 0., sthovl_max)
+
+        time = timeit.timeit(calc_hkl, number=N_REPEAT)
+        time_cache = timeit.timeit(
+            lambda: cell.calc_hkl(space_group, 0.1, 0.9*sthovl_max),
+            number=N_REPEAT)
+
+        def calc_hkl_refined():
+            cell.length_a = a*(1. + 0.005*numpy.random.random())
+            cell.calc_hkl(space_group, 0., sthovl_max)
+
+        time_refined = timeit.timeit(calc_hkl_refined, number=N_REPEAT)
+        cell.length_a = a
+        print(f"it_number {it_number:3} cell {a:5.1f} {b:5.1f} {c:5.1f} \
+sthovl_max {sthovl_max:3.1f}: {n_hkl:7} reflections \
+{time*1e3/N_REPEAT:10.1f} ms (cached {time_cache*1e3/N_REPEAT:6.2f} ms, \
+refined cell {time_refined*1e3/N_REPEAT:6.2f} ms)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Time of the central-difference gradient of chi square over the refined
+parameters of two powder diffraction experiments (PbSO4 measured twice)
+calculated point by point and by one batched call. In the batched call
+chi square of the experiment whose parameters are not changed is not
+calculated again, and the sets differing only in scale factors and
+background intensities give one calculation of the profile.
+
+Run from the root of the repository:
+
+    python benchmarks/bench_chi_sq_batch.py
+"""
+import os.path
+import time
+
+import numpy
+
+import cryspy
+
+N_REPEAT = 1
+DELTA = 1e-5
+
+F_MAIN = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), "tests", "PbSO4_unpol_powder_test",
+    "main.rcif")
+
+rhochi = cryspy.file_to_globaln(F_MAIN)
+# the powder diffraction experiment is given twice
+pd_2 = cryspy.file_to_globaln(F_MAIN).experiments()[0]
+pd_2.data_name = "pd2"
+rhochi.add_items([pd_2])
+l_var_name = rhochi.get_variable_names()
+parameter_vector = cryspy.ParameterVector(rhochi, l_var_name)
+val_0 = parameter_vector.get_all()
+n_param = val_0.size
+values = numpy.vstack([val_0 + DELTA*numpy.eye(n_param),
+                       val_0 - DELTA*numpy.eye(n_param)])
+
+
+def gradient_serial():
+    l_chi_sq = []
+    for values_k in values:
+        parameter_vector.set_all(values_k)
+        l_chi_sq.append(rhochi.calc_chi_sq(flag_internal=False)[0])
+    parameter_vector.set_all(val_0)
+    chi_sq = numpy.array(l_chi_sq, dtype=float)
+    return (chi_sq[:n_param] - chi_sq[n_param:]) / (2.*DELTA)
+
+
+def gradient_batch():
+    chi_sq = rhochi.calc_chi_sq_batch(values, l_var_name)[0]
+    return (chi_sq[:n_param] - chi_sq[n_param:]) / (2.*DELTA)
+
+
+def main():
+    print(f"{n_param:} parameters, {values.shape[0]:} sets of parameters")
+    l_grad = []
+    for func in (gradient_serial, gradient_batch):
+        t_0 = time.perf_counter()
+        for i in range(N_REPEAT):
+            grad = func()
+        t_1 = time.perf_counter()
+        l_grad.append(grad)
+        print(f"{func.__name__:20}{(t_1-t_0)*1e3/N_REPEAT:10.1f} ms")
+    print(f"max difference of gradients: \
+{numpy.abs(l_grad[0]-l_grad[1]).max():.3e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Parse throughput of CIF readers on the '.rcif' files of the tests.
+
+Run from the root of the repository:
+
+    python benchmarks/bench_cif_reader.py
+"""
+import glob
+import os.path
+import time
+import warnings
+
+import pycifstar
+
+from cryspy.A_functions_base.function_1_cif import file_to_global
+from cryspy.H_functions_global.function_1_cryspy_objects import \
+    file_to_globaln
+
+F_DIR = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), "tests")
+
+L_FILE = sorted(glob.glob(os.path.join(F_DIR, "**", "*.rcif"),
+                          recursive=True))
+
+
+def time_function(func) -> float:
+    time_start = time.perf_counter()
+    for f_name in L_FILE:
+        try:
+            func(f_name)
+        except Exception:
+            pass
+    return time.perf_counter() - time_start
+
+
+def main():
+    warnings.filterwarnings("ignore")
+    n_byte = sum([os.path.getsize(f_name) for f_name in L_FILE])
+    print(f"{len(L_FILE):} files, {n_byte/1e6:.2f} MB")
+    l_func = (
+        ("pycifstar.to_global", pycifstar.to_global),
+        ("file_to_global", file_to_global),
+        ("file_to_globaln", file_to_globaln),
+        )
+    for name, func in l_func:
+        time_total = time_function(func)
+        print(f"{name:40}{time_total:10.3f} s{n_byte/1e6/time_total:10.2f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Time of writing loops and 2D powder blocks in CIF format.
+
+Run from the root of the repository:
+
+    python benchmarks/bench_cif_writer.py
+"""
+import os.path
+import timeit
+
+import numpy
+
+from cryspy.C_item_loop_classes.cl_1_pd_meas import PdMeasL
+from cryspy.C_item_loop_classes.cl_1_pd2d_background import Pd2dBackground
+
+N_REPEAT = 5
+
+F_PD_DATA = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), "tests", "PbSO4_unpol_powder_test",
+    "pd_data.rcif")
+
+with open(F_PD_DATA, "r") as fid:
+    pd_meas = PdMeasL.from_cif(fid.read())
+pd_meas.to_items()
+pd_meas_columnar = PdMeasL.from_cif(pd_meas.to_cif())
+pd_meas_columnar.to_columnar()
+
+np_random = numpy.random.default_rng(0)
+pd2d_background = Pd2dBackground()
+pd2d_background.__dict__["ttheta"] = numpy.linspace(4., 120., 600)
+pd2d_background.__dict__["phi"] = numpy.linspace(-5., 30., 60)
+pd2d_background.__dict__["intensity"] = np_random.random((600, 60))*100.
+pd2d_background.__dict__["intensity_sigma"] = np_random.random((600, 60))
+pd2d_background.__dict__["intensity_refinement"] = \
+    np_random.random((600, 60)) < 0.3
+
+L_STATEMENT = (
+    "pd_meas.to_cif()",
+    "pd_meas_columnar.to_cif()",
+    "pd2d_background.form_ttheta_phi_intensity()",
+    )
+
+
+def main():
+    for statement in L_STATEMENT:
+        time = timeit.timeit(statement, globals=globals(), number=N_REPEAT)
+        print(f"{statement:45}{time*1e3/N_REPEAT:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Time and peak memory of the nuclear structure factor in asymmetric unit
+cell: arrays (hkl, atoms, symmetry) of calc_phase_by_hkl_xyz_rb and calc_dwf
+against the chunked kernel calc_f_hkl_as_by_hkl_xyz_rb.
+
+Run from the root of the repository:
+
+    python benchmarks/bench_f_nucl.py
+"""
+import time
+import tracemalloc
+
+import numpy
+
+from cryspy.A_functions_base.function_2_crystallography_base import \
+    calc_phase_by_hkl_xyz_rb, calc_dwf, calc_f_hkl_as_by_hkl_xyz_rb
+from cryspy.C_item_loop_classes.cl_1_cell import Cell
+from cryspy.C_item_loop_classes.cl_2_space_group import SpaceGroup
+
+N_HKL, N_ATOM = 2000, 40
+
+np_random = numpy.random.default_rng(0)
+space_group = SpaceGroup(it_number=227, it_coordinate_system_code="2")
+space_group.form_object()
+r_s_g_s = space_group.full_space_group_symop
+L_R = [numpy.array(getattr(r_s_g_s, f"r_{ij:}"), dtype=float) for ij in
+       (11, 12, 13, 21, 22, 23, 31, 32, 33)]
+L_B = [numpy.array(getattr(r_s_g_s, f"b_{i:}"), dtype=float)
+       for i in (1, 2, 3)]
+cell = Cell(length_a=30., length_b=30., length_c=30., angle_alpha=90.,
+            angle_beta=90., angle_gamma=90.)
+index_h, index_k, index_l = np_random.integers(-20, 20, size=(3, N_HKL))
+x, y, z = np_random.random((3, N_ATOM))
+b_scat = np_random.random(N_ATOM) + 0j
+b_iso = np_random.random(N_ATOM)
+beta = np_random.random((N_ATOM, 6)) * 1e-4
+sthovl = cell.calc_sthovl(index_h, index_k, index_l)
+
+
+def calc_by_meshgrid():
+    phase_3d = calc_phase_by_hkl_xyz_rb(index_h, index_k, index_l, x, y, z,
+                                        *L_R, *L_B)
+    dwf_3d = calc_dwf(cell, index_h, index_k, index_l, b_iso, beta, *L_R)
+    return ((phase_3d*dwf_3d).sum(axis=2)*b_scat).sum(axis=1)/L_R[0].size
+
+
+def calc_by_kernel():
+    return calc_f_hkl_as_by_hkl_xyz_rb(index_h, index_k, index_l, x, y, z,
+                                       *L_R, *L_B, b_scat, sthovl, b_iso,
+                                       beta)
+
+
+def main():
+    print(f"{N_HKL:} reflections, {N_ATOM:} atoms, {L_R[0].size:} \
+symmetry elements")
+    for func in (calc_by_meshgrid, calc_by_kernel):
+        tracemalloc.start()
+        time_start = time.perf_counter()
+        func()
+        time_run = time.perf_counter() - time_start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{func.__name__:20}{time_run*1e3:10.1f} ms, peak memory \
+{peak/2**20:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
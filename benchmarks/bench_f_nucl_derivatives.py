@@ -0,0 +1,58 @@
+"""
+Time of the nuclear structure factor with derivatives over coordinates,
+occupancies and isotropic parameters of all atoms: by finite differences
+(one calc_f_nucl per parameter) against calc_f_nucl_with_derivatives.
+
+Run from the root of the repository:
+
+    python benchmarks/bench_f_nucl_derivatives.py
+"""
+import os.path
+import time
+
+import cryspy
+
+N_REPEAT = 3
+DELTA = 1e-6
+
+F_MAIN = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), "tests", "PbSO4_unpol_powder_test",
+    "main.rcif")
+
+rhochi = cryspy.file_to_globaln(F_MAIN)
+crystal = rhochi.crystals()[0]
+index_h, index_k, index_l, mult = crystal.calc_hkl(0., 1.)
+L_PARAM = [(label, name) for label in crystal.atom_site.label
+           for name in ("fract_x", "fract_y", "fract_z", "occupancy")]
+
+
+def calc_by_finite_differences():
+    f_nucl = crystal.calc_f_nucl(index_h, index_k, index_l)
+    d_f_nucl = {}
+    for label, name in L_PARAM:
+        item = crystal.atom_site[label]
+        value = getattr(item, name)
+        setattr(item, name, value + DELTA)
+        d_f_nucl[(label, name)] = (crystal.calc_f_nucl(
+            index_h, index_k, index_l) - f_nucl) / DELTA
+        setattr(item, name, value)
+    return f_nucl, d_f_nucl
+
+
+def calc_analytically():
+    return crystal.calc_f_nucl_with_derivatives(
+        index_h, index_k, index_l, params=L_PARAM)
+
+
+def main():
+    print(f"{index_h.size:} reflections, {len(L_PARAM):} parameters")
+    for func in (calc_by_finite_differences, calc_analytically):
+        time_start = time.perf_counter()
+        for i_repeat in range(N_REPEAT):
+            func()
+        time_run = (time.perf_counter() - time_start) / N_REPEAT
+        print(f"{func.__name__:30}{time_run*1e3:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
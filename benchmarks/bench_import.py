@@ -0,0 +1,48 @@
+"""
+Time of import of cryspy library in a new process.
+
+Run from the root of the repository:
+
+    python benchmarks/bench_import.py
+
+The script exits with status 1 if "import cryspy" takes more than
+T_BUDGET seconds.
+"""
+import subprocess
+import sys
+import time
+
+N_REPEAT = 5
+T_BUDGET = 0.1
+
+L_STATEMENT = (
+    "import cryspy",
+    "import cryspy; cryspy.RhoChi",
+    "from cryspy.A_functions_base.function_3_mcif import read_magnetic_data;"
+    "read_magnetic_data()",
+    )
+
+
+def time_process(statement: str) -> float:
+    """Give the best time of new process running statement."""
+    l_time = []
+    for i_repeat in range(N_REPEAT):
+        time_start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], check=True)
+        l_time.append(time.perf_counter() - time_start)
+    return min(l_time)
+
+
+def main():
+    time_python = time_process("pass")
+    d_time = {}
+    for statement in L_STATEMENT:
+        d_time[statement] = time_process(statement) - time_python
+        print(f"{statement[:60]:60}{d_time[statement]*1e3:10.1f} ms")
+    if d_time["import cryspy"] > T_BUDGET:
+        print(f"'import cryspy' exceeds the budget of {T_BUDGET:} s.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Microbenchmark of attribute access for ItemN objects.
+
+Run from the root of the repository:
+
+    python benchmarks/bench_item_attributes.py
+"""
+import timeit
+
+from cryspy.C_item_loop_classes.cl_1_atom_site import AtomSite
+from cryspy.C_item_loop_classes.cl_1_cell import Cell
+
+N_REPEAT = 100000
+
+atom_site = AtomSite(label="Fe", type_symbol="Fe", fract_x=0.1, fract_y=0.2,
+                     fract_z=0.3, occupancy=1., adp_type="Uiso",
+                     u_iso_or_equiv=0.)
+cell = Cell(length_a=5., length_b=5., length_c=5., angle_alpha=90.,
+            angle_beta=90., angle_gamma=90.)
+
+L_STATEMENT = (
+    "atom_site.fract_x = 0.25",
+    "atom_site.fract_x_sigma = 0.01",
+    "atom_site.fract_x_refinement = True",
+    "cell.length_a = 5.1",
+    "atom_site.fract_x",
+    "atom_site.is_attribute('fract_x_sigma')",
+    "atom_site.fract_x_as_string",
+    )
+
+
+def main():
+    for statement in L_STATEMENT:
+        time = timeit.timeit(statement, globals=globals(), number=N_REPEAT)
+        print(f"{statement:40}{time*1e9/N_REPEAT:10.1f} ns")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Time and peak memory of function_3_mcif.calc_hkl_in_range for a magnetic
+supercell at different sizes of slabs.
+
+Run from the root of the repository:
+
+    python benchmarks/bench_mcif_hkl_in_range.py
+"""
+import time
+import tracemalloc
+
+import numpy
+
+from cryspy.A_functions_base.function_3_mcif import calc_hkl_in_range
+from cryspy.C_item_loop_classes.cl_2_space_group import SpaceGroup
+
+L_N_ELEMENT = (10**5, 10**6, 10**7)
+
+space_group = SpaceGroup(it_number=227, it_coordinate_system_code="2")
+space_group.form_object()
+s_g_s = space_group.full_space_group_symop
+sym_elems = numpy.zeros((13, len(s_g_s.r_11)), dtype=int)
+sym_elems[4:13] = (s_g_s.r_11, s_g_s.r_12, s_g_s.r_13,
+                   s_g_s.r_21, s_g_s.r_22, s_g_s.r_23,
+                   s_g_s.r_31, s_g_s.r_32, s_g_s.r_33)
+half_pi = 0.5*numpy.pi
+# 2x2x2 supercell
+unit_cell_parameters = (16.8, 16.8, 16.8, half_pi, half_pi, half_pi)
+sthovl_min, sthovl_max = 0.05, 0.6
+
+
+def main():
+    for n_element in L_N_ELEMENT:
+        tracemalloc.start()
+        time_start = time.perf_counter()
+        res = calc_hkl_in_range(sym_elems, unit_cell_parameters, sthovl_min,
+                                sthovl_max, n_element=n_element)
+        time_run = time.perf_counter() - time_start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"n_element {n_element:10}: {res[0].size:6} reflections \
+{time_run*1e3:8.1f} ms, peak memory {peak/2**20:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
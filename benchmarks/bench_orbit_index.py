@@ -0,0 +1,49 @@
+"""
+Time of the flip-ratio calculation of a single-crystal experiment with
+structure factors calculated for every measured reflection and only for
+unique orbits of symmetry-equivalent reflections.
+
+Run from the root of the repository:
+
+    python benchmarks/bench_orbit_index.py
+"""
+import os.path
+import timeit
+
+import numpy
+
+import cryspy
+
+N_REPEAT = 3
+
+F_MAIN = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), "tests", "HoTi_single_test", "main.rcif")
+
+rhochi = cryspy.file_to_globaln(F_MAIN)
+crystal = rhochi.crystals()[0]
+diffrn_refln = rhochi.experiments()[0].diffrn_refln
+# the measurements repeated as at 20 fields
+index_h, index_k, index_l = [numpy.tile(numpy.array(index, dtype=int), 20)
+                             for index in (diffrn_refln.index_h,
+                                           diffrn_refln.index_k,
+                                           diffrn_refln.index_l)]
+n_unique = crystal.calc_orbit_index(index_h, index_k, index_l)[0].size
+
+L_STATEMENT = (
+    "crystal.calc_f_nucl(index_h, index_k, index_l)",
+    "crystal.calc_f_nucl_by_orbit(index_h, index_k, index_l)",
+    "crystal.calc_susceptibility_moment_tensor(index_h, index_k, index_l)",
+    "crystal.calc_susceptibility_moment_tensor_by_orbit(index_h, index_k, \
+index_l)",
+    )
+
+
+def main():
+    print(f"{index_h.size:} reflections, {n_unique:} unique orbits")
+    for statement in L_STATEMENT:
+        time = timeit.timeit(statement, globals=globals(), number=N_REPEAT)
+        print(f"{statement:80}{time*1e3/N_REPEAT:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Time and peak memory of the powder diffraction profile calculated over all
+points for each reflection (dense matrices) and within windows of
++- peak_cutoff*FWHM around reflections (sparse matrices) for the large
+synthetic pattern of PbSO4 (the cell is doubled along all axes to have
+thousands of reflections).
+
+Run from the root of the repository:
+
+    python benchmarks/bench_pd_windowed_profile.py
+"""
+import os.path
+import time
+import tracemalloc
+import warnings
+
+import numpy
+
+import cryspy
+
+N_POINTS = 20000
+L_PEAK_CUTOFF = (None, 50., 20., 10.)
+
+F_MAIN = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), "tests", "PbSO4_unpol_powder_test",
+    "main.rcif")
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore")
+    rhochi = cryspy.file_to_globaln(F_MAIN)
+pd = rhochi.experiments()[0]
+l_crystal = rhochi.crystals()
+cell = l_crystal[0].cell
+cell.length_a, cell.length_b, cell.length_c = 2.*cell.length_a, \
+    2.*cell.length_b, 2.*cell.length_c
+tth = numpy.linspace(5., 150., N_POINTS)
+
+
+def calc_profile(peak_cutoff):
+    pd.peak_cutoff = peak_cutoff
+    return pd.calc_profile(tth, l_crystal, flag_internal=False)
+
+
+def main():
+    proc = calc_profile(None)
+    n_hkl = pd.d_internal_val[f"peak_{l_crystal[0].data_name:}"][
+        "index_h"].size
+    intensity_0 = proc.numpy_intensity_total
+    print(f"{N_POINTS:} points, {n_hkl:} reflections")
+    print(f"{'peak_cutoff':>12}{'time, ms':>12}{'memory, MB':>12}\
+{'max rel. difference':>22}")
+    for peak_cutoff in L_PEAK_CUTOFF:
+        t_0 = time.perf_counter()
+        calc_profile(peak_cutoff)
+        t_1 = time.perf_counter()
+        tracemalloc.start()
+        proc = calc_profile(peak_cutoff)
+        memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        intensity = proc.numpy_intensity_total
+        diff = numpy.abs(intensity-intensity_0).max() / \
+            numpy.abs(intensity_0).max()
+        print(f"{str(peak_cutoff):>12}{(t_1-t_0)*1e3:12.1f}\
+{memory/2**20:12.1f}{diff:22.2e}")
+    pd.peak_cutoff = None
+
+
+if __name__ == "__main__":
+    main()
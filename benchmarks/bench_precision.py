@@ -0,0 +1,65 @@
+"""
+Accuracy and time of calculations in single precision compared with double
+precision on the datasets of the tests: chi square of refinement objects
+(RhoChi) and goodness of fit of flipping ratios calculated by MEM objects.
+
+Run from the root of the repository:
+
+    python benchmarks/bench_precision.py
+"""
+import glob
+import os.path
+import time
+import warnings
+
+import cryspy
+
+DIR_TESTS = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), "tests")
+
+L_PRECISION = ("double", "single")
+
+
+def calc_rhochi(f_name: str):
+    rhochi = cryspy.file_to_globaln(f_name)
+    return rhochi.calc_chi_sq(flag_internal=True)[0]
+
+
+def calc_mem(f_name: str):
+    mem = cryspy.file_to_globaln(f_name)
+    mem.calc_fr()
+    return sum([experiment.refine_ls.goodness_of_fit_all
+                for experiment in mem.experiments()])
+
+
+def main():
+    l_f_name = sorted(glob.glob(os.path.join(DIR_TESTS, "*", "main.rcif"))) \
+        + sorted(glob.glob(os.path.join(DIR_TESTS, "tof", "*.rcif")))
+    l_task = [(f_name, calc_rhochi) for f_name in l_f_name] + [
+        (f_name, calc_mem) for f_name in sorted(glob.glob(os.path.join(
+            DIR_TESTS, "MEM_test", "*", "main.rcif")))]
+    print(f"{'dataset':50}{'double':>16}{'single':>16}{'rel. error':>12}\
+{'time ratio':>12}")
+    for f_name, func in l_task:
+        name = os.path.relpath(f_name, DIR_TESTS)
+        l_value, l_time = [], []
+        try:
+            for precision in L_PRECISION:
+                cryspy.set_precision(precision)
+                t_0 = time.perf_counter()
+                l_value.append(func(f_name))
+                l_time.append(time.perf_counter() - t_0)
+        except Exception as error:
+            print(f"{name:50}  is skipped: {error!r}"[:120])
+            continue
+        finally:
+            cryspy.set_precision("double")
+        rel_error = abs(l_value[1] - l_value[0]) / abs(l_value[0])
+        print(f"{name:50}{l_value[0]:16.6f}{l_value[1]:16.6f}\
+{rel_error:12.2e}{l_time[1]/l_time[0]:12.2f}")
+
+
+if __name__ == "__main__":
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        main()
@@ -0,0 +1,56 @@
+"""
+Time of the dense shape profile of powder diffraction (pseudo-Voigt
+function, asymmetry and Lorentz factor for all points and reflections)
+calculated directly and interpolated by precalculated tables with
+different steps, and the maximal error of the tables relative to the
+maximal value of the profile.
+
+Run from the root of the repository:
+
+    python benchmarks/bench_profile_table.py
+"""
+import os.path
+import time
+import warnings
+
+import numpy
+
+import cryspy
+
+N_POINTS = 10000
+N_REFLECTIONS = 800
+N_REPEAT = 5
+L_STEP = (None, 1e-3, 1e-2)
+
+F_MAIN = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), "tests", "PbSO4_unpol_powder_test",
+    "main.rcif")
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore")
+    rhochi = cryspy.file_to_globaln(F_MAIN)
+pd = rhochi.experiments()[0]
+tth = numpy.linspace(5., 150., N_POINTS)
+tth_hkl = numpy.linspace(10., 140., N_REFLECTIONS)
+
+
+def main():
+    print(f"{N_POINTS:} points, {N_REFLECTIONS:} reflections")
+    profile_0 = None
+    for step in L_STEP:
+        pd.profile_table_step = step
+        # tables are calculated at the first call
+        pd.calc_shape_profile(tth, tth_hkl)
+        t_0 = time.perf_counter()
+        for i in range(N_REPEAT):
+            profile = pd.calc_shape_profile(tth, tth_hkl)[0]
+        t_1 = time.perf_counter()
+        if profile_0 is None:
+            profile_0 = profile
+        error = numpy.abs(profile-profile_0).max()/profile_0.max()
+        print(f"step {str(step):8}{(t_1-t_0)*1e3/N_REPEAT:10.1f} ms   \
+relative error {error:.2e}")
+
+
+if __name__ == "__main__":
+    main()
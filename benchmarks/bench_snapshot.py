@@ -0,0 +1,37 @@
+"""
+Time of reading of RhoChi object from rcif file and from binary snapshot.
+
+Run from the root of the repository:
+
+    python benchmarks/bench_snapshot.py
+"""
+import os.path
+import tempfile
+import timeit
+
+from cryspy import file_to_globaln
+from cryspy.B_parent_classes.cl_4_global import GlobalN
+
+N_REPEAT = 5
+
+F_MAIN = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), "tests", "PbSO4_unpol_powder_test",
+    "main.rcif")
+
+DIR_SNAPSHOT = os.path.join(tempfile.mkdtemp(), "snapshot")
+file_to_globaln(F_MAIN).save_snapshot(DIR_SNAPSHOT)
+
+L_STATEMENT = (
+    "file_to_globaln(F_MAIN)",
+    "GlobalN.load_snapshot(DIR_SNAPSHOT)",
+    )
+
+
+def main():
+    for statement in L_STATEMENT:
+        time = timeit.timeit(statement, globals=globals(), number=N_REPEAT)
+        print(f"{statement:45}{time*1e3/N_REPEAT:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
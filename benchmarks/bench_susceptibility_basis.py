@@ -0,0 +1,55 @@
+"""
+Time of the susceptibility and moment tensors calculated at every step of
+refinement of susceptibility parameters: directly and by the kept basis
+of tensors (only chi_ij is changed between the steps).
+
+Run from the root of the repository:
+
+    python benchmarks/bench_susceptibility_basis.py
+"""
+import os.path
+import timeit
+
+import numpy
+
+import cryspy
+
+N_REPEAT = 10
+
+F_MAIN = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), "tests", "HoTi_single_test", "main.rcif")
+
+rhochi = cryspy.file_to_globaln(F_MAIN)
+crystal = rhochi.crystals()[0]
+diffrn_refln = rhochi.experiments()[0].diffrn_refln
+index_h, index_k, index_l = [numpy.array(index, dtype=int)
+                             for index in (diffrn_refln.index_h,
+                                           diffrn_refln.index_k,
+                                           diffrn_refln.index_l)]
+orbit_index = crystal.calc_orbit_index(index_h, index_k, index_l)
+item = crystal.atom_site_susceptibility.items[0]
+
+
+def step_chi():
+    """Change susceptibility as a refinement step does."""
+    item.chi_11 = item.chi_11 + 1e-3
+
+
+L_STATEMENT = (
+    "crystal.calc_susceptibility_moment_tensor_by_orbit(index_h, index_k, \
+index_l, orbit_index=orbit_index)",
+    "crystal.calc_susceptibility_moment_tensor_by_basis(index_h, index_k, \
+index_l, orbit_index=orbit_index)",
+    )
+
+
+def main():
+    print(f"{index_h.size:} reflections")
+    for statement in L_STATEMENT:
+        time = timeit.timeit(f"step_chi(); {statement:}", globals=globals(),
+                             number=N_REPEAT)
+        print(f"{statement:80}{time*1e3/N_REPEAT:10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Time of BFGS refinement of PbSO4 powder diffraction (the phase scale is
+perturbed and refined together with the background and other parameters)
+with all the parameters given to the minimizer and with the phase scale and
+background intensities found by linear least squares at each step
+(variable projection).
+
+Run from the root of the repository:
+
+    python benchmarks/bench_variable_projection.py
+"""
+import os.path
+import time
+import warnings
+
+import cryspy
+
+F_MAIN = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), "tests", "PbSO4_unpol_powder_test",
+    "main.rcif")
+
+
+def refine(flag_variable_projection: bool):
+    rhochi = cryspy.file_to_globaln(F_MAIN)
+    phase = rhochi.experiments()[0].phase.items[0]
+    phase.scale_refinement = True
+    phase.scale = 1.3*phase.scale
+    t_0 = time.perf_counter()
+    dict_out = rhochi.refine(flag_variable_projection=flag_variable_projection)
+    t_1 = time.perf_counter()
+    chi_sq, n = rhochi.calc_chi_sq(flag_internal=False)
+    print(f"variable projection {str(flag_variable_projection):6}\
+{(t_1-t_0):10.1f} s  {dict_out['res']['nfev']:6} calls  \
+chi_sq/n {chi_sq/n:.5f}")
+
+
+def main():
+    warnings.simplefilter("ignore")
+    for flag_variable_projection in (False, True):
+        refine(flag_variable_projection)
+
+
+if __name__ == "__main__":
+    main()
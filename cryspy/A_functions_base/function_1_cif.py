@@ -0,0 +1,300 @@
+"""
+Fast reader of files in CIF/STAR format.
+
+The file is read once line by line and the result is given as objects of
+pycifstar library (Global, Data, Loop, Items), so it can be used everywhere
+in place of pycifstar.to_global without the intermediate conversion of
+the content to the string and back.
+"""
+import os
+import os.path
+import re
+from warnings import warn
+
+from pycifstar import Global, Data, Loop, Items, Item
+
+# a token is a comment, a quoted string (the quote is closed only if it is
+# followed by a white space) or a sequence of non-white characters
+RE_TOKEN = re.compile(
+    r"""(#.*)|'((?:[^']|'(?=\S))*)'(?=\s|$)|"((?:[^"]|"(?=\S))*)"(?=\s|$)|"""
+    r"""(\S+)""")
+
+
+def split_cif_line(line: str) -> list:
+    """
+    Split line of CIF file into values.
+
+    Quoted strings are given without quotes, comments are skipped.
+
+    Parameters
+    ----------
+    line : str
+        Line of CIF file.
+
+    Returns
+    -------
+    list
+        Values.
+
+    """
+    if (("'" not in line) and ('"' not in line) and ("#" not in line)):
+        return line.split()
+    l_value = []
+    for comment, val_1, val_2, val_3 in RE_TOKEN.findall(line):
+        if comment != "":
+            break
+        elif val_3 != "":
+            l_value.append(val_3)
+        elif val_1 != "":
+            l_value.append(val_1)
+        else:
+            l_value.append(val_2)
+    return l_value
+
+
+def expand_add_url(l_line: list, f_dir: str) -> list:
+    """Insert content of files given by '_add_url' items."""
+    if not(any([line.lstrip().startswith("_add_url") for line in l_line])):
+        return l_line
+    l_line_new = []
+    for line in l_line:
+        if line.lstrip().startswith("_add_url"):
+            f_name = line.split("#")[0].strip()[len("_add_url"):].strip()
+            f_name = f_name.strip("\"").strip("'")
+            f_full = os.path.join(f_dir, f_name)
+            if os.path.isfile(f_full):
+                with open(f_full, "r") as fid:
+                    l_line_new.extend(fid.read().splitlines())
+            else:
+                warn(f"File {f_full:} is not found.", UserWarning)
+        else:
+            l_line_new.append(line)
+    return l_line_new
+
+
+def get_prefix_position(l_name, prefix: str) -> int:
+    """
+    Give position of the first name with the prefix in the list of names.
+
+    It is used to keep objects in the order of the file. Names are compared
+    in lower case. The length of the list is given if the prefix is not
+    found.
+    """
+    prefix = "_" + prefix.strip("_").lower()
+    n_prefix = len(prefix)
+    for ind, name in enumerate(l_name):
+        name = name.lower()
+        if (name.startswith(prefix) and
+                (name[n_prefix:n_prefix+1] in ("_", ".", ""))):
+            return ind
+    return len(l_name)
+
+
+class _Block(object):
+    """Items and loops of a block during reading."""
+
+    def __init__(self, name: str = ""):
+        self.name = name
+        self.items = []
+        self.loops = []
+
+    def add_loop(self, loop_name: str, l_name: list, l_value: list):
+        n_name = len(l_name)
+        if n_name == 0:
+            return
+        n_rest = len(l_value) % n_name
+        if n_rest != 0:
+            l_value.extend((n_name - n_rest)*["."])
+        l_row = [l_value[ind:ind+n_name] for ind in
+                 range(0, len(l_value), n_name)]
+        if len(l_row) == 0:
+            return
+        self.loops.append(Loop(name=loop_name, names=l_name, values=l_row))
+
+    def to_data(self) -> Data:
+        return Data(name=self.name, items=Items(items=self.items),
+                    loops=self.loops)
+
+
+def str_to_global(string: str, f_dir: str = None) -> Global:
+    """
+    Read string of CIF format.
+
+    Parameters
+    ----------
+    string : str
+        Content of CIF file.
+    f_dir : str, optional
+        Directory for files given by '_add_url' item.
+        Default is current directory.
+
+    Returns
+    -------
+    Global
+        Object of pycifstar library.
+
+    """
+    if f_dir is None:
+        f_dir = os.getcwd()
+    l_line = expand_add_url(string.splitlines(), f_dir)
+
+    block_global = _Block()
+    block = block_global
+    l_data = []
+
+    flag_loop, flag_loop_names = False, False
+    loop_name, l_loop_name, l_loop_value = "", [], []
+    tag = None
+
+    def set_value(value):
+        nonlocal tag
+        if flag_loop:
+            l_loop_value.append(value)
+        elif tag is not None:
+            block.items.append(Item(name=tag, value=value))
+            tag = None
+
+    n_line = len(l_line)
+    i_line = 0
+    while i_line < n_line:
+        line = l_line[i_line]
+        i_line += 1
+        str_1 = line.strip()
+        if ((str_1 == "") or str_1.startswith("#")):
+            continue
+        if line.startswith(";"):
+            # text field
+            l_text = [str_1[1:].strip()]
+            while i_line < n_line:
+                line = l_line[i_line]
+                i_line += 1
+                if line.startswith(";"):
+                    break
+                l_text.append(line.strip())
+            set_value("\n".join(l_text).strip())
+            flag_loop_names = False
+            continue
+
+        str_1_low = str_1[:7].lower()
+        if str_1.startswith("_"):
+            if flag_loop_names:
+                l_loop_name.append(str_1.split()[0])
+                continue
+            if flag_loop:
+                block.add_loop(loop_name, l_loop_name, l_loop_value)
+                flag_loop = False
+            if tag is not None:
+                block.items.append(Item(name=tag, value="."))
+            l_help = str_1.split(None, 1)
+            tag = l_help[0]
+            if len(l_help) > 1:
+                rest = l_help[1]
+                l_value = split_cif_line(rest)
+                if len(l_value) == 1:
+                    set_value(l_value[0])
+                elif len(l_value) > 1:
+                    # value with spaces given without quotes
+                    set_value(rest.split("#")[0].strip())
+        elif str_1_low.startswith(("loop_", "data_", "global_")):
+            if flag_loop:
+                block.add_loop(loop_name, l_loop_name, l_loop_value)
+                flag_loop = False
+            if tag is not None:
+                block.items.append(Item(name=tag, value="."))
+                tag = None
+            if str_1_low.startswith("loop_"):
+                flag_loop, flag_loop_names = True, True
+                loop_name = str_1.split()[0][len("loop_"):]
+                l_loop_name, l_loop_value = [], []
+            elif str_1_low.startswith("data_"):
+                block = _Block(str_1.split()[0][len("data_"):])
+                l_data.append(block)
+            elif block is block_global:
+                block_global.name = str_1.split()[0][len("global_"):]
+            else:
+                # the next global block is not read
+                break
+        else:
+            flag_loop_names = False
+            l_value = split_cif_line(str_1)
+            if flag_loop:
+                l_loop_value.extend(l_value)
+            elif len(l_value) > 0:
+                set_value(l_value[0])
+
+    if flag_loop:
+        block.add_loop(loop_name, l_loop_name, l_loop_value)
+    if tag is not None:
+        block.items.append(Item(name=tag, value="."))
+
+    global_ = Global(name=block_global.name,
+                     items=Items(items=block_global.items),
+                     loops=block_global.loops,
+                     datas=[block.to_data() for block in l_data])
+    return global_
+
+
+def file_to_global(f_name: str) -> Global:
+    """
+    Read file of CIF format.
+
+    Parameters
+    ----------
+    f_name : str
+        File name.
+
+    Returns
+    -------
+    Global
+        Object of pycifstar library.
+
+    """
+    with open(f_name, "r") as fid:
+        string = fid.read()
+    return str_to_global(string, os.path.dirname(f_name))
+
+
+def str_to_data(string: str, f_dir: str = None) -> Data:
+    """
+    Read string of CIF format as one data block.
+
+    If the string contains data blocks, the first one is given. Otherwise
+    all items and loops of the string are given as a data block.
+
+    Parameters
+    ----------
+    string : str
+        Content of CIF file.
+    f_dir : str, optional
+        Directory for files given by '_add_url' item.
+
+    Returns
+    -------
+    Data
+        Object of pycifstar library.
+
+    """
+    global_ = str_to_global(string, f_dir=f_dir)
+    if len(global_.datas) != 0:
+        return global_.datas[0]
+    return Data(name="", items=global_.items, loops=global_.loops)
+
+
+def file_to_data(f_name: str) -> Data:
+    """
+    Read file of CIF format as one data block.
+
+    Parameters
+    ----------
+    f_name : str
+        File name.
+
+    Returns
+    -------
+    Data
+        Object of pycifstar library.
+
+    """
+    with open(f_name, "r") as fid:
+        string = fid.read()
+    return str_to_data(string, os.path.dirname(f_name))
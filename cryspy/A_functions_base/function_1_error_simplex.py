@@ -8,13 +8,18 @@ Functions
 import numpy
 
 
-def error_estimation_simplex(vertex_vector_h, vertex_chi_sq_h, func):
+def error_estimation_simplex(vertex_vector_h, vertex_chi_sq_h, func,
+                             func_batch=None):
     """
     Error estimation.
 
     Calculations according to
     ANALYTICAL CHEMISTRY, VOL. 60, NO. 8, APRIL 15, 1988
 
+    If func_batch is given it gives chi square for (K, number of
+    parameters) array of parameters and all the points are calculated by
+    one call.
+
     notations
     ---------
         theta_i = vertex_vector[i, :]
@@ -42,12 +47,21 @@ def error_estimation_simplex(vertex_vector_h, vertex_chi_sq_h, func):
         radius_h[i-1] = max_radius[i-1]
         vertex_vector[i, :] = theta_0+radius_h
 
-    l_chi_sq = []
-    for i in range(0, k):
-        theta_i = vertex_vector_h[i, :]
-        chi_sq = func(theta_i)
-        l_chi_sq.append(chi_sq)
-    vertex_chi_sq = numpy.array(l_chi_sq, dtype=float)
+    # points: vertices, middles of edges from vertex 0, middles of other
+    # edges
+    l_theta = [vertex_vector_h[i, :] for i in range(0, k)]
+    for i in range(1, k):
+        l_theta.append(0.5*(theta_0+vertex_vector[i, :]))
+    for i in range(1, k):
+        for j in range(i+1, k):
+            l_theta.append(0.5*(vertex_vector[i, :]+vertex_vector[j, :]))
+    if func_batch is None:
+        l_chi_sq = [func(theta) for theta in l_theta]
+    else:
+        l_chi_sq = func_batch(numpy.array(l_theta, dtype=float))
+    l_chi_sq = list(numpy.array(l_chi_sq, dtype=float))
+    vertex_chi_sq = numpy.array(l_chi_sq[:k], dtype=float)
+    l_chi_sq_ij = l_chi_sq[2*k-1:]
 
     # print("hh, k: ", hh, k)
     # print("theta_0: ", theta_0)
@@ -60,8 +74,7 @@ def error_estimation_simplex(vertex_vector_h, vertex_chi_sq_h, func):
     # print("step 1")
     for i in range(1, k):
         theta_i = vertex_vector[i, :]
-        theta_0i = 0.5*(theta_0+theta_i)
-        chi_sq_0i = func(theta_0i)
+        chi_sq_0i = l_chi_sq[k+i-1]
         # print("ii: {:}     {:}".format(i, chi_sq_0i))
         m_chi_sq_0i[i-1] = chi_sq_0i
         m_q[i-1, :] = theta_i-theta_0
@@ -80,9 +93,7 @@ def error_estimation_simplex(vertex_vector_h, vertex_chi_sq_h, func):
 
         for j in range(i+1, k):
             chi_sq_0j = m_chi_sq_0i[j-1]
-            theta_j = vertex_vector[j, :]
-            theta_ij = 0.5*(theta_i+theta_j)
-            chi_sq_ij = func(theta_ij)
+            chi_sq_ij = l_chi_sq_ij.pop(0)
             # print("ij: {:} {:}    {:}".format(i, j, chi_sq_ij))
             b_ij = 2.*(chi_sq_ij + chi_sq_0 - chi_sq_0i - chi_sq_0j)
             m_b[i-1, j-1] = b_ij
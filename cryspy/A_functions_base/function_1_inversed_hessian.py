@@ -11,28 +11,22 @@ Functions
 import numpy
 import copy
 
-def estimate_inversed_hessian_matrix(func, param_0):
-    """Estimate inversed Hessian matrix."""
+def estimate_inversed_hessian_matrix(func, param_0, func_batch=None):
+    """Estimate inversed Hessian matrix.
+
+    func gives chi square for parameters. If func_batch is given it gives
+    chi square for (K, number of parameters) array of parameters and all
+    the points are calculated by one call.
+    """
     n_param = len(param_0)
     np_hessian = numpy.zeros(shape=(n_param, n_param), dtype=float)
     np_first_der = numpy.zeros(shape=(n_param,), dtype=float)
-    chi_sq = func(param_0)
     perc = 0.01
+    l_index, l_delta, l_param = [], [], []
     for i_p_1, p_1 in enumerate(param_0):
         delta_p_1 = perc * numpy.abs(p_1)
         if delta_p_1 < 1e-5:
             delta_p_1 = 1e-5
-        param_p = copy.deepcopy(param_0)
-        param_m = copy.deepcopy(param_0)
-        param_p[i_p_1] += delta_p_1
-        param_m[i_p_1] -= delta_p_1
-        # chi_sq_p = func(param_p)
-        # chi_sq_m = func(param_m)
-        # der_second = (chi_sq_p + chi_sq_m - 2.*chi_sq)/(delta_p_1**2)
-        # np_hessian[i_p_1, i_p_1] = der_second
-
-        # der_first = (chi_sq_p - chi_sq_m) / (2.*delta_p_1)
-        # np_first_der[i_p_1] = der_first
 
         param_pp = copy.deepcopy(param_0)
         param_pm = copy.deepcopy(param_0)
@@ -51,16 +45,25 @@ def estimate_inversed_hessian_matrix(func, param_0):
             param_mp[i_p_2] += delta_p_2
             param_mm[i_p_2] -= delta_p_2
 
-            chi_sq_pp = func(param_pp)
-            chi_sq_pm = func(param_pm)
-            chi_sq_mp = func(param_mp)
-            chi_sq_mm = func(param_mm)
+            l_index.append((i_p_1, i_p_2))
+            l_delta.append(delta_p_1 * delta_p_2)
+            l_param.extend([copy.deepcopy(param_pp), copy.deepcopy(param_pm),
+                            copy.deepcopy(param_mp), copy.deepcopy(param_mm)])
 
-            der_second = (chi_sq_pp + chi_sq_mm - chi_sq_pm - chi_sq_mp) / (
-                4. * delta_p_1 * delta_p_2) 
-            np_hessian[i_p_1, i_p_2] = der_second
-            np_hessian[i_p_2, i_p_1] = der_second
+    if func_batch is None:
+        func(param_0)
+        chi_sq = numpy.array([func(param) for param in l_param], dtype=float)
+    else:
+        chi_sq = numpy.array(func_batch(numpy.array(l_param, dtype=float)),
+                             dtype=float)
+    chi_sq = chi_sq.reshape(-1, 4)
+
+    for (i_p_1, i_p_2), delta, (chi_sq_pp, chi_sq_pm, chi_sq_mp,
+                                chi_sq_mm) in zip(l_index, l_delta, chi_sq):
+        der_second = (chi_sq_pp + chi_sq_mm - chi_sq_pm - chi_sq_mp) / (
+            4. * delta)
+        np_hessian[i_p_1, i_p_2] = der_second
+        np_hessian[i_p_2, i_p_1] = der_second
     np_hessian_inv = numpy.linalg.inv(np_hessian)
     func(param_0)
     return np_hessian_inv, np_first_der
-
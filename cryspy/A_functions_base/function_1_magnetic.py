@@ -8,7 +8,14 @@ import os
 import pycifstar
 
 F_FORMMAG = os.path.join(os.path.dirname(__file__), "formmag.tab")
-FORMMAG_data = pycifstar.to_data(F_FORMMAG)
+
+
+def get_formmag_data():
+    """Give magnetic form factors (file formmag.tab is read at first call)."""
+    global FORMMAG_data
+    if "FORMMAG_data" not in globals():
+        FORMMAG_data = pycifstar.to_data(F_FORMMAG)
+    return FORMMAG_data
 
 
 def get_j0_j2_by_symbol(symbol: str):
@@ -19,7 +26,7 @@ def get_j0_j2_by_symbol(symbol: str):
     j2_a2, j2_A1, j2_B1, j2_b2 = 0., 0., 0., 0.
     j2_C1, j2_c2, j2_D = 0., 0., 0.
     flag_0, flag_2 = False, False
-    for loop in FORMMAG_data.loops:
+    for loop in get_formmag_data().loops:
         if "_atom_type_scat_neutron_magnetic_j0_a1" in loop.names:
             hh = [_i1 for _i1, _1 in enumerate(loop[s_1]) if (_1 == symbol)]
             if len(hh) > 0:
@@ -62,3 +69,10 @@ def get_j0_j2_by_symbol(symbol: str):
             break
     return j0_A1, j0_a2, j0_B1, j0_b2, j0_C1, j0_c2, j0_D, j2_A1, j2_a2, \
         j2_B1, j2_b2, j2_C1, j2_c2, j2_D
+
+
+def __getattr__(name: str):
+    """Read table FORMMAG_data at first access (PEP 562)."""
+    if name == "FORMMAG_data":
+        return get_formmag_data()
+    raise AttributeError(f"module '{__name__:}' has no attribute '{name:}'")
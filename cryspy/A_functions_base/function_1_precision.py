@@ -0,0 +1,85 @@
+"""
+Precision of numerical kernels.
+
+By default all calculations are done in double precision (float64 and
+complex128). In single precision the phases and structure factors in
+asymmetric unit cell, the factor matrices of MEM and the profile matrices
+of powder experiments (1d, 2d and TOF) are calculated in float32 and
+complex64, which halves the memory traffic of the largest arrays. The
+profiles are summed into float64 arrays, so chi square is accumulated in
+double precision in both modes.
+
+The precision is global. The results kept in internal caches of objects
+are not recalculated when the precision is changed, use flag_internal=True
+(or new objects) to calculate them again.
+
+Functions
+---------
+    - set_precision
+    - get_precision
+    - get_float_dtype
+    - get_complex_dtype
+    - to_precision
+"""
+from typing import NoReturn
+
+import numpy
+
+D_DTYPE = {
+    "double": (numpy.float64, numpy.complex128),
+    "single": (numpy.float32, numpy.complex64)}
+
+D_PRECISION = {"precision": "double"}
+
+
+def set_precision(precision: str = "double") -> NoReturn:
+    """
+    Set precision of numerical kernels.
+
+    Keyword Arguments
+    -----------------
+        - precision: "double" (by default) or "single"
+
+    Example
+    -------
+    >>> cryspy.set_precision("single")
+    """
+    precision = str(precision).strip().lower()
+    if precision not in D_DTYPE.keys():
+        raise ValueError(
+            f"Precision should be one of {tuple(D_DTYPE.keys())}, \
+got '{precision:}'.")
+    D_PRECISION["precision"] = precision
+
+
+def get_precision() -> str:
+    """Give precision of numerical kernels: "double" or "single"."""
+    return D_PRECISION["precision"]
+
+
+def get_float_dtype():
+    """Give float type of numerical kernels."""
+    return D_DTYPE[D_PRECISION["precision"]][0]
+
+
+def get_complex_dtype():
+    """Give complex type of numerical kernels."""
+    return D_DTYPE[D_PRECISION["precision"]][1]
+
+
+def to_precision(array):
+    """
+    Give numerical array in the precision of numerical kernels.
+
+    In double precision the array is returned as it is. In single precision
+    real (and integer) arrays are given as float32 and complex arrays as
+    complex64.
+    """
+    if D_PRECISION["precision"] == "double":
+        return array
+    array = numpy.asarray(array)
+    if array.dtype.kind == "c":
+        return array.astype(numpy.complex64, copy=False)
+    if array.dtype.kind in "fiu":
+        return array.astype(numpy.float32, copy=False)
+    return array
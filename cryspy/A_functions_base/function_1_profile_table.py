@@ -0,0 +1,144 @@
+"""
+Tabulated shapes of powder diffraction peaks.
+
+The pseudo-Voigt function with full width at half maximum H is
+
+    pv(dtth) = (eta*L(x) + (1-eta)*G(x)) / H,  x = dtth / H
+
+with normalized shapes of unit width
+
+    G(x) = 2*sqrt(ln2/pi)*exp(-4*ln2*x**2)  (zero for 4*ln2*x**2 >= 5)
+    L(x) = 2/pi / (1+4*x**2)
+
+and the asymmetry of reflections (FullProf Manual, page 54) is given by
+
+    F_a(z) = 2*z*exp(-z**2),  F_b(z) = 2*(2*z**2-3)*F_a(z),  z = dtth / H.
+
+The pseudo-Voigt function is linear in eta, so G, L, F_a and F_b are
+tabulated over one variable only: on the uniform grid 0 <= x <= X_MAX with
+a given step. The values are found by linear interpolation, the error is
+less than step**2/8 * max|f''|, that is about 0.65*step**2 of the peak
+height of G and L (6.5e-7 for the default step 1e-3). Out of the grid G,
+F_a and F_b are zero and L is calculated directly.
+
+The tables are calculated once for each step and precision and are shared
+by all phases and experiments.
+
+Functions
+---------
+    - get_profile_table
+    - calc_pseudo_voigt_by_table
+    - calc_asymmetry_functions_by_table
+"""
+import numpy
+
+from cryspy.A_functions_base.function_1_precision import get_precision, \
+    to_precision
+
+X_MAX = 8.
+STEP = 1e-3
+
+# x at which the gauss function is cut: 4*ln2*x**2 = 5
+X_GAUSS = (5./(4.*numpy.log(2.)))**0.5
+
+# calculated tables: key is (step, precision)
+D_PROFILE_TABLE = {}
+
+
+def get_profile_table(step: float = STEP) -> dict:
+    """
+    Give tables of G, L, F_a and F_b for 0 <= x <= X_MAX.
+
+    Output
+    ------
+        - dictionary with keys "step", "number" and for each function
+          "gauss", "lorentz", "fa", "fb" its values on the grid and
+          differences between neighbouring values ("d_gauss", ...)
+    """
+    step = float(step)
+    key = (step, get_precision())
+    if key in D_PROFILE_TABLE.keys():
+        return D_PROFILE_TABLE[key]
+    number = int(numpy.ceil(X_MAX/step))+1
+    x = numpy.arange(number, dtype=float)*step
+    x_sq = numpy.square(x)
+    d_func = {
+        "gauss": 2.*(numpy.log(2.)/numpy.pi)**0.5 *
+        numpy.exp(-4.*numpy.log(2.)*x_sq),
+        "lorentz": 2./(numpy.pi*(1.+4.*x_sq)),
+        "fa": 2.*x*numpy.exp(-x_sq)}
+    d_func["fb"] = 2.*(2.*x_sq-3.)*d_func["fa"]
+    d_table = {"step": step, "number": number}
+    for name, value in d_func.items():
+        d_table[name] = to_precision(value)
+        d_table[f"d_{name:}"] = to_precision(numpy.diff(value, append=0.))
+    D_PROFILE_TABLE[key] = d_table
+    return d_table
+
+
+def _calc_index_weight(abs_x, d_table: dict):
+    """Give indexes of grid points and weights of linear interpolation."""
+    weight = abs_x * (1./d_table["step"])
+    numpy.minimum(weight, d_table["number"]-1, out=weight)
+    # the last difference is defined, so the last point is not excluded
+    index = weight.astype(numpy.intp)
+    weight -= index
+    return index, weight
+
+
+def _interpolate(d_table: dict, name: str, index, weight):
+    """Interpolate tabulated function by indexes and weights."""
+    value = d_table[f"d_{name:}"].take(index)
+    value *= weight
+    value += d_table[name].take(index)
+    return value
+
+
+def calc_pseudo_voigt_by_table(x, eta, step: float = STEP):
+    """
+    Calculate pseudo-Voigt function of unit width by tables.
+
+    Arguments
+    ---------
+        - x: (ttheta-ttheta_hkl)/fwhm
+        - eta: mixing parameter (broadcasted to x)
+        - step: step of the table
+
+    Output
+    ------
+        - eta*L(x) + (1-eta)*G(x) (it should be divided by fwhm)
+    """
+    d_table = get_profile_table(step)
+    abs_x = numpy.abs(x)
+    index, weight = _calc_index_weight(abs_x, d_table)
+
+    gauss = _interpolate(d_table, "gauss", index, weight)
+    gauss *= abs_x < X_GAUSS
+    lorentz = _interpolate(d_table, "lorentz", index, weight)
+    flag_out = abs_x > X_MAX
+    if numpy.any(flag_out):
+        lorentz[flag_out] = 2./(numpy.pi*(1.+4.*numpy.square(x[flag_out])))
+
+    # eta*L + (1-eta)*G
+    lorentz -= gauss
+    lorentz *= eta
+    lorentz += gauss
+    return lorentz
+
+
+def calc_asymmetry_functions_by_table(z, step: float = STEP):
+    """
+    Calculate functions F_a(z) and F_b(z) of asymmetry by tables.
+
+    Output
+    ------
+        - f_a, f_b
+    """
+    d_table = get_profile_table(step)
+    index, weight = _calc_index_weight(numpy.abs(z), d_table)
+    sign = numpy.sign(z)
+    f_a = _interpolate(d_table, "fa", index, weight)
+    f_a *= sign
+    f_b = _interpolate(d_table, "fb", index, weight)
+    f_b *= sign
+    return f_a, f_b
@@ -0,0 +1,224 @@
+"""
+Process-wide cache of reflection lists.
+
+Lists of reflections (h, k, l, multiplicity) depend only on the symmetry,
+on the metric of the unit cell and on the range of sin(theta)/lambda. They
+are kept in one cache for all experiments, so the crystal shared by several
+experiments (or used in consecutive calculations) gives its reflections
+only once. The list for a narrower range is given by slicing of the cached
+list of a wider range. Old lists are removed by LRU policy.
+
+The lists are calculated in the range widened by the relative margin
+(ReflectionCache.margin). When the cell parameters are changed (cell
+refinement) the cached list is still used while it is guaranteed to contain
+all reflections of the requested range: sthovl of the reflections is
+calculated for the new cell and the reflections are masked in or out. The
+list is calculated again only when the cell drifts past the margin.
+
+Reflections with equal sin(theta)/lambda given from cache can come in the
+order different from the one given by direct calculation.
+
+The cache is thread-safe: entries are changed under a lock and the search
+goes over a snapshot of the entries, so several threads can request and
+add lists at once. Lists given by the cache are copies.
+"""
+import threading
+from collections import OrderedDict
+from typing import NoReturn, Callable
+
+import numpy
+
+# number of decimals of cell parameters in the key of cache
+N_DECIMALS_CELL = 6
+
+# relative accuracy of the bounds of sthovl ratio
+EPSILON_RATIO = 1e-9
+
+
+class ReflectionCache(object):
+    """
+    LRU cache of reflection lists.
+
+    Entries are kept under the key (key, sthovl_min, sthovl_max) where key
+    describes the symmetry and the kind of the list. Each entry keeps the
+    cell parameters used for the calculation, its metric tensor, sthovl of
+    the reflections (sorted) and the arrays of the list.
+
+    Attributes
+    ----------
+        - max_size is maximal number of kept lists
+        - margin is relative margin of sthovl range of calculated lists
+        - entries
+        - n_hit, n_miss are numbers of successful and failed requests
+        - lock guards entries and counters
+    """
+
+    def __init__(self, max_size: int = 32, margin: float = 0.02):
+        self.max_size = max_size
+        self.margin = margin
+        self.entries = OrderedDict()
+        self.n_hit = 0
+        self.n_miss = 0
+        self.lock = threading.Lock()
+
+    def get(self, key, cell_parameters, sthovl_min: float,
+            sthovl_max: float, func_sthovl: Callable = None,
+            flag_strict: bool = True):
+        """
+        Give reflections in the range from cache (None if there is no list
+        covering the range).
+
+        Parameters
+        ----------
+        key : tuple
+            Symmetry and kind of the list.
+        cell_parameters : tuple
+            (a, b, c, alpha, beta, gamma), angles in degrees.
+        sthovl_min, sthovl_max : float
+            Range of sin(theta)/lambda.
+        func_sthovl : Callable
+            Function giving sthovl by (index_h, index_k, index_l) for the
+            cell. If it is None only lists calculated for the same cell are
+            used.
+        flag_strict : bool
+            For flag_strict the range is sthovl_min < sthovl < sthovl_max,
+            otherwise sthovl_min <= sthovl <= sthovl_max.
+
+        Returns
+        -------
+        index_h, index_k, index_l, multiplicity : numpy.ndarray
+        """
+        cell_key = calc_cell_key(*cell_parameters)
+        metric = None
+        with self.lock:
+            l_entry = list(self.entries.items())
+        for key_entry, entry in reversed(l_entry):
+            if key_entry[0] != key:
+                continue
+            window_min, window_max = key_entry[1], key_entry[2]
+            cell_key_entry, metric_entry, sthovl, l_array = entry
+            if cell_key_entry == cell_key:
+                if ((window_min <= sthovl_min) and
+                        (sthovl_max <= window_max)):
+                    break
+            elif func_sthovl is not None:
+                if metric is None:
+                    metric = calc_metric_tensor(*cell_parameters)
+                ratio_min, ratio_max = calc_sthovl_ratio_bounds(
+                    metric_entry, metric)
+                if (((window_min == 0.) or
+                        (window_min*ratio_max < sthovl_min)) and
+                        (sthovl_max < window_max*ratio_min)):
+                    sthovl = func_sthovl(*l_array[:3])
+                    arg_sort = numpy.argsort(sthovl, kind="stable")
+                    sthovl = sthovl[arg_sort]
+                    l_array = [array[arg_sort] for array in l_array]
+                    break
+        else:
+            with self.lock:
+                self.n_miss += 1
+            return None
+        with self.lock:
+            self.n_hit += 1
+            if key_entry in self.entries.keys():
+                self.entries.move_to_end(key_entry)
+        return select_reflections(sthovl, l_array, sthovl_min, sthovl_max,
+                                  flag_strict=flag_strict)
+
+    def put(self, key, cell_parameters, sthovl_min: float, sthovl_max: float,
+            sthovl: numpy.ndarray, l_array) -> NoReturn:
+        """Keep reflections sorted by sthovl in cache."""
+        key_entry = (key, float(sthovl_min), float(sthovl_max))
+        entry = (
+            calc_cell_key(*cell_parameters),
+            calc_metric_tensor(*cell_parameters),
+            numpy.array(sthovl, dtype=float),
+            tuple([numpy.array(array) for array in l_array]))
+        with self.lock:
+            self.entries[key_entry] = entry
+            self.entries.move_to_end(key_entry)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def calc_superset_range(self, sthovl_min: float, sthovl_max: float):
+        """Give the range widened by margin."""
+        return sthovl_min/(1. + self.margin), sthovl_max*(1. + self.margin)
+
+    def clear(self) -> NoReturn:
+        """Remove all lists."""
+        with self.lock:
+            self.entries.clear()
+            self.n_hit = 0
+            self.n_miss = 0
+
+
+REFLECTION_CACHE = ReflectionCache()
+
+
+def get_reflection_cache() -> ReflectionCache:
+    """Give process-wide cache of reflection lists."""
+    return REFLECTION_CACHE
+
+
+def select_reflections(sthovl: numpy.ndarray, l_array, sthovl_min: float,
+                       sthovl_max: float, flag_strict: bool = True) -> tuple:
+    """Give copies of arrays sorted by sthovl in the range of sthovl."""
+    if flag_strict:
+        i_begin = numpy.searchsorted(sthovl, sthovl_min, side="right")
+        i_end = numpy.searchsorted(sthovl, sthovl_max, side="left")
+    else:
+        i_begin = numpy.searchsorted(sthovl, sthovl_min, side="left")
+        i_end = numpy.searchsorted(sthovl, sthovl_max, side="right")
+    return tuple([array[i_begin:i_end].copy() for array in l_array])
+
+
+def calc_cell_key(length_a: float, length_b: float, length_c: float,
+                  angle_alpha: float, angle_beta: float,
+                  angle_gamma: float) -> tuple:
+    """Give rounded cell metric used in the key of cache."""
+    return tuple([round(float(value), N_DECIMALS_CELL) for value in (
+        length_a, length_b, length_c, angle_alpha, angle_beta, angle_gamma)])
+
+
+def calc_metric_tensor(length_a: float, length_b: float, length_c: float,
+                       angle_alpha: float, angle_beta: float,
+                       angle_gamma: float) -> numpy.ndarray:
+    """Give metric tensor of direct space (angles in degrees)."""
+    cos_a, cos_b, cos_g = numpy.cos(numpy.radians(
+        [angle_alpha, angle_beta, angle_gamma]))
+    a, b, c = float(length_a), float(length_b), float(length_c)
+    return numpy.array([[a*a, a*b*cos_g, a*c*cos_b],
+                        [a*b*cos_g, b*b, b*c*cos_a],
+                        [a*c*cos_b, b*c*cos_a, c*c]], dtype=float)
+
+
+def calc_sthovl_ratio_bounds(metric_1: numpy.ndarray,
+                             metric_2: numpy.ndarray):
+    """
+    Give bounds of the ratio sthovl_2/sthovl_1 for any reflection, where
+    sthovl_1 and sthovl_2 are calculated for the cells with metric tensors
+    metric_1 and metric_2.
+
+    sthovl**2 = 1/4 * hkl * G* * hkl, where G* is inverse of the metric
+    tensor, so the squared ratio is bounded by eigenvalues of
+    G_1 * inverse(G_2).
+    """
+    eigenvalues = numpy.linalg.eigvals(
+        numpy.matmul(metric_1, numpy.linalg.inv(metric_2))).real
+    ratio_min = numpy.sqrt(eigenvalues.min()) * (1. - EPSILON_RATIO)
+    ratio_max = numpy.sqrt(eigenvalues.max()) * (1. + EPSILON_RATIO)
+    return ratio_min, ratio_max
+
+
+def calc_symmetry_key(r_ij, shift_i) -> tuple:
+    """Give key of symmetry by rotation matrices and centring translations.
+
+    Arguments
+    ---------
+        - r_ij = (r_11, r_12, r_13, r_21, r_22, r_23, r_31, r_32, r_33)
+        - shift_i = (shift_x, shift_y, shift_z)
+    """
+    r_ij = numpy.rint(numpy.array(r_ij, dtype=float)).astype(int)
+    shift_i = numpy.array(shift_i, dtype=float)
+    return (r_ij.shape, r_ij.tobytes(), shift_i.shape,
+            numpy.round(shift_i, 8).tobytes())
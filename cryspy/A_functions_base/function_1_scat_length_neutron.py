@@ -15,7 +15,14 @@ import pycifstar
 from typing import List, Tuple
 
 F_BSCAT = os.path.join(os.path.dirname(__file__), "bscat.tab")
-BSCAT = pycifstar.to_loop(F_BSCAT)
+
+
+def get_bscat():
+    """Give table of scattering lengths (bscat.tab is read at first call)."""
+    global BSCAT
+    if "BSCAT" not in globals():
+        BSCAT = pycifstar.to_loop(F_BSCAT)
+    return BSCAT
 
 
 def apply_constraint_on_cell_by_type_cell(cell, type_cell:str,
@@ -86,7 +93,8 @@ def get_scat_length_neutron(type_n):
     str_1 = "".join([hh if hh.isalpha() else ' ' for hh in str_1 ]).split(" ")[0]
 
     flag = False
-    for _1, _2 in zip(BSCAT["_atom_type_symbol"], BSCAT["_atom_type_cohb"]):
+    bscat = get_bscat()
+    for _1, _2 in zip(bscat["_atom_type_symbol"], bscat["_atom_type_cohb"]):
         if (_1.lower() == str_1):
             res = 0.1 * complex(_2)  # in 10**-12cm
             flag = True
@@ -98,3 +106,10 @@ def get_scat_length_neutron(type_n):
             f"Can not find b_scat for '{type_n:}'.\n It is putted as 0.",
             UserWarning, stacklevel=2)
     return res
+
+
+def __getattr__(name: str):
+    """Read table BSCAT at first access (PEP 562)."""
+    if name == "BSCAT":
+        return get_bscat()
+    raise AttributeError(f"module '{__name__:}' has no attribute '{name:}'")
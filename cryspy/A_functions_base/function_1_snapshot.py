@@ -0,0 +1,204 @@
+"""
+Functions to keep objects of cryspy library in binary snapshots.
+
+Snapshot is a directory with the file 'manifest.json' describing the tree
+of objects and the files '*.npy' keeping numerical arrays as raw buffers.
+Arrays are loaded in memory-mapped mode, so loading of a snapshot does not
+depend on the size of measured data.
+"""
+import os
+import os.path
+import json
+import importlib
+from typing import NoReturn
+
+import numpy
+
+SNAPSHOT_FORMAT = "cryspy-snapshot"
+SNAPSHOT_VERSION = 1
+F_MANIFEST = "manifest.json"
+
+
+class SnapshotArrays(object):
+    """
+    Arrays of snapshot.
+
+    At saving the arrays are collected by method add. At loading the
+    arrays are read from the directory of snapshot only when they are
+    requested.
+    """
+
+    def __init__(self, f_dir: str = None, mmap_mode: str = "c"):
+        self.f_dir = f_dir
+        self.mmap_mode = mmap_mode
+        self.arrays = {}
+
+    def add(self, array: numpy.ndarray) -> str:
+        """Add array, give its key."""
+        key = f"a{len(self.arrays):}"
+        self.arrays[key] = array
+        return key
+
+    def __getitem__(self, key: str) -> numpy.ndarray:
+        if key not in self.arrays.keys():
+            f_name = os.path.join(self.f_dir, f"{key:}.npy")
+            self.arrays[key] = numpy.load(f_name, mmap_mode=self.mmap_mode,
+                                          allow_pickle=False)
+        return self.arrays[key]
+
+    def save(self, f_dir: str) -> NoReturn:
+        """Save arrays into directory."""
+        for key, array in self.arrays.items():
+            numpy.save(os.path.join(f_dir, f"{key:}.npy"),
+                       numpy.ascontiguousarray(array), allow_pickle=False)
+
+
+def class_to_name(cls) -> str:
+    """Give full name of class."""
+    return f"{cls.__module__:}.{cls.__qualname__:}"
+
+
+def name_to_class(name: str):
+    """
+    Give class by its full name.
+
+    Only classes of cryspy library derived from ItemN, LoopN, DataN or
+    GlobalN are given, so that a snapshot can not import other modules.
+    """
+    from cryspy.B_parent_classes.cl_1_item import ItemN
+    from cryspy.B_parent_classes.cl_2_loop import LoopN
+    from cryspy.B_parent_classes.cl_3_data import DataN
+    from cryspy.B_parent_classes.cl_4_global import GlobalN
+    module_name, cls_name = ("."+str(name)).rsplit(".", 1)
+    module_name = module_name[1:]
+    cls = None
+    if module_name.startswith("cryspy."):
+        try:
+            cls = getattr(importlib.import_module(module_name), cls_name)
+        except (ImportError, AttributeError, TypeError, ValueError):
+            cls = None
+    if not(isinstance(cls, type) and
+           issubclass(cls, (ItemN, LoopN, DataN, GlobalN))):
+        raise UserWarning(f"Class '{name:}' is not a class of cryspy \
+objects, it can not be restored from snapshot.")
+    return cls
+
+
+def value_to_snapshot(value, arrays: SnapshotArrays):
+    """
+    Convert value to the form kept in manifest of snapshot.
+
+    Numerical arrays are given to arrays and only their keys are kept in
+    manifest. For values which can not be kept in snapshot
+    TypeError is raised.
+    """
+    if ((value is None) or isinstance(value, (bool, int, float, str))):
+        return value
+    elif isinstance(value, numpy.ndarray):
+        if value.dtype.kind in "biufc":
+            return {"__array__": arrays.add(value)}
+        elif value.dtype.kind == "U":
+            return {"__array_str__": value.tolist()}
+        return {"__array_object__": [value_to_snapshot(val, arrays)
+                                     for val in value.ravel().tolist()],
+                "shape": list(value.shape)}
+    elif isinstance(value, numpy.generic):
+        return value_to_snapshot(value.item(), arrays)
+    elif isinstance(value, complex):
+        return {"__complex__": [value.real, value.imag]}
+    elif isinstance(value, tuple):
+        return {"__tuple__": [value_to_snapshot(val, arrays)
+                              for val in value]}
+    elif isinstance(value, list):
+        return {"__list__": [value_to_snapshot(val, arrays)
+                             for val in value]}
+    raise TypeError(f"Value of type '{type(value).__name__:}' can not be \
+kept in snapshot.")
+
+
+def value_from_snapshot(value, arrays: SnapshotArrays):
+    """Convert value kept in manifest of snapshot back."""
+    if not(isinstance(value, dict)):
+        return value
+    elif "__array__" in value.keys():
+        return arrays[value["__array__"]]
+    elif "__array_str__" in value.keys():
+        return numpy.array(value["__array_str__"], dtype=str)
+    elif "__array_object__" in value.keys():
+        l_value = [value_from_snapshot(val, arrays)
+                   for val in value["__array_object__"]]
+        res = numpy.empty(len(l_value), dtype=object)
+        res[:] = l_value
+        return res.reshape(value["shape"])
+    elif "__complex__" in value.keys():
+        return complex(*value["__complex__"])
+    elif "__tuple__" in value.keys():
+        return tuple([value_from_snapshot(val, arrays)
+                      for val in value["__tuple__"]])
+    elif "__list__" in value.keys():
+        return [value_from_snapshot(val, arrays) for val in value["__list__"]]
+    raise ValueError("Unknown value in snapshot.")
+
+
+def save_snapshot(obj, f_dir: str) -> NoReturn:
+    """
+    Save object of cryspy library (GlobalN, DataN, LoopN, ItemN) in snapshot.
+
+    Parameters
+    ----------
+    obj : Union[GlobalN, DataN, LoopN, ItemN]
+        Object.
+    f_dir : str
+        Directory of snapshot. It is created if it does not exist.
+
+    Returns
+    -------
+    NoReturn
+
+    """
+    arrays = SnapshotArrays()
+    d_object = obj.get_snapshot(arrays)
+    d_manifest = {"format": SNAPSHOT_FORMAT, "version": SNAPSHOT_VERSION,
+                  "object": d_object}
+    os.makedirs(f_dir, exist_ok=True)
+    arrays.save(f_dir)
+    with open(os.path.join(f_dir, F_MANIFEST), "w") as fid:
+        json.dump(d_manifest, fid)
+
+
+def load_snapshot(f_dir: str, mmap_mode: str = "c"):
+    """
+    Load object of cryspy library from snapshot.
+
+    Parameters
+    ----------
+    f_dir : str
+        Directory of snapshot.
+    mmap_mode : str, optional
+        Mode of memory-mapping of arrays (see numpy.load). The default
+        is "c" (copy-on-write): arrays can be changed, but the changes
+        are not written in snapshot. None gives arrays loaded in memory.
+
+    Returns
+    -------
+    Union[GlobalN, DataN, LoopN, ItemN]
+        Object.
+
+    """
+    f_manifest = os.path.join(f_dir, F_MANIFEST)
+    if not(os.path.isfile(f_manifest)):
+        raise UserWarning(f"Snapshot '{f_dir:}' is not found.")
+    with open(f_manifest, "r") as fid:
+        d_manifest = json.load(fid)
+    if d_manifest.get("format", None) != SNAPSHOT_FORMAT:
+        raise UserWarning(f"File '{f_manifest:}' is not a snapshot.")
+    if d_manifest.get("version", None) != SNAPSHOT_VERSION:
+        raise UserWarning(f"Version of snapshot '{f_dir:}' is not supported.")
+    arrays = SnapshotArrays(f_dir, mmap_mode=mmap_mode)
+    return object_from_snapshot(d_manifest["object"], arrays)
+
+
+def object_from_snapshot(d_object: dict, arrays: SnapshotArrays):
+    """Create object from its description in snapshot."""
+    cls = name_to_class(d_object["class"])
+    return cls.from_snapshot(d_object, arrays)
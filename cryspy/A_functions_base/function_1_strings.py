@@ -117,6 +117,50 @@ def string_to_value_error(string: str) -> Tuple[float, Union[float, None]]:
             value = None
     return value, error
 
+
+def strings_to_values_errors(l_string: list) -> \
+        Tuple[numpy.ndarray, numpy.ndarray]:
+    """
+    Convert strings to arrays of floats and errors.
+
+    It is vectorized version of string_to_value_error. Undefined values and
+    errors are given as numpy.nan.
+
+    Parameters
+    ----------
+    l_string : list
+        Strings like "1.234", "1.234(5)", ".".
+
+    Returns
+    -------
+    values : numpy.ndarray
+        Values.
+    errors : numpy.ndarray
+        Errors.
+
+    """
+    n_string = len(l_string)
+    np_string = numpy.array(l_string, dtype=str)
+    errors = numpy.full(n_string, numpy.nan, dtype=float)
+    if n_string == 0:
+        return numpy.zeros(0, dtype=float), errors
+    flag_error = numpy.char.find(np_string, "(") != -1
+    values = numpy.full(n_string, numpy.nan, dtype=float)
+    try:
+        values[~flag_error] = np_string[~flag_error].astype(float)
+        l_ind = numpy.flatnonzero(flag_error)
+    except ValueError:
+        l_ind = range(n_string)
+    for ind in l_ind:
+        string = l_string[ind]
+        value, error = string_to_value_error(string)
+        if value is not None:
+            values[ind] = value
+        if error is not None:
+            errors[ind] = error
+    return values, errors
+
+
 def value_error_to_string(value: float, error: float) -> str:
     """
     Convert value and error to string
@@ -161,6 +205,152 @@ def value_error_to_string(value: float, error: float) -> str:
     return string
 
 
+def values_to_strings(values: numpy.ndarray) -> numpy.ndarray:
+    """
+    Convert array of floats to strings as f"{value:}" does.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        Values.
+
+    Returns
+    -------
+    numpy.ndarray
+        Strings.
+
+    """
+    np_values = numpy.asarray(values)
+    if np_values.dtype.kind == "f":
+        return np_values.astype(float).astype(str)
+    res = numpy.empty(np_values.shape, dtype=object)
+    res.ravel()[:] = [f"{val:}" for val in np_values.ravel()]
+    return res.astype(str)
+
+
+def values_errors_to_strings(values: numpy.ndarray, errors: numpy.ndarray) \
+        -> numpy.ndarray:
+    """
+    Convert arrays of values and errors to strings like "1.234(5)".
+
+    It is vectorized version of value_error_to_string.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        Values.
+    errors : numpy.ndarray
+        Errors. For zero error the string "1.234()" is given, for
+        numpy.nan the value is given without error.
+
+    Returns
+    -------
+    numpy.ndarray
+        Strings.
+
+    """
+    values = numpy.asarray(values, dtype=float)
+    errors = numpy.asarray(errors, dtype=float)
+    shape = numpy.broadcast(values, errors).shape
+    values = numpy.broadcast_to(values, shape).ravel()
+    errors = numpy.broadcast_to(errors, shape).ravel()
+    s_values = values.astype(str)
+    res = s_values.astype(object)
+
+    flag_nan = numpy.isnan(errors)
+    flag_zero = errors == 0.
+    res[flag_zero] = numpy.char.add(s_values[flag_zero], "()")
+
+    flag_error = numpy.logical_not(flag_nan | flag_zero)
+    flag_correct = (flag_error & (errors > 0.) & numpy.isfinite(errors) &
+                    numpy.isfinite(values))
+    for ind in numpy.flatnonzero(flag_error & numpy.logical_not(
+            flag_correct)):
+        if numpy.isnan(values[ind]):
+            res[ind] = "."
+        else:
+            res[ind] = value_error_to_string(float(values[ind]),
+                                             float(errors[ind]))
+
+    val_hh = numpy.log10(numpy.where(flag_correct, errors, 1.))
+    n_power = val_hh.astype(int)
+
+    # errors larger than 1: "123(4)"
+    flag_big = flag_correct & (val_hh > 0)
+    if numpy.any(flag_big):
+        s_1 = numpy.round(values[flag_big]).astype(int).astype(str)
+        s_2 = numpy.round(errors[flag_big]).astype(int).astype(str)
+        res[flag_big] = numpy.char.add(numpy.char.add(
+            numpy.char.add(s_1, "("), s_2), ")")
+
+    # errors smaller than 1: "1.234(5)", the number of decimals is
+    # defined by error
+    flag_small = flag_correct & (val_hh <= 0)
+    for n_decimal in numpy.unique(2 - n_power[flag_small]):
+        flag = flag_small & (n_power == 2 - n_decimal)
+        val_1 = numpy.round(values[flag], decimals=n_decimal)
+        val_2 = numpy.round(errors[flag], decimals=n_decimal)
+        s_sign = numpy.where(val_1 < 0., "-", "")
+        s_11 = numpy.abs(val_1.astype(int)).astype(str)
+        s_12 = numpy.char.rjust((numpy.abs(val_1) % 1. *
+                                 10**int(n_decimal)).astype(int).astype(str),
+                                int(n_decimal), "0")
+        s_2 = (val_2 * 10**int(n_decimal)).astype(int).astype(str)
+        s_out = numpy.char.add(s_sign, s_11)
+        s_out = numpy.char.add(numpy.char.add(s_out, "."), s_12)
+        s_out = numpy.char.add(numpy.char.add(s_out, "("), s_2)
+        res[flag] = numpy.char.add(s_out, ")")
+    return res.astype(str).reshape(shape)
+
+
+def ttheta_phi_intensity_to_string(
+        ttheta, phi, intensity, intensity_sigma=None,
+        intensity_refinement=None) -> str:
+    """
+    Give 2D block of intensities (used for 2D powder diffraction).
+
+    The first line contains the number of phi points and ttheta values,
+    the next lines contain phi and intensities at given phi.
+
+    Parameters
+    ----------
+    ttheta : numpy.ndarray
+        Ttheta, shape (n_ttheta, ).
+    phi : numpy.ndarray
+        Phi, shape (n_phi, ).
+    intensity : numpy.ndarray
+        Intensity, shape (n_ttheta, n_phi).
+    intensity_sigma : numpy.ndarray, optional
+        Sigmas of intensity.
+    intensity_refinement : numpy.ndarray, optional
+        Refinement flags. Refined intensities are given as "value(sigma)".
+
+    Returns
+    -------
+    str
+        Block of intensities.
+
+    """
+    s_ttheta = numpy.char.mod("%6.2f      ", numpy.asarray(ttheta,
+                                                          dtype=float))
+    ls_out = [f"{len(phi):12} " + " ".join(s_ttheta.tolist())]
+    np_intensity = numpy.asarray(intensity).transpose()
+    s_intensity = numpy.char.rjust(values_to_strings(np_intensity), 12)
+    if intensity_refinement is not None:
+        flag_ref = numpy.asarray(intensity_refinement,
+                                 dtype=bool).transpose()
+        if numpy.any(flag_ref):
+            np_sigma = numpy.asarray(intensity_sigma,
+                                     dtype=float).transpose()
+            s_intensity = s_intensity.astype(object)
+            s_intensity[flag_ref] = numpy.char.ljust(values_errors_to_strings(
+                np_intensity[flag_ref], np_sigma[flag_ref]), 12)
+    s_phi = numpy.char.mod("%12.2f ", numpy.asarray(phi, dtype=float))
+    for s_phi_i, s_intensity_i in zip(s_phi.tolist(), s_intensity.tolist()):
+        ls_out.append(s_phi_i + " ".join(s_intensity_i))
+    return "\n".join(ls_out)
+
+
 def transform_string_to_r_b(name: str, labels=("x", "y", "z")) -> Tuple:
     """
     transform string to rotation part and offset: 
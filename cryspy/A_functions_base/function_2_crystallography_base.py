@@ -4,6 +4,8 @@ Base crystallographic functions.
 import numpy
 from cryspy.A_functions_base.function_1_matrices import calc_mRmCmRT, \
     calc_product_matrix_vector, scalar_product
+from cryspy.A_functions_base.function_1_precision import get_float_dtype, \
+    get_complex_dtype, to_precision
 
 
 def calc_cos_ang(cell, h_1, k_1, l_1, h_2, k_2, l_2):
@@ -118,7 +120,11 @@ r_ij, b_i are elements of symmetry
 phase = exp(2\pi i (h*Rs*x + h*bs))
 
 phase_3d: [hkl, points, symmetry]
+
+The phases are given in the precision set by cryspy.set_precision.
     """
+    hkl, r_ij, b_i = to_precision(hkl), to_precision(r_ij), to_precision(b_i)
+    fract_xyz = to_precision(fract_xyz)
     h, k, l = hkl[0], hkl[1], hkl[2]
     x, y, z = fract_xyz[:, 0], fract_xyz[:, 1], fract_xyz[:, 2]
     r_11, r_12, r_13, r_21, r_22, r_23, r_31, r_32, r_33 = r_ij
@@ -146,6 +152,10 @@ phase_3d: [hkl, points, symmetry]
 
 def calc_phase_by_hkl_xyz_rb(h, k, l, x, y, z, r_11, r_12, r_13, r_21, r_22,
                              r_23, r_31, r_32, r_33, b_1, b_2, b_3):
+    h, k, l, x, y, z = [to_precision(val) for val in (h, k, l, x, y, z)]
+    r_11, r_12, r_13, r_21, r_22, r_23, r_31, r_32, r_33, b_1, b_2, b_3 = [
+        to_precision(val) for val in (r_11, r_12, r_13, r_21, r_22, r_23,
+                                      r_31, r_32, r_33, b_1, b_2, b_3)]
     np_h, np_x, np_r_11 = numpy.meshgrid(h, x, r_11, indexing="ij")
     np_k, np_y, np_r_22 = numpy.meshgrid(k, y, r_22, indexing="ij")
     np_l, np_z, np_r_33 = numpy.meshgrid(l, z, r_33, indexing="ij")
@@ -164,7 +174,7 @@ def calc_phase_by_hkl_xyz_rb(h, k, l, x, y, z, r_11, r_12, r_13, r_21, r_22,
     np_y_s = np_x*np_r_21 + np_y*np_r_22 + np_z*np_r_23 + np_b_2
     np_z_s = np_x*np_r_31 + np_y*np_r_32 + np_z*np_r_33 + np_b_3
     hh = (2*numpy.pi*1j*(np_h*np_x_s + np_k*np_y_s+ np_l*np_z_s)).astype(
-        complex)
+        get_complex_dtype())
     phase_3d = numpy.exp(hh)
     return phase_3d
 
@@ -224,6 +234,188 @@ def calc_dwf(cell, h, k, l, b_iso, beta, r_11, r_12, r_13, r_21, r_22, r_23,
     return dwf_3d
 
 
+def calc_f_hkl_as_by_hkl_xyz_rb(
+        h, k, l, x, y, z, r_11, r_12, r_13, r_21, r_22, r_23, r_31, r_32,
+        r_33, b_1, b_2, b_3, b_scat, sthovl, b_iso, beta,
+        n_element: int = 1048576):
+    """Calculate structure factor in asymmetric unit cell.
+
+    The same as combination of calc_phase_by_hkl_xyz_rb and calc_dwf summed
+    over symmetry elements and atoms, but hkl are rotated by symmetry
+    elements once, phases and Debye-Waller factors are calculated together
+    and the reflections are treated by chunks.
+
+    Arguments
+    ---------
+        - h, k, l are 1D arrays of Miller indices
+        - x, y, z are fractional coordinates of atoms (1D arrays)
+        - r_11, ..., r_33, b_1, b_2, b_3 are symmetry elements (1D arrays)
+        - b_scat is scattering amplitude multiplied by occupancy and
+          multiplicity of atoms
+        - sthovl is sin(theta)/lambda of reflections
+        - b_iso, beta are isotropic and anisotropic parameters of atomic
+          displacements: beta is (n_atoms, 6) array of beta_11, beta_22,
+          beta_33, beta_12, beta_13, beta_23
+        - n_element is maximal size of (hkl, atoms, symmetry) arrays
+          calculated at once
+
+    The arrays are calculated in the precision set by
+    cryspy.set_precision.
+
+    Output
+    ------
+        - f_hkl_as is 1D complex array
+    """
+    float_dtype, complex_dtype = get_float_dtype(), get_complex_dtype()
+    hkl = numpy.stack([numpy.asarray(h, dtype=float_dtype),
+                       numpy.asarray(k, dtype=float_dtype),
+                       numpy.asarray(l, dtype=float_dtype)], axis=0)
+    r_ij = numpy.stack([numpy.asarray(r_11, dtype=float_dtype),
+                        numpy.asarray(r_12, dtype=float_dtype),
+                        numpy.asarray(r_13, dtype=float_dtype),
+                        numpy.asarray(r_21, dtype=float_dtype),
+                        numpy.asarray(r_22, dtype=float_dtype),
+                        numpy.asarray(r_23, dtype=float_dtype),
+                        numpy.asarray(r_31, dtype=float_dtype),
+                        numpy.asarray(r_32, dtype=float_dtype),
+                        numpy.asarray(r_33, dtype=float_dtype)],
+                       axis=0).reshape(3, 3, -1)
+    b_i = numpy.stack([numpy.asarray(b_1, dtype=float_dtype),
+                       numpy.asarray(b_2, dtype=float_dtype),
+                       numpy.asarray(b_3, dtype=float_dtype)], axis=0)
+    # (atoms, 3)
+    xyz = numpy.stack([numpy.asarray(x, dtype=float_dtype),
+                       numpy.asarray(y, dtype=float_dtype),
+                       numpy.asarray(z, dtype=float_dtype)], axis=1)
+    beta = numpy.asarray(beta, dtype=float_dtype)
+    beta_as = numpy.concatenate([beta[:, :3], 2.*beta[:, 3:]], axis=1)
+    b_iso = numpy.asarray(b_iso, dtype=float_dtype)
+    b_scat = numpy.asarray(b_scat, dtype=complex_dtype)
+    sthovl_sq = numpy.square(numpy.asarray(sthovl, dtype=float_dtype))
+
+    n_hkl, n_atom, n_sym = hkl.shape[1], xyz.shape[0], r_ij.shape[2]
+    n_chunk = max(1, n_element // max(1, n_atom*n_sym))
+    f_hkl_as = numpy.zeros(n_hkl, dtype=complex_dtype)
+    for i_begin in range(0, n_hkl, n_chunk):
+        i_end = min(i_begin + n_chunk, n_hkl)
+        term_3d = calc_term_3d_by_hkl_xyz_rb(
+            hkl[:, i_begin:i_end], xyz, r_ij, b_i, sthovl_sq[i_begin:i_end],
+            b_iso, beta_as)[0]
+        f_hkl_as[i_begin:i_end] = numpy.matmul(term_3d.sum(axis=2), b_scat)
+    return f_hkl_as*1./n_sym
+
+
+def calc_term_3d_by_hkl_xyz_rb(hkl, xyz, r_ij, b_i, sthovl_sq, b_iso,
+                               beta_as):
+    """Calculate phase factors multiplied by Debye-Waller factors.
+
+    Arguments
+    ---------
+        - hkl is (3, hkl) array of Miller indices
+        - xyz is (atoms, 3) array of fractional coordinates
+        - r_ij is (3, 3, symmetry) array of rotations, b_i is (3, symmetry)
+          array of translations
+        - sthovl_sq is squared sin(theta)/lambda of reflections
+        - b_iso is isotropic parameter of atoms, beta_as is (atoms, 6)
+          array of beta_11, beta_22, beta_33, 2 beta_12, 2 beta_13,
+          2 beta_23
+
+    Output
+    ------
+        - term_3d is (hkl, atoms, symmetry) complex array
+        - hkl_s is (3, hkl, symmetry) array of rotated Miller indices
+        - hh is (hkl, 6, symmetry) array of products of rotated Miller
+          indices (hh, kk, ll, hk, hl, kl)
+    """
+    # hkl rotated by symmetry elements (3, hkl, symmetry)
+    hkl_s = numpy.einsum("in,ijs->jns", hkl, r_ij)
+    hb_2d = numpy.einsum("in,is->ns", hkl, b_i)
+
+    # (hkl, atoms, symmetry)
+    phase_3d = numpy.matmul(xyz, hkl_s.transpose(1, 0, 2))
+    phase_3d += hb_2d[:, numpy.newaxis, :]
+    hh = numpy.stack([hkl_s[0]*hkl_s[0], hkl_s[1]*hkl_s[1],
+                      hkl_s[2]*hkl_s[2], hkl_s[0]*hkl_s[1],
+                      hkl_s[0]*hkl_s[2], hkl_s[1]*hkl_s[2]], axis=1)
+    power_3d = numpy.matmul(beta_as, hh)
+    power_3d += (sthovl_sq[:, numpy.newaxis] *
+                 b_iso[numpy.newaxis, :])[:, :, numpy.newaxis]
+    term_3d = numpy.exp(2.*numpy.pi*1j*phase_3d)
+    term_3d *= numpy.exp(-power_3d)
+    return term_3d, hkl_s, hh
+
+
+def calc_f_hkl_as_with_derivatives_by_hkl_xyz_rb(
+        h, k, l, x, y, z, r_11, r_12, r_13, r_21, r_22, r_23, r_31, r_32,
+        r_33, b_1, b_2, b_3, b_scat, sthovl, b_iso, beta,
+        n_element: int = 1048576):
+    """Calculate structure factor in asymmetric unit cell and its
+    derivatives over parameters of atoms.
+
+    The arguments are the same as in calc_f_hkl_as_by_hkl_xyz_rb. The
+    derivatives are given by the same phase factors and Debye-Waller
+    factors as the structure factor.
+
+    Output
+    ------
+        - f_hkl_as is 1D complex array
+        - df_db_scat is (hkl, atoms) array of derivatives over b_scat
+        - df_dxyz is (hkl, atoms, 3) array of derivatives over x, y, z
+        - df_db_iso is (hkl, atoms) array of derivatives over b_iso
+        - df_dbeta is (hkl, atoms, 6) array of derivatives over beta_11,
+          beta_22, beta_33, beta_12, beta_13, beta_23
+    """
+    hkl = numpy.stack([numpy.asarray(h, dtype=float),
+                       numpy.asarray(k, dtype=float),
+                       numpy.asarray(l, dtype=float)], axis=0)
+    r_ij = numpy.stack([numpy.asarray(r_11, dtype=float),
+                        numpy.asarray(r_12, dtype=float),
+                        numpy.asarray(r_13, dtype=float),
+                        numpy.asarray(r_21, dtype=float),
+                        numpy.asarray(r_22, dtype=float),
+                        numpy.asarray(r_23, dtype=float),
+                        numpy.asarray(r_31, dtype=float),
+                        numpy.asarray(r_32, dtype=float),
+                        numpy.asarray(r_33, dtype=float)],
+                       axis=0).reshape(3, 3, -1)
+    b_i = numpy.stack([numpy.asarray(b_1, dtype=float),
+                       numpy.asarray(b_2, dtype=float),
+                       numpy.asarray(b_3, dtype=float)], axis=0)
+    xyz = numpy.stack([numpy.asarray(x, dtype=float),
+                       numpy.asarray(y, dtype=float),
+                       numpy.asarray(z, dtype=float)], axis=1)
+    beta = numpy.asarray(beta, dtype=float)
+    beta_as = numpy.concatenate([beta[:, :3], 2.*beta[:, 3:]], axis=1)
+    b_iso = numpy.asarray(b_iso, dtype=float)
+    b_scat = numpy.asarray(b_scat, dtype=complex)
+    sthovl_sq = numpy.square(numpy.asarray(sthovl, dtype=float))
+
+    n_hkl, n_atom, n_sym = hkl.shape[1], xyz.shape[0], r_ij.shape[2]
+    n_chunk = max(1, n_element // max(1, n_atom*n_sym))
+    df_db_scat = numpy.zeros((n_hkl, n_atom), dtype=complex)
+    df_dxyz = numpy.zeros((n_hkl, n_atom, 3), dtype=complex)
+    df_dbeta = numpy.zeros((n_hkl, n_atom, 6), dtype=complex)
+    for i_begin in range(0, n_hkl, n_chunk):
+        i_end = min(i_begin + n_chunk, n_hkl)
+        term_3d, hkl_s, hh = calc_term_3d_by_hkl_xyz_rb(
+            hkl[:, i_begin:i_end], xyz, r_ij, b_i, sthovl_sq[i_begin:i_end],
+            b_iso, beta_as)
+        df_db_scat[i_begin:i_end] = term_3d.sum(axis=2)
+        df_dxyz[i_begin:i_end] = numpy.matmul(
+            term_3d, hkl_s.transpose(1, 2, 0))
+        df_dbeta[i_begin:i_end] = numpy.matmul(term_3d, hh.transpose(0, 2, 1))
+
+    df_db_scat *= 1./n_sym
+    f_hkl_as = numpy.matmul(df_db_scat, b_scat)
+    b_scat_2d = b_scat[numpy.newaxis, :]*1./n_sym
+    df_dxyz *= (2.*numpy.pi*1j*b_scat_2d)[:, :, numpy.newaxis]
+    df_dbeta *= -b_scat_2d[:, :, numpy.newaxis]
+    df_dbeta[:, :, 3:] *= 2.
+    df_db_iso = -sthovl_sq[:, numpy.newaxis]*b_scat[numpy.newaxis, :] * \
+        df_db_scat
+    return f_hkl_as, df_db_scat, df_dxyz, df_db_iso, df_dbeta
+
+
 def calc_form_factor_tensor_susceptibility(
         chi_11, chi_22, chi_33, chi_12, chi_13, chi_23, space_group_symop,
         form_factor, cell, h, k, l):
@@ -401,3 +593,369 @@ def calc_atoms_in_unit_cell(r_ij, b_i, fract_xyz, atom_label):
     label_uc_s = numpy.take_along_axis(label_uc, ind_sort, 0)
 
     return fract_uc_x_s, fract_uc_y_s, fract_uc_z_s, label_uc_s
+
+
+def calc_hkl_by_symmetry(h_max: int, k_max: int, l_max: int, r_ij, shift_i,
+                         n_element: int = 1048576):
+    """Give unique reflections in the box 0 <= h <= h_max, |k| <= k_max,
+    |l| <= l_max.
+
+    Arguments
+    ---------
+        - h_max, k_max, l_max
+        - r_ij = (r_11, r_12, r_13, r_21, r_22, r_23, r_31, r_32, r_33)
+          rotation parts of symmetry elements (integer)
+        - shift_i = (shift_x, shift_y, shift_z) centring translations
+        - n_element is maximal size of arrays of symmetry-equivalent
+          reflections calculated at once (the box is treated by chunks)
+
+    Reflections extinct by centring translations are excluded. The orbit
+    of reflection hkl consists of reflections (h, k, l) * R and their Friedel
+    pairs. Each orbit is represented by the reflection with the largest key
+    10000*h + 100*k + l (the last one for equal keys). Reflections are given
+    in order of the first appearance of their orbit in the box when h, k, l
+    run as nested loops.
+
+    Output
+    ------
+        - index_h, index_k, index_l
+        - multiplicity (number of different reflections in the orbit)
+    """
+    r_ij = numpy.rint(numpy.array(r_ij, dtype=float)).astype(int)
+    n_sym = r_ij.shape[1]
+    r_ij = r_ij.reshape(3, 3, n_sym)
+    shift_i = numpy.array(shift_i, dtype=float)
+    h_max, k_max, l_max = int(h_max), int(k_max), int(l_max)
+
+    # orbits of reflections in the box are inside of the cube |index| < b_max
+    b_max = 3*max(h_max, k_max, l_max) + 1
+    b_size = 2*b_max + 1
+    n_box = (h_max + 1) * (2*k_max + 1) * (2*l_max + 1)
+    n_chunk = max(1, n_element // (2*n_sym))
+
+    l_hkl, l_mult = [], []
+    for i_begin in range(0, n_box, n_chunk):
+        index = numpy.arange(i_begin, min(i_begin + n_chunk, n_box))
+        index, ind_l = numpy.divmod(index, 2*l_max + 1)
+        ind_h, ind_k = numpy.divmod(index, 2*k_max + 1)
+        hkl = numpy.stack([ind_h, ind_k - k_max, ind_l - l_max], axis=0)
+
+        phase = 2.*numpy.pi*numpy.tensordot(shift_i, hkl, axes=(0, 0))
+        flag = numpy.abs(numpy.exp(1j*phase).sum(axis=0)) > 0.00001
+        hkl = hkl[:, flag]
+
+        # (3, n_hkl, 2*n_sym): images (h, k, l) * R and their Friedel pairs
+        hkl_sym = numpy.einsum("in,ijs->jns", hkl, r_ij)
+        hkl_sym = numpy.concatenate([hkl_sym, -hkl_sym], axis=2)
+
+        key = 10000*hkl_sym[0] + 100*hkl_sym[1] + hkl_sym[2]
+        ind_max = key.shape[1] - 1 - numpy.argmax(key[:, ::-1], axis=1)
+        hkl_rep = numpy.take_along_axis(
+            hkl_sym, ind_max[numpy.newaxis, :, numpy.newaxis], axis=2)[:, :, 0]
+
+        code = numpy.sort(((hkl_sym[0] + b_max)*b_size + hkl_sym[1] + b_max)
+                          * b_size + hkl_sym[2] + b_max, axis=1)
+        mult = 1 + numpy.count_nonzero(numpy.diff(code, axis=1), axis=1)
+        l_hkl.append(hkl_rep)
+        l_mult.append(mult)
+
+    hkl = numpy.concatenate(l_hkl, axis=1)
+    mult = numpy.concatenate(l_mult)
+    code = ((hkl[0] + b_max)*b_size + hkl[1] + b_max)*b_size + hkl[2] + b_max
+    ind_first = numpy.sort(numpy.unique(code, return_index=True)[1])
+    return hkl[0, ind_first], hkl[1, ind_first], hkl[2, ind_first], \
+        mult[ind_first]
+
+
+# Reciprocal asymmetric units of Laue classes: signs of (h, k, l) (1 for
+# non-negative index, 0 for any) and condition on (h, k, l). Several
+# settings are given for some classes, the one fitting the symmetry elements
+# is chosen by check_asu_by_symmetry.
+D_ASU_LAUE_CLASS = {
+    "-1": (
+        ((0, 0, 1), lambda h, k, l: (l > 0) | ((l == 0) & (
+            (k > 0) | ((k == 0) & (h >= 0))))),),
+    "2/m": (
+        ((0, 1, 1), lambda h, k, l: (l > 0) | ((l == 0) & (h >= 0))),
+        ((0, 0, 1), lambda h, k, l: (h > 0) | ((h == 0) & (k >= 0))),
+        ((1, 0, 0), lambda h, k, l: (k > 0) | ((k == 0) & (l >= 0))),),
+    "mmm": (
+        ((1, 1, 1), lambda h, k, l: h == h),),
+    "4/m": (
+        ((1, 1, 1), lambda h, k, l: (k > 0) | (h == 0)),),
+    "4/mmm": (
+        ((1, 1, 1), lambda h, k, l: h >= k),),
+    "-3": (
+        ((1, 1, 0), lambda h, k, l: (k > 0) | ((h == 0) & (l >= 0))),
+        ((1, 0, 0), lambda h, k, l: (h > k) & (h >= l) |
+         ((h == k) & (h == l) & (h >= 0)) | ((h == k) & (h > l))),),
+    "-3m": (
+        ((1, 1, 0), lambda h, k, l: (h >= k) & ((k > 0) | (l >= 0))),
+        ((1, 1, 0), lambda h, k, l: (h >= k) & ((h > k) | (l >= 0))),
+        ((1, 0, 0), lambda h, k, l: (h >= k) & (k >= l)),),
+    "6/m": (
+        ((1, 1, 1), lambda h, k, l: (k > 0) | (h == 0)),),
+    "6/mmm": (
+        ((1, 1, 1), lambda h, k, l: h >= k),),
+    "m-3": (
+        ((1, 1, 1), lambda h, k, l: ((l >= h) & (k > h)) |
+         ((l == h) & (k == h))),),
+    "m-3m": (
+        ((1, 1, 1), lambda h, k, l: (k >= h) & (l >= k)),),
+    }
+
+# asymmetric units checked for symmetry elements
+D_ASU_CHECKED = {}
+
+
+def calc_orbit_hkl(hkl, r_ij):
+    """Give orbits of reflections: images (h, k, l) * R and Friedel pairs.
+
+    Arguments
+    ---------
+        - hkl is array of shape (3, n_hkl)
+        - r_ij is integer array of shape (3, 3, n_sym)
+
+    Output
+    ------
+        - hkl_sym is array of shape (3, n_hkl, 2*n_sym)
+    """
+    hkl_sym = numpy.einsum("in,ijs->jns", hkl, r_ij)
+    return numpy.concatenate([hkl_sym, -hkl_sym], axis=2)
+
+
+def check_asu_by_symmetry(signs, func_asu, r_ij, index_max: int = 6):
+    """Check that the region of reciprocal space is asymmetric unit for
+    symmetry elements: each orbit of reflections in the box
+    |h|, |k|, |l| <= index_max has exactly one reflection in the region.
+
+    Arguments
+    ---------
+        - signs, func_asu define the region (see D_ASU_LAUE_CLASS)
+        - r_ij is integer array of shape (3, 3, n_sym)
+    """
+    index = numpy.arange(-index_max, index_max+1)
+    hkl = numpy.stack([array.flatten() for array in numpy.meshgrid(
+        index, index, index, indexing="ij")], axis=0)
+    hkl_sym = calc_orbit_hkl(hkl, r_ij)
+    flag_asu = func_asu(*hkl_sym)
+    for i_index, sign in enumerate(signs):
+        if sign == 1:
+            flag_asu = flag_asu & (hkl_sym[i_index] >= 0)
+    b_size = 2*3*index_max + 1
+    code = numpy.where(
+        flag_asu, ((hkl_sym[0]*b_size + hkl_sym[1])*b_size + hkl_sym[2]),
+        numpy.iinfo(int).max)
+    code = numpy.sort(code, axis=1)
+    flag_first = numpy.concatenate([
+        numpy.ones((code.shape[0], 1), dtype=bool),
+        numpy.diff(code, axis=1) != 0], axis=1)
+    n_asu = numpy.count_nonzero(
+        flag_first & (code != numpy.iinfo(int).max), axis=1)
+    return bool(numpy.all(n_asu == 1))
+
+
+def get_asu_by_laue_class(laue_class: str, r_ij):
+    """Give asymmetric unit (signs, func_asu) of Laue class fitting to
+    symmetry elements (None if there is no one).
+
+    Arguments
+    ---------
+        - laue_class is one of "-1", "2/m", "mmm", "4/m", "4/mmm", "-3",
+          "-3m", "6/m", "6/mmm", "m-3", "m-3m"
+        - r_ij is integer array of shape (3, 3, n_sym)
+    """
+    key = (laue_class, r_ij.shape, r_ij.tobytes())
+    if key not in D_ASU_CHECKED.keys():
+        res = None
+        for signs, func_asu in D_ASU_LAUE_CLASS.get(laue_class, ()):
+            if check_asu_by_symmetry(signs, func_asu, r_ij):
+                res = (signs, func_asu)
+                break
+        D_ASU_CHECKED[key] = res
+    return D_ASU_CHECKED[key]
+
+
+def calc_hkl_by_laue_class(laue_class: str, h_max: int, k_max: int,
+                           l_max: int, r_ij, shift_i,
+                           n_element: int = 1048576):
+    """Give unique reflections in the box 0 <= h <= h_max, |k| <= k_max,
+    |l| <= l_max enumerating only the reciprocal asymmetric unit of the
+    Laue class.
+
+    Arguments
+    ---------
+        - laue_class is Laue class of space group (SpaceGroup.laue_class)
+        - h_max, k_max, l_max
+        - r_ij = (r_11, r_12, r_13, r_21, r_22, r_23, r_31, r_32, r_33)
+          rotation parts of symmetry elements (integer)
+        - shift_i = (shift_x, shift_y, shift_z) centring translations
+        - n_element is maximal size of arrays of symmetry-equivalent
+          reflections calculated at once
+
+    Orbits with the reflection of asymmetric unit in the box are taken
+    (it is the same set of orbits as in calc_hkl_by_symmetry for the
+    reflections in the sphere inscribed in the box when the metric of the
+    cell obeys the symmetry). The multiplicity is calculated by the number
+    of symmetry elements keeping the reflection. Representatives and order
+    of reflections are the same as in calc_hkl_by_symmetry. If asymmetric
+    unit of the Laue class does not fit the symmetry elements (non-standard
+    setting) the function calc_hkl_by_symmetry is used.
+
+    Output
+    ------
+        - index_h, index_k, index_l
+        - multiplicity (number of different reflections in the orbit)
+    """
+    r_ij_int = numpy.rint(numpy.array(r_ij, dtype=float)).astype(int)
+    n_sym = r_ij_int.shape[1]
+    r_ij_int = r_ij_int.reshape(3, 3, n_sym)
+    asu = get_asu_by_laue_class(laue_class, r_ij_int)
+    if asu is None:
+        return calc_hkl_by_symmetry(h_max, k_max, l_max, r_ij, shift_i,
+                                    n_element=n_element)
+    signs, func_asu = asu
+    shift_i = numpy.array(shift_i, dtype=float)
+    h_max, k_max, l_max = int(h_max), int(k_max), int(l_max)
+    l_index_min = [-index_max*(1-sign) for sign, index_max
+                   in zip(signs, (h_max, k_max, l_max))]
+    n_h, n_k, n_l = [index_max - index_min + 1 for index_min, index_max
+                     in zip(l_index_min, (h_max, k_max, l_max))]
+    n_box = n_h * n_k * n_l
+    n_half_box = (h_max + 1) * (2*k_max + 1) * (2*l_max + 1)
+    n_chunk = max(1, n_element // (2*n_sym))
+
+    l_hkl, l_mult, l_first = [], [], []
+    for i_begin in range(0, n_box, n_chunk):
+        index = numpy.arange(i_begin, min(i_begin + n_chunk, n_box))
+        index, ind_l = numpy.divmod(index, n_l)
+        ind_h, ind_k = numpy.divmod(index, n_k)
+        hkl = numpy.stack([ind_h + l_index_min[0], ind_k + l_index_min[1],
+                           ind_l + l_index_min[2]], axis=0)
+        hkl = hkl[:, func_asu(*hkl)]
+
+        phase = 2.*numpy.pi*numpy.tensordot(shift_i, hkl, axes=(0, 0))
+        flag = numpy.abs(numpy.exp(1j*phase).sum(axis=0)) > 0.00001
+        hkl = hkl[:, flag]
+
+        hkl_sym = calc_orbit_hkl(hkl, r_ij_int)
+        n_stab = numpy.count_nonzero(
+            numpy.all(hkl_sym == hkl[:, :, numpy.newaxis], axis=0), axis=1)
+        mult = (2*n_sym) // n_stab
+
+        key = 10000*hkl_sym[0] + 100*hkl_sym[1] + hkl_sym[2]
+        ind_max = key.shape[1] - 1 - numpy.argmax(key[:, ::-1], axis=1)
+        hkl_rep = numpy.take_along_axis(
+            hkl_sym, ind_max[numpy.newaxis, :, numpy.newaxis], axis=2)[:, :, 0]
+
+        # the first appearance of the orbit in the box
+        flag_box = ((hkl_sym[0] >= 0) & (hkl_sym[0] <= h_max) &
+                    (numpy.abs(hkl_sym[1]) <= k_max) &
+                    (numpy.abs(hkl_sym[2]) <= l_max))
+        first = numpy.where(
+            flag_box, (hkl_sym[0]*(2*k_max+1) + hkl_sym[1] + k_max) *
+            (2*l_max+1) + hkl_sym[2] + l_max, n_half_box).min(axis=1)
+        l_hkl.append(hkl_rep)
+        l_mult.append(mult)
+        l_first.append(first)
+
+    hkl = numpy.concatenate(l_hkl, axis=1)
+    mult = numpy.concatenate(l_mult)
+    ind_sort = numpy.argsort(numpy.concatenate(l_first), kind="stable")
+    return hkl[0, ind_sort], hkl[1, ind_sort], hkl[2, ind_sort], \
+        mult[ind_sort]
+
+
+def calc_orbit_index(index_h, index_k, index_l, r_ij):
+    """Give orbit index of reflections: reflections are grouped in orbits
+    of symmetry-equivalent reflections (h, k, l) * R.
+
+    Arguments
+    ---------
+        - index_h, index_k, index_l are 1D arrays of Miller indices
+        - r_ij = (r_11, r_12, r_13, r_21, r_22, r_23, r_31, r_32, r_33)
+          rotation parts of symmetry elements (integer)
+
+    The first reflection of each orbit is its representative. Each
+    reflection is given as (representative) * R_s.
+
+    Output
+    ------
+        - ind_unique are indices of representatives
+        - ind_inverse are numbers of orbits of reflections (representative
+          of reflection i is ind_unique[ind_inverse[i]])
+        - ind_symm are numbers of symmetry elements
+    """
+    hkl = numpy.rint(numpy.stack([
+        numpy.asarray(index_h, dtype=float),
+        numpy.asarray(index_k, dtype=float),
+        numpy.asarray(index_l, dtype=float)], axis=0)).astype(int)
+    r_ij = numpy.rint(numpy.array(r_ij, dtype=float)).astype(int)
+    n_sym = r_ij.shape[-1]
+    # (3, hkl, symmetry)
+    hkl_sym = numpy.matmul(hkl.transpose(), r_ij.reshape(3, 3*n_sym)).reshape(
+        -1, 3, n_sym).transpose(1, 0, 2)
+
+    b_max = 3*int(numpy.abs(hkl).max(initial=0)) + 1
+    b_size = 2*b_max + 1
+    code = ((hkl_sym[0] + b_max)*b_size + hkl_sym[1] + b_max)*b_size + \
+        hkl_sym[2] + b_max
+    ind_unique, ind_inverse = numpy.unique(
+        code.max(axis=1), return_index=True, return_inverse=True)[1:]
+    ind_inverse = ind_inverse.ravel()
+
+    hkl_rep_sym = hkl_sym[:, ind_unique[ind_inverse], :]
+    ind_symm = numpy.argmax(numpy.all(
+        hkl_rep_sym == hkl[:, :, numpy.newaxis], axis=0), axis=1)
+    return ind_unique, ind_inverse, ind_symm
+
+
+def calc_orbit_phase(index_h, index_k, index_l, ind_unique, ind_inverse,
+                     ind_symm, b_i):
+    """Give phase factors of structure factors of reflections relative to
+    their representatives: F(h * R_s) = exp(-2 pi i h * b_s) F(h).
+
+    Arguments
+    ---------
+        - index_h, index_k, index_l are 1D arrays of Miller indices
+        - ind_unique, ind_inverse, ind_symm is orbit index (see
+          calc_orbit_index)
+        - b_i = (b_1, b_2, b_3) translations of symmetry elements
+    """
+    ind_rep = ind_unique[ind_inverse]
+    b_i = numpy.array(b_i, dtype=float)[:, ind_symm]
+    hb = numpy.asarray(index_h, dtype=float)[ind_rep]*b_i[0] + \
+        numpy.asarray(index_k, dtype=float)[ind_rep]*b_i[1] + \
+        numpy.asarray(index_l, dtype=float)[ind_rep]*b_i[2]
+    return numpy.exp(-2.*numpy.pi*1j*hb)
+
+
+def calc_tensor_by_orbit(t_ij, ind_inverse, ind_symm, orbit_phase, r_ij,
+                         m_m):
+    """Give tensor structure factors of reflections by the ones of
+    representatives of their orbits:
+    T(h * R_s) = exp(-2 pi i h * b_s) Rc_s^-1 T(h) Rc_s^-T,
+    where Rc_s = M R_s M^-1 is rotation in Cartesian coordinate system.
+
+    Arguments
+    ---------
+        - t_ij = (t_11, t_12, ..., t_33) tensors of representatives
+        - ind_inverse, ind_symm is orbit index (see calc_orbit_index)
+        - orbit_phase is given by calc_orbit_phase
+        - r_ij = (r_11, r_12, r_13, r_21, r_22, r_23, r_31, r_32, r_33)
+          rotation parts of symmetry elements
+        - m_m is matrix M of the cell (Cell.m_m)
+
+    Output
+    ------
+        - t_11, t_12, ..., t_33
+    """
+    r_ij = numpy.array(r_ij, dtype=float)
+    r_ij = r_ij.reshape(3, 3, r_ij.shape[-1]).transpose(2, 0, 1)
+    m_m = numpy.array(m_m, dtype=float)
+    rc_inv = numpy.linalg.inv(numpy.matmul(
+        numpy.matmul(m_m, r_ij), numpy.linalg.inv(m_m)))[ind_symm]
+    t_ij = numpy.stack(t_ij, axis=-1).reshape(-1, 3, 3)[ind_inverse]
+    res = numpy.matmul(numpy.matmul(rc_inv, t_ij), rc_inv.transpose(0, 2, 1))
+    res = res * orbit_phase[:, numpy.newaxis, numpy.newaxis]
+    return tuple(res.reshape(-1, 9).transpose())
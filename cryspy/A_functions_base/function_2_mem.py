@@ -6,6 +6,7 @@ import numpy
 
 from cryspy.A_functions_base.function_1_matrices import \
     calc_product_matrix_vector, calc_vector_product, calc_mRmCmRT
+from cryspy.A_functions_base.function_1_precision import to_precision
 
 
 def calc_asymmetric_unit_cell_indexes(n_x: int, n_y: int, n_z: int, r_ij, b_i)\
@@ -168,6 +169,7 @@ def calc_factor_in_front_of_density_for_fm(mult_i, np, volume,
     Output data:
         - v_i_1, v_i_2, v_i_3: [hkl, points]
 
+    The factors are given in the precision set by cryspy.set_precision.
     """
     # number of symmetry elements
     ns = phase_3d.shape[2]
@@ -179,6 +181,9 @@ def calc_factor_in_front_of_density_for_fm(mult_i, np, volume,
     m_2d_1, m_2d_2, m_2d_3 = moment_2d
     t_2d_1, t_2d_2, t_2d_3 = m_rho[:, numpy.newaxis] * m_2d_1, \
         m_rho[:, numpy.newaxis] * m_2d_2, m_rho[:, numpy.newaxis] * m_2d_3
+    t_2d_1, t_2d_2, t_2d_3 = to_precision(t_2d_1), to_precision(t_2d_2), \
+        to_precision(t_2d_3)
+    phase_3d = to_precision(phase_3d)
 
     # [hkl, ind, symm]
     v_hkl_3d_1 = t_2d_1[numpy.newaxis, :, :] * phase_3d[:, :, :]
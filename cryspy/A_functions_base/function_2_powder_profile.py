@@ -0,0 +1,367 @@
+"""
+Kernels of powder diffraction profiles.
+
+The functions take numpy arrays and tuples of parameters and give numpy
+arrays. They neither keep nor change any object. The methods
+calc_shape_profile, calc_iint, calc_profile of the classes Pd, Pd2d and TOF
+are wrappers around them; given with its own d_internal_val each call keeps
+intermediate results there, so the same experiment can be calculated by
+several threads at once. The crystals are shared by the threads: their
+lists of reflections (function_1_reflection_cache) and bases of tensors
+are kept in caches guarded by locks, and their parameters should not be
+changed meanwhile.
+
+Parameters
+----------
+    - resolution_parameters: (u, v, w, x, y) of instrument resolution
+    - phase_parameters: (igsize, u, v, w, x, y) of phase
+    - asymmetry_parameters: (p1, p2, p3, p4) of asymmetry of reflections
+
+Functions
+---------
+    - calc_resolution_pd
+    - calc_asymmetry_by_z
+    - calc_lorentz_factor
+    - calc_shape_profile_pd
+    - calc_shape_profile_pd_windowed
+    - calc_shape_profile_pd2d
+    - calc_iint_by_susceptibility
+    - calc_iint_by_f_mag_perp
+"""
+import numpy
+from scipy.sparse import csc_matrix
+
+from cryspy.A_functions_base.function_1_matrices import calc_mRmCmRT
+from cryspy.A_functions_base.function_1_precision import to_precision
+from cryspy.A_functions_base.function_1_profile_table import \
+    calc_pseudo_voigt_by_table, calc_asymmetry_functions_by_table
+from cryspy.A_functions_base.function_1_tof import calc_hpv_eta
+
+PHASE_PARAMETERS = (0., 0., 0., 0., 0., 0.)
+
+# indexes of components of tensors
+L_IJ = ("11", "12", "13", "21", "22", "23", "31", "32", "33")
+
+
+def calc_resolution_pd(tth_hkl, resolution_parameters: tuple,
+                       phase_parameters: tuple = PHASE_PARAMETERS):
+    """
+    Calculate parameters of peak shapes for 1d and 2d powder diffraction.
+
+    Arguments
+    ---------
+        - tth_hkl: ttheta of reflections in degrees
+        - resolution_parameters: (u, v, w, x, y)
+        - phase_parameters: (igsize, u, v, w, x, y)
+
+    Output
+    ------
+        - h_pv, eta, h_g, h_l, a_g, b_g, a_l, b_l
+    """
+    res_u, res_v, res_w, res_x, res_y = resolution_parameters
+    phase_igsize, phase_u, phase_v, phase_w, phase_x, phase_y = \
+        phase_parameters
+
+    th_hkl = 0.5*tth_hkl*numpy.pi/180.
+    t_th = numpy.tan(th_hkl)
+    t_th_sq = t_th**2
+    ic_th = 1./numpy.cos(th_hkl)
+
+    u = float(res_u)+phase_u
+    v = float(res_v)+phase_v
+    w = float(res_w)+phase_w
+    h_g = numpy.sqrt(u*t_th_sq + v*t_th + w + phase_igsize*ic_th**2)
+
+    x, y = float(res_x)+phase_x, float(res_y)+phase_y
+    h_l = x*t_th + y*ic_th
+
+    h_pv, eta = calc_hpv_eta(h_g, h_l)
+
+    a_g = (2./h_pv)*(numpy.log(2.)/numpy.pi)**0.5
+    b_g = 4*numpy.log(2)/(h_pv**2)
+    a_l = 2./(numpy.pi*h_pv)
+    b_l = 4./(h_pv**2)
+    return h_pv, eta, h_g, h_l, a_g, b_g, a_l, b_l
+
+
+def _calc_fa(z):
+    """For assymmetry correction F_a(z)."""
+    return 2*z*numpy.exp(-z**2)
+
+
+def _calc_fb(z):
+    """For assymmetry correction F_b(z)."""
+    return 2.*(2.*z**2-3.)*_calc_fa(z)
+
+
+def calc_asymmetry_by_z(z, tth_hkl, asymmetry_parameters: tuple,
+                        table_step: float = None):
+    """
+    Calculate asymmetry coefficients for given points.
+
+    z is (ttheta - ttheta_hkl)/fwhm and tth_hkl is ttheta of bragg
+    reflections (in degrees) given for each point (or broadcasted to z).
+
+    If table_step is given F_a(z) and F_b(z) are interpolated by tables
+    with the given step (see function_1_profile_table).
+
+    look page 54 in FullProf Manual
+    """
+    np_zero = numpy.zeros(z.shape, dtype = float)
+    np_one = numpy.ones(z.shape, dtype = float)
+    val_1, val_2 = np_zero, np_zero
+
+    p1, p2, p3, p4 = [float(_) for _ in asymmetry_parameters]
+    flag_1, flag_2 = False, False
+    if ((p1!= 0.)|(p2!= 0.)|(p3!= 0.)|(p4!= 0.)) & (table_step is not None):
+        fa, fb = calc_asymmetry_functions_by_table(z, step=table_step)
+        flag_1 = ((p1!= 0.)|(p3!= 0.))
+        flag_2 = ((p2!= 0.)|(p4!= 0.))
+    else:
+        if ((p1!= 0.)|(p3!= 0.)):
+            flag_1 = True
+            fa = _calc_fa(z)
+        if ((p2!= 0.)|(p4!= 0.)):
+            flag_2 = True
+            fb = _calc_fb(z)
+
+    flag_3, flag_4 = False, False
+    if ((p1!= 0.)|(p2!= 0.)):
+        if flag_1:
+            val_1 += p1*fa
+            flag_3 = True
+        if flag_2:
+            val_1 += p2*fb
+            flag_3 = True
+        if flag_3:
+            c1 = 1./numpy.tanh(0.5*tth_hkl)
+            val_1 *= c1
+
+    if ((p3!= 0.)|(p4!= 0.)):
+        if flag_1:
+            val_2 += p3*fa
+            flag_4 = True
+        if flag_2:
+            val_2 += p4*fb
+            flag_4 = True
+        if flag_4:
+            c2 = 1./numpy.tanh(tth_hkl)
+            val_2 *= c2
+
+    asymmetry = np_one+val_1+val_2
+    return asymmetry
+
+
+def calc_lorentz_factor(tth):
+    """Calculate Lorentz factor for ttheta in degrees."""
+    tth_rad = tth*numpy.pi/180.
+    return 1./(numpy.sin(tth_rad)*numpy.sin(0.5*tth_rad))
+
+
+def calc_shape_profile_pd(
+        tth_zs, tth_hkl, resolution_parameters: tuple,
+        phase_parameters: tuple = PHASE_PARAMETERS,
+        asymmetry_parameters: tuple = None, table_step: float = None):
+    """
+    Calculate shape profile of 1d powder diffraction.
+
+    Arguments
+    ---------
+        - tth_zs: ttheta of points corrected by zero shift in degrees
+        - tth_hkl: ttheta of reflections in degrees
+        - resolution_parameters, phase_parameters, asymmetry_parameters:
+          see the module description (there is no asymmetry if
+          asymmetry_parameters is None)
+        - table_step: if it is given the shapes are interpolated by tables
+
+    Output
+    ------
+        - profile_2d: (points, reflections) array in the precision set by
+          cryspy.set_precision
+        - h_pv: FWHM of reflections
+    """
+    h_pv, eta, h_g, h_l, a_g, b_g, a_l, b_l = calc_resolution_pd(
+        tth_hkl, resolution_parameters, phase_parameters)
+
+    np_lor_1d = to_precision(calc_lorentz_factor(tth_zs))
+    dtth_2d = to_precision(tth_zs)[:, numpy.newaxis] - \
+        to_precision(tth_hkl)[numpy.newaxis, :]
+
+    if table_step is not None:
+        h_pv_1d = to_precision(h_pv)
+        x_2d = dtth_2d / h_pv_1d[numpy.newaxis, :]
+        profile_2d = calc_pseudo_voigt_by_table(
+            x_2d, to_precision(eta)[numpy.newaxis, :], step=table_step)
+        profile_2d /= h_pv_1d[numpy.newaxis, :]
+        if asymmetry_parameters is not None:
+            profile_2d *= to_precision(calc_asymmetry_by_z(
+                x_2d, tth_hkl[numpy.newaxis, :], asymmetry_parameters,
+                table_step=table_step))
+        profile_2d *= np_lor_1d[:, numpy.newaxis]
+        return profile_2d, h_pv
+
+    dtth_sq_2d = dtth_2d**2
+    val_1 = to_precision(b_g)[numpy.newaxis, :]*dtth_sq_2d
+    g_pd_2d = to_precision(a_g)[numpy.newaxis, :]*numpy.where(
+        val_1 < 5., numpy.exp(-val_1), 0.)
+    l_pd_2d = to_precision(a_l)[numpy.newaxis, :]*1./(
+        1.+to_precision(b_l)[numpy.newaxis, :]*dtth_sq_2d)
+    eta_2d = to_precision(eta)[numpy.newaxis, :]
+
+    np_shape_2d = eta_2d * l_pd_2d + (1.-eta_2d) * g_pd_2d
+
+    if asymmetry_parameters is not None:
+        z_2d = (tth_zs[:, numpy.newaxis] - tth_hkl[numpy.newaxis, :]) / \
+            h_pv[numpy.newaxis, :]
+        np_shape_2d = np_shape_2d*to_precision(calc_asymmetry_by_z(
+            z_2d, tth_hkl[numpy.newaxis, :], asymmetry_parameters))
+
+    profile_2d = np_shape_2d*np_lor_1d[:, numpy.newaxis]
+    return profile_2d, h_pv
+
+
+def calc_shape_profile_pd_windowed(
+        tth_zs, tth_hkl, peak_cutoff: float, resolution_parameters: tuple,
+        phase_parameters: tuple = PHASE_PARAMETERS,
+        asymmetry_parameters: tuple = None, table_step: float = None):
+    """
+    Calculate shape profile of 1d powder diffraction within windows.
+
+    The same profile as given by calc_shape_profile_pd, but each reflection
+    is calculated only for the points within
+    ttheta_hkl +- peak_cutoff*FWHM.
+
+    Output
+    ------
+        - profile: sparse matrix (CSR format) of shape (points, reflections)
+        - h_pv: FWHM of reflections
+    """
+    h_pv, eta, h_g, h_l, a_g, b_g, a_l, b_l = calc_resolution_pd(
+        tth_hkl, resolution_parameters, phase_parameters)
+
+    # points of windows: indexes of points (row) and of reflections (col)
+    ind_sort = numpy.argsort(tth_zs, kind="stable")
+    tth_sorted = tth_zs[ind_sort]
+    half_width = peak_cutoff*h_pv
+    i_begin = numpy.searchsorted(tth_sorted, tth_hkl-half_width,
+                                 side="left")
+    i_end = numpy.searchsorted(tth_sorted, tth_hkl+half_width,
+                               side="right")
+    counts = numpy.maximum(i_end-i_begin, 0)
+    indptr = numpy.concatenate([[0], numpy.cumsum(counts)])
+    col = numpy.repeat(numpy.arange(tth_hkl.size), counts)
+    row = ind_sort[numpy.arange(indptr[-1]) +
+                   numpy.repeat(i_begin-indptr[:-1], counts)]
+
+    dtth = to_precision(tth_zs[row]-tth_hkl[col])
+    eta_p = to_precision(eta)[col]
+    if table_step is None:
+        dtth_sq = dtth**2
+        val_1 = to_precision(b_g)[col]*dtth_sq
+        g_pd = to_precision(a_g)[col]*numpy.where(
+            val_1 < 5., numpy.exp(-val_1), 0.)
+        l_pd = to_precision(a_l)[col]*1./(
+            1.+to_precision(b_l)[col]*dtth_sq)
+        np_shape = eta_p * l_pd + (1.-eta_p) * g_pd
+    else:
+        h_pv_p = to_precision(h_pv)[col]
+        np_shape = calc_pseudo_voigt_by_table(
+            dtth/h_pv_p, eta_p, step=table_step) / h_pv_p
+
+    if asymmetry_parameters is not None:
+        np_shape = np_shape * to_precision(calc_asymmetry_by_z(
+            dtth/h_pv[col], tth_hkl[col], asymmetry_parameters,
+            table_step=table_step))
+
+    np_lor_1d = to_precision(calc_lorentz_factor(tth_zs))
+
+    profile = csc_matrix((np_shape*np_lor_1d[row], row, indptr),
+                         shape=(tth_zs.size, tth_hkl.size)).tocsr()
+    return profile, h_pv
+
+
+def calc_shape_profile_pd2d(
+        tth_zs, phi, tth_hkl, resolution_parameters: tuple,
+        phase_parameters: tuple = PHASE_PARAMETERS,
+        asymmetry_parameters: tuple = None):
+    """
+    Calculate shape profile of 2d powder diffraction.
+
+    Arguments
+    ---------
+        - tth_zs: ttheta of points corrected by zero shift in degrees
+        - phi: phi of points in degrees
+        - tth_hkl: ttheta of reflections in degrees
+
+    Output
+    ------
+        - profile_3d: (ttheta, phi, reflections) array in the precision set
+          by cryspy.set_precision
+        - h_pv: FWHM of reflections
+    """
+    profile_2d, h_pv = calc_shape_profile_pd(
+        tth_zs, tth_hkl, resolution_parameters,
+        phase_parameters=phase_parameters,
+        asymmetry_parameters=asymmetry_parameters)
+    profile_3d = profile_2d[:, numpy.newaxis, :] * numpy.ones(
+        phi.size, dtype=profile_2d.dtype)[numpy.newaxis, :, numpy.newaxis]
+    return profile_3d, h_pv
+
+
+def calc_iint_by_susceptibility(
+        f_nucl, chi_ij: tuple, moment_ij: tuple, t_ij: tuple,
+        field: float = 0., p_u: float = 0., p_d: float = 0.):
+    """
+    Calculate integrated intensities by susceptibility and moment tensors.
+
+    Arguments
+    ---------
+        - f_nucl: nuclear structure factors
+        - chi_ij: 11, 12, 13, 21, ... 33 components of structure factor
+          tensor of susceptibility
+        - moment_ij: components of structure factor tensor of moments
+        - t_ij: matrix given by cell.calc_m_t
+        - field: magnetic field
+        - p_u, p_d: polarizations of up and down beams
+
+    Output
+    ------
+        - iint_u, iint_d
+    """
+    f_nucl_sq = abs(f_nucl*f_nucl.conjugate())
+    _ij = tuple([sftm+field*sft for sftm, sft in zip(moment_ij, chi_ij)])
+
+    # FIXME: I would like to recheck the expression for T
+    #        and expression SIGMA = T^T CHI T
+    t_tr_ij = (t_ij[0], t_ij[3], t_ij[6],
+               t_ij[1], t_ij[4], t_ij[7],
+               t_ij[2], t_ij[5], t_ij[8])
+    th_11, th_12, th_13, th_21, th_22, th_23, th_31, th_32, th_33 = \
+        calc_mRmCmRT(t_tr_ij, _ij)
+
+    fm_p_sq = abs(0.5 * (th_11 * th_11.conjugate() +
+                         th_22 * th_22.conjugate()) +
+                  th_12 * th_12.conjugate())
+    fm_p_field = 0.5*(th_11 + th_22)
+    cross = 2.*(f_nucl.real*fm_p_field.real +
+                f_nucl.imag*fm_p_field.imag)
+
+    iint_u = f_nucl_sq + fm_p_sq + p_u*cross
+    iint_d = f_nucl_sq + fm_p_sq - p_d*cross
+    return iint_u, iint_d
+
+
+def calc_iint_by_f_mag_perp(f_nucl, f_mag_perp):
+    """
+    Calculate integrated intensities by perpendicular components of
+    magnetic structure factors (unpolarized).
+
+    Output
+    ------
+        - iint_u, iint_d
+    """
+    f_nucl_sq = abs(f_nucl*f_nucl.conjugate())
+    f_mag_perp_sq = abs(f_mag_perp*f_mag_perp.conjugate()).sum(axis=0)
+    iint_u = f_nucl_sq + f_mag_perp_sq
+    iint_d = f_nucl_sq + f_mag_perp_sq
+    return iint_u, iint_d
@@ -81,7 +81,12 @@ def read_el_cards():
     return ldcard
 
 
-EL_CARDS = read_el_cards()
+def get_el_cards() -> list:
+    """Give cards of space groups (file itables.txt is read at first call)."""
+    global EL_CARDS
+    if "EL_CARDS" not in globals():
+        EL_CARDS = read_el_cards()
+    return EL_CARDS
 
 
 def read_wyckoff():
@@ -127,7 +132,12 @@ def read_wyckoff():
     return l_data
 
 
-WYCKOFF = read_wyckoff()
+def get_wyckoff() -> list:
+    """Give Wyckoff positions (file wyckoff.dat is read at first call)."""
+    global WYCKOFF
+    if "WYCKOFF" not in globals():
+        WYCKOFF = read_wyckoff()
+    return WYCKOFF
 
 
 def get_crystal_system_by_it_number(it_number: int) -> str:
@@ -1270,7 +1280,7 @@ def get_symop_pcentr_multiplicity_letter_site_symmetry_coords_xyz_2(
     else:
         choice = "1"
     symop, p_centr = None, None
-    for _el_card in EL_CARDS:
+    for _el_card in get_el_cards():
         if ((_el_card["it_number"] == it_number) & (_el_card["choice"][0] == choice)):
             symop = tuple(_el_card["symmetry"])
             p_centr = array([Fraction(_).limit_denominator(10) for _ in _el_card["pcentr"][0].split(",")],
@@ -1284,7 +1294,7 @@ def get_symop_pcentr_multiplicity_letter_site_symmetry_coords_xyz_2(
     p_centr_new = p_centr + q
     symop_2 = [transform_symop_operation_xyz_by_pp_abc(_symop, P, p) for _symop in symop]
 
-    for _el_card in WYCKOFF:
+    for _el_card in get_wyckoff():
         if ((_el_card["it_number"] == it_number) & (_el_card["choice"] == int(choice))):
             wyckoff = _el_card["wyckoff"]
             break
@@ -1669,3 +1679,12 @@ def is_good_for_mask(r, b, fract_x, fract_y, fract_z):
 #     transs,
 #     calc_GCF
 # ]
+
+
+def __getattr__(name: str):
+    """Read tables EL_CARDS and WYCKOFF at first access (PEP 562)."""
+    if name == "EL_CARDS":
+        return get_el_cards()
+    elif name == "WYCKOFF":
+        return get_wyckoff()
+    raise AttributeError(f"module '{__name__:}' has no attribute '{name:}'")
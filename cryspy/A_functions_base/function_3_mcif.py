@@ -1,6 +1,9 @@
 """Function to operate with mcif.
 
+    - parse_magnetic_data
+    - compile_magnetic_data
     - read_magnetic_data
+    - load_magnetic_data
     - calc_fract_by_sym_elem
     - calc_moment_by_sym_elem
     - get_sym_elem_by_ops
@@ -13,9 +16,11 @@
 """
 
 import os
+import json
+import hashlib
 import numpy
 
-from typing import Tuple
+from typing import Tuple, NoReturn
 
 from cryspy.A_functions_base.function_1_matrices import \
     calc_determinant_matrix_ij
@@ -23,112 +28,36 @@ from cryspy.A_functions_base.function_1_matrices import \
 from cryspy.A_functions_base.function_2_crystallography_base import \
     calc_sthovl_by_hkl_abc_angles
 
-# for the ith nonhexagonal point operator:
-# point_op_label(i): point operator symbol (from Litvin)
-point_op_label = numpy.zeros(shape=(48, ), dtype='<8U')
-# point_op_xyz(i): point operator in x,y,z notation
-point_op_xyz = numpy.zeros(shape=(48, ), dtype='<10U')
-# point_op_matrix(i): point operator matrix
-point_op_matrix = numpy.zeros(shape=(3, 3, 48, ), dtype=int)
-# for the ith hexagonal point operator:
-# point_op_hex_label(i): point operator symbol (from Litvin)
-point_op_hex_label = numpy.zeros(shape=(24, ), dtype='<8U')
-# point_op_hex_xyz(i): point operator in x,y,z notation
-point_op_hex_xyz = numpy.zeros(shape=(24, ), dtype='<10U')
-# point_op_hex_matrix(i): point operator matrix
-point_op_hex_matrix = numpy.zeros(shape=(3, 3, 24, ), dtype=int)
-
 # number of magnetic space groups
 magcount = 1651
-# for the ith magnetic space group
-# nlabel_bns(i): numerical label in BNS setting
-nlabel_bns = numpy.zeros(shape=(magcount, ), dtype='<12U')
-# nlabel_parts_bns(j,i): jth part of nlabel_bns
-nlabelparts_bns = numpy.zeros(shape=(2, magcount, ), dtype=int)
-# label_bns(i): group symbol
-spacegroup_label_bns = numpy.zeros(shape=(magcount, ), dtype='<14U')
-# nlabel_og(i): numerical label in OG setting
-nlabel_og = numpy.zeros(shape=(magcount, ), dtype='<12U')
-# nlabel_parts_og(j,i): jth part of nlabel_og
-nlabelparts_og = numpy.zeros(shape=(3, magcount, ), dtype=int)
-# label_og(i): group symbol
-spacegroup_label_og = numpy.zeros(shape=(magcount, ), dtype='<14U')
-# magtype(i): type of magnetic space group (1-4)
-magtype = numpy.zeros(shape=(magcount, ), dtype=int)
-# BNS-OG transformation (if type-4)
-# bnsog_point_op(j,k,i): 3x3 point operator part of transformation
-bnsog_point_op = numpy.zeros(shape=(3, 3, magcount, ), dtype=int)
-# bnsog_origin(j,i): translation part of transformation
-# bnsog_point_origin(i): common denominator
-bnsog_origin = numpy.zeros(shape=(3, magcount, ), dtype=int)
-bnsog_origin_denom = numpy.zeros(shape=(magcount, ), dtype=int)
-# iops_count(i): number of point operators
-ops_count = numpy.zeros(shape=(magcount, ), dtype=int)
-# wyckoff_count(i): number of wyckoff sites
-wyckoff_site_count = numpy.zeros(shape=(magcount, ), dtype=int)
-# wyckoff_pos_count(j,i): number of positions in jth wyckoff site
-wyckoff_pos_count = numpy.zeros(shape=(27, magcount, ), dtype=int)
-# wyckoff_mult(j,i): multiplicity for jth wyckoff site
-wyckoff_mult = numpy.zeros(shape=(27, magcount, ), dtype=int)
-# wyckoff_label(j,i): symbol (a,b,c,...,z,alpha) for jth wyckoff site
-wyckoff_label = numpy.zeros(shape=(27, magcount, ), dtype="<5U")
-# for BNS setting
-# lattice_bns_vectors_count(i): number of lattice vectors defining the lattice
-lattice_bns_vectors_count = numpy.zeros(shape=(magcount, ), dtype=int)
-# lattice_bns_vectors(k,j,i): kth component of the jth lattice vector
-# lattice_bns_vectors_denom(j,i): common denominator
-lattice_bns_vectors = numpy.zeros(shape=(3, 6, magcount, ), dtype=int)
-lattice_bns_vectors_denom = numpy.zeros(shape=(6, magcount, ), dtype=int)
-# for jth operator
-# ops_bns_point_op(j,i): point operator part
-ops_bns_point_op = numpy.zeros(shape=(96, magcount, ), dtype=int)
-# ops_bns_trans(k,j,i): kth component of translation part
-# ops_bns_trans_denom(j,i): common denominator
-ops_bns_trans = numpy.zeros(shape=(3, 96, magcount, ), dtype=int)
-ops_bns_trans_denom = numpy.zeros(shape=(96, magcount, ), dtype=int)
-# ops_bns_timeinv(j,i): 1=no time inversion, -1=time inversion
-ops_bns_timeinv = numpy.zeros(shape=(96, magcount, ), dtype=int)
-# for jth wyckoff site
-# wyckoff_bns_fract(k,j,i): kth component of fractional part of wyckoff
-# position
-# wyckoff_bns_fract_denom(j,i): common denominator
-wyckoff_bns_fract = numpy.zeros(shape=(3, 96, 27, magcount, ), dtype=int)
-wyckoff_bns_fract_denom = numpy.zeros(shape=(96, 27, magcount, ), dtype=int)
-# wyckoff_bns_xyz(m,k,j,i): mth component to coeffcient of kth paramater
-# (x,y,z)
-wyckoff_bns_xyz = numpy.zeros(shape=(3, 3, 96, 27, magcount, ), dtype=int)
-# wyckoff_bns_mag(m,k,j,i): mth component to coeffcient of kth magnetic
-# paramater (mx,my,mz)
-wyckoff_bns_mag = numpy.zeros(shape=(3, 3, 96, 27, magcount, ), dtype=int)
-
-# for OG setting (for type-4 groups)
-# lattice_og_vectors_count(i): number of lattice vectors defining the lattice
-lattice_og_vectors_count = numpy.zeros(shape=(magcount, ), dtype=int)
-# lattice_og_vectors(k,j,i): kth component of the jth lattice vector
-# lattice_og_vectors_denom(j,i): common denominator
-lattice_og_vectors = numpy.zeros(shape=(3, 6, magcount, ), dtype=int)
-lattice_og_vectors_denom = numpy.zeros(shape=(6, magcount, ), dtype=int)
-# for jth operator
-# ops_og_point_op(j,i): point operator part
-ops_og_point_op = numpy.zeros(shape=(96, magcount, ), dtype=int)
-# ops_og_trans(k,j,i): kth component of translation part
-# ops_og_trans_denom(j,i): common denominator
-ops_og_trans = numpy.zeros(shape=(3, 96, magcount, ), dtype=int)
-ops_og_trans_denom = numpy.zeros(shape=(96, magcount, ), dtype=int)
-# ops_og_timeinv(j,i): 1=no time inversion, -1=time inversion
-ops_og_timeinv = numpy.zeros(shape=(96, magcount, ), dtype=int)
-# for jth wyckoff site
-# wyckoff_og_fract(k,j,i): kth component of fractional part of wyckoff position
-# wyckoff_og_fract_denom(j,i): common denominator
-wyckoff_og_fract = numpy.zeros(shape=(3, 96, 27, magcount, ), dtype=int)
-wyckoff_og_fract_denom = numpy.zeros(shape=(96, 27, magcount, ), dtype=int)
-# wyckoff_og_xyz(m,k,j,i): mth component to coeffcient of kth paramater (x,y,z)
-wyckoff_og_xyz = numpy.zeros(shape=(3, 3, 96, 27, magcount, ), dtype=int)
-# wyckoff_og_mag(m,k,j,i): mth component to coeffcient of kth magnetic
-# paramater (mx,my,mz)
-wyckoff_og_mag = numpy.zeros(shape=(3, 3, 96, 27, magcount, ), dtype=int)
+
+MAGNETIC_DATA_NAMES = (
+    "point_op_label", "point_op_xyz", "point_op_matrix", "point_op_hex_label",
+    "point_op_hex_xyz", "point_op_hex_matrix", "nlabel_bns", "nlabelparts_bns",
+    "spacegroup_label_bns", "nlabel_og", "nlabelparts_og",
+    "spacegroup_label_og", "magtype", "bnsog_point_op", "bnsog_origin",
+    "bnsog_origin_denom", "ops_count", "wyckoff_site_count",
+    "wyckoff_pos_count", "wyckoff_mult", "wyckoff_label",
+    "lattice_bns_vectors_count", "lattice_bns_vectors",
+    "lattice_bns_vectors_denom", "ops_bns_point_op", "ops_bns_trans",
+    "ops_bns_trans_denom", "ops_bns_timeinv", "wyckoff_bns_fract",
+    "wyckoff_bns_fract_denom", "wyckoff_bns_xyz", "wyckoff_bns_mag",
+    "lattice_og_vectors_count", "lattice_og_vectors",
+    "lattice_og_vectors_denom", "ops_og_point_op", "ops_og_trans",
+    "ops_og_trans_denom", "ops_og_timeinv", "wyckoff_og_fract",
+    "wyckoff_og_fract_denom", "wyckoff_og_xyz", "wyckoff_og_mag")
+
+WYCKOFF_DATA_NAMES = (
+    "wyckoff_bns_fract", "wyckoff_bns_fract_denom", "wyckoff_bns_xyz",
+    "wyckoff_bns_mag", "wyckoff_og_fract", "wyckoff_og_fract_denom",
+    "wyckoff_og_xyz", "wyckoff_og_mag")
 
 F_MAG_DATA = os.path.join(os.path.dirname(__file__), "magnetic_data.txt")
+F_MAG_DATA_CACHE = os.path.join(os.path.dirname(__file__), "magnetic_data.bin")
+
+CACHE_SIGNATURE = b"CRYSPY-MAGNETIC-DATA"
+CACHE_VERSION = 1
+CACHE_ALIGNMENT = 64
 
 D_CENTRING_TYPE_SHIFT = {
     "P": numpy.array([[0, 0, 0, 1], ], dtype=int).transpose(),
@@ -146,9 +75,112 @@ D_CENTRING_TYPE_SHIFT = {
                      dtype=int).transpose(),    
         }
 
-def read_magnetic_data():
-    """Read magnetic data."""
-    with open(F_MAG_DATA, "r") as fid:
+def parse_magnetic_data(f_name: str = F_MAG_DATA) -> dict:
+    """Parse text file of magnetic data, give dictionary of arrays."""
+    # for the ith nonhexagonal point operator:
+    # point_op_label(i): point operator symbol (from Litvin)
+    point_op_label = numpy.zeros(shape=(48, ), dtype='<8U')
+    # point_op_xyz(i): point operator in x,y,z notation
+    point_op_xyz = numpy.zeros(shape=(48, ), dtype='<10U')
+    # point_op_matrix(i): point operator matrix
+    point_op_matrix = numpy.zeros(shape=(3, 3, 48, ), dtype=int)
+    # for the ith hexagonal point operator:
+    # point_op_hex_label(i): point operator symbol (from Litvin)
+    point_op_hex_label = numpy.zeros(shape=(24, ), dtype='<8U')
+    # point_op_hex_xyz(i): point operator in x,y,z notation
+    point_op_hex_xyz = numpy.zeros(shape=(24, ), dtype='<10U')
+    # point_op_hex_matrix(i): point operator matrix
+    point_op_hex_matrix = numpy.zeros(shape=(3, 3, 24, ), dtype=int)
+
+    # for the ith magnetic space group
+    # nlabel_bns(i): numerical label in BNS setting
+    nlabel_bns = numpy.zeros(shape=(magcount, ), dtype='<12U')
+    # nlabel_parts_bns(j,i): jth part of nlabel_bns
+    nlabelparts_bns = numpy.zeros(shape=(2, magcount, ), dtype=int)
+    # label_bns(i): group symbol
+    spacegroup_label_bns = numpy.zeros(shape=(magcount, ), dtype='<14U')
+    # nlabel_og(i): numerical label in OG setting
+    nlabel_og = numpy.zeros(shape=(magcount, ), dtype='<12U')
+    # nlabel_parts_og(j,i): jth part of nlabel_og
+    nlabelparts_og = numpy.zeros(shape=(3, magcount, ), dtype=int)
+    # label_og(i): group symbol
+    spacegroup_label_og = numpy.zeros(shape=(magcount, ), dtype='<14U')
+    # magtype(i): type of magnetic space group (1-4)
+    magtype = numpy.zeros(shape=(magcount, ), dtype=int)
+    # BNS-OG transformation (if type-4)
+    # bnsog_point_op(j,k,i): 3x3 point operator part of transformation
+    bnsog_point_op = numpy.zeros(shape=(3, 3, magcount, ), dtype=int)
+    # bnsog_origin(j,i): translation part of transformation
+    # bnsog_point_origin(i): common denominator
+    bnsog_origin = numpy.zeros(shape=(3, magcount, ), dtype=int)
+    bnsog_origin_denom = numpy.zeros(shape=(magcount, ), dtype=int)
+    # iops_count(i): number of point operators
+    ops_count = numpy.zeros(shape=(magcount, ), dtype=int)
+    # wyckoff_count(i): number of wyckoff sites
+    wyckoff_site_count = numpy.zeros(shape=(magcount, ), dtype=int)
+    # wyckoff_pos_count(j,i): number of positions in jth wyckoff site
+    wyckoff_pos_count = numpy.zeros(shape=(27, magcount, ), dtype=int)
+    # wyckoff_mult(j,i): multiplicity for jth wyckoff site
+    wyckoff_mult = numpy.zeros(shape=(27, magcount, ), dtype=int)
+    # wyckoff_label(j,i): symbol (a,b,c,...,z,alpha) for jth wyckoff site
+    wyckoff_label = numpy.zeros(shape=(27, magcount, ), dtype="<5U")
+    # for BNS setting
+    # lattice_bns_vectors_count(i): number of lattice vectors defining the lattice
+    lattice_bns_vectors_count = numpy.zeros(shape=(magcount, ), dtype=int)
+    # lattice_bns_vectors(k,j,i): kth component of the jth lattice vector
+    # lattice_bns_vectors_denom(j,i): common denominator
+    lattice_bns_vectors = numpy.zeros(shape=(3, 6, magcount, ), dtype=int)
+    lattice_bns_vectors_denom = numpy.zeros(shape=(6, magcount, ), dtype=int)
+    # for jth operator
+    # ops_bns_point_op(j,i): point operator part
+    ops_bns_point_op = numpy.zeros(shape=(96, magcount, ), dtype=int)
+    # ops_bns_trans(k,j,i): kth component of translation part
+    # ops_bns_trans_denom(j,i): common denominator
+    ops_bns_trans = numpy.zeros(shape=(3, 96, magcount, ), dtype=int)
+    ops_bns_trans_denom = numpy.zeros(shape=(96, magcount, ), dtype=int)
+    # ops_bns_timeinv(j,i): 1=no time inversion, -1=time inversion
+    ops_bns_timeinv = numpy.zeros(shape=(96, magcount, ), dtype=int)
+    # for jth wyckoff site
+    # wyckoff_bns_fract(k,j,i): kth component of fractional part of wyckoff
+    # position
+    # wyckoff_bns_fract_denom(j,i): common denominator
+    wyckoff_bns_fract = numpy.zeros(shape=(3, 96, 27, magcount, ), dtype=int)
+    wyckoff_bns_fract_denom = numpy.zeros(shape=(96, 27, magcount, ), dtype=int)
+    # wyckoff_bns_xyz(m,k,j,i): mth component to coeffcient of kth paramater
+    # (x,y,z)
+    wyckoff_bns_xyz = numpy.zeros(shape=(3, 3, 96, 27, magcount, ), dtype=int)
+    # wyckoff_bns_mag(m,k,j,i): mth component to coeffcient of kth magnetic
+    # paramater (mx,my,mz)
+    wyckoff_bns_mag = numpy.zeros(shape=(3, 3, 96, 27, magcount, ), dtype=int)
+
+    # for OG setting (for type-4 groups)
+    # lattice_og_vectors_count(i): number of lattice vectors defining the lattice
+    lattice_og_vectors_count = numpy.zeros(shape=(magcount, ), dtype=int)
+    # lattice_og_vectors(k,j,i): kth component of the jth lattice vector
+    # lattice_og_vectors_denom(j,i): common denominator
+    lattice_og_vectors = numpy.zeros(shape=(3, 6, magcount, ), dtype=int)
+    lattice_og_vectors_denom = numpy.zeros(shape=(6, magcount, ), dtype=int)
+    # for jth operator
+    # ops_og_point_op(j,i): point operator part
+    ops_og_point_op = numpy.zeros(shape=(96, magcount, ), dtype=int)
+    # ops_og_trans(k,j,i): kth component of translation part
+    # ops_og_trans_denom(j,i): common denominator
+    ops_og_trans = numpy.zeros(shape=(3, 96, magcount, ), dtype=int)
+    ops_og_trans_denom = numpy.zeros(shape=(96, magcount, ), dtype=int)
+    # ops_og_timeinv(j,i): 1=no time inversion, -1=time inversion
+    ops_og_timeinv = numpy.zeros(shape=(96, magcount, ), dtype=int)
+    # for jth wyckoff site
+    # wyckoff_og_fract(k,j,i): kth component of fractional part of wyckoff position
+    # wyckoff_og_fract_denom(j,i): common denominator
+    wyckoff_og_fract = numpy.zeros(shape=(3, 96, 27, magcount, ), dtype=int)
+    wyckoff_og_fract_denom = numpy.zeros(shape=(96, 27, magcount, ), dtype=int)
+    # wyckoff_og_xyz(m,k,j,i): mth component to coeffcient of kth paramater (x,y,z)
+    wyckoff_og_xyz = numpy.zeros(shape=(3, 3, 96, 27, magcount, ), dtype=int)
+    # wyckoff_og_mag(m,k,j,i): mth component to coeffcient of kth magnetic
+    # paramater (mx,my,mz)
+    wyckoff_og_mag = numpy.zeros(shape=(3, 3, 96, 27, magcount, ), dtype=int)
+
+    with open(f_name, "r") as fid:
         l_cont = fid.readlines()
     # read nonhexangonal point operators
     i_line = 0
@@ -289,6 +321,227 @@ def read_magnetic_data():
                         numpy.array(l_h[4:4+9], dtype=int).reshape(3, 3))
                     wyckoff_og_mag[:, :, k, j, i] = numpy.transpose(
                         numpy.array(l_h[13:13+9], dtype=int).reshape(3, 3))
+    l_array = (
+        point_op_label, point_op_xyz, point_op_matrix, point_op_hex_label,
+        point_op_hex_xyz, point_op_hex_matrix, nlabel_bns, nlabelparts_bns,
+        spacegroup_label_bns, nlabel_og, nlabelparts_og, spacegroup_label_og,
+        magtype, bnsog_point_op, bnsog_origin, bnsog_origin_denom, ops_count,
+        wyckoff_site_count, wyckoff_pos_count, wyckoff_mult, wyckoff_label,
+        lattice_bns_vectors_count, lattice_bns_vectors,
+        lattice_bns_vectors_denom, ops_bns_point_op, ops_bns_trans,
+        ops_bns_trans_denom, ops_bns_timeinv, wyckoff_bns_fract,
+        wyckoff_bns_fract_denom, wyckoff_bns_xyz, wyckoff_bns_mag,
+        lattice_og_vectors_count, lattice_og_vectors, lattice_og_vectors_denom,
+        ops_og_point_op, ops_og_trans, ops_og_trans_denom, ops_og_timeinv,
+        wyckoff_og_fract, wyckoff_og_fract_denom, wyckoff_og_xyz,
+        wyckoff_og_mag)
+    return dict(zip(MAGNETIC_DATA_NAMES, l_array))
+
+
+def pack_wyckoff_arrays(d_array: dict) -> dict:
+    """Keep only nonzero Wyckoff positions of arrays wyckoff_bns_* and
+    wyckoff_og_*.
+
+    The last three axes of the arrays are (position, site, group). The
+    positions which are zero in all arrays of the setting are dropped, their
+    indexes are kept in array wyckoff_bns_index (wyckoff_og_index).
+    """
+    d_pack = {}
+    for name, array in d_array.items():
+        if name not in WYCKOFF_DATA_NAMES:
+            d_pack[name] = array
+    for setting in ("bns", "og"):
+        l_name = [name for name in WYCKOFF_DATA_NAMES
+                  if name.startswith(f"wyckoff_{setting:}_")]
+        flag = numpy.zeros(d_array[l_name[0]].shape[-3:], dtype=bool)
+        for name in l_name:
+            array = d_array[name]
+            flag |= (array != 0).reshape(-1, *flag.shape).any(axis=0)
+        index = numpy.nonzero(flag)
+        d_pack[f"wyckoff_{setting:}_index"] = numpy.stack(
+            index, axis=0).astype(numpy.int16)
+        for name in l_name:
+            d_pack[f"{name:}_packed"] = d_array[name][
+                (Ellipsis, ) + index].astype(numpy.int8)
+    return d_pack
+
+
+def unpack_wyckoff_array(name: str, d_array: dict) -> numpy.ndarray:
+    """Restore array wyckoff_bns_* or wyckoff_og_* packed by
+    pack_wyckoff_arrays."""
+    setting = name.split("_")[1]
+    index = tuple(d_array[f"wyckoff_{setting:}_index"])
+    array_packed = d_array[f"{name:}_packed"]
+    array = numpy.zeros(array_packed.shape[:-1] + (96, 27, magcount),
+                        dtype=int)
+    array[(Ellipsis, ) + index] = array_packed
+    return array
+
+
+def calc_file_checksum(f_name: str) -> str:
+    """Give checksum (sha256) of file."""
+    sha256 = hashlib.sha256()
+    with open(f_name, "rb") as fid:
+        for block in iter(lambda: fid.read(1 << 20), b""):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+
+def write_magnetic_data_cache_file(f_name: str, d_header: dict,
+                                   l_block: list, n_data: int) -> NoReturn:
+    """Write binary cache file of magnetic data.
+
+    Blocks of data are given as (offset, bytes), offsets are counted from
+    the start of data and n_data is the full size of data. File is written
+    under temporary name and then renamed, so that concurrent processes
+    never see a partial file.
+    """
+    b_header = json.dumps(d_header).encode("utf-8")
+    n_start = len(CACHE_SIGNATURE) + 8 + len(b_header)
+    n_start = -(-n_start // CACHE_ALIGNMENT) * CACHE_ALIGNMENT
+    f_name_tmp = f"{f_name:}.{os.getpid():}.tmp"
+    with open(f_name_tmp, "wb") as fid:
+        fid.write(CACHE_SIGNATURE)
+        fid.write(len(b_header).to_bytes(8, "little"))
+        fid.write(b_header)
+        for offset, b_block in l_block:
+            fid.seek(n_start + offset)
+            fid.write(b_block)
+        fid.truncate(n_start + n_data)
+    os.replace(f_name_tmp, f_name)
+
+
+def save_magnetic_data_cache(d_array: dict, d_source: dict,
+                             f_name: str = F_MAG_DATA_CACHE) -> NoReturn:
+    """Save arrays of magnetic data in binary cache file.
+
+    File consists of signature, size of header, header in json format and
+    raw buffers of arrays aligned on CACHE_ALIGNMENT bytes. The header keeps
+    description of source text file (d_source) and dtype, shape and
+    offset of each array (see write_magnetic_data_cache_file).
+    """
+    d_pack = pack_wyckoff_arrays(d_array)
+    d_header = {"version": CACHE_VERSION, "source": d_source, "arrays": {}}
+    l_block = []
+    offset = 0
+    for name, array in d_pack.items():
+        d_header["arrays"][name] = [array.dtype.str, list(array.shape),
+                                    offset]
+        l_block.append((offset, numpy.ascontiguousarray(array).tobytes()))
+        offset += -(-array.nbytes // CACHE_ALIGNMENT) * CACHE_ALIGNMENT
+    write_magnetic_data_cache_file(f_name, d_header, l_block, offset)
+
+
+def update_magnetic_data_cache_source(
+        d_source: dict, f_name: str = F_MAG_DATA_CACHE) -> NoReturn:
+    """Replace description of source text file in binary cache file.
+
+    Arrays are copied without changes.
+    """
+    with open(f_name, "rb") as fid:
+        if fid.read(len(CACHE_SIGNATURE)) != CACHE_SIGNATURE:
+            raise ValueError(f"File '{f_name:}' is not a cache of magnetic \
+data.")
+        n_header = int.from_bytes(fid.read(8), "little")
+        d_header = json.loads(fid.read(n_header).decode("utf-8"))
+        n_start = len(CACHE_SIGNATURE) + 8 + n_header
+        n_start = -(-n_start // CACHE_ALIGNMENT) * CACHE_ALIGNMENT
+        fid.seek(n_start)
+        b_data = fid.read()
+    d_header["source"] = d_source
+    write_magnetic_data_cache_file(f_name, d_header, [(0, b_data), ],
+                                   len(b_data))
+
+
+def read_magnetic_data_cache(f_name: str = F_MAG_DATA_CACHE):
+    """Read binary cache file of magnetic data.
+
+    Arrays are memory-mapped (copy-on-write). Arrays wyckoff_bns_* and
+    wyckoff_og_* are given in packed form (see pack_wyckoff_arrays).
+
+    Returns
+    -------
+    d_source : dict
+        Description of source text file.
+    d_array : dict
+        Arrays.
+    """
+    with open(f_name, "rb") as fid:
+        if fid.read(len(CACHE_SIGNATURE)) != CACHE_SIGNATURE:
+            raise ValueError(f"File '{f_name:}' is not a cache of magnetic \
+data.")
+        n_header = int.from_bytes(fid.read(8), "little")
+        d_header = json.loads(fid.read(n_header).decode("utf-8"))
+    if d_header["version"] != CACHE_VERSION:
+        raise ValueError(f"Version of file '{f_name:}' is not supported.")
+    n_start = len(CACHE_SIGNATURE) + 8 + n_header
+    n_start = -(-n_start // CACHE_ALIGNMENT) * CACHE_ALIGNMENT
+    buffer = numpy.memmap(f_name, dtype=numpy.uint8, mode="c")
+    d_array = {}
+    for name, (dtype, shape, offset) in d_header["arrays"].items():
+        dtype = numpy.dtype(dtype)
+        n_byte = int(numpy.prod(shape)) * dtype.itemsize
+        d_array[name] = buffer[n_start+offset:n_start+offset+n_byte].view(
+            dtype).reshape(shape)
+    return d_header["source"], d_array
+
+
+def describe_source(f_name: str, flag_checksum: bool = True) -> dict:
+    """Give size, time of modification and checksum of file."""
+    stat = os.stat(f_name)
+    d_source = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if flag_checksum:
+        d_source["checksum"] = calc_file_checksum(f_name)
+    return d_source
+
+
+def compile_magnetic_data(f_name: str = F_MAG_DATA,
+                          f_name_cache: str = F_MAG_DATA_CACHE) -> dict:
+    """Parse text file of magnetic data and save it in binary cache file.
+
+    Gives dictionary of arrays.
+    """
+    d_array = parse_magnetic_data(f_name)
+    try:
+        save_magnetic_data_cache(d_array, describe_source(f_name),
+                                 f_name=f_name_cache)
+    except OSError:
+        pass  # directory of library can be read-only
+    return d_array
+
+
+def read_magnetic_data(f_name: str = F_MAG_DATA,
+                       f_name_cache: str = F_MAG_DATA_CACHE) -> NoReturn:
+    """Read magnetic data.
+
+    Binary cache file is used if it corresponds to the text file: the size
+    and the time of modification of the text file are compared first and
+    the checksum is compared only if they differ. If the checksum is the
+    same the new size and time of modification are written in the cache
+    file, so that the checksum is not calculated again. Otherwise the text
+    file is parsed and the cache file is compiled again.
+    """
+    d_array = None
+    if os.path.isfile(f_name_cache):
+        try:
+            d_source_cache, d_array = read_magnetic_data_cache(f_name_cache)
+        except (ValueError, KeyError, OSError):
+            d_array = None
+    if ((d_array is not None) and os.path.isfile(f_name)):
+        d_source = describe_source(f_name, flag_checksum=False)
+        if ((d_source["size"] != d_source_cache["size"]) or
+                (d_source["mtime_ns"] != d_source_cache["mtime_ns"])):
+            d_source["checksum"] = calc_file_checksum(f_name)
+            if d_source["checksum"] != d_source_cache["checksum"]:
+                d_array = None
+            else:
+                try:
+                    update_magnetic_data_cache_source(d_source, f_name_cache)
+                except (ValueError, OSError):
+                    pass  # directory of library can be read-only
+    if d_array is None:
+        d_array = compile_magnetic_data(f_name, f_name_cache)
+    globals().update(d_array)
 
 
 def calc_fract_by_sym_elem(sym_elems, fract):
@@ -366,6 +619,8 @@ def get_sym_elem_by_ops(ops, flag_non_hexagonal: bool = True):
 
     t_i = ops[5]  # time inversion
 
+    load_magnetic_data()
+
     if flag_non_hexagonal:
         val = numpy.reshape(point_op_matrix[:, :, ops[0]-1], (9, size_ops))
     else:
@@ -379,10 +634,11 @@ def get_sym_elem_by_ops(ops, flag_non_hexagonal: bool = True):
 
 
 def find_i_for_nlabel_bns(part_1: int, part_2: int):
+    load_magnetic_data()
     flag_1 = nlabelparts_bns[0, :] == part_1
     flag_2 = nlabelparts_bns[1, :] == part_2
     flag_3 = flag_1*flag_2
-    return int(numpy.argwhere(flag_3))
+    return int(numpy.flatnonzero(flag_3)[0])
 
 
 
@@ -623,10 +879,17 @@ def calc_multiplicity(sym_elems, fract_xyz):
 
 
 def calc_hkl_in_range(sym_elems, unit_cell_parameters: Tuple[float],
-                      sthovl_min: float, sthovl_max: float):
+                      sthovl_min: float, sthovl_max: float,
+                      n_element: int = 1048576):
     """Give index_hkl and their multiplicity in the range sthovl.
 
     unit_cell_parameters is (a, b, c, alpha, beta, gamma)
+
+    The box of reflections 0 <= h <= h_max, |k| <= k_max, |l| <= l_max is
+    treated by slabs (consecutive planes of h, or parts of a plane) so that
+    arrays of symmetry-equivalent reflections calculated at once have no
+    more than n_element elements. Only representatives of orbits (with
+    multiplicities) are kept from each slab and merged at the end.
     """
     length_a, length_b, length_c, angle_alpha, angle_beta, angle_gamma = \
         unit_cell_parameters
@@ -635,9 +898,6 @@ def calc_hkl_in_range(sym_elems, unit_cell_parameters: Tuple[float],
     kmax = int(2.*length_b*sthovl_max)
     lmax = int(2.*length_c*sthovl_max)
 
-    hmin, kmin, lmin = -1*hmax, -1*kmax, -1*lmax
-
-    hmin = 0
     # FIXME: absent condition:
     #   shift = space_group.shift
     #   orig_x, orig_y, orig_z = zip(*shift)
@@ -650,56 +910,64 @@ def calc_hkl_in_range(sym_elems, unit_cell_parameters: Tuple[float],
     r_11, r_12, r_13 = sym_elems[4], sym_elems[5], sym_elems[6]
     r_21, r_22, r_23 = sym_elems[7], sym_elems[8], sym_elems[9]
     r_31, r_32, r_33 = sym_elems[10], sym_elems[11], sym_elems[12]
+    n_symm = numpy.size(r_11)
 
-    index_h, index_k, index_l = numpy.meshgrid(
-        range(hmin, hmax+1, 1), range(kmin, kmax+1, 1),
-        range(lmin, lmax+1, 1), indexing="ij")
-    index_h, index_k = index_h.flatten(), index_k.flatten()
-    index_l = index_l.flatten()
+    n_box = (hmax + 1) * (2*kmax + 1) * (2*lmax + 1)
+    n_slab = max(1, n_element // n_symm)
 
     n_a = numpy.newaxis
-    index_h_new = r_11[n_a, :]*index_h[:, n_a] + \
-        r_21[n_a, :]*index_k[:, n_a] + r_31[n_a, :]*index_l[:, n_a]
-    index_k_new = r_12[n_a, :]*index_h[:, n_a] + \
-        r_22[n_a, :]*index_k[:, n_a] + r_32[n_a, :]*index_l[:, n_a]
-    index_l_new = r_13[n_a, :]*index_h[:, n_a] + \
-        r_23[n_a, :]*index_k[:, n_a] + r_33[n_a, :]*index_l[:, n_a]
-
-    keys = -10000*index_h_new + -100*index_k_new + -index_l_new
-
-    sort_arg = numpy.argsort(keys, axis=1)
-    sorted_keys = numpy.take_along_axis(keys, sort_arg, axis=1)
-
-    unique, unique_ind = numpy.unique(sorted_keys[:, 0], return_index=True)
-
-    flag = sorted_keys == sorted_keys[:, 0][:, n_a]
-    inv_mult = flag.sum(axis=1)
-    multiplicity = flag.shape[1]//inv_mult
-
-    # ind_h_un = index_h_new[sort_arg][unique_ind]
-    # ind_k_un = index_k_new[sort_arg][unique_ind]
-    # ind_l_un = index_l_new[sort_arg][unique_ind]
-
-    ind_h_un = numpy.take_along_axis(index_h_new, sort_arg, axis=1)[:, 0][
-        unique_ind]
-    ind_k_un = numpy.take_along_axis(index_k_new, sort_arg, axis=1)[:, 0][
-        unique_ind]
-    ind_l_un = numpy.take_along_axis(index_l_new, sort_arg, axis=1)[:, 0][
-        unique_ind]
-    mult_un = multiplicity[unique_ind]
-
-    sthovl = calc_sthovl_by_hkl_abc_angles(
-        ind_h_un, ind_k_un, ind_l_un, length_a, length_b, length_c,
-        angle_alpha, angle_beta, angle_gamma)
-
-    flag = numpy.array((sthovl >= sthovl_min) *
-                       (sthovl <= sthovl_max), dtype=bool)
-
-    sort_arg = numpy.argsort(sthovl[flag])
-    ind_h_sort = ind_h_un[flag][sort_arg]
-    ind_k_sort = ind_k_un[flag][sort_arg]
-    ind_l_sort = ind_l_un[flag][sort_arg]
-    mult_sort = mult_un[flag][sort_arg]
+    l_key, l_h, l_k, l_l, l_mult, l_sthovl = [], [], [], [], [], []
+    for i_begin in range(0, n_box, n_slab):
+        index = numpy.arange(i_begin, min(i_begin + n_slab, n_box))
+        index, index_l = numpy.divmod(index, 2*lmax + 1)
+        index_h, index_k = numpy.divmod(index, 2*kmax + 1)
+        index_k, index_l = index_k - kmax, index_l - lmax
+
+        index_h_new = r_11[n_a, :]*index_h[:, n_a] + \
+            r_21[n_a, :]*index_k[:, n_a] + r_31[n_a, :]*index_l[:, n_a]
+        index_k_new = r_12[n_a, :]*index_h[:, n_a] + \
+            r_22[n_a, :]*index_k[:, n_a] + r_32[n_a, :]*index_l[:, n_a]
+        index_l_new = r_13[n_a, :]*index_h[:, n_a] + \
+            r_23[n_a, :]*index_k[:, n_a] + r_33[n_a, :]*index_l[:, n_a]
+
+        keys = -10000*index_h_new + -100*index_k_new + -index_l_new
+        arg_min = numpy.argmin(keys, axis=1)[:, n_a]
+        key_min = numpy.take_along_axis(keys, arg_min, axis=1)
+        inv_mult = (keys == key_min).sum(axis=1)
+        multiplicity = n_symm//inv_mult
+
+        # representatives of the slab
+        key_un, unique_ind = numpy.unique(key_min[:, 0], return_index=True)
+        ind_h_un = numpy.take_along_axis(index_h_new, arg_min, axis=1)[
+            unique_ind, 0]
+        ind_k_un = numpy.take_along_axis(index_k_new, arg_min, axis=1)[
+            unique_ind, 0]
+        ind_l_un = numpy.take_along_axis(index_l_new, arg_min, axis=1)[
+            unique_ind, 0]
+        mult_un = multiplicity[unique_ind]
+
+        sthovl = calc_sthovl_by_hkl_abc_angles(
+            ind_h_un, ind_k_un, ind_l_un, length_a, length_b, length_c,
+            angle_alpha, angle_beta, angle_gamma)
+        flag = numpy.array((sthovl >= sthovl_min) *
+                           (sthovl <= sthovl_max), dtype=bool)
+        l_key.append(key_un[flag])
+        l_h.append(ind_h_un[flag])
+        l_k.append(ind_k_un[flag])
+        l_l.append(ind_l_un[flag])
+        l_mult.append(mult_un[flag])
+        l_sthovl.append(sthovl[flag])
+
+    # merge representatives of slabs (orbits are ordered by their keys)
+    unique, unique_ind = numpy.unique(numpy.concatenate(l_key),
+                                      return_index=True)
+    sthovl = numpy.concatenate(l_sthovl)[unique_ind]
+
+    sort_arg = numpy.argsort(sthovl)
+    ind_h_sort = numpy.concatenate(l_h)[unique_ind][sort_arg]
+    ind_k_sort = numpy.concatenate(l_k)[unique_ind][sort_arg]
+    ind_l_sort = numpy.concatenate(l_l)[unique_ind][sort_arg]
+    mult_sort = numpy.concatenate(l_mult)[unique_ind][sort_arg]
 
     return ind_h_sort, ind_k_sort, ind_l_sort, mult_sort
 
@@ -715,7 +983,21 @@ def calc_hkl_in_range(sym_elems, unit_cell_parameters: Tuple[float],
 #                             lmult.append(len(set(lhkls)))
 
 
-read_magnetic_data()
+def load_magnetic_data():
+    """Read magnetic data if it has not been read yet."""
+    if "ops_count" not in globals():
+        read_magnetic_data()
+
+
+def __getattr__(name: str):
+    """Read magnetic data at first access to its tables (PEP 562)."""
+    if name in MAGNETIC_DATA_NAMES:
+        load_magnetic_data()
+        if name not in globals():
+            globals()[name] = unpack_wyckoff_array(name, globals())
+        return globals()[name]
+    raise AttributeError(f"module '{__name__:}' has no attribute '{name:}'")
+
 
 # sym_elems, magn_centering = get_sym_elems_magn_centering_for_bns(71, 536)
 # print("sym_elems.shape: ", sym_elems.shape)
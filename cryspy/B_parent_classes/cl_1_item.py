@@ -5,13 +5,108 @@ It should be used ass parent to describe new item classes.
 """
 import os
 import os.path
+import threading
+import weakref
 from typing import NoReturn, Union
-from pycifstar import Data, to_data
+import numpy
 
 from cryspy.A_functions_base.function_1_markdown import md_to_html
 from cryspy.A_functions_base.function_1_strings import find_prefix, \
     string_to_value_error, value_error_to_string
 from cryspy.A_functions_base.function_1_objects import get_functions_of_objet
+from cryspy.A_functions_base.function_1_cif import str_to_data, file_to_data
+from cryspy.A_functions_base.function_1_snapshot import class_to_name, \
+    value_to_snapshot, value_from_snapshot
+
+
+LAST_VERSION = 0
+LOCK_VERSION = threading.Lock()
+
+
+def get_new_version() -> int:
+    """
+    Give new value of the global counter of modifications.
+
+    Every modification of objects (items, loops, data and global
+    containers) is marked by new value of the counter. So, the versions of
+    different objects can be compared: the object is not changed while its
+    version is the same. The counter is changed under the lock, so that
+    threads never get the same version.
+
+    Returns
+    -------
+    int
+        New version.
+
+    """
+    global LAST_VERSION
+    with LOCK_VERSION:
+        LAST_VERSION += 1
+        version = LAST_VERSION
+    return version
+
+
+def get_last_version() -> int:
+    """Give the last value of the global counter of modifications."""
+    return LAST_VERSION
+
+
+# owners of items (loops): their versions are changed with the items
+ITEM_OWNERS = weakref.WeakKeyDictionary()
+
+
+def add_item_owner(item, owner) -> NoReturn:
+    """
+    Register owner of item.
+
+    The owner (object with method 'bump_version') is marked as changed
+    when any attribute of the item is changed. Owners are kept by weak
+    references.
+    """
+    owners = ITEM_OWNERS.get(item, None)
+    if owners is None:
+        owners = weakref.WeakSet()
+        ITEM_OWNERS[item] = owners
+    owners.add(owner)
+
+
+def form_attr_spec(obj) -> dict:
+    """
+    Form lookup tables of attributes for an item class (or an item).
+
+    The tables are built once from ATTR_* tuples so that the checks in
+    __setattr__, __getattr__ and delete_internal_parameters are dictionary
+    and set lookups instead of scans over tuples.
+
+    Parameters
+    ----------
+    obj : ItemN or its subclass
+        Class or object with defined ATTR_* tuples.
+
+    Returns
+    -------
+    dict
+        - "types": {name: type} for ATTR_NAMES
+        - "sigma": names of sigmas
+        - "flags": names of constraint and refinement flags
+        - "keep": names kept by delete_internal_parameters
+        - "not_defined": names giving AttributeError when not defined
+        - "internal": ATTR_INT_NAMES
+
+    """
+    attr_names, attr_sigma = obj.ATTR_NAMES, obj.ATTR_SIGMA
+    attr_flags = obj.ATTR_CONSTR_FLAG + obj.ATTR_REF_FLAG
+    attr_protected = obj.ATTR_INT_PROTECTED_NAMES
+    spec = {
+        "types": dict(zip(attr_names, obj.ATTR_TYPES)),
+        "sigma": frozenset(attr_sigma),
+        "flags": frozenset(attr_flags),
+        "keep": frozenset(attr_names + attr_sigma + attr_flags +
+                          attr_protected +
+                          ("D_MIN", "D_MAX", "VERSION", "ATTR_SPEC")),
+        "not_defined": frozenset(attr_names + attr_sigma + attr_protected),
+        "internal": frozenset(obj.ATTR_INT_NAMES)}
+    return spec
 
 
 class ItemN(object):
@@ -19,8 +114,16 @@ class ItemN(object):
 
     It is internal class of cryspy library.
     You should use it only to create your own classes.
+
+    Lookup tables of attributes (ATTR_SPEC) are formed from ATTR_* tuples
+    when a subclass is created.
     """
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if hasattr(cls, "ATTR_NAMES"):
+            cls.ATTR_SPEC = form_attr_spec(cls)
+
     def __repr__(self):
         """
         Magic method print() is redefined.
@@ -150,12 +253,15 @@ class ItemN(object):
                 else:
                     res = s_format.format(val)
             return res
-        if name in (self.ATTR_NAMES + self.ATTR_SIGMA
-                    + self.ATTR_INT_PROTECTED_NAMES):
+        if name == "ATTR_SPEC":
+            raise AttributeError(f"Attribute '{name:}' is not defined in \
+'{type(self).__name__:}'")
+        attr_spec = self.ATTR_SPEC
+        if name in attr_spec["not_defined"]:
             raise AttributeError(f"Attribute '{name:}' is not defined in \
 '{type(self).__name__:}'")
             # return None
-        elif name in self.ATTR_INT_NAMES:
+        elif name in attr_spec["internal"]:
             if self.is_defined():
                 # print("is_defined: ", self.is_defined())
                 self.form_object()
@@ -189,15 +295,16 @@ class ItemN(object):
         if isinstance(value, str):
             flag_none_string = ((value == ".") | (value == "?"))
 
+        attr_spec = self.ATTR_SPEC
+        d_types = attr_spec["types"]
         if (value is None):
             flag, flag_write = True, True
             val_new = None
         elif flag_none_string:
             flag, flag_write = True, True
             val_new = None
-        elif name in self.ATTR_NAMES:
-            ind = self.ATTR_NAMES.index(name)
-            val_type = self.ATTR_TYPES[ind]
+        elif name in d_types:
+            val_type = d_types[name]
             if ((val_type is bool) and (isinstance(value, str))):
                 val_new = value == "True"
             else:
@@ -215,14 +322,28 @@ class ItemN(object):
                     val_new = self.D_MAX[name]
 
             self.delete_internal_parameters()
-        elif name in self.ATTR_SIGMA:
+        elif name in attr_spec["sigma"]:
             val_new = float(value)
             flag, flag_write = True, True
-        elif name in (self.ATTR_CONSTR_FLAG+self.ATTR_REF_FLAG):
+        elif name in attr_spec["flags"]:
             val_new = bool(value)
             flag, flag_write = True, True
 
         if flag and flag_write:
+            flag_changed = name not in self.__dict__.keys()
+            if not(flag_changed):
+                val_old = self.__dict__[name]
+                try:
+                    flag_changed = not((val_old is val_new) or
+                                       bool(val_old == val_new))
+                except ValueError:
+                    flag_changed = True
+            if flag_changed:
+                self.__dict__["VERSION"] = get_new_version()
+                owners = ITEM_OWNERS.get(self, None)
+                if owners is not None:
+                    for owner in owners:
+                        owner.bump_version()
             self.__dict__[name] = val_new
         elif not(flag):
             self.__dict__[name] = value
@@ -236,19 +357,27 @@ class ItemN(object):
         None.
 
         """
-        l_del_name = []
-        for key in self.__dict__.keys():
-            flag = True
-            if ((key == "D_MIN") | (key == "D_MAX")):
-                flag = False
-            elif key in (self.ATTR_NAMES + self.ATTR_SIGMA +
-                         self.ATTR_CONSTR_FLAG + self.ATTR_REF_FLAG +
-                         self.ATTR_INT_PROTECTED_NAMES):
-                flag = False
-            if flag:
-                l_del_name.append(key)
-        for key in l_del_name:
-            del self.__dict__[key]
+        d_self = self.__dict__
+        attr_keep = self.ATTR_SPEC["keep"]
+        if d_self.keys() <= attr_keep:
+            return
+        for key in d_self.keys() - attr_keep:
+            del d_self[key]
+
+    def get_version(self) -> int:
+        """
+        Give version of the item.
+
+        The version is changed when any attribute (value, sigma, flags of
+        refinement or constraint) of the item is changed.
+
+        Returns
+        -------
+        int
+            Version.
+
+        """
+        return self.__dict__.get("VERSION", 0)
 
     def is_attribute(self, name: str):
         """Give True if attribute is defined.
@@ -483,6 +612,7 @@ class ItemN(object):
             "D_FORMATS", "D_CONSTRAINTS", "D_DEFAULT",
             "ATTR_INT_NAMES", "ATTR_INT_NAMES",
             "ATTR_INT_PROTECTED_NAMES", "D_MIN", "D_MAX")
+        self.__dict__["ATTR_SPEC"] = form_attr_spec(self)
 
     @classmethod
     def from_cif(cls, string: str):
@@ -502,8 +632,7 @@ class ItemN(object):
             DESCRIPTION.
 
         """
-        cif_data = Data()
-        flag = cif_data.take_from_string(string)
+        cif_data = str_to_data(string)
         item = None
         if cls is ItemN:
             l_name = [item.name for item in cif_data.items]
@@ -588,11 +717,59 @@ class ItemN(object):
         if not(os.path.isfile(f_name)):
             raise UserWarning(f"File {f_name:} is not found.")
             return None
-        str_from_cif = str(to_data(f_name))
-        obj = cls.from_cif(str_from_cif)
+        obj = cls.from_cif(str(file_to_data(f_name)))
         obj.file_input = f_name
         return obj
 
+    def get_snapshot(self, arrays) -> dict:
+        """
+        Give description of object for snapshot (see GlobalN.save_snapshot).
+
+        Attributes, sigmas and flags are given together with the internal
+        attributes kept as numpy arrays. Arrays are given to arrays.
+
+        Parameters
+        ----------
+        arrays : SnapshotArrays
+            Arrays of snapshot.
+
+        Returns
+        -------
+        dict
+            Description of object.
+
+        """
+        d_snapshot = {"class": class_to_name(type(self))}
+        if type(self) is ItemN:
+            d_snapshot["cif"] = self.to_cif()
+            return d_snapshot
+        attr_spec = self.ATTR_SPEC
+        d_attr = {}
+        for name, value in self.__dict__.items():
+            flag_attr = ((name in attr_spec["not_defined"]) |
+                         (name in attr_spec["flags"]))
+            flag_internal = ((name in attr_spec["internal"]) &
+                             isinstance(value, numpy.ndarray))
+            if (flag_attr | flag_internal):
+                try:
+                    d_attr[name] = value_to_snapshot(value, arrays)
+                except TypeError:
+                    pass
+        d_snapshot["attributes"] = d_attr
+        return d_snapshot
+
+    @classmethod
+    def from_snapshot(cls, d_snapshot: dict, arrays):
+        """Create object from its description in snapshot."""
+        if "cif" in d_snapshot.keys():
+            return cls.from_cif(d_snapshot["cif"])
+        item = cls()
+        d_item = item.__dict__
+        for name, value in d_snapshot["attributes"].items():
+            d_item[name] = value_from_snapshot(value, arrays)
+        d_item["VERSION"] = get_new_version()
+        return item
+
     def copy_from(self, obj):
         """Copy attributes from obj to self."""
         if type(obj) is not type(self):
@@ -6,17 +6,656 @@ It should be used ass parent to describe new loop classes.
 import os
 import os.path
 import copy
+import weakref
 from typing import NoReturn, Union
 import numpy
-from pycifstar import Data, to_data
+from pycifstar import Data
 
 from cryspy.A_functions_base.function_1_markdown import md_to_html
 from cryspy.A_functions_base.function_1_strings import find_prefix, \
-    string_to_value_error
+    string_to_value_error, value_error_to_string, strings_to_values_errors, \
+    values_to_strings, values_errors_to_strings
 from cryspy.A_functions_base.function_1_objects import \
     get_functions_of_objet, get_table_html_for_variables
+from cryspy.A_functions_base.function_1_cif import str_to_data, \
+    file_to_data
+from cryspy.A_functions_base.function_1_snapshot import class_to_name, \
+    value_to_snapshot, value_from_snapshot
 
-from cryspy.B_parent_classes.cl_1_item import ItemN
+from cryspy.B_parent_classes.cl_1_item import ItemN, get_new_version, \
+    get_last_version, add_item_owner
+
+
+def get_column_names(item_class) -> tuple:
+    """Names of the attributes which can be kept as columns."""
+    return (item_class.ATTR_NAMES + item_class.ATTR_SIGMA +
+            item_class.ATTR_CONSTR_FLAG + item_class.ATTR_REF_FLAG)
+
+
+def get_column_type(item_class, name: str):
+    """Type of numpy array used to keep the column of attribute.
+
+    Strings (and any other non-numeric types) are kept in arrays of
+    objects so that assigned values are never truncated.
+    """
+    if name in item_class.ATTR_NAMES:
+        val_type = item_class.ATTR_TYPES[item_class.ATTR_NAMES.index(name)]
+    elif name in item_class.ATTR_SIGMA:
+        val_type = float
+    else:
+        val_type = bool
+    if val_type in (float, int, bool, complex):
+        return val_type
+    return object
+
+
+def values_to_column(values, column_type) -> numpy.ndarray:
+    """Create column from the list of values (None is undefined value)."""
+    if column_type is float:
+        return numpy.array([numpy.nan if val is None else val
+                            for val in values], dtype=float)
+    flag_none = any([val is None for val in values])
+    if ((column_type is object) | flag_none):
+        column = numpy.empty(len(values), dtype=object)
+        column[:] = values
+        return column
+    return numpy.array(values, dtype=column_type)
+
+
+def items_to_columns(item_class, l_item: list) -> dict:
+    """Give columns {name: numpy.ndarray} of attributes defined in items."""
+    d_column = {}
+    if len(l_item) == 0:
+        return d_column
+    for name in get_column_names(item_class):
+        if any([name in item.__dict__.keys() for item in l_item]):
+            d_column[name] = values_to_column(
+                [item.__dict__.get(name, None) for item in l_item],
+                get_column_type(item_class, name))
+    return d_column
+
+
+def column_value(column: numpy.ndarray, index: int):
+    """Give element of column as python object (NaN is given as None)."""
+    val = column.item(index)
+    if ((column.dtype == float) and (val != val)):
+        val = None
+    return val
+
+
+def column_to_strings(column: numpy.ndarray, column_sigma=None,
+                      column_flag=None, s_format: str = None,
+                      flag_none=None) -> list:
+    """
+    Give values of column as strings (as in '_as_string' of items).
+
+    Columns of floats are formatted at once.
+
+    Parameters
+    ----------
+    column : numpy.ndarray
+        Values.
+    column_sigma : numpy.ndarray, optional
+        Sigmas of values.
+    column_flag : numpy.ndarray, optional
+        Refinement flags. For refined values the strings are given as
+        "value(sigma)".
+    s_format : str, optional
+        Format of not refined values (from D_FORMATS).
+    flag_none : numpy.ndarray, optional
+        Flags of undefined values given as ".".
+
+    Returns
+    -------
+    list
+        Strings.
+
+    """
+    n_row = column.shape[0]
+    if column_flag is None:
+        column_flag = numpy.zeros(n_row, dtype=bool)
+    else:
+        column_flag = numpy.asarray(column_flag, dtype=bool)
+    if flag_none is None:
+        flag_none = numpy.zeros(n_row, dtype=bool)
+    flag_ref = column_flag & numpy.logical_not(flag_none)
+    flag_value = numpy.logical_not(flag_ref | flag_none)
+
+    res = numpy.full(n_row, ".", dtype=object)
+    if numpy.any(flag_ref):
+        res[flag_ref] = values_errors_to_strings(
+            numpy.asarray(column[flag_ref], dtype=float),
+            numpy.asarray(column_sigma, dtype=float)[flag_ref])
+    if s_format is not None:
+        res[flag_value] = [s_format.format(val) for val in
+                           column[flag_value].tolist()]
+    elif column.dtype == float:
+        res[flag_value] = values_to_strings(column[flag_value])
+    else:
+        res[flag_value] = [f"{val:}" for val in column[flag_value]]
+    return res.tolist()
+
+
+def items_to_strings(items: list, name: str) -> list:
+    """
+    Give values of attribute of items as strings (as in '_as_string').
+
+    Values are collected from items and formatted at once by
+    column_to_strings.
+    """
+    item_0 = items[0]
+    cls_item = type(item_0)
+    name_sigma, name_flag = f"{name:}_sigma", f"{name:}_refinement"
+    s_format = None
+    if (("D_FORMATS" in item_0.__dict__.keys()) |
+            ("D_FORMATS" in cls_item.__dict__.keys())):
+        s_format = item_0.D_FORMATS.get(name, None)
+    l_value, l_sigma, l_flag = [], [], []
+    for item in items:
+        d_item = item.__dict__
+        if ((type(item) is not cls_item) or (name not in d_item)):
+            return [getattr(item, f"{name:}_as_string") for item in items]
+        l_value.append(d_item[name])
+        if ((name_flag in d_item) and (name_sigma in d_item) and
+                d_item[name_flag]):
+            sigma = d_item[name_sigma]
+            l_flag.append(True)
+            l_sigma.append(numpy.nan if sigma is None else sigma)
+        else:
+            l_flag.append(False)
+            l_sigma.append(numpy.nan)
+    flag_none = numpy.array([val is None for val in l_value], dtype=bool)
+    if all([((val is None) or isinstance(val, float)) for val in l_value]):
+        column = values_to_column(l_value, float)
+    elif any(l_flag):
+        return [getattr(item, f"{name:}_as_string") for item in items]
+    else:
+        column = values_to_column(l_value, object)
+    return column_to_strings(column, numpy.array(l_sigma, dtype=float),
+                             numpy.array(l_flag, dtype=bool), s_format,
+                             flag_none)
+
+
+def strings_to_columns(item_class, name: str, l_string: list,
+                       item_0=None) -> dict:
+    """
+    Convert strings of CIF loop to the columns of attribute.
+
+    Parameters
+    ----------
+    item_class : TYPE
+        Class of items.
+    name : str
+        Name of attribute.
+    l_string : list
+        Values given as strings.
+    item_0 : TYPE, optional
+        Object of item_class which defines restrictions on the values.
+
+    Returns
+    -------
+    dict
+        Columns {name: numpy.ndarray}. For refined attributes the columns
+        of sigmas and refinement flags are given as well.
+
+    """
+    if item_0 is None:
+        item_0 = item_class()
+    d_column = {}
+    column_type = get_column_type(item_class, name)
+    if ((column_type is float) and (name in item_class.ATTR_REF)):
+        column, errors = strings_to_values_errors(l_string)
+        flag_error = numpy.logical_not(numpy.isnan(errors))
+        d_column[f"{name:}_sigma"] = numpy.where(flag_error, errors, 0.)
+        d_column[f"{name:}_refinement"] = flag_error
+    elif column_type is float:
+        column = strings_to_values_errors(l_string)[0]
+    elif name in item_class.ATTR_REF:
+        l_value, l_sigma, l_flag = [], [], []
+        for string in l_string:
+            value, error = string_to_value_error(string)
+            l_value.append(value)
+            l_flag.append(error is not None)
+            l_sigma.append(0. if error is None else error)
+        column = values_to_column(l_value, column_type)
+        d_column[f"{name:}_sigma"] = numpy.array(l_sigma, dtype=float)
+        d_column[f"{name:}_refinement"] = numpy.array(l_flag, dtype=bool)
+    else:
+        l_value = []
+        for string in l_string:
+            if ((string == ".") | (string == "?")):
+                value = None
+            elif column_type is bool:
+                value = (string == "True")
+            elif column_type is object:
+                value = string
+            else:
+                value = column_type(string)
+            l_value.append(value)
+        column = values_to_column(l_value, column_type)
+
+    if column.dtype != object:
+        if name in item_0.D_MIN.keys():
+            column[column < item_0.D_MIN[name]] = item_0.D_MIN[name]
+        if name in item_0.D_MAX.keys():
+            column[column > item_0.D_MAX[name]] = item_0.D_MAX[name]
+    if name in item_0.D_CONSTRAINTS.keys():
+        l_allowed = item_0.D_CONSTRAINTS[name]
+        flags = numpy.array([val not in l_allowed for val in column],
+                            dtype=bool)
+        if numpy.any(flags):
+            column = column.astype(object)
+            column[flags] = item_0.__dict__.get(name, None)
+    d_column[name] = column
+    return d_column
+
+
+class ColumnarItems(object):
+    """Rows of LoopN object kept in columnar mode.
+
+    Attributes of all rows are kept as numpy arrays (columns). Object of
+    ITEM_CLASS is created for a row only when the row is requested by
+    index or by iteration. Created rows are kept and synchronized with the
+    columns: a row attribute changed by user is written into the column,
+    all other attributes of the row are updated from the columns.
+    Rows are added, deleted and reordered as in list (append, extend,
+    insert, pop, remove, clear, sort, reverse, del and item assignment);
+    the columns are changed accordingly and created rows are re-indexed.
+    """
+
+    def __init__(self, loop):
+        item_0 = loop.ITEM_CLASS()
+        column_names = get_column_names(loop.ITEM_CLASS)
+        self.loop = loop
+        self.item_0 = item_0
+        self.columns = {}
+        self.defaults = {name: item_0.__dict__[name] for name in column_names
+                         if name in item_0.__dict__.keys()}
+        self.rows = {}
+        self.snapshots = {}
+
+    def __len__(self) -> int:
+        for column in self.columns.values():
+            return column.shape[0]
+        return 0
+
+    def __bool__(self) -> bool:
+        return len(self) != 0
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[ind] for ind in range(*index.indices(len(self)))]
+        n_row = len(self)
+        ind = int(index)
+        if ind < 0:
+            ind += n_row
+        if not((ind >= 0) & (ind < n_row)):
+            raise IndexError("list index out of range")
+        if ind in self.rows.keys():
+            self.sync_row(ind)
+        else:
+            item = self.loop.ITEM_CLASS()
+            d_item = item.__dict__
+            for name, column in self.columns.items():
+                d_item[name] = column_value(column, ind)
+            self.rows[ind] = item
+            self.snapshots[ind] = {name: d_item[name] for name in
+                                   self.columns.keys()}
+        return self.rows[ind]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (list, ColumnarItems)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __contains__(self, item) -> bool:
+        return any([row is item for row in self.rows.values()])
+
+    def index(self, item) -> int:
+        """Give index of item (as list.index).
+
+        Only created rows are checked, other rows can not be referenced.
+        """
+        for ind in sorted(self.rows.keys()):
+            if self.rows[ind] is item:
+                return ind
+        raise ValueError("item is not in list")
+
+    def take_rows(self, indexes) -> NoReturn:
+        """
+        Keep rows given by indexes in the given order.
+
+        Created rows are kept (re-indexed), the version of the loop is
+        changed.
+        """
+        self.sync_rows()
+        indexes = numpy.asarray(indexes, dtype=int)
+        for name in self.columns.keys():
+            self.columns[name] = self.columns[name][indexes]
+        rows, snapshots = self.rows, self.snapshots
+        self.rows = {ind_new: rows[ind] for ind_new, ind in
+                     enumerate(indexes.tolist()) if ind in rows.keys()}
+        self.snapshots = {ind_new: snapshots[ind] for ind_new, ind in
+                          enumerate(indexes.tolist()) if ind in rows.keys()}
+        self.loop.__dict__["VERSION"] = get_new_version()
+
+    def insert_rows(self, index: int, l_item: list) -> NoReturn:
+        """
+        Insert items before index.
+
+        Attributes of items are written into the columns and the items are
+        kept as created rows (their changes are synchronized with the
+        columns).
+        """
+        l_item = list(l_item)
+        item_class = self.loop.ITEM_CLASS
+        if not(all([isinstance(item, item_class) for item in l_item])):
+            raise TypeError(
+                f"Only objects of '{item_class.__name__:}' can be added.")
+        if len(l_item) == 0:
+            return
+        self.sync_rows()
+        n_row, n_new = len(self), len(l_item)
+        index = max(min(index if index >= 0 else index+n_row, n_row), 0)
+        d_column_new = items_to_columns(item_class, l_item)
+        for name in set(self.columns.keys()) | set(d_column_new.keys()):
+            column_type = get_column_type(item_class, name)
+            column = self.columns.get(name, None)
+            if column is None:
+                column = values_to_column(n_row*[None], column_type)
+            column_new = d_column_new.get(name, None)
+            if column_new is None:
+                column_new = values_to_column(n_new*[None], column_type)
+            if column.dtype != column_new.dtype:
+                column = column.astype(object)
+                column_new = column_new.astype(object)
+            self.columns[name] = numpy.concatenate(
+                (column[:index], column_new, column[index:]), axis=0)
+        rows, snapshots = self.rows, self.snapshots
+        self.rows = {(ind if ind < index else ind+n_new): row
+                     for ind, row in rows.items()}
+        self.snapshots = {(ind if ind < index else ind+n_new): snapshot
+                          for ind, snapshot in snapshots.items()}
+        for ind, item in enumerate(l_item, start=index):
+            d_item = item.__dict__
+            for name, column in self.columns.items():
+                d_item[name] = column_value(column, ind)
+            self.rows[ind] = item
+            self.snapshots[ind] = {name: d_item[name] for name in
+                                   self.columns.keys()}
+        self.loop.__dict__["VERSION"] = get_new_version()
+
+    def append(self, item) -> NoReturn:
+        self.insert_rows(len(self), (item, ))
+
+    def extend(self, l_item) -> NoReturn:
+        self.insert_rows(len(self), l_item)
+
+    def insert(self, index, item) -> NoReturn:
+        self.insert_rows(int(index), (item, ))
+
+    def pop(self, index: int = -1):
+        item = self[index]
+        indexes = list(range(len(self)))
+        del indexes[index]
+        self.take_rows(indexes)
+        return item
+
+    def remove(self, item) -> NoReturn:
+        ind = self.index(item)
+        self.take_rows([i for i in range(len(self)) if i != ind])
+
+    def clear(self) -> NoReturn:
+        self.take_rows([])
+
+    def sort(self, key=None, reverse: bool = False) -> NoReturn:
+        l_item = list(self)
+        if key is None:
+            indexes = sorted(range(len(l_item)), key=lambda ind: l_item[ind],
+                             reverse=reverse)
+        else:
+            indexes = sorted(range(len(l_item)),
+                             key=lambda ind: key(l_item[ind]),
+                             reverse=reverse)
+        self.take_rows(indexes)
+
+    def reverse(self) -> NoReturn:
+        self.take_rows(list(range(len(self)))[::-1])
+
+    def __delitem__(self, index) -> NoReturn:
+        indexes = list(range(len(self)))
+        del indexes[index]
+        self.take_rows(indexes)
+
+    def __setitem__(self, index, value) -> NoReturn:
+        if isinstance(index, slice):
+            l_value = list(value)
+            indexes = list(range(len(self)))
+            l_ind = indexes[index]
+            if ((index.step not in (None, 1)) and
+                    (len(l_ind) != len(l_value))):
+                raise ValueError(f"attempt to assign sequence of size \
+{len(l_value):} to extended slice of size {len(l_ind):}")
+            if index.step in (None, 1):
+                ind_start = index.indices(len(self))[0]
+                del indexes[index]
+                self.take_rows(indexes)
+                self.insert_rows(ind_start, l_value)
+                return
+            for ind, item in zip(l_ind, l_value):
+                self[ind] = item
+            return
+        ind = int(index)
+        if ind < 0:
+            ind += len(self)
+        if not((ind >= 0) & (ind < len(self))):
+            raise IndexError("list assignment index out of range")
+        del self[ind]
+        self.insert_rows(ind, (value, ))
+
+    def __iadd__(self, l_item):
+        self.extend(l_item)
+        return self
+
+    def set_column(self, name: str, values) -> NoReturn:
+        """Set column of attribute given by name."""
+        column_type = get_column_type(self.loop.ITEM_CLASS, name)
+        if isinstance(values, numpy.ndarray) and (column_type is not object):
+            column = numpy.asarray(values, dtype=column_type)
+        elif (isinstance(values, numpy.ndarray) and (values.dtype == object)):
+            column = values
+        else:
+            column = values_to_column(list(values), column_type)
+        if column.ndim != 1:
+            raise ValueError("Column should be given as 1D array.")
+        n_row, n_row_new = len(self), column.shape[0]
+        if ((n_row == 0) & (n_row_new != 0)):
+            self.rows.clear()
+            self.snapshots.clear()
+            for name_d, value_d in self.defaults.items():
+                self.columns[name_d] = values_to_column(
+                    n_row_new*[value_d],
+                    get_column_type(self.loop.ITEM_CLASS, name_d))
+        elif n_row_new != n_row:
+            raise ValueError(f"Length of column '{name:}' ({n_row_new:}) \
+does not correspond to number of rows ({n_row:}).")
+        self.columns[name] = column
+        self.loop.__dict__["VERSION"] = get_new_version()
+        for ind, item in self.rows.items():
+            value = column_value(column, ind)
+            item.__dict__[name] = value
+            self.snapshots[ind][name] = value
+
+    def set_value(self, name: str, index: int, value) -> NoReturn:
+        """Set value of attribute to the row given by index."""
+        column = self.columns.get(name, None)
+        if column is None:
+            column = values_to_column(
+                len(self)*[None],
+                get_column_type(self.loop.ITEM_CLASS, name))
+            self.columns[name] = column
+        if ((value is None) & (column.dtype != float) &
+                (column.dtype != object)):
+            column = column.astype(object)
+            self.columns[name] = column
+        if ((value is None) & (column.dtype == float)):
+            value = numpy.nan
+        column[index] = value
+        self.loop.__dict__["VERSION"] = get_new_version()
+
+    def get_index(self, name):
+        """Give index of row given by ATTR_INDEX value or by number."""
+        attr_index = self.loop.ATTR_INDEX
+        column = None
+        if attr_index is not None:
+            column = self.columns.get(attr_index, None)
+        if column is not None:
+            self.sync_rows()
+            for ind in range(column.shape[0]):
+                if name == column_value(column, ind):
+                    return ind
+        if isinstance(name, int):
+            if name < 0:
+                name += len(self)
+            if ((name >= 0) & (name < len(self))):
+                return name
+        return None
+
+    def sync_row(self, index: int) -> NoReturn:
+        """Synchronize created row with the columns."""
+        item, snapshot = self.rows[index], self.snapshots[index]
+        d_item = item.__dict__
+        flag_updated = False
+        for name in get_column_names(self.loop.ITEM_CLASS):
+            if name in d_item.keys():
+                value = d_item[name]
+                if name in snapshot.keys():
+                    value_old = snapshot[name]
+                    if ((value is value_old) or (value == value_old)):
+                        value_new = column_value(self.columns[name], index)
+                        if not((value_new is value) or (value_new == value)):
+                            d_item[name] = value_new
+                            snapshot[name] = value_new
+                            flag_updated = True
+                        continue
+                self.set_value(name, index, value)
+                snapshot[name] = value
+            elif name in self.columns.keys():
+                value_new = column_value(self.columns[name], index)
+                d_item[name] = value_new
+                snapshot[name] = value_new
+                flag_updated = True
+        if flag_updated:
+            item.delete_internal_parameters()
+
+    def sync_rows(self) -> NoReturn:
+        """Synchronize all created rows with the columns."""
+        for index in self.rows.keys():
+            self.sync_row(index)
+
+    def get_column_as_strings(self, name: str) -> list:
+        """Give values of column as strings (as in '_as_string' of items)."""
+        column = self.columns[name]
+        column_sigma = self.columns.get(f"{name:}_sigma", None)
+        column_flag = self.columns.get(f"{name:}_refinement", None)
+        flag_ref = ((column_sigma is not None) & (column_flag is not None))
+        if not(flag_ref):
+            column_flag = None
+        s_format = None
+        if "D_FORMATS" in type(self.item_0).__dict__.keys():
+            s_format = self.item_0.D_FORMATS.get(name, None)
+        if column.dtype == float:
+            flag_none = numpy.isnan(column)
+        else:
+            flag_none = numpy.array([val is None for val in column],
+                                    dtype=bool)
+        return column_to_strings(column, column_sigma, column_flag,
+                                 s_format, flag_none)
+
+
+class ItemList(list):
+    """List of items of LoopN object.
+
+    The version of the loop is changed when items are added, deleted or
+    reordered in the list. The loop is registered as owner of its items, so
+    that it is marked as changed also by changes of the items.
+    """
+
+    def __init__(self, l_item, loop):
+        super(ItemList, self).__init__(l_item)
+        self.loop_ref = weakref.ref(loop)
+        for item in self:
+            add_item_owner(item, loop)
+
+    def __reduce__(self):
+        # copies are plain lists, they are wrapped by the loop using them
+        return (list, (list(self), ))
+
+    def _changed(self, l_item=()) -> NoReturn:
+        loop = self.loop_ref()
+        if loop is None:
+            return
+        loop.bump_version()
+        for item in l_item:
+            add_item_owner(item, loop)
+
+    def append(self, item) -> NoReturn:
+        super(ItemList, self).append(item)
+        self._changed((item, ))
+
+    def extend(self, l_item) -> NoReturn:
+        l_item = list(l_item)
+        super(ItemList, self).extend(l_item)
+        self._changed(l_item)
+
+    def insert(self, index, item) -> NoReturn:
+        super(ItemList, self).insert(index, item)
+        self._changed((item, ))
+
+    def pop(self, *args):
+        item = super(ItemList, self).pop(*args)
+        self._changed()
+        return item
+
+    def remove(self, item) -> NoReturn:
+        super(ItemList, self).remove(item)
+        self._changed()
+
+    def clear(self) -> NoReturn:
+        super(ItemList, self).clear()
+        self._changed()
+
+    def sort(self, *args, **kwargs) -> NoReturn:
+        super(ItemList, self).sort(*args, **kwargs)
+        self._changed()
+
+    def reverse(self) -> NoReturn:
+        super(ItemList, self).reverse()
+        self._changed()
+
+    def __setitem__(self, index, value) -> NoReturn:
+        super(ItemList, self).__setitem__(index, value)
+        if isinstance(index, slice):
+            self._changed(list(value))
+        else:
+            self._changed((value, ))
+
+    def __delitem__(self, index) -> NoReturn:
+        super(ItemList, self).__delitem__(index)
+        self._changed()
+
+    def __iadd__(self, l_item):
+        self.extend(l_item)
+        return self
+
+    def __imul__(self, number):
+        super(ItemList, self).__imul__(number)
+        self._changed()
+        return self
 
 
 class LoopN(object):
@@ -24,8 +663,31 @@ class LoopN(object):
 
     It is internal class of cryspy library.
     You should use it only to create your own classes.
+
+    Loop can be switched in columnar mode (see methods to_columnar and
+    to_items). In columnar mode attributes of all items are kept as numpy
+    arrays: attributes 'numpy_*' give the arrays without copying and the
+    objects of items are created only on request. Derived classes with
+    COLUMNAR = True are read from CIF and filled by 'numpy_*' attributes
+    directly in columnar mode.
     """
 
+    COLUMNAR = False
+
+    @property
+    def items(self):
+        """Items of the loop (ItemList or ColumnarItems object)."""
+        try:
+            items = self.__dict__["items"]
+        except KeyError:
+            raise AttributeError(
+                f"'{type(self).__name__:}' object has no attribute 'items'")
+        if type(items) is list:
+            items = ItemList(items, self)
+            self.__dict__["items"] = items
+            self.__dict__["VERSION"] = get_new_version()
+        return items
+
     def __repr__(self):
         """
         Magic method print() is redefined.
@@ -99,10 +761,28 @@ class LoopN(object):
             DESCRIPTION.
 
         """
+        items = self.__dict__.get("items", None)
+        if isinstance(items, ColumnarItems):
+            name_sh = name
+            if name.startswith("numpy_"):
+                name_sh = name[6:]
+            if name_sh in items.columns.keys():
+                items.sync_rows()
+                column = items.columns[name_sh]
+                if name_sh == name:
+                    return [column_value(column, ind)
+                            for ind in range(column.shape[0])]
+                return column
+            elif name_sh in get_column_names(self.ITEM_CLASS):
+                raise AttributeError(f"Attribute '{name_sh:}' is not \
+defined in '{type(self).__name__:}'")
         item_class = self.ITEM_CLASS
         if item_class is ItemN:
             item_class = self.items[0]
         if name.startswith("numpy_"):
+            res = self.load_numpy_cache(name)
+            if res is not None:
+                return res
             name_sh = name[6:]
             if name_sh in (item_class.ATTR_NAMES + item_class.ATTR_SIGMA +
                            item_class.ATTR_CONSTR_FLAG +
@@ -117,14 +797,14 @@ class LoopN(object):
                 else:
                     type_array = float
                 res = numpy.array(l_val, dtype=type_array)
-                self.__dict__[name] = res
+                self.save_numpy_cache(name, res)
                 return res
             elif name_sh in (item_class.ATTR_INT_NAMES +
                              item_class.ATTR_INT_PROTECTED_NAMES):
                 l_val = [getattr(item, name_sh) for item in self.items]
                 type_array = type(l_val[0])
                 res = numpy.array(l_val, dtype=type_array)
-                self.__dict__[name] = res
+                self.save_numpy_cache(name, res)
                 return res
         elif name in (item_class.ATTR_NAMES + item_class.ATTR_SIGMA +
                       item_class.ATTR_CONSTR_FLAG + item_class.ATTR_REF_FLAG):
@@ -155,6 +835,16 @@ class LoopN(object):
 
         """
         flag_direct = True
+        if name in ("items", "loop_name") or name.startswith("numpy_"):
+            self.__dict__["VERSION"] = get_new_version()
+        if (name.startswith("numpy_") and (self.ITEM_CLASS is not ItemN)):
+            if name[6:] in get_column_names(self.ITEM_CLASS):
+                if ((not(self.is_columnar())) and self.COLUMNAR and
+                        (len(self.__dict__.get("items", [])) == 0)):
+                    self.to_columnar()
+                if self.is_columnar():
+                    self.items.set_column(name[6:], value)
+                    return
         if name == "items":
             flag = all([isinstance(val, self.ITEM_CLASS) for val in value])
             if not(flag):
@@ -169,12 +859,114 @@ class LoopN(object):
             self.__dict__[name] = value
         else:
             self.__dict__[name] = val_new
+        if name == "items":
+            # to trace changes of the list and of its items
+            items = self.__dict__["items"]
+            if isinstance(items, ItemList) and (items.loop_ref() is not self):
+                self.__dict__["items"] = list(items)
+            self.items
 
     def is_attribute(self, name: str):
         """Give True if all attributes are defined."""
+        if self.is_columnar():
+            if name in get_column_names(self.ITEM_CLASS):
+                return ((name in self.items.columns.keys()) |
+                        (len(self.items) == 0))
         flag = all([item.is_attribute(name) for item in self.items])
         return flag
 
+    def get_version(self) -> int:
+        """
+        Give version of the loop.
+
+        The version is changed when any item of the loop is changed, when
+        items are added, deleted, reordered or replaced or when columns are
+        changed (in columnar mode). Items report their changes to the loop,
+        so the version is given without scanning the items.
+        Changes made in place of numpy arrays given by attributes 'numpy_*'
+        can not be traced, call 'bump_version' after them.
+
+        Returns
+        -------
+        int
+            Version.
+
+        """
+        items = self.__dict__.get("items", None)
+        if isinstance(items, ColumnarItems):
+            items.sync_rows()
+        elif type(items) is list:
+            self.items
+        return self.__dict__.get("VERSION", 0)
+
+    def bump_version(self) -> NoReturn:
+        """Mark the loop as changed."""
+        self.__dict__["VERSION"] = get_new_version()
+
+    def save_numpy_cache(self, name: str, value: numpy.ndarray) -> NoReturn:
+        """Keep numpy array built from items together with loop version."""
+        d_cache = self.__dict__.get("d_numpy_cache", None)
+        if d_cache is None:
+            d_cache = {}
+            self.__dict__["d_numpy_cache"] = d_cache
+        d_cache[name] = (get_last_version(), self.get_version(), value)
+
+    def load_numpy_cache(self, name: str):
+        """Give numpy array built from items if the items are not changed."""
+        d_cache = self.__dict__.get("d_numpy_cache", None)
+        if d_cache is None:
+            return None
+        if name not in d_cache.keys():
+            return None
+        last_version, version, value = d_cache[name]
+        if last_version == get_last_version():
+            return value
+        if version == self.get_version():
+            d_cache[name] = (get_last_version(), version, value)
+            return value
+        del d_cache[name]
+        return None
+
+    def is_columnar(self) -> bool:
+        """Give True if loop is kept in columnar mode."""
+        return isinstance(self.__dict__.get("items", None), ColumnarItems)
+
+    def to_columnar(self) -> NoReturn:
+        """
+        Keep attributes of all items as numpy arrays (columnar mode).
+
+        In columnar mode attributes 'numpy_*' give the arrays without
+        copying them, and objects of items are created only when they are
+        requested (by index or by iteration over items).
+        Changes of created items are transfered to the arrays when the loop
+        is accessed. Loops of general ItemN objects stay unchanged.
+
+        Returns
+        -------
+        NoReturn
+
+        """
+        if (self.is_columnar() | (self.ITEM_CLASS is ItemN)):
+            return
+        l_item = self.__dict__.get("items", [])
+        items = ColumnarItems(self)
+        items.columns.update(items_to_columns(self.ITEM_CLASS, l_item))
+        self.__dict__["items"] = items
+
+    def to_items(self) -> NoReturn:
+        """
+        Switch off columnar mode: objects are created for all items.
+
+        Returns
+        -------
+        NoReturn
+
+        """
+        if not(self.is_columnar()):
+            return
+        l_item = list(self.items)
+        self.__dict__["items"] = l_item
+
     def numpy_to_items(self) -> NoReturn:
         """
         Transform all internal numpy arrays to elements of items.
@@ -253,8 +1045,25 @@ class LoopN(object):
             DESCRIPTION.
 
         """
-        cif_data = Data()
-        cif_data.take_from_string(string)
+        cif_data = str_to_data(string)
+        return cls.from_cif_data(cif_data)
+
+    @classmethod
+    def from_cif_data(cls, cif_data: Data):
+        """
+        Create object from loops of data block already read from CIF.
+
+        Parameters
+        ----------
+        cif_data : Data
+            Data block (object of pycifstar library).
+
+        Returns
+        -------
+        obj : TYPE
+            DESCRIPTION.
+
+        """
         obj = None
         if cls is LoopN:
             loop = cif_data.loops[0]
@@ -294,6 +1103,19 @@ class LoopN(object):
 
                 if obj is None:
                     obj = cls(loop_name=loop_name)
+                if ((item_class is not ItemN) and cls.COLUMNAR):
+                    obj.to_columnar()
+                    for _name, _name_short in zip(l_name, l_name_short):
+                        _name_short = _name_short.lower()
+                        if _name_short in l_cif_attr:
+                            _name_short_obj = l_attr[l_cif_attr.index(
+                                _name_short)]
+                            d_column = strings_to_columns(
+                                item_class, _name_short_obj, cif_loop[_name],
+                                item_0=obj.items.item_0)
+                            for name_column, column in d_column.items():
+                                obj.items.set_column(name_column, column)
+                    break
                 _i = 0
                 for _name, _name_short in zip(l_name, l_name_short):
                     if _name_short.lower() in l_cif_attr:
@@ -391,38 +1213,44 @@ class LoopN(object):
             ls_out.append(" ".join(len(item_class.ATTR_CIF)*["."]))
             return "\n".join(ls_out)
 
-        item_0 = self.items[0]
+        flag_columnar = self.is_columnar()
+        if flag_columnar:
+            self.items.sync_rows()
+            item_0 = self.items.item_0
+        else:
+            item_0 = self.items[0]
         prefix = item_0.PREFIX
-        ls_out_2 = []
+        ls_out_2 = None
         for name, name_cif in zip(item_0.ATTR_NAMES, item_0.ATTR_CIF):
-            flag_value = item_0.is_attribute(name)
+            if flag_columnar:
+                flag_value = name in self.items.columns.keys()
+            else:
+                flag_value = item_0.is_attribute(name)
             if flag_value:
                 if name_cif == "":
                     ls_out.append(f"_{prefix:}")
                 else:
                     ls_out.append(f"_{prefix:}{separator:}{name_cif:}")
-                list_value = [getattr(item, f"{name}_as_string")
-                              for item in self.items]
-                if len(ls_out_2) == 0:
-                    n_max = max(map(len, [str(h) for h in list_value])) + 2
-                    for s_val in list_value:
-                        if ((len(s_val.split(" ")) > 1) |
-                                s_val.startswith("_")):
-                            ls_out_2.append([("\""+s_val+"\"").ljust(n_max)])
-                        else:
-                            ls_out_2.append([s_val.ljust(n_max)])
+                if flag_columnar:
+                    list_value = self.items.get_column_as_strings(name)
                 else:
-                    n_max = max(map(len, [str(h) for h in list_value])) + 2
-                    for list_out, s_val in zip(ls_out_2, list_value):
-                        if ((len(s_val.split(" ")) > 1) | 
-                                s_val.startswith("_")):
-                            list_out.append(("\""+s_val+"\"").ljust(n_max))
-                        else:
-                            list_out.append(s_val.ljust(n_max))
+                    list_value = items_to_strings(self.items, name)
+                np_value = numpy.array(list_value, dtype=str)
+                n_max = int(numpy.max(numpy.char.str_len(np_value))) + 2
+                flag_quote = ((numpy.char.find(np_value, " ") != -1) |
+                              numpy.char.startswith(np_value, "_"))
+                if numpy.any(flag_quote):
+                    np_value = numpy.where(flag_quote, numpy.char.add(
+                        numpy.char.add("\"", np_value), "\""), np_value)
+                np_value = numpy.char.ljust(np_value, n_max)
+                if ls_out_2 is None:
+                    ls_out_2 = np_value
+                else:
+                    ls_out_2 = numpy.char.add(numpy.char.add(ls_out_2, " "),
+                                              np_value)
 
-        for list_out in ls_out_2:
-            s_line = " ".join(list_out)
-            ls_out.append(s_line)
+        if ls_out_2 is not None:
+            ls_out.extend(ls_out_2.tolist())
         return "\n".join(ls_out)
 
     def attributes_to_html(self) -> str:
@@ -522,6 +1350,10 @@ class LoopN(object):
                 return self.items[name]
             else:
                 return None
+        elif self.is_columnar():
+            ind = self.items.get_index(name)
+            if ind is not None:
+                return self.items[ind]
         else:
             for item in self.items:
                 if name == getattr(item, attr_index):
@@ -564,6 +1396,19 @@ class LoopN(object):
             prefix = item_class.PREFIX
         loop_name = self.loop_name
         l_var = []
+        if self.is_columnar():
+            columns = self.items.columns
+            l_ind_var = []
+            for i_attr, (name, name_flag) in enumerate(zip(
+                    item_class.ATTR_REF, item_class.ATTR_REF_FLAG)):
+                if name_flag in columns.keys():
+                    l_ind_var.extend([
+                        (ind, i_attr, name) for ind in
+                        numpy.flatnonzero(columns[name_flag] == True)])
+            l_ind_var.sort()
+            l_var = [((prefix, loop_name), (name, int(ind)))
+                     for ind, i_attr, name in l_ind_var]
+            return l_var
         for ind, item in enumerate(self.items):
             l_var.extend([((prefix, loop_name), (name[1][0], ind))
                           for name in item.get_variable_names()])
@@ -572,6 +1417,14 @@ class LoopN(object):
     def is_variables(self) -> bool:
         """Define is there variables or not."""
         flag = False
+        if self.is_columnar():
+            columns = self.items.columns
+            for name_flag in self.ITEM_CLASS.ATTR_REF_FLAG:
+                if name_flag in columns.keys():
+                    if numpy.any(columns[name_flag] == True):
+                        flag = True
+                        break
+            return flag
         for item in self.items:
             if item.is_variables():
                 flag = True
@@ -614,6 +1467,11 @@ class LoopN(object):
         item_index = attr_t[1]
         if attr_name is None:
             return self.items[item_index]
+        if self.is_columnar():
+            columns = self.items.columns
+            if attr_name in columns.keys():
+                self.items.sync_rows()
+                return column_value(columns[attr_name], item_index)
         return getattr(self.items[item_index], attr_name)
 
     def set_variable_by_name(self, name: tuple, value) -> NoReturn:
@@ -646,6 +1504,18 @@ class LoopN(object):
         if prefix_t != (prefix, self.loop_name):
             return
         attr_name, item_index = attr_t
+        if self.is_columnar():
+            if attr_name in get_column_names(item_class):
+                self.items.sync_rows()
+                item_0 = self.items.item_0
+                item_0.__dict__.pop(attr_name, None)
+                setattr(item_0, attr_name, value)
+                if attr_name in item_0.__dict__.keys():
+                    self.items.set_value(attr_name, item_index,
+                                         item_0.__dict__[attr_name])
+                if item_index in self.items.rows.keys():
+                    self.items.sync_row(item_index)
+                return
         setattr(self.items[item_index], attr_name, value)
 
     def is_defined(self) -> bool:
@@ -659,6 +1529,17 @@ class LoopN(object):
 
         """
         flag = True
+        if self.is_columnar():
+            if len(self.items) == 0:
+                return flag
+            item_class = self.ITEM_CLASS
+            columns = self.items.columns
+            flag = all([name in columns.keys() for name in
+                        item_class.ATTR_MANDATORY_NAMES])
+            if len(item_class.ATTR_MANDATORY_NAMES) == 0:
+                flag = any([name in columns.keys() for name in
+                            item_class.ATTR_OPTIONAL_NAMES])
+            return flag
         for item in self.items:
             if not(item.is_defined()):
                 flag = False
@@ -671,16 +1552,70 @@ class LoopN(object):
         if not(os.path.isfile(f_name)):
             raise UserWarning(f"File {f_name:} is not found.")
             return None
-        str_from_cif = str(to_data(f_name))
-        obj = cls.from_cif(str_from_cif)
+        obj = cls.from_cif_data(file_to_data(f_name))
         obj.file_input = f_name
         return obj
 
+    def get_snapshot(self, arrays) -> dict:
+        """
+        Give description of object for snapshot (see GlobalN.save_snapshot).
+
+        Attributes of items are given as columns, numerical columns are
+        given to arrays.
+
+        Parameters
+        ----------
+        arrays : SnapshotArrays
+            Arrays of snapshot.
+
+        Returns
+        -------
+        dict
+            Description of object.
+
+        """
+        d_snapshot = {"class": class_to_name(type(self))}
+        if self.ITEM_CLASS is ItemN:
+            d_snapshot["cif"] = self.to_cif()
+            return d_snapshot
+        if self.is_columnar():
+            self.items.sync_rows()
+            d_column = self.items.columns
+        else:
+            d_column = items_to_columns(self.ITEM_CLASS, self.items)
+        d_snapshot["loop_name"] = self.loop_name
+        d_snapshot["columns"] = {
+            name: value_to_snapshot(column, arrays)
+            for name, column in d_column.items()}
+        return d_snapshot
+
+    @classmethod
+    def from_snapshot(cls, d_snapshot: dict, arrays):
+        """
+        Create object from its description in snapshot.
+
+        The loop is created in columnar mode, so memory-mapped arrays of
+        snapshot are used as columns without copying.
+        """
+        if "cif" in d_snapshot.keys():
+            return cls.from_cif(d_snapshot["cif"])
+        obj = cls(loop_name=d_snapshot["loop_name"])
+        obj.to_columnar()
+        for name, column in d_snapshot["columns"].items():
+            obj.items.set_column(name, value_from_snapshot(column, arrays))
+        return obj
+
     def copy_from(self, obj):
         """Copy attributes from obj to self."""
         if type(obj) is not type(self):
             return
-        self.items.clear()
+        if obj.is_columnar():
+            obj.items.sync_rows()
+            self.__dict__["items"] = ColumnarItems(self)
+            for name, column in obj.items.columns.items():
+                self.items.columns[name] = column.copy()
+            return
+        self.__dict__["items"] = []
         self.items = copy.deepcopy(obj.items)
 
     def report(self):
@@ -694,6 +1629,13 @@ class LoopN(object):
 
     def fix_variables(self):
         """Fix variables."""
+        if self.is_columnar():
+            self.items.sync_rows()
+            for name_flag in self.ITEM_CLASS.ATTR_REF_FLAG:
+                if name_flag in self.items.columns.keys():
+                    self.items.set_column(
+                        name_flag, numpy.zeros(len(self.items), dtype=bool))
+            return
         for item in self.items:
             item.fix_variables()
 
@@ -712,7 +1654,23 @@ class LoopN(object):
         else:
             att_ref = item_class.ATTR_REF
 
-        if name_sh in att_ref:
+        if ((name_sh in att_ref) and self.is_columnar()):
+            self.items.sync_rows()
+            columns = self.items.columns
+            if name_sh not in columns.keys():
+                return
+            flags_ref = columns.get(f"{name_sh:}_refinement", numpy.zeros(
+                len(self.items), dtype=bool)).copy()
+            flags_constr = columns.get(f"{name_sh:}_constraint", numpy.zeros(
+                len(self.items), dtype=bool))
+            if index is None:
+                flags_ref[numpy.logical_not(flags_constr)] = True
+            else:
+                ind = self.items.get_index(index)
+                if ((ind is not None) and not(flags_constr[ind])):
+                    flags_ref[ind] = True
+            self.items.set_column(f"{name_sh:}_refinement", flags_ref)
+        elif name_sh in att_ref:
             if index is None:
                 for item in self.items:
                     item.set_variable(name_sh, index=index)
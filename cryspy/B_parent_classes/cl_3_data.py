@@ -3,13 +3,17 @@ import os
 import os.path
 from warnings import warn
 from typing import Union, NoReturn
-from pycifstar import Data, to_data
+from pycifstar import Data
 
 from cryspy.A_functions_base.function_1_markdown import md_to_html
+from cryspy.A_functions_base.function_1_cif import str_to_data, \
+    file_to_data, get_prefix_position
 from cryspy.A_functions_base.function_1_objects import \
     get_functions_of_objet, get_table_html_for_variables
+from cryspy.A_functions_base.function_1_snapshot import class_to_name, \
+    name_to_class, object_from_snapshot
 
-from cryspy.B_parent_classes.cl_1_item import ItemN
+from cryspy.B_parent_classes.cl_1_item import ItemN, get_new_version
 from cryspy.B_parent_classes.cl_2_loop import LoopN
 
 
@@ -174,6 +178,7 @@ class DataN(object):
                 if name_new in l_name:
                     self.items.pop(l_name.index(name))
                 self.items.append(value)
+                self.__dict__["VERSION"] = get_new_version()
                 flag_items, flag_direct = True, False
                 if name_new != name:
                     warn(f"Access to variable by '{name_new:}'.", UserWarning)
@@ -192,7 +197,8 @@ class DataN(object):
 
         if len(s_name) != len(l_name):
             warn("Double items were given.", UserWarning)
-            items_unique = [items[l_name.index(name)] for name in s_name]
+            items_unique = [items[l_name.index(name)] for name in
+                            dict.fromkeys(l_name)]
         else:
             items_unique = items
         l_ind_del = []
@@ -205,6 +211,7 @@ class DataN(object):
         for item in items_unique:
             if isinstance(item, self.CLASSES):
                 self.items.append(item)
+        self.__dict__["VERSION"] = get_new_version()
 
     @classmethod
     def make_container(cls, cls_mandatory, cls_optional, prefix):
@@ -295,6 +302,45 @@ class DataN(object):
                 break
         return flag
 
+    def get_version(self, names: tuple = None) -> int:
+        """
+        Give version of the data.
+
+        The version is changed when any item is changed, added or removed.
+
+        Parameters
+        ----------
+        names : tuple, optional
+            Names of items (given by method get_name) which are taken into
+            account. By default all items are taken into account.
+
+        Returns
+        -------
+        int
+            Version.
+
+        """
+        version = self.__dict__.get("VERSION", 0)
+        for item in self.items:
+            if ((names is None) or (item.get_name() in names)):
+                version_item = item.get_version()
+                if version_item > version:
+                    version = version_item
+        return version
+
+    def get_versions(self) -> dict:
+        """
+        Give versions of items.
+
+        Returns
+        -------
+        dict
+            Versions {name: version} where name is given by method get_name
+            of item.
+
+        """
+        return {item.get_name(): item.get_version() for item in self.items}
+
     def get_variable_by_name(self, name: tuple) -> Union[float, int, str]:
         """
         Get variable given by name.
@@ -458,13 +504,16 @@ class DataN(object):
     @classmethod
     def from_cif(cls, string: str):
         """Generate object from string of CIF format."""
-        cif_data = Data()
-        flag = cif_data.take_from_string(string)
+        cif_data = str_to_data(string)
+        return cls.from_cif_data(cif_data)
 
+    @classmethod
+    def from_cif_data(cls, cif_data: Data):
+        """Generate object from data block already read from CIF."""
         cif_items = cif_data.items
         cif_loops = cif_data.loops
 
-        items = []
+        items, l_position = [], []
         flag = True
         n_mandatory = len(cls.CLASSES_MANDATORY)
         for i_cls, cls_ in enumerate(cls.CLASSES):
@@ -477,15 +526,18 @@ class DataN(object):
                     obj_prefix = cls_.from_cif(cif_string)
                     if obj_prefix is not None:
                         items.append(obj_prefix)
+                        l_position.append((0, get_prefix_position(
+                            cif_items.names, prefix_cls)))
                         flag = True
             elif issubclass(cls_, LoopN):
                 prefix_cls = cls_.ITEM_CLASS.PREFIX
-                for cif_loop in cif_loops:
+                for i_loop, cif_loop in enumerate(cif_loops):
                     if cif_loop.is_prefix("_"+prefix_cls):
-                        cif_string = str(cif_loop)
-                        obj_prefix = cls_.from_cif(cif_string)
+                        obj_prefix = cls_.from_cif_data(
+                            Data(loops=[cif_loop]))
                         if obj_prefix is not None:
                             items.append(obj_prefix)
+                            l_position.append((1, i_loop))
                             flag = True
             if (not(flag)):
                 warn(f"Mandatory class: '{cls_.__name__:}' is not given.",
@@ -495,6 +547,9 @@ class DataN(object):
         if not(flag):
             return None
 
+        # items are kept in the order of the file
+        items = [items[ind] for ind in sorted(
+            range(len(items)), key=lambda ind: l_position[ind])]
         data_name = cif_data.name
         obj = cls(data_name=data_name, items=items)
         obj.form_object()
@@ -506,11 +561,61 @@ class DataN(object):
         if not(os.path.isfile(f_name)):
             raise UserWarning(f"File {f_name:} is not found.")
             return None
-        str_from_cif = str(to_data(f_name))
-        obj = cls.from_cif(str_from_cif)
+        obj = cls.from_cif_data(file_to_data(f_name))
         obj.file_input = f_name
         return obj
 
+    def get_snapshot(self, arrays) -> dict:
+        """
+        Give description of object for snapshot (see GlobalN.save_snapshot).
+
+        Parameters
+        ----------
+        arrays : SnapshotArrays
+            Arrays of snapshot.
+
+        Returns
+        -------
+        dict
+            Description of object.
+
+        """
+        d_snapshot = {"class": class_to_name(type(self)),
+                      "data_name": self.data_name,
+                      "items": [item.get_snapshot(arrays)
+                                for item in self.items]}
+        if type(self) is DataN:
+            d_snapshot["classes_mandatory"] = [
+                class_to_name(cls_) for cls_ in self.CLASSES_MANDATORY]
+            d_snapshot["classes_optional"] = [
+                class_to_name(cls_) for cls_ in self.CLASSES_OPTIONAL]
+            d_snapshot["prefix"] = self.PREFIX
+        return d_snapshot
+
+    @classmethod
+    def from_snapshot(cls, d_snapshot: dict, arrays):
+        """
+        Create object from its description in snapshot.
+
+        Constraints are not applied (form_object is not called): the object
+        is restored in the state it was saved.
+        """
+        items = [object_from_snapshot(d_item, arrays)
+                 for d_item in d_snapshot["items"]]
+        items = [item for item in items if item is not None]
+        if cls is DataN:
+            obj = cls.make_container(
+                tuple([name_to_class(name) for name in
+                       d_snapshot["classes_mandatory"]]),
+                tuple([name_to_class(name) for name in
+                       d_snapshot["classes_optional"]]),
+                d_snapshot["prefix"])
+            obj.data_name = d_snapshot["data_name"]
+            obj.add_items(items)
+        else:
+            obj = cls(data_name=d_snapshot["data_name"], items=items)
+        return obj
+
     def copy(self, data_name: str = ""):
         """Deep copy of object with new data name."""
         s_cif = self.to_cif()
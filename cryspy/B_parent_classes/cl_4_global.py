@@ -3,13 +3,17 @@ import os
 import os.path
 from warnings import warn
 from typing import Union, NoReturn
-from pycifstar import Global, to_global
+from pycifstar import Global, Data
 
 from cryspy.A_functions_base.function_1_markdown import md_to_html
+from cryspy.A_functions_base.function_1_cif import str_to_global, \
+    file_to_global, get_prefix_position
 from cryspy.A_functions_base.function_1_objects import \
     get_functions_of_objet, get_table_html_for_variables
+from cryspy.A_functions_base.function_1_snapshot import class_to_name, \
+    name_to_class, object_from_snapshot, save_snapshot, load_snapshot
 
-from cryspy.B_parent_classes.cl_1_item import ItemN
+from cryspy.B_parent_classes.cl_1_item import ItemN, get_new_version
 from cryspy.B_parent_classes.cl_2_loop import LoopN
 from cryspy.B_parent_classes.cl_3_data import DataN
 
@@ -171,6 +175,7 @@ class GlobalN(object):
                 if name_new in l_name:
                     self.items.pop(l_name.index(name))
                 self.items.append(value)
+                self.__dict__["VERSION"] = get_new_version()
                 flag_items, flag_direct = True, False
                 if name_new != name:
                     warn(f"Access to variable by '{name_new:}'.", UserWarning)
@@ -203,7 +208,8 @@ class GlobalN(object):
         s_name = set(l_name)
         if len(s_name) != len(l_name):
             warn("Double items were given.", UserWarning)
-            items_unique = [items[l_name.index(name)] for name in s_name]
+            items_unique = [items[l_name.index(name)] for name in
+                            dict.fromkeys(l_name)]
         else:
             items_unique = items
         l_ind_del = []
@@ -216,6 +222,7 @@ class GlobalN(object):
         for item in items_unique:
             if isinstance(item, self.CLASSES):
                 self.items.append(item)
+        self.__dict__["VERSION"] = get_new_version()
 
     @classmethod
     def make_container(cls, cls_mandatory, cls_optional, prefix):
@@ -293,6 +300,45 @@ class GlobalN(object):
                 break
         return flag
 
+    def get_version(self, names: tuple = None) -> int:
+        """
+        Give version of the global object.
+
+        The version is changed when any item is changed, added or removed.
+
+        Parameters
+        ----------
+        names : tuple, optional
+            Names of items (given by method get_name) which are taken into
+            account. By default all items are taken into account.
+
+        Returns
+        -------
+        int
+            Version.
+
+        """
+        version = self.__dict__.get("VERSION", 0)
+        for item in self.items:
+            if ((names is None) or (item.get_name() in names)):
+                version_item = item.get_version()
+                if version_item > version:
+                    version = version_item
+        return version
+
+    def get_versions(self) -> dict:
+        """
+        Give versions of items.
+
+        Returns
+        -------
+        dict
+            Versions {name: version} where name is given by method get_name
+            of item.
+
+        """
+        return {item.get_name(): item.get_version() for item in self.items}
+
     def get_variable_by_name(self, name: tuple) -> Union[float, int, str]:
         """
         Get variable given by name.
@@ -463,14 +509,17 @@ class GlobalN(object):
     @classmethod
     def from_cif(cls, string: str):
         """Generate object from string of CIF format."""
-        cif_global = Global()
-        flag = cif_global.take_from_string(string)
+        cif_global = str_to_global(string)
+        return cls.from_cif_global(cif_global)
 
+    @classmethod
+    def from_cif_global(cls, cif_global: Global):
+        """Generate object from global block already read from CIF."""
         cif_items = cif_global.items
         cif_loops = cif_global.loops
         cif_datas = cif_global.datas
 
-        items = []
+        items, l_position = [], []
         flag = True
         n_mandatory = len(cls.CLASSES_MANDATORY)
         for i_cls, cls_ in enumerate(cls.CLASSES):
@@ -483,23 +532,26 @@ class GlobalN(object):
                     obj_prefix = cls_.from_cif(cif_string)
                     if obj_prefix is not None:
                         items.append(obj_prefix)
+                        l_position.append((0, get_prefix_position(
+                            cif_items.names, prefix_cls)))
                         flag = True
             elif issubclass(cls_, LoopN):
                 prefix_cls = cls_.ITEM_CLASS.PREFIX
-                for cif_loop in cif_loops:
+                for i_loop, cif_loop in enumerate(cif_loops):
                     if cif_loop.is_prefix("_"+prefix_cls):
-                        cif_string = str(cif_loop)
-                        obj_prefix = cls_.from_cif(cif_string)
+                        obj_prefix = cls_.from_cif_data(
+                            Data(loops=[cif_loop]))
                         if obj_prefix is not None:
                             items.append(obj_prefix)
+                            l_position.append((1, i_loop))
                             flag = True
             elif issubclass(cls_, DataN):
                 prefix_cls = cls_.PREFIX
-                for cif_data in cif_datas:
-                    cif_string = str(cif_data)
-                    obj_prefix = cls_.from_cif(cif_string)
+                for i_data, cif_data in enumerate(cif_datas):
+                    obj_prefix = cls_.from_cif_data(cif_data)
                     if obj_prefix is not None:
                         items.append(obj_prefix)
+                        l_position.append((2, i_data))
                         flag = True
             if not(flag):
                 warn(f"Mandatory class: '{cls_.__name__:}' is not given.",
@@ -509,6 +561,9 @@ class GlobalN(object):
         if not(flag):
             return None
 
+        # items are kept in the order of the file
+        items = [items[ind] for ind in sorted(
+            range(len(items)), key=lambda ind: l_position[ind])]
         global_name = cif_global.name
         obj = cls(global_name=global_name, items=items)
         obj.form_object()
@@ -520,11 +575,111 @@ class GlobalN(object):
         if not(os.path.isfile(f_name)):
             raise UserWarning(f"File {f_name:} is not found.")
             return None
-        str_from_cif = str(to_global(f_name))
-        obj = cls.from_cif(str_from_cif)
+        obj = cls.from_cif_global(file_to_global(f_name))
         obj.file_input = f_name
         return obj
 
+    def get_snapshot(self, arrays) -> dict:
+        """
+        Give description of object for snapshot (see save_snapshot).
+
+        Parameters
+        ----------
+        arrays : SnapshotArrays
+            Arrays of snapshot.
+
+        Returns
+        -------
+        dict
+            Description of object.
+
+        """
+        d_snapshot = {"class": class_to_name(type(self)),
+                      "global_name": self.__dict__.get("global_name", None),
+                      "items": [item.get_snapshot(arrays)
+                                for item in self.items]}
+        if type(self) is GlobalN:
+            d_snapshot["classes_mandatory"] = [
+                class_to_name(cls_) for cls_ in self.CLASSES_MANDATORY]
+            d_snapshot["classes_optional"] = [
+                class_to_name(cls_) for cls_ in self.CLASSES_OPTIONAL]
+            d_snapshot["prefix"] = self.PREFIX
+        return d_snapshot
+
+    @classmethod
+    def from_snapshot(cls, d_snapshot: dict, arrays):
+        """
+        Create object from its description in snapshot.
+
+        Constraints are not applied (form_object is not called): the object
+        is restored in the state it was saved.
+        """
+        items = [object_from_snapshot(d_item, arrays)
+                 for d_item in d_snapshot["items"]]
+        items = [item for item in items if item is not None]
+        if cls is GlobalN:
+            obj = cls.make_container(
+                tuple([name_to_class(name) for name in
+                       d_snapshot["classes_mandatory"]]),
+                tuple([name_to_class(name) for name in
+                       d_snapshot["classes_optional"]]),
+                d_snapshot["prefix"])
+            obj.__dict__["global_name"] = d_snapshot["global_name"]
+            obj.add_items(items)
+        else:
+            obj = cls(global_name=d_snapshot["global_name"], items=items)
+        return obj
+
+    def save_snapshot(self, f_dir: str) -> NoReturn:
+        """
+        Save object in binary snapshot.
+
+        Snapshot is a directory with the file 'manifest.json' describing
+        the objects and the files '*.npy' keeping numerical columns of loops
+        and internal arrays of items as raw numpy buffers.
+
+        Parameters
+        ----------
+        f_dir : str
+            Directory of snapshot. It is created if it does not exist.
+
+        Returns
+        -------
+        NoReturn
+
+        Example
+        -------
+        >>> rhochi.save_snapshot("snapshot")
+        >>> rhochi_2 = RhoChi.load_snapshot("snapshot")
+        """
+        save_snapshot(self, f_dir)
+
+    @classmethod
+    def load_snapshot(cls, f_dir: str, mmap_mode: str = "c"):
+        """
+        Load object from binary snapshot (see save_snapshot).
+
+        Parameters
+        ----------
+        f_dir : str
+            Directory of snapshot.
+        mmap_mode : str, optional
+            Mode of memory-mapping of arrays (see numpy.load). The default
+            is "c" (copy-on-write): arrays can be changed, but the changes
+            are not written in snapshot. None gives arrays loaded in memory.
+
+        Returns
+        -------
+        GlobalN
+            Object.
+
+        """
+        obj = load_snapshot(f_dir, mmap_mode=mmap_mode)
+        if not(isinstance(obj, cls)):
+            raise UserWarning(f"Snapshot '{f_dir:}' keeps object of \
+'{type(obj).__name__:}' class.")
+        return obj
+
     def report(self):
         return ""
 
@@ -0,0 +1,186 @@
+"""ParameterVector class."""
+import numpy
+from typing import NoReturn, List, Union, Callable
+
+from cryspy.B_parent_classes.cl_1_item import ItemN
+from cryspy.B_parent_classes.cl_2_loop import LoopN
+
+
+class ParameterVector(object):
+    """
+    Refined parameters of object as a vector.
+
+    Names of variables are resolved once into handles pointing directly to
+    the objects keeping the parameters, so getting and setting of all
+    parameters does not walk over the tree of objects.
+
+    Attributes
+    ----------
+        - names
+        - handles
+
+    Methods
+    -------
+        - get_all()
+        - set_all(values)
+        - get_sigmas()
+        - set_sigmas(sigmas)
+        - evaluate_batch(values, func)
+
+    Parameters
+    ----------
+    obj : Union[ItemN, LoopN, DataN, GlobalN, list]
+        Object (or list of objects) keeping the parameters.
+    names : list, optional
+        Names of variables. By default it is obj.get_variable_names().
+
+    Example
+    -------
+    >>> parameter_vector = ParameterVector(rhochi)
+    >>> values = parameter_vector.get_all()
+    >>> parameter_vector.set_all(values*1.01)
+    """
+
+    def __init__(self, obj, names: List[tuple] = None) -> NoReturn:
+        if isinstance(obj, (list, tuple)):
+            l_obj = list(obj)
+        else:
+            l_obj = [obj, ]
+        if names is None:
+            names = []
+            for _obj in l_obj:
+                names.extend(_obj.get_variable_names())
+        self.names = list(names)
+        self.handles = [self.get_handle(l_obj, name) for name in self.names]
+
+    def __len__(self) -> int:
+        return len(self.handles)
+
+    def __repr__(self) -> str:
+        return f"<ParameterVector with {len(self):} parameters>"
+
+    @staticmethod
+    def get_handle(l_obj: list, name: tuple) -> tuple:
+        """
+        Find an object keeping the variable given by name.
+
+        Parameters
+        ----------
+        l_obj : list
+            Objects to look for the variable.
+        name : tuple
+            Name of variable.
+
+        Returns
+        -------
+        tuple
+            (item, attribute) if the variable is kept by an item, otherwise
+            (obj, short_name) and the variable is set by
+            obj.set_variable_by_name(short_name, value).
+        """
+        attr_name, index = name[-1]
+        for root in l_obj:
+            owner = root.get_variable_by_name(name[:-1])
+            if ((index is None) & isinstance(owner, ItemN)):
+                return (owner, attr_name)
+            elif ((index is not None) & isinstance(owner, LoopN)):
+                if owner.is_columnar():
+                    return (owner, name[-2:])
+                return (owner.items[index], attr_name)
+        for root in l_obj:
+            if root.get_variable_by_name(name) is not None:
+                return (root, name)
+        raise AttributeError(f"Variable '{name:}' is not found.")
+
+    def get_all(self) -> numpy.ndarray:
+        """Get values of all parameters."""
+        return numpy.array([self._get(handle) for handle in self.handles],
+                           dtype=float)
+
+    def set_all(self, values) -> NoReturn:
+        """
+        Set values of all parameters.
+
+        Parameters
+        ----------
+        values : numpy.ndarray
+            Values in the order of names.
+        """
+        if len(values) != len(self.handles):
+            raise ValueError(
+                f"Expected {len(self.handles):} values, got {len(values):}.")
+        for handle, value in zip(self.handles, values):
+            self._set(handle, float(value))
+
+    def get_sigmas(self) -> numpy.ndarray:
+        """Get sigmas of all parameters."""
+        return numpy.array([self._get(handle, "_sigma")
+                            for handle in self.handles], dtype=float)
+
+    def set_sigmas(self, sigmas) -> NoReturn:
+        """
+        Set sigmas of all parameters.
+
+        Parameters
+        ----------
+        sigmas : numpy.ndarray
+            Sigmas in the order of names.
+        """
+        if len(sigmas) != len(self.handles):
+            raise ValueError(
+                f"Expected {len(self.handles):} values, got {len(sigmas):}.")
+        for handle, sigma in zip(self.handles, sigmas):
+            self._set(handle, float(sigma), "_sigma")
+
+    def evaluate_batch(self, values, func: Callable) -> list:
+        """
+        Evaluate function at several sets of parameters.
+
+        The sets are given one by one and the parameters are restored at
+        the end. Only changed values give new versions of objects, so the
+        results cached on versions of objects not affected by the
+        parameters changed between neighbouring sets are used again.
+
+        Parameters
+        ----------
+        values : numpy.ndarray
+            (K, number of parameters) array of sets of parameters.
+        func : Callable
+            Function without arguments calculated for each set.
+
+        Returns
+        -------
+        list
+            K results of func.
+        """
+        values = numpy.atleast_2d(numpy.array(values, dtype=float))
+        values_0 = self.get_all()
+        l_res = []
+        try:
+            for values_k in values:
+                self.set_all(values_k)
+                l_res.append(func())
+        finally:
+            self.set_all(values_0)
+        return l_res
+
+    @staticmethod
+    def _get(handle: tuple, suffix: str = "") -> Union[float, None]:
+        obj, attr_name = handle
+        if isinstance(attr_name, tuple):
+            attr_t = attr_name[-1]
+            return obj.get_variable_by_name(
+                attr_name[:-1] + ((f"{attr_t[0]:}{suffix:}", attr_t[1]), ))
+        return getattr(obj, f"{attr_name:}{suffix:}")
+
+    @staticmethod
+    def _set(handle: tuple, value: float, suffix: str = "") -> NoReturn:
+        obj, attr_name = handle
+        if isinstance(attr_name, tuple):
+            attr_t = attr_name[-1]
+            obj.set_variable_by_name(
+                attr_name[:-1] + ((f"{attr_t[0]:}{suffix:}", attr_t[1]), ),
+                value)
+        else:
+            setattr(obj, f"{attr_name:}{suffix:}", value)
+
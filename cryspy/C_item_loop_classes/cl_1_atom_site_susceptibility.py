@@ -266,6 +266,67 @@ class AtomSiteSusceptibility(ItemN):
             self.__dict__["moment_13_constraint"] = True
             self.__dict__["moment_23_constraint"] = True
 
+    def calc_constraint_matrix(self, numb: int, cell,
+                               flag_moment: bool = False):
+        """
+        Give independent components of susceptibility (or moment) tensor.
+
+        The components (11, 22, 33, 12, 13, 23) are linear combinations of
+        the independent ones (see apply_chi_iso_constraint,
+        apply_moment_iso_constraint and apply_space_group_constraint).
+
+        Arguments
+        ---------
+            - numb is number of constraint of the atom site (see
+              AtomSiteL.calc_constr_number)
+            - cell
+            - flag_moment: components of moment tensor are given if True
+
+        Output
+        ------
+            - names of independent components
+            - matrix of shape (6, number of independent components)
+        """
+        if flag_moment:
+            prefix, tensor_type, type_iso, type_ani = \
+                "moment", "moment_type", "miso", "mani"
+        else:
+            prefix, tensor_type, type_iso, type_ani = \
+                "chi", "chi_type", "ciso", "cani"
+        names = tuple([f"{prefix:}_{_h:}" for _h in
+                       ("11", "22", "33", "12", "13", "23")])
+        if self.is_attribute(tensor_type):
+            tensor_type = getattr(self, tensor_type).lower()
+        else:
+            tensor_type = ""
+
+        if tensor_type.startswith(type_iso):
+            c_a = cell.cos_a
+            s_ib = cell.sin_ib
+            s_ig = cell.sin_ig
+            c_ib = cell.cos_ib
+            c_ig = cell.cos_ig
+            matrix = numpy.array([[1., 1., 1., c_ig, c_ib,
+                                   c_ib*c_ig-s_ib*s_ig*c_a]], dtype=float)
+            return names[:1], matrix.transpose()
+        elif tensor_type.startswith(type_ani):
+            sigma_i = (0., 0., 0., 0., 0., 0.)
+            ref_i = (False, False, False, False, False, False)
+            constr_i = vibration_constraints(
+                numb, (1., 1., 1., 1., 1., 1.), sigma_i, ref_i)[3]
+            l_name, l_column = [], []
+            for i_comp, (name, constr) in enumerate(zip(names, constr_i)):
+                if constr:
+                    continue
+                param_i = numpy.zeros(shape=(6, ), dtype=float)
+                param_i[i_comp] = 1.
+                l_column.append(vibration_constraints(
+                    numb, tuple(param_i), sigma_i, ref_i)[0])
+                l_name.append(name)
+            matrix = numpy.array(l_column, dtype=float).reshape(-1, 6)
+            return tuple(l_name), matrix.transpose()
+        return names, numpy.eye(6, dtype=float)
+
     def calc_main_axes_of_magnetization_ellipsoid(self, cell):
         """Susceptibility along the main axes of magnetization ellipsoid.
 
@@ -327,6 +388,7 @@ class AtomSiteSusceptibilityL(LoopN):
         - apply_space_group_constraint
         - apply_chi_iso_constraint
         - apply_moment_iso_constraint
+        - calc_constraint_matrix
     """
 
     ITEM_CLASS = AtomSiteSusceptibility
@@ -380,6 +442,38 @@ class AtomSiteSusceptibilityL(LoopN):
             l_rot_matrix.append(rot_matrix)
         return l_moments, l_moments_sigma, l_rot_matrix
 
+    def calc_constraint_matrix(self, atom_site, space_group, cell,
+                               flag_moment: bool = False):
+        """
+        Give independent components of susceptibility (or moment) tensors
+        of all atom sites.
+
+        Output
+        ------
+            - l_index_name is list of (index of item, name of component)
+              for independent components
+            - matrix of shape (number of items, 6, number of independent
+              components) giving the components (11, 22, 33, 12, 13, 23)
+              of tensors
+        """
+        l_numb = atom_site.calc_constr_number(space_group)
+        label = atom_site.label
+        l_index_name, l_matrix = [], []
+        for i_item, item in enumerate(self.items):
+            numb = l_numb[label.index(item.label)]
+            names, matrix = item.calc_constraint_matrix(
+                numb, cell, flag_moment=flag_moment)
+            l_index_name.extend([(i_item, name) for name in names])
+            l_matrix.append(matrix)
+        res = numpy.zeros(shape=(len(self.items), 6, len(l_index_name)),
+                          dtype=float)
+        i_begin = 0
+        for i_item, matrix in enumerate(l_matrix):
+            i_end = i_begin + matrix.shape[1]
+            res[i_item, :, i_begin:i_end] = matrix
+            i_begin = i_end
+        return l_index_name, res
+
 
 # s_cont = """
 #  loop_
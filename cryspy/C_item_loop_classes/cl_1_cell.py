@@ -4,7 +4,10 @@ import warnings
 from cryspy.A_functions_base.function_1_atomic_vibrations import \
     apply_constraint_on_cell_by_type_cell
 from cryspy.A_functions_base.function_2_crystallography_base import \
-    calc_sthovl_by_hkl_abc_cosines, ortogonalize_matrix
+    calc_sthovl_by_hkl_abc_cosines, ortogonalize_matrix, \
+    calc_hkl_by_symmetry, calc_hkl_by_laue_class
+from cryspy.A_functions_base.function_1_reflection_cache import \
+    get_reflection_cache, calc_symmetry_key, select_reflections
 from cryspy.B_parent_classes.cl_1_item import ItemN
 from cryspy.B_parent_classes.cl_2_loop import LoopN
 
@@ -371,64 +374,76 @@ class Cell(ItemN):
         """
         A list of reflections hkl for cell in the range sthovl_min, sthovl_max
         taking into account the space group
-        """
-        lhkl, lmult = [], []
-        l_hklres = []
 
-        hmax = int(2.*self.length_a*sthovl_max)
-        kmax = int(2.*self.length_b*sthovl_max)
-        lmax = int(2.*self.length_c*sthovl_max)
-        hmin, kmin, lmin = -1*hmax, -1*kmax, -1*lmax
+        Only the reciprocal asymmetric unit of the Laue class of the space
+        group is enumerated (see calc_hkl_by_laue_class).
 
-        hmin = 0
-        shift = space_group.shift
+        The lists are kept in the process-wide reflection cache (see
+        function_1_reflection_cache). The list is calculated in the range
+        widened by the margin of cache, so at refinement of the cell
+        parameters only sin(theta)/lambda of cached reflections is
+        recalculated while the cell stays within the margin.
+        """
         r_s_g_s = space_group.reduced_space_group_symop
-        orig_x, orig_y, orig_z = zip(*shift)
-        np_orig_x = numpy.array(orig_x, dtype=float)
-        np_orig_y = numpy.array(orig_y, dtype=float)
-        np_orig_z = numpy.array(orig_z, dtype=float)
-
-        r_11 = numpy.array(r_s_g_s.r_11, dtype=float)
-        r_12 = numpy.array(r_s_g_s.r_12, dtype=float)
-        r_13 = numpy.array(r_s_g_s.r_13, dtype=float)
-        r_21 = numpy.array(r_s_g_s.r_21, dtype=float)
-        r_22 = numpy.array(r_s_g_s.r_22, dtype=float)
-        r_23 = numpy.array(r_s_g_s.r_23, dtype=float)
-        r_31 = numpy.array(r_s_g_s.r_31, dtype=float)
-        r_32 = numpy.array(r_s_g_s.r_32, dtype=float)
-        r_33 = numpy.array(r_s_g_s.r_33, dtype=float)
-
-        for h in range(hmin, hmax+1, 1):
-            for k in range(kmin, kmax+1, 1):
-                for l in range(lmin, lmax+1, 1):
-                    flag=(abs(sum(numpy.exp(2.*numpy.pi*1j*(np_orig_x*h+np_orig_y*k+np_orig_z*l))))>0.00001)
-                    if (flag):
-                        lhkls = [(_1, _2, _3) for _1, _2, _3 in zip(h*r_11+k*r_21+l*r_31, h*r_12+k*r_22+l*r_32, h*r_13+k*r_23+l*r_33)]
-                        lhkls.extend([(-hkl[0],-hkl[1],-hkl[2]) for hkl in lhkls])
-                        lhkls.sort(key=lambda x:10000*x[0]+100*x[1]+x[2])
-                        if (not(lhkls[-1] in lhkl)):
-                            lhkl.append(lhkls[-1])
-                            lmult.append(len(set(lhkls)))
-
-        l_hklsthovl=[(hkl, self.calc_sthovl(hkl[0], hkl[1], hkl[2]), mult) for hkl, mult in zip(lhkl, lmult)]
-        l_hklsthovl.sort(key=lambda x: x[1])
-        l_hklres = [hklsthovl[0] for hklsthovl in l_hklsthovl if ((hklsthovl[1]>sthovl_min) & (hklsthovl[1]<sthovl_max))]
-        l_multres = [hklsthovl[2] for hklsthovl in l_hklsthovl if ((hklsthovl[1]>sthovl_min) & (hklsthovl[1]<sthovl_max))]
-
-        h = numpy.array([hh[0] for hh in l_hklres], dtype=int)
-        k = numpy.array([hh[1] for hh in l_hklres], dtype=int)
-        l = numpy.array([hh[2] for hh in l_hklres], dtype=int)
-        mult = numpy.array(l_multres, dtype=int)
-        return h, k, l, mult
+        r_ij = (r_s_g_s.r_11, r_s_g_s.r_12, r_s_g_s.r_13,
+                r_s_g_s.r_21, r_s_g_s.r_22, r_s_g_s.r_23,
+                r_s_g_s.r_31, r_s_g_s.r_32, r_s_g_s.r_33)
+        shift_i = tuple(zip(*space_group.shift))
+
+        reflection_cache = get_reflection_cache()
+        key = ("hkl", calc_symmetry_key(r_ij, shift_i))
+        cell_parameters = self.get_cell_parameters()
+        res = reflection_cache.get(key, cell_parameters, sthovl_min,
+                                   sthovl_max, func_sthovl=self.calc_sthovl)
+        if res is not None:
+            return res
+
+        window_min, window_max = reflection_cache.calc_superset_range(
+            sthovl_min, sthovl_max)
+        hmax = int(2.*self.length_a*window_max)
+        kmax = int(2.*self.length_b*window_max)
+        lmax = int(2.*self.length_c*window_max)
+
+        if space_group.is_attribute("laue_class"):
+            h, k, l, mult = calc_hkl_by_laue_class(
+                space_group.laue_class, hmax, kmax, lmax, r_ij, shift_i)
+        else:
+            h, k, l, mult = calc_hkl_by_symmetry(
+                hmax, kmax, lmax, r_ij, shift_i)
+
+        sthovl = self.calc_sthovl(h, k, l)
+        arg_sort = numpy.argsort(sthovl, kind="stable")
+        flag = numpy.logical_and(sthovl[arg_sort] > window_min,
+                                 sthovl[arg_sort] < window_max)
+        arg_sort = arg_sort[flag]
+        l_array = (h[arg_sort], k[arg_sort], l[arg_sort], mult[arg_sort])
+        reflection_cache.put(key, cell_parameters, window_min, window_max,
+                             sthovl[arg_sort], l_array)
+        return select_reflections(sthovl[arg_sort], l_array, sthovl_min,
+                                  sthovl_max)
 
     def calc_hkl_in_range(self, sthovl_min, sthovl_max):
         """
         Give a list of reflections hkl for cell in the range.
         sthovl_min, sthovl_max
+
+        The lists are kept in the process-wide reflection cache (see
+        function_1_reflection_cache).
         """
-        h_max = int(2.*self.length_a*sthovl_max)
-        k_max = int(2.*self.length_b*sthovl_max)
-        l_max = int(2.*self.length_c*sthovl_max)
+        reflection_cache = get_reflection_cache()
+        key = ("hkl_in_range", )
+        cell_parameters = self.get_cell_parameters()
+        res = reflection_cache.get(key, cell_parameters, sthovl_min,
+                                   sthovl_max, func_sthovl=self.calc_sthovl,
+                                   flag_strict=False)
+        if res is not None:
+            return res
+
+        window_min, window_max = reflection_cache.calc_superset_range(
+            sthovl_min, sthovl_max)
+        h_max = int(2.*self.length_a*window_max)
+        k_max = int(2.*self.length_b*window_max)
+        l_max = int(2.*self.length_c*window_max)
         h_min, k_min, l_min = -1*h_max, -1*k_max, -1*l_max
 
         np_h = numpy.array(range(h_min, h_max+1, 1), dtype=int)
@@ -437,8 +452,8 @@ class Cell(ItemN):
         h_3d, k_3d, l_3d = numpy.meshgrid(np_h, np_k, np_l, indexing="ij")
 
         sthovl_3d = self.calc_sthovl(h_3d, k_3d, l_3d)
-        flag_1 = sthovl_3d >= sthovl_min
-        flag_2 = sthovl_3d <= sthovl_max
+        flag_1 = sthovl_3d >= window_min
+        flag_2 = sthovl_3d <= window_max
         flag_12 = numpy.logical_and(flag_1, flag_2)
 
         h = h_3d[flag_12]
@@ -446,8 +461,17 @@ class Cell(ItemN):
         l = l_3d[flag_12]
         mult = numpy.ones(h.size, dtype=int)
         sthovl = sthovl_3d[flag_12]
-        arg_sort = numpy.argsort(sthovl)
-        return h[arg_sort], k[arg_sort], l[arg_sort], mult[arg_sort] 
+        arg_sort = numpy.argsort(sthovl, kind="stable")
+        l_array = (h[arg_sort], k[arg_sort], l[arg_sort], mult[arg_sort])
+        reflection_cache.put(key, cell_parameters, window_min, window_max,
+                             sthovl[arg_sort], l_array)
+        return select_reflections(sthovl[arg_sort], l_array, sthovl_min,
+                                  sthovl_max, flag_strict=False)
+
+    def get_cell_parameters(self) -> tuple:
+        """Give (a, b, c, alpha, beta, gamma) of the cell."""
+        return (self.length_a, self.length_b, self.length_c,
+                self.angle_alpha, self.angle_beta, self.angle_gamma)
 
     def calc_position_by_coordinate(self, x ,y, z):
         """
@@ -1,7 +1,6 @@
 from typing import NoReturn
 import math
 import numpy
-import matplotlib.pyplot as plt
 
 from cryspy.B_parent_classes.cl_1_item import ItemN
 from cryspy.B_parent_classes.cl_2_loop import LoopN
@@ -90,6 +89,20 @@ class DiffrnReflnL(LoopN):
         self.__dict__["items"] = []
         self.__dict__["loop_name"] = loop_name
 
+    def calc_orbit_index(self, crystal):
+        """
+        Give orbit index of measured reflections for the crystal.
+
+        Symmetry-equivalent and repeated reflections are grouped in orbits
+        (see Crystal.calc_orbit_index), so structure factors are calculated
+        only for unique orbits by Crystal.calc_f_nucl_by_orbit and
+        Crystal.calc_susceptibility_moment_tensor_by_orbit.
+        """
+        return crystal.calc_orbit_index(
+            numpy.array(self.index_h, dtype=int),
+            numpy.array(self.index_k, dtype=int),
+            numpy.array(self.index_l, dtype=int))
+
     def report(self):
         return self.report_agreement_factor_exp() + "\n" + self.report_chi_sq_exp()
 
@@ -261,6 +274,7 @@ class DiffrnReflnL(LoopN):
     def plot_fr_vs_fr_calc(self):
         """Plot experimental fr vs. fr_calc
         """
+        import matplotlib.pyplot as plt
         if not(self.is_attribute("fr") & self.is_attribute("fr_sigma") &
                self.is_attribute("fr_calc")):
             return 
@@ -304,6 +318,7 @@ class DiffrnReflnL(LoopN):
     def plot_asymmetry_vs_asymmetry_calc(self):
         """Plot experimental fr vs. fr_calc
         """
+        import matplotlib.pyplot as plt
         if not(self.is_attribute("fr") & self.is_attribute("fr_sigma") &
                self.is_attribute("fr_calc")):
             return 
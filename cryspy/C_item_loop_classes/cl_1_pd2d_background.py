@@ -1,10 +1,8 @@
 """Pd2dBackground class."""
 import numpy
-import scipy
-import scipy.interpolate
 from typing import NoReturn, Union
 from cryspy.A_functions_base.function_1_strings import \
-    string_to_value_error, value_error_to_string
+    string_to_value_error, ttheta_phi_intensity_to_string
 from cryspy.B_parent_classes.cl_1_item import ItemN
 
 
@@ -29,6 +27,7 @@ class Pd2dBackground(ItemN):
         - get_variable_names
         - get_variable_by_name, set_variable_by_name
         - form_ttheta_phi_intensity
+        - calc_interpolation_weights
         - interpolate_by_points
     """
 
@@ -111,34 +110,11 @@ class Pd2dBackground(ItemN):
         """Form 2theta_phi_intensity from internal attributes."""
         if ((self.phi is not None) & (self.ttheta is not None) &
                 (self.intensity is not None)):
-            ls_out = []
-            ls_out.append(f"{len(self.phi):12} " + " ".join(
-                [f"{_:6.2f}      " for _ in self.ttheta]))
-            ll_intensity = self.intensity
-            ll_intensity_sigma = self.intensity_sigma
-            ll_intensity_refinement = self.intensity_refinement
-
-            ll_intensity = [[ll_intensity[_2][_1] for _2 in
-                             range(len(ll_intensity))] for _1 in
-                            range(len(ll_intensity[0]))]
-            ll_intensity_sigma = [[ll_intensity_sigma[_2][_1] for _2 in
-                                   range(len(ll_intensity_sigma))] for _1 in
-                                  range(len(ll_intensity_sigma[0]))]
-            ll_intensity_refinement = [[ll_intensity_refinement[_2][_1] for _2
-                                        in range(len(ll_intensity_refinement))]
-                                       for _1 in range(len(
-                                               ll_intensity_refinement[0]))]
-            for phi, l_int, l_int_sig, l_int_ref in \
-                zip(self.phi, ll_intensity, ll_intensity_sigma,
-                    ll_intensity_refinement):
-                ls_out.append("{:12.2f} ".format(phi) +
-                              " ".join(
-                                  [f"{value_error_to_string(int, int_sig):12}"
-                                   if int_ref else f"{int:12}"
-                                   for int, int_sig, int_ref in
-                                   zip(l_int, l_int_sig, l_int_ref)]))
-
-            self.__dict__["ttheta_phi_intensity"] = "\n".join(ls_out)
+            self.__dict__["ttheta_phi_intensity"] = \
+                ttheta_phi_intensity_to_string(
+                    self.ttheta, self.phi, self.intensity,
+                    intensity_sigma=self.intensity_sigma,
+                    intensity_refinement=self.intensity_refinement)
 
     def get_variable_names(self) -> list:
         """
@@ -204,24 +180,33 @@ class Pd2dBackground(ItemN):
         np_val = getattr(self, attr_name)
         np_val[ind_ij] = value
 
+    def calc_interpolation_weights(self, tth, phi):
+        """
+        Give weights of interpolation by the points of background.
+
+        The interpolated intensity is weight_tth * intensity * weight_phi^T.
+        It is bilinear inside of the grid of background, outside of the grid
+        the intensity of the nearest edge is taken.
+
+        Output
+        ------
+            - weight_tth: 2D array (tth.size, size of ttheta of background)
+            - weight_phi: 2D array (phi.size, size of phi of background)
+        """
+        weight_tth = calc_linear_interpolation_weights(
+            numpy.array(self.ttheta, dtype=float), tth)
+        weight_phi = calc_linear_interpolation_weights(
+            numpy.array(self.phi, dtype=float), phi)
+        return weight_tth, weight_phi
+
     def interpolate_by_points(self, tth, phi):
         """Interpolate by points."""
-        l_phi_b = self.phi
-        l_tth_b = self.ttheta
-        ll_int_b = self.intensity
-        ll_int_b = [[float(ll_int_b[_2][_1]) for _2 in range(len(ll_int_b))]
-                    for _1 in range(len(ll_int_b[0]))]
-        if len(l_tth_b) == 0:
-            int_2d = numpy.zeros((tth.size, phi.size), dtype=float)
-        else:
-            phi_b = numpy.array(l_phi_b, dtype=float)
-            tth_b = numpy.array(l_tth_b, dtype=float)
-            int_b = numpy.array(ll_int_b, dtype=float)
-            func = scipy.interpolate.interp2d(tth_b, phi_b, int_b)
-            # tth_2d, phi_2d = numpy.meshgrid(tth, phi, indexing="ij")
-            int_2d = func(tth, phi)
-            int_2d = int_2d.transpose()
-        return int_2d
+        if len(self.ttheta) == 0:
+            return numpy.zeros((tth.size, phi.size), dtype=float)
+        weight_tth, weight_phi = self.calc_interpolation_weights(tth, phi)
+        int_b = numpy.array(self.intensity, dtype=float)
+        return numpy.matmul(numpy.matmul(weight_tth, int_b),
+                            weight_phi.transpose())
 
     def is_variables(self):
         """
@@ -229,6 +214,19 @@ class Pd2dBackground(ItemN):
         """
         return numpy.any(self.intensity_refinement)
 
+
+def calc_linear_interpolation_weights(x_b, x):
+    """
+    Give matrix (x.size, x_b.size) of weights of linear interpolation by
+    the nodes x_b. Outside of the nodes the value of the nearest one is taken.
+    """
+    arg_sort = numpy.argsort(x_b, kind="stable")
+    weight = numpy.zeros((numpy.size(x), x_b.size), dtype=float)
+    for i_node, unit in zip(arg_sort, numpy.eye(x_b.size)):
+        weight[:, i_node] = numpy.interp(x, x_b[arg_sort], unit)
+    return weight
+
+
 # s_cont = """
 #   _pd2d_background_2theta_phi_intensity
 #   ;
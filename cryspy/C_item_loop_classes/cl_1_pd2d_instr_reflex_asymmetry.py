@@ -1,6 +1,9 @@
 import numpy
 from typing import NoReturn
 
+from cryspy.A_functions_base.function_2_powder_profile import \
+    calc_asymmetry_by_z
+
 from cryspy.B_parent_classes.cl_1_item import ItemN
 from cryspy.B_parent_classes.cl_2_loop import LoopN
 
@@ -101,49 +104,11 @@ class Pd2dInstrReflexAsymmetry(ItemN):
         
         IMPORTANT: THERE IS MISTAKE (look page 54 in FullProf Manual)
         """
-        tth_2d, tth_hkl_2d = numpy.meshgrid(tth, tth_hkl, indexing="ij")
-        np_zero = numpy.zeros(tth_2d.shape, dtype = float)
-        np_one = numpy.ones(tth_2d.shape, dtype = float)
-        val_1, val_2 = np_zero, np_zero
-        
-        z_2d = (tth_2d - tth_hkl_2d)/fwhm[numpy.newaxis, :]
-        
-        
-        p1, p2 = float(self.p1), float(self.p2)
-        p3, p4 = float(self.p3), float(self.p4)
-        flag_1, flag_2 = False, False
-        if ((p1!= 0.)|(p3!= 0.)):
-            flag_1 = True
-            fa = self._func_fa(z_2d)
-        if ((p2!= 0.)|(p4!= 0.)):
-            flag_2 = True
-            fb = self._func_fb(z_2d)
-            
-        flag_3, flag_4 = False, False
-        if ((p1!= 0.)|(p2!= 0.)):
-            if flag_1:
-                val_1 += p1*fa
-                flag_3 = True
-            if flag_2:
-                val_1 += p2*fb
-                flag_3 = True
-            if flag_3:
-                c1 = 1./numpy.tanh(0.5*tth_hkl)
-                val_1 *= c1[numpy.newaxis, :]
-
-        if ((p3!= 0.)|(p4!= 0.)):
-            if flag_1:
-                val_2 += p3*fa
-                flag_4 = True
-            if flag_2:
-                val_2 += p4*fb
-                flag_4 = True
-            if flag_4:
-                c2 = 1./numpy.tanh(tth_hkl)
-                val_2 *= c2[numpy.newaxis, :]
-
-        asymmetry_2d = np_one+val_1+val_2
-        return asymmetry_2d
+        z_2d = (tth[:, numpy.newaxis] - tth_hkl[numpy.newaxis, :]) / \
+            fwhm[numpy.newaxis, :]
+        return calc_asymmetry_by_z(
+            z_2d, tth_hkl[numpy.newaxis, :],
+            (self.p1, self.p2, self.p3, self.p4))
     
 
 
@@ -1,6 +1,8 @@
-import numpy
 from typing import NoReturn
 
+from cryspy.A_functions_base.function_2_powder_profile import \
+    calc_resolution_pd
+
 from cryspy.B_parent_classes.cl_1_item import ItemN
 from cryspy.B_parent_classes.cl_2_loop import LoopN
 
@@ -67,69 +69,6 @@ class Pd2dInstrResolution(ItemN):
         for key, attr in kwargs.items():
             setattr(self, key, attr)
 
-
-    def _calc_tancos(self, th_hkl):
-        """
-        tth_hkl in radianas
-        calculate tangenth (theta)
-        """
-        self.t_th = numpy.tan(th_hkl)
-        self.t_th_sq = self.t_th**2
-        res = numpy.cos(th_hkl)
-
-        self.c_th = res
-        self.ic_th = 1./res
-
-    def _calc_hg(self, phase_igsize: float = 0., phase_u: float = 0.,
-                 phase_v: float = 0., phase_w: float = 0.):
-        """
-        ttheta in radians, could be array
-        gauss size
-        """
-        u, v = float(self.u)+phase_u, float(self.v)+phase_v
-        w = float(self.w)+phase_w
-        res_sq = (u*self.t_th_sq + v*self.t_th + w + 
-                  phase_igsize*self.ic_th**2)
-        self.hg = numpy.sqrt(res_sq)
-
-    def _calc_hl(self, phase_x: float = 0., phase_y: float = 0.):
-        """
-        ttheta in radians, could be array
-        lorentz site
-        """
-        x, y = float(self.x)+phase_x, float(self.y)+phase_y
-        self.hl = x*self.t_th + y*self.ic_th
-
-    def _calc_hpveta(self):
-        """
-        ttheta in radians, could be array
-        pseudo-Voight function
-        """
-        hg = self.hg
-        hl = self.hl
-
-        hg_2, hl_2 = hg**2, hl**2
-        hg_3, hl_3 = hg_2*hg, hl_2*hl
-        hg_4, hl_4 = hg_3*hg, hl_3*hl
-        hg_5, hl_5 = hg_4*hg, hl_4*hl
-        c_2, c_3, c_4, c_5 = 2.69269, 2.42843, 4.47163, 0.07842
-        hpv = (hg_5 + c_2*hg_4*hl + c_3*hg_3*hl_2 + 
-                       c_4*hg_2*hl_3 + c_5*hg*hl_4 + hl_5)**0.2
-        hh = hl*1./hpv
-        self.hpv = hpv 
-        self.eta = 1.36603*hh - 0.47719*hh**2 + 0.11116*hh**3
-
-    def _calc_agbg(self):
-        hpv = self.hpv
-
-        self.ag = (2./hpv)*(numpy.log(2.)/numpy.pi)**0.5
-        self.bg = 4*numpy.log(2)/(hpv**2)
-        
-    def _calc_albl(self):
-        hpv = self.hpv
-        self.al = 2./(numpy.pi*hpv )
-        self.bl = 4./(hpv**2)
-    
     def calc_resolution(
             self, tth_hkl, phase_igsize: float = 0., phase_u: float = 0.,
             phase_v: float = 0., phase_w: float = 0., phase_x: float = 0.,
@@ -138,24 +77,9 @@ class Pd2dInstrResolution(ItemN):
 Calculate parameters for tth
 tth_hkl in degrees
         """
-        self._calc_tancos(0.5*tth_hkl*numpy.pi/180.)
-        self._calc_hg(phase_igsize=phase_igsize, phase_u=phase_u,
-                      phase_v=phase_v, phase_w=phase_w)
-        self._calc_hl(phase_x=phase_x, phase_y=phase_y)
-        self._calc_hpveta()
-        self._calc_agbg()
-        self._calc_albl()
-
-        a_g = self.ag  
-        b_g = self.bg  
-        a_l = self.al  
-        b_l = self.bl 
-        h_g = self.hg  
-        h_l = self.hl 
-        h_pv = self.hpv 
-        eta = self.eta
-        
-        return h_pv, eta, h_g, h_l, a_g, b_g, a_l, b_l
+        return calc_resolution_pd(
+            tth_hkl, (self.u, self.v, self.w, self.x, self.y),
+            (phase_igsize, phase_u, phase_v, phase_w, phase_x, phase_y))
 
 
 class Pd2dInstrResolutionL(LoopN):
@@ -1,10 +1,10 @@
 from typing import NoReturn
 import numpy
-import matplotlib
-import matplotlib.pyplot as plt
 
 from cryspy.A_functions_base.function_1_gamma_nu import \
     recal_int_to_gammanu_grid
+from cryspy.A_functions_base.function_1_strings import \
+    ttheta_phi_intensity_to_string
 
 from cryspy.B_parent_classes.cl_1_item import ItemN
 
@@ -139,46 +139,30 @@ class Pd2dMeas(ItemN):
     def form_ttheta_phi_intensity_up(self) -> bool:
         if (self.is_attribute("phi") & self.is_attribute("ttheta") &
             self.is_attribute("intensity_up")):
-            ls_out = []
-            ls_out.append("{:12} ".format(len(self.phi)) + " ".join(["{:6.2f}      ".format(_) for _ in self.ttheta]))
-            ll_intensity = self.intensity_up
-            ll_intensity = [[ll_intensity[_2][_1] for _2 in range(len(ll_intensity))] for _1 in range(len(ll_intensity[0]))]
-            for phi, l_intensity in zip(self.phi, ll_intensity):
-                ls_out.append("{:12.2f} ".format(phi) + " ".join(["{:12}".format(_) for _ in l_intensity]))
-            self.__dict__["ttheta_phi_intensity_up"] = "\n".join(ls_out)
+            self.__dict__["ttheta_phi_intensity_up"] = \
+                ttheta_phi_intensity_to_string(
+                    self.ttheta, self.phi, self.intensity_up)
 
     def form_ttheta_phi_intensity_up_sigma(self) -> bool:
         if (self.is_attribute("phi") & self.is_attribute("ttheta") &
             self.is_attribute("intensity_up_sigma")):
-            ls_out = []
-            ls_out.append("{:12} ".format(len(self.phi)) + " ".join(["{:6.2f}      ".format(_) for _ in self.ttheta]))
-            ll_intensity = self.intensity_up_sigma
-            ll_intensity = [[ll_intensity[_2][_1] for _2 in range(len(ll_intensity))] for _1 in range(len(ll_intensity[0]))]
-            for phi, l_intensity in zip(self.phi, ll_intensity):
-                ls_out.append("{:12.2f} ".format(phi) + " ".join(["{:12}".format(_) for _ in l_intensity]))
-            self.__dict__["ttheta_phi_intensity_up_sigma"] = "\n".join(ls_out)
+            self.__dict__["ttheta_phi_intensity_up_sigma"] = \
+                ttheta_phi_intensity_to_string(
+                    self.ttheta, self.phi, self.intensity_up_sigma)
 
     def form_ttheta_phi_intensity_down(self) -> bool:
         if (self.is_attribute("phi") & self.is_attribute("ttheta") &
             self.is_attribute("intensity_down")):
-            ls_out = []
-            ls_out.append("{:12} ".format(len(self.phi)) + " ".join(["{:6.2f}      ".format(_) for _ in self.ttheta]))
-            ll_intensity = self.intensity_down
-            ll_intensity = [[ll_intensity[_2][_1] for _2 in range(len(ll_intensity))] for _1 in range(len(ll_intensity[0]))]
-            for phi, l_intensity in zip(self.phi, ll_intensity):
-                ls_out.append("{:12.2f} ".format(phi) + " ".join(["{:12}".format(_) for _ in l_intensity]))
-            self.__dict__["ttheta_phi_intensity_down"] = "\n".join(ls_out)
+            self.__dict__["ttheta_phi_intensity_down"] = \
+                ttheta_phi_intensity_to_string(
+                    self.ttheta, self.phi, self.intensity_down)
 
     def form_ttheta_phi_intensity_down_sigma(self) -> bool:
         if (self.is_attribute("phi") & self.is_attribute("ttheta") &
             self.is_attribute("intensity_down_sigma")):
-            ls_out = []
-            ls_out.append("{:12} ".format(len(self.phi)) + " ".join(["{:6.2f}      ".format(_) for _ in self.ttheta]))
-            ll_intensity = self.intensity_down_sigma
-            ll_intensity = [[ll_intensity[_2][_1] for _2 in range(len(ll_intensity))] for _1 in range(len(ll_intensity[0]))]
-            for phi, l_intensity in zip(self.phi, ll_intensity):
-                ls_out.append("{:12.2f} ".format(phi) + " ".join(["{:12}".format(_) for _ in l_intensity]))
-            self.__dict__["ttheta_phi_intensity_down_sigma"] = "\n".join(ls_out)
+            self.__dict__["ttheta_phi_intensity_down_sigma"] = \
+                ttheta_phi_intensity_to_string(
+                    self.ttheta, self.phi, self.intensity_down_sigma)
 
     def recalc_to_gamma_nu_grid(self):
         l_tth_grid = numpy.array(self.ttheta)*numpy.pi/180.
@@ -211,6 +195,8 @@ class Pd2dMeas(ItemN):
         return [self.plot_projection_sum(), self.plot_projection_diff()]
 
     def plot_ttheta_phi(self):
+        import matplotlib
+        import matplotlib.pyplot as plt
         if not(self.is_attribute("ttheta") & self.is_attribute("phi") &
                self.is_attribute("intensity_up") & 
                self.is_attribute("intensity_down")):
@@ -255,6 +241,7 @@ class Pd2dMeas(ItemN):
     def plot_projection_sum(self):
         """Plot experimental unpolarized intensity vs. 2 theta (degrees)
         """
+        import matplotlib.pyplot as plt
         if not(self.is_attribute("ttheta") & self.is_attribute("intensity_up") & 
                self.is_attribute("intensity_up_sigma") &
                self.is_attribute("intensity_down") & 
@@ -288,6 +275,7 @@ class Pd2dMeas(ItemN):
     def plot_projection_diff(self):
         """Plot experimental polarized intensity vs. 2 theta (degrees)
         """
+        import matplotlib.pyplot as plt
         if not(self.is_attribute("ttheta") & self.is_attribute("intensity_up") & 
                self.is_attribute("intensity_up_sigma") &
                self.is_attribute("intensity_down") & 
@@ -320,6 +308,8 @@ class Pd2dMeas(ItemN):
         return (fig, ax)
 
     def plot_gamma_nu(self):
+        import matplotlib
+        import matplotlib.pyplot as plt
         if not(self.is_attribute("ttheta") & self.is_attribute("phi") &
                self.is_attribute("intensity_up") & 
                self.is_attribute("intensity_down")):
@@ -1,10 +1,10 @@
 from typing import NoReturn
 import numpy
-import matplotlib
-import matplotlib.pyplot as plt
 
 from cryspy.A_functions_base.function_1_gamma_nu import \
     recal_int_to_gammanu_grid
+from cryspy.A_functions_base.function_1_strings import \
+    ttheta_phi_intensity_to_string
 
 from cryspy.B_parent_classes.cl_1_item import ItemN
 
@@ -167,94 +167,58 @@ class Pd2dProc(ItemN):
 
     def form_ttheta_phi_intensity_up_net(self) -> bool:
         if ((self.phi is not None) & (self.ttheta is not None) & (self.intensity_up_net is not None)):
-            ls_out = []
-            ls_out.append("{:12} ".format(len(self.phi)) + " ".join(["{:6.2f}      ".format(_) for _ in self.ttheta]))
-            ll_intensity = self.intensity_up_net
-            ll_intensity = [[ll_intensity[_2][_1] for _2 in range(len(ll_intensity))] for _1 in range(len(ll_intensity[0]))]
-            for phi, l_intensity in zip(self.phi, ll_intensity):
-                ls_out.append("{:12.2f} ".format(phi) + " ".join(["{:12}".format(_) for _ in l_intensity]))
-            self.__dict__["ttheta_phi_intensity_up_net"] = "\n".join(ls_out)
+            self.__dict__["ttheta_phi_intensity_up_net"] = \
+                ttheta_phi_intensity_to_string(
+                    self.ttheta, self.phi, self.intensity_up_net)
 
     def form_ttheta_phi_intensity_down_net(self) -> bool:
         if ((self.phi is not None) & (self.ttheta is not None) & (self.intensity_down_net is not None)):
-            ls_out = []
-            ls_out.append("{:12} ".format(len(self.phi)) + " ".join(["{:6.2f}      ".format(_) for _ in self.ttheta]))
-            ll_intensity = self.intensity_down_net
-            ll_intensity = [[ll_intensity[_2][_1] for _2 in range(len(ll_intensity))] for _1 in range(len(ll_intensity[0]))]
-            for phi, l_intensity in zip(self.phi, ll_intensity):
-                ls_out.append("{:12.2f} ".format(phi) + " ".join(["{:12}".format(_) for _ in l_intensity]))
-            self.__dict__["ttheta_phi_intensity_down_net"] = "\n".join(ls_out)
+            self.__dict__["ttheta_phi_intensity_down_net"] = \
+                ttheta_phi_intensity_to_string(
+                    self.ttheta, self.phi, self.intensity_down_net)
 
     def form_ttheta_phi_intensity_up_total(self) -> bool:
         if ((self.phi is not None) & (self.ttheta is not None) & (self.intensity_up_total is not None)):
-            ls_out = []
-            ls_out.append("{:12} ".format(len(self.phi)) + " ".join(["{:6.2f}      ".format(_) for _ in self.ttheta]))
-            ll_intensity = self.intensity_up_total
-            ll_intensity = [[ll_intensity[_2][_1] for _2 in range(len(ll_intensity))] for _1 in range(len(ll_intensity[0]))]
-            for phi, l_intensity in zip(self.phi, ll_intensity):
-                ls_out.append("{:12.2f} ".format(phi) + " ".join(["{:12}".format(_) for _ in l_intensity]))
-            self.__dict__["ttheta_phi_intensity_up_total"] = "\n".join(ls_out)
+            self.__dict__["ttheta_phi_intensity_up_total"] = \
+                ttheta_phi_intensity_to_string(
+                    self.ttheta, self.phi, self.intensity_up_total)
 
     def form_ttheta_phi_intensity_down_total(self) -> bool:
         if ((self.phi is not None) & (self.ttheta is not None) & (self.intensity_down_total is not None)):
-            ls_out = []
-            ls_out.append("{:12} ".format(len(self.phi)) + " ".join(["{:6.2f}      ".format(_) for _ in self.ttheta]))
-            ll_intensity = self.intensity_down_total
-            ll_intensity = [[ll_intensity[_2][_1] for _2 in range(len(ll_intensity))] for _1 in range(len(ll_intensity[0]))]
-            for phi, l_intensity in zip(self.phi, ll_intensity):
-                ls_out.append("{:12.2f} ".format(phi) + " ".join(["{:12}".format(_) for _ in l_intensity]))
-            self.__dict__["ttheta_phi_intensity_down_total"] = "\n".join(ls_out)
+            self.__dict__["ttheta_phi_intensity_down_total"] = \
+                ttheta_phi_intensity_to_string(
+                    self.ttheta, self.phi, self.intensity_down_total)
 
     def form_ttheta_phi_intensity_bkg_calc(self) -> bool:
         if ((self.phi is not None) & (self.ttheta is not None) & (self.intensity_bkg_calc is not None)):
-            ls_out = []
-            ls_out.append("{:12} ".format(len(self.phi)) + " ".join(["{:6.2f}      ".format(_) for _ in self.ttheta]))
-            ll_intensity = self.intensity_bkg_calc
-            ll_intensity = [[ll_intensity[_2][_1] for _2 in range(len(ll_intensity))] for _1 in range(len(ll_intensity[0]))]
-            for phi, l_intensity in zip(self.phi, ll_intensity):
-                ls_out.append("{:12.2f} ".format(phi) + " ".join(["{:12}".format(_) for _ in l_intensity]))
-            self.__dict__["ttheta_phi_intensity_bkg_calc"] = "\n".join(ls_out)
+            self.__dict__["ttheta_phi_intensity_bkg_calc"] = \
+                ttheta_phi_intensity_to_string(
+                    self.ttheta, self.phi, self.intensity_bkg_calc)
 
 
     def form_ttheta_phi_intensity_up(self) -> bool:
         if ((self.phi is not None) & (self.ttheta is not None) & (self.intensity_up is not None)):
-            ls_out = []
-            ls_out.append("{:12} ".format(len(self.phi)) + " ".join(["{:6.2f}      ".format(_) for _ in self.ttheta]))
-            ll_intensity = self.intensity_up
-            ll_intensity = [[ll_intensity[_2][_1] for _2 in range(len(ll_intensity))] for _1 in range(len(ll_intensity[0]))]
-            for phi, l_intensity in zip(self.phi, ll_intensity):
-                ls_out.append("{:12.2f} ".format(phi) + " ".join(["{:12}".format(_) for _ in l_intensity]))
-            self.__dict__["ttheta_phi_intensity_up"] = "\n".join(ls_out)
+            self.__dict__["ttheta_phi_intensity_up"] = \
+                ttheta_phi_intensity_to_string(
+                    self.ttheta, self.phi, self.intensity_up)
 
     def form_ttheta_phi_intensity_up_sigma(self) -> bool:
         if ((self.phi is not None) & (self.ttheta is not None) & (self.intensity_up_sigma is not None)):
-            ls_out = []
-            ls_out.append("{:12} ".format(len(self.phi)) + " ".join(["{:6.2f}      ".format(_) for _ in self.ttheta]))
-            ll_intensity = self.intensity_up_sigma
-            ll_intensity = [[ll_intensity[_2][_1] for _2 in range(len(ll_intensity))] for _1 in range(len(ll_intensity[0]))]
-            for phi, l_intensity in zip(self.phi, ll_intensity):
-                ls_out.append("{:12.2f} ".format(phi) + " ".join(["{:12}".format(_) for _ in l_intensity]))
-            self.__dict__["ttheta_phi_intensity_up_sigma"] = "\n".join(ls_out)
+            self.__dict__["ttheta_phi_intensity_up_sigma"] = \
+                ttheta_phi_intensity_to_string(
+                    self.ttheta, self.phi, self.intensity_up_sigma)
 
     def form_ttheta_phi_intensity_down(self) -> bool:
         if ((self.phi is not None) & (self.ttheta is not None) & (self.intensity_down is not None)):
-            ls_out = []
-            ls_out.append("{:12} ".format(len(self.phi)) + " ".join(["{:6.2f}      ".format(_) for _ in self.ttheta]))
-            ll_intensity = self.intensity_down
-            ll_intensity = [[ll_intensity[_2][_1] for _2 in range(len(ll_intensity))] for _1 in range(len(ll_intensity[0]))]
-            for phi, l_intensity in zip(self.phi, ll_intensity):
-                ls_out.append("{:12.2f} ".format(phi) + " ".join(["{:12}".format(_) for _ in l_intensity]))
-            self.__dict__["ttheta_phi_intensity_down"] = "\n".join(ls_out)
+            self.__dict__["ttheta_phi_intensity_down"] = \
+                ttheta_phi_intensity_to_string(
+                    self.ttheta, self.phi, self.intensity_down)
 
     def form_ttheta_phi_intensity_down_sigma(self) -> bool:
         if ((self.phi is not None) & (self.ttheta is not None) & (self.intensity_down_sigma is not None)):
-            ls_out = []
-            ls_out.append("{:12} ".format(len(self.phi)) + " ".join(["{:6.2f}      ".format(_) for _ in self.ttheta]))
-            ll_intensity = self.intensity_down_sigma
-            ll_intensity = [[ll_intensity[_2][_1] for _2 in range(len(ll_intensity))] for _1 in range(len(ll_intensity[0]))]
-            for phi, l_intensity in zip(self.phi, ll_intensity):
-                ls_out.append("{:12.2f} ".format(phi) + " ".join(["{:12}".format(_) for _ in l_intensity]))
-            self.__dict__["ttheta_phi_intensity_down_sigma"] = "\n".join(ls_out)
+            self.__dict__["ttheta_phi_intensity_down_sigma"] = \
+                ttheta_phi_intensity_to_string(
+                    self.ttheta, self.phi, self.intensity_down_sigma)
 
     def recalc_to_gamma_nu_grid(self):
         l_tth_grid = numpy.array(self.ttheta)*numpy.pi/180.
@@ -300,6 +264,7 @@ class Pd2dProc(ItemN):
     def plot_projection_sum(self):
         """Plot experimental unpolarized intensity vs. 2 theta (degrees)
         """
+        import matplotlib.pyplot as plt
         if not(self.is_attribute("ttheta") & self.is_attribute("intensity_up") & 
                self.is_attribute("intensity_up_sigma") &
                self.is_attribute("intensity_down") & 
@@ -355,6 +320,7 @@ class Pd2dProc(ItemN):
     def plot_projection_diff(self):
         """Plot experimental polarized intensity vs. 2 theta (degrees)
         """
+        import matplotlib.pyplot as plt
         if not(self.is_attribute("ttheta") & self.is_attribute("intensity_up") & 
                self.is_attribute("intensity_up_sigma") &
                self.is_attribute("intensity_down") & 
@@ -401,6 +367,8 @@ class Pd2dProc(ItemN):
         return (fig, ax)
 
     def plot_ttheta_phi(self):
+        import matplotlib
+        import matplotlib.pyplot as plt
         if not(self.is_attribute("ttheta") & self.is_attribute("phi") &
                self.is_attribute("intensity_up_total") & 
                self.is_attribute("intensity_down_total")):
@@ -469,6 +437,8 @@ class Pd2dProc(ItemN):
         return (fig, ax_1)
 
     def plot_diff_total(self):
+        import matplotlib
+        import matplotlib.pyplot as plt
         if not(self.is_attribute("ttheta") & self.is_attribute("phi") &
                self.is_attribute("intensity_up_total") & 
                self.is_attribute("intensity_down_total")):
@@ -502,6 +472,8 @@ class Pd2dProc(ItemN):
         return (fig, ax)
 
     def plot_gamma_nu(self):
+        import matplotlib
+        import matplotlib.pyplot as plt
         if not(self.is_attribute("ttheta") & self.is_attribute("phi") &
                self.is_attribute("intensity_up_total") & 
                self.is_attribute("intensity_down_total")):
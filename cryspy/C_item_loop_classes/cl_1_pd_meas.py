@@ -1,6 +1,5 @@
 from typing import NoReturn
 import numpy
-import matplotlib.pyplot as plt
 
 from cryspy.B_parent_classes.cl_1_item import ItemN
 from cryspy.B_parent_classes.cl_2_loop import LoopN
@@ -105,6 +104,7 @@ class PdMeasL(LoopN):
     """
 
     ITEM_CLASS = PdMeas
+    COLUMNAR = True
     ATTR_INDEX = "ttheta"
 
     def __init__(self, loop_name: str = None) -> NoReturn:
@@ -134,6 +134,7 @@ class PdMeasL(LoopN):
     def plot_up_down(self):
         """Plot experimental intensity up and down vs. 2 theta (degrees)
         """
+        import matplotlib.pyplot as plt
         fig, ax = plt.subplots()
         ax.set_title("I_up and I_down")
         ax.set_xlabel("2 theta (degrees)")
@@ -162,6 +163,7 @@ class PdMeasL(LoopN):
         return (fig, ax)
 
     def plot_sum_diff(self):
+        import matplotlib.pyplot as plt
 
         if (self.is_attribute("ttheta") & self.is_attribute("intensity_up") & 
             self.is_attribute("intensity_up_sigma") &
@@ -205,6 +207,7 @@ class PdMeasL(LoopN):
     def plot_sum(self):
         """Plot experimental unpolarized intensity vs. 2 theta (degrees)
         """
+        import matplotlib.pyplot as plt
         fig, ax = plt.subplots()
         ax.set_title("Unpolarized intensity: I_up + I_down")
         ax.set_xlabel("2 theta (degrees)")
@@ -239,6 +242,7 @@ class PdMeasL(LoopN):
     def plot_diff(self):
         """Plot experimental polarized intensity vs. 2 theta (degrees)
         """
+        import matplotlib.pyplot as plt
         if not(self.is_attribute("ttheta") & self.is_attribute("intensity_up") & 
                self.is_attribute("intensity_up_sigma") &
                self.is_attribute("intensity_down") & 
@@ -1,6 +1,5 @@
 from typing import NoReturn
 import numpy
-import matplotlib.pyplot as plt
 
 from cryspy.B_parent_classes.cl_1_item import ItemN
 from cryspy.B_parent_classes.cl_2_loop import LoopN
@@ -110,6 +109,7 @@ class PdProcL(LoopN):
     def plot_sum(self):
         """Plot unpolarized intensity vs. 2 theta
         """
+        import matplotlib.pyplot as plt
         fig, ax = plt.subplots()
         ax.set_title("Unpolarized intensity: I_up + I_down")
         ax.set_xlabel("2 theta (degrees)")
@@ -186,6 +186,7 @@ class PdProcL(LoopN):
     def plot_diff(self):
         """Plot polarized intensity vs. 2 theta
         """
+        import matplotlib.pyplot as plt
 
         if not(self.is_attribute("ttheta") &
                self.is_attribute("intensity_up") & 
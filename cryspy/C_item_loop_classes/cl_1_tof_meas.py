@@ -1,6 +1,5 @@
 from typing import NoReturn
 import numpy
-import matplotlib.pyplot as plt
 
 from cryspy.B_parent_classes.cl_1_item import ItemN
 from cryspy.B_parent_classes.cl_2_loop import LoopN
@@ -113,6 +112,7 @@ class TOFMeasL(LoopN):
     """
 
     ITEM_CLASS = TOFMeas
+    COLUMNAR = True
     ATTR_INDEX = "time"
 
     def __init__(self, loop_name: str = None) -> NoReturn:
@@ -141,6 +141,7 @@ class TOFMeasL(LoopN):
     def plot_up_down(self):
         """Plot experimental intensity up and down vs. 2 theta (degrees)
         """
+        import matplotlib.pyplot as plt
         fig, ax = plt.subplots()
         ax.set_title("I_up and I_down")
         ax.set_xlabel("Time (microseconds)")
@@ -171,6 +172,7 @@ class TOFMeasL(LoopN):
     def plot_sum(self):
         """Plot experimental unpolarized intensity vs. time
         """
+        import matplotlib.pyplot as plt
         fig, ax = plt.subplots()
         ax.set_title("Unpolarized intensity: I_up + I_down")
         ax.set_xlabel("Time (microseconds)")
@@ -205,6 +207,7 @@ class TOFMeasL(LoopN):
     def plot_diff(self):
         """Plot experimental polarized intensity vs. time
         """
+        import matplotlib.pyplot as plt
         if not(self.is_attribute("time") & self.is_attribute("intensity_up") & 
                self.is_attribute("intensity_up_sigma") &
                self.is_attribute("intensity_down") & 
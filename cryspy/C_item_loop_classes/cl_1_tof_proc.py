@@ -1,6 +1,5 @@
 from typing import NoReturn
 import numpy
-import matplotlib.pyplot as plt
 
 from cryspy.B_parent_classes.cl_1_item import ItemN
 from cryspy.B_parent_classes.cl_2_loop import LoopN
@@ -110,6 +109,7 @@ class TOFProcL(LoopN):
     def plot_sum(self):
         """Plot unpolarized intensity vs. time
         """
+        import matplotlib.pyplot as plt
         fig, ax = plt.subplots()
         ax.set_title("Unpolarized intensity: I_up + I_down")
         ax.set_xlabel("Time (microseconds)")
@@ -171,6 +171,7 @@ class TOFProcL(LoopN):
     def plot_diff(self):
         """Plot polarized intensity vs. time
         """
+        import matplotlib.pyplot as plt
         if not(self.is_attribute("time") & self.is_attribute("intensity_up") & 
                self.is_attribute("intensity_up_sigma") &
                self.is_attribute("intensity_down") & 
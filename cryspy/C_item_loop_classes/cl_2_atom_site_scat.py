@@ -1,7 +1,6 @@
 """Classes AtomSiteScat, AtomSiteScatL."""
 from typing import NoReturn
 import numpy
-import matplotlib.pyplot as plt
 
 from cryspy.B_parent_classes.cl_1_item import ItemN
 from cryspy.B_parent_classes.cl_2_loop import LoopN
@@ -100,6 +99,7 @@ class AtomSiteScat(ItemN):
     def plot_form_factor(self):
         """Plot magnetic form factor.
         """
+        import matplotlib.pyplot as plt
         x_min, x_max = 0, 1.5
         sthovl = numpy.linspace(x_min, x_max, 100)
         try:
@@ -154,6 +154,7 @@ class AtomSiteScatL(LoopN):
     def plot_form_factor(self):
         """Plot magnetic form factor.
         """
+        import matplotlib.pyplot as plt
         x_min, x_max = 0, 1.5
         sthovl = numpy.linspace(x_min, x_max, 100)
         try:
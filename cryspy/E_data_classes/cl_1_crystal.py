@@ -2,6 +2,7 @@
 __author__ = 'ikibalin'
 __version__ = "2020_08_19"
 import math
+import threading
 import numpy
 
 from typing import NoReturn
@@ -10,7 +11,10 @@ from cryspy.A_functions_base.function_1_strings import \
     value_error_to_string
 from cryspy.A_functions_base.function_1_algebra import calc_m_sigma
 from cryspy.A_functions_base.function_2_crystallography_base import \
-    calc_phase_by_hkl_xyz_rb, calc_dwf, calc_form_factor_tensor_susceptibility
+    calc_phase_by_hkl_xyz_rb, calc_dwf, \
+    calc_form_factor_tensor_susceptibility, calc_f_hkl_as_by_hkl_xyz_rb, \
+    calc_orbit_index, calc_orbit_phase, calc_tensor_by_orbit, \
+    calc_f_hkl_as_with_derivatives_by_hkl_xyz_rb
 
 from cryspy.B_parent_classes.cl_3_data import DataN
 
@@ -37,6 +41,19 @@ from cryspy.C_item_loop_classes.cl_1_atom_electron_configuration \
 from cryspy.D_functions_item_loop.function_1_report_magnetization_ellipsoid \
     import magnetization_ellipsoid_by_u_ij, report_main_axes_of_magnetization_ellipsoids
 
+# parameters of atoms for calc_f_nucl_with_derivatives
+NAMES_F_NUCL_DERIVATIVE = (
+    "fract_x", "fract_y", "fract_z", "occupancy", "b_iso", "beta_11",
+    "beta_22", "beta_33", "beta_12", "beta_13", "beta_23",
+    "scat_length_neutron")
+
+# maximal number of kept bases of susceptibility and moment tensors
+N_SUSCEPTIBILITY_BASIS = 8
+
+# guards the kept bases of susceptibility and moment tensors
+LOCK_SUSCEPTIBILITY_BASIS = threading.Lock()
+
+
 class Crystal(DataN):
     """
     Crystal structure description.
@@ -48,7 +65,14 @@ class Crystal(DataN):
     -------
         - calc_b_iso_beta
         - calc_f_nucl
+        - calc_f_nucl_with_derivatives
+        - get_f_nucl_parameters
         - calc_susceptibility_moment_tensor
+        - calc_orbit_index
+        - calc_f_nucl_by_orbit
+        - calc_susceptibility_moment_tensor_by_orbit
+        - calc_susceptibility_moment_basis
+        - calc_susceptibility_moment_tensor_by_basis
         - calc_magnetic_moments_with_field_loc
         - report_main_axes_of_magnetization_ellipsoids
         - calc_main_axes_of_magnetization_ellipsoids
@@ -179,13 +203,16 @@ class Crystal(DataN):
         np_beta = numpy.array(l_beta, dtype=float)
         return np_b_iso, np_beta
 
-    def calc_f_nucl(self, index_h, index_k, index_l):
+    def calc_f_nucl(self, index_h, index_k, index_l,
+                    n_element: int = 1048576):
         """
         Calculate nuclear structure factor.
 
         Keyword Arguments
         -----------------
             index_h, index_k, index_l: 1D numpy array of Miller indexes
+            n_element: maximal size of (hkl, atoms, symmetry) arrays
+                calculated at once (the reflections are treated by chunks)
 
         Output
         ------
@@ -237,32 +264,154 @@ class Crystal(DataN):
         b_2 = r_s_g_s.numpy_b_2.astype(float)
         b_3 = r_s_g_s.numpy_b_3.astype(float)
 
-        phase_3d = calc_phase_by_hkl_xyz_rb(
-            index_h, index_k, index_l, x, y, z, r_11, r_12, r_13, r_21, r_22,
-            r_23, r_31, r_32, r_33, b_1, b_2, b_3)
-
         b_iso, beta = self.calc_b_iso_beta()
+        sthovl = cell.calc_sthovl(index_h, index_k, index_l)
 
-        dwf_3d = calc_dwf(cell, index_h, index_k, index_l, b_iso, beta, r_11,
-                          r_12, r_13, r_21, r_22, r_23, r_31, r_32, r_33)
-
-        hh = phase_3d*dwf_3d
-        phase_2d = hh.sum(axis=2)  # sum over symmetry
-
-        b_scat_2d = numpy.meshgrid(index_h, scat_length_neutron,
-                                   indexing="ij")[1]
-        occ_mult_2d = numpy.meshgrid(index_h, occ_mult, indexing="ij")[1]
-
-        hh = phase_2d * b_scat_2d * occ_mult_2d
         # nuclear structure factor in assymetric unit cell
-        f_hkl_as = hh.sum(axis=1)*1./r_11.size
+        f_hkl_as = calc_f_hkl_as_by_hkl_xyz_rb(
+            index_h, index_k, index_l, x, y, z, r_11, r_12, r_13, r_21, r_22,
+            r_23, r_31, r_32, r_33, b_1, b_2, b_3,
+            scat_length_neutron*occ_mult, sthovl, b_iso, beta,
+            n_element=n_element)
 
         f_nucl = space_group.calc_f_hkl_by_f_hkl_as(index_h, index_k, index_l,
                                                     f_hkl_as)
         return f_nucl
 
+    def calc_f_nucl_with_derivatives(self, index_h, index_k, index_l,
+                                     params: list = None,
+                                     n_element: int = 1048576):
+        """
+        Calculate nuclear structure factor and its derivatives over
+        parameters of atoms.
+
+        The derivatives are given by the same phase factors and
+        Debye-Waller factors as the structure factor, so the time of
+        calculation is a few times of the one of calc_f_nucl.
+
+        Keyword Arguments
+        -----------------
+            index_h, index_k, index_l: 1D numpy array of Miller indexes
+            params: list of (label, name), where label is label of atom
+                site and name is one of NAMES_F_NUCL_DERIVATIVE. By default
+                refined parameters are taken (see get_f_nucl_parameters).
+            n_element: see calc_f_nucl
+
+        Output
+        ------
+            f_nucl: 1D numpy array of nuclear structure factor
+            d_f_nucl: dictionary {(label, name): 1D numpy array of
+                derivative of nuclear structure factor}
+
+        The derivative over b_iso multiplied by 8 pi**2 gives the one over
+        u_iso_or_equiv.
+        """
+        if isinstance(index_h, (float, int)):
+            index_h = numpy.array([index_h], dtype=float)
+            index_k = numpy.array([index_k], dtype=float)
+            index_l = numpy.array([index_l], dtype=float)
+        elif isinstance(index_h, list):
+            index_h = numpy.array(index_h, dtype=float)
+            index_k = numpy.array(index_k, dtype=float)
+            index_l = numpy.array(index_l, dtype=float)
+        if params is None:
+            params = self.get_f_nucl_parameters()
+
+        space_group = self.space_group
+        r_s_g_s = space_group.reduced_space_group_symop
+
+        cell = self.cell
+        atom_site = self.atom_site
+        occupancy = numpy.array(atom_site.occupancy, dtype=float)
+        x = numpy.array(atom_site.fract_x, dtype=float)
+        y = numpy.array(atom_site.fract_y, dtype=float)
+        z = numpy.array(atom_site.fract_z, dtype=float)
+
+        atom_multiplicity = numpy.array(atom_site.multiplicity, dtype=int)
+        scat_length_neutron = numpy.array(atom_site.scat_length_neutron,
+                                          dtype=complex)
+
+        occ_mult = occupancy*atom_multiplicity
+
+        r_ij = [getattr(r_s_g_s, f"numpy_r_{_h:}").astype(float)
+                for _h in ("11", "12", "13", "21", "22", "23", "31", "32",
+                           "33")]
+        b_i = [getattr(r_s_g_s, f"numpy_b_{_h:}").astype(float)
+               for _h in ("1", "2", "3")]
+
+        b_iso, beta = self.calc_b_iso_beta()
+        sthovl = cell.calc_sthovl(index_h, index_k, index_l)
+
+        f_hkl_as, df_db_scat, df_dxyz, df_db_iso, df_dbeta = \
+            calc_f_hkl_as_with_derivatives_by_hkl_xyz_rb(
+                index_h, index_k, index_l, x, y, z, *r_ij, *b_i,
+                scat_length_neutron*occ_mult, sthovl, b_iso, beta,
+                n_element=n_element)
+
+        label = list(atom_site.label)
+        n_hkl = f_hkl_as.size
+        df_as = numpy.zeros(shape=(n_hkl, len(params)+1), dtype=complex)
+        df_as[:, 0] = f_hkl_as
+        for i_param, (label_atom, name) in enumerate(params):
+            ind = label.index(label_atom)
+            if name in ("fract_x", "fract_y", "fract_z"):
+                df = df_dxyz[:, ind, ("fract_x", "fract_y",
+                                      "fract_z").index(name)]
+            elif name == "occupancy":
+                df = df_db_scat[:, ind] * \
+                    scat_length_neutron[ind]*atom_multiplicity[ind]
+            elif name == "b_iso":
+                df = df_db_iso[:, ind]
+            elif name.startswith("beta_"):
+                df = df_dbeta[:, ind, NAMES_F_NUCL_DERIVATIVE.index(name)-5]
+            elif name == "scat_length_neutron":
+                df = df_db_scat[:, ind]*occ_mult[ind]
+            else:
+                raise KeyError(f"Derivative over '{name:}' is not defined.")
+            df_as[:, i_param+1] = df
+
+        # the transformation is linear for real parameters
+        df = space_group.calc_f_hkl_by_f_hkl_as(index_h, index_k, index_l,
+                                                df_as)
+        f_nucl = df[:, 0]
+        d_f_nucl = {tuple(param): df[:, i_param+1]
+                    for i_param, param in enumerate(params)}
+        return f_nucl, d_f_nucl
+
+    def get_f_nucl_parameters(self) -> list:
+        """
+        Give refined parameters of atoms for calc_f_nucl_with_derivatives.
+
+        Output
+        ------
+            list of (label, name) for fract_x, fract_y, fract_z, occupancy,
+            b_iso (refined b_iso_or_equiv or u_iso_or_equiv) and beta_ij
+            (refined u_ij or b_ij of atom_site_aniso).
+        """
+        try:
+            atom_site_aniso = self.atom_site_aniso
+            l_label_aniso = list(atom_site_aniso.label)
+        except AttributeError:
+            l_label_aniso = []
+        params = []
+        for item in self.atom_site.items:
+            label = item.label
+            for name in ("fract_x", "fract_y", "fract_z", "occupancy"):
+                if getattr(item, f"{name:}_refinement"):
+                    params.append((label, name))
+            if (item.b_iso_or_equiv_refinement or
+                    item.u_iso_or_equiv_refinement):
+                params.append((label, "b_iso"))
+            if label in l_label_aniso:
+                item_aniso = atom_site_aniso[label]
+                for ij in ("11", "22", "33", "12", "13", "23"):
+                    if (getattr(item_aniso, f"u_{ij:}_refinement") or
+                            getattr(item_aniso, f"b_{ij:}_refinement")):
+                        params.append((label, f"beta_{ij:}"))
+        return params
+
     def calc_refln(self, index_h, index_k, index_l,
-                   flag_internal: bool = True):
+                   flag_internal: bool = True, orbit_index=None):
         """
         Calculate Refln cryspy object where nuclear structure factor is stored.
 
@@ -272,6 +421,9 @@ class Crystal(DataN):
             flag_internal: a flag to calculate or to use internal objects.
                            It should be True if user call the function.
                            It's True by default.
+            orbit_index: if it is given (see calc_orbit_index) the
+                         structure factor is calculated only for
+                         representatives of orbits of reflections.
 
         Output:
         -------
@@ -294,7 +446,11 @@ class Crystal(DataN):
             index_k = numpy.array(index_k, dtype=float)
             index_l = numpy.array(index_l, dtype=float)
         
-        f_nucl = self.calc_f_nucl(index_h, index_k, index_l)
+        if orbit_index is None:
+            f_nucl = self.calc_f_nucl(index_h, index_k, index_l)
+        else:
+            f_nucl = self.calc_f_nucl_by_orbit(index_h, index_k, index_l,
+                                               orbit_index=orbit_index)
         res = ReflnL(loop_name=self.data_name)
         res.numpy_index_h = index_h
         res.numpy_index_k = index_k
@@ -550,9 +706,335 @@ class Crystal(DataN):
         return s_11, s_12, s_13, s_21, s_22, s_23, s_31, s_32, s_33, \
             sm_11, sm_12, sm_13, sm_21, sm_22, sm_23, sm_31, sm_32, sm_33
 
+    def calc_orbit_index(self, index_h, index_k, index_l):
+        """
+        Calculate orbit index of reflections.
+
+        Symmetry-equivalent (and repeated) reflections are grouped in orbits,
+        so structure factors can be calculated only for representatives of
+        orbits (see calc_f_nucl_by_orbit,
+        calc_susceptibility_moment_tensor_by_orbit).
+
+        Keyword Arguments
+        -----------------
+            index_h, index_k, index_l: 1D numpy array of Miller indexes
+
+        Output
+        ------
+            ind_unique: indices of representatives of orbits
+            ind_inverse: numbers of orbits of reflections
+            ind_symm: numbers of symmetry elements transforming
+                representatives to reflections
+            orbit_phase: phase factors of structure factors of reflections
+                relative to their representatives
+        """
+        r_ij, b_i = self._get_orbit_symmetry()
+        ind_unique, ind_inverse, ind_symm = calc_orbit_index(
+            index_h, index_k, index_l, r_ij)
+        orbit_phase = calc_orbit_phase(index_h, index_k, index_l, ind_unique,
+                                       ind_inverse, ind_symm, b_i)
+        return ind_unique, ind_inverse, ind_symm, orbit_phase
+
+    def _get_orbit_symmetry(self):
+        """
+        Give rotations r_ij and translations b_i of symmetry elements
+        relating structure factors of equivalent reflections.
+
+        The elements of reduced space group are taken. The elements
+        combined with the inversion are added only when scattering lengths
+        are real (F(-h) is conjugate of F(h) only in this case).
+        """
+        space_group = self.space_group
+        r_s_g_s = space_group.reduced_space_group_symop
+        r_ij = numpy.stack([
+            r_s_g_s.numpy_r_11, r_s_g_s.numpy_r_12, r_s_g_s.numpy_r_13,
+            r_s_g_s.numpy_r_21, r_s_g_s.numpy_r_22, r_s_g_s.numpy_r_23,
+            r_s_g_s.numpy_r_31, r_s_g_s.numpy_r_32, r_s_g_s.numpy_r_33],
+            axis=0).astype(float)
+        b_i = numpy.stack([r_s_g_s.numpy_b_1, r_s_g_s.numpy_b_2,
+                           r_s_g_s.numpy_b_3], axis=0).astype(float)
+        scat_length_neutron = numpy.array(
+            self.atom_site.scat_length_neutron, dtype=complex)
+        if (space_group.centrosymmetry and
+                numpy.all(scat_length_neutron.imag == 0.)):
+            p_centr = numpy.array(space_group.pcentr, dtype=float)
+            r_ij = numpy.concatenate([r_ij, -r_ij], axis=1)
+            b_i = numpy.concatenate(
+                [b_i, 2.*p_centr[:, numpy.newaxis] - b_i], axis=1)
+        return r_ij, b_i
+
+    def calc_f_nucl_by_orbit(self, index_h, index_k, index_l,
+                             orbit_index=None):
+        """
+        Calculate nuclear structure factor only for representatives of
+        orbits of symmetry-equivalent reflections.
+
+        The result is the same as the one of calc_f_nucl.
+
+        Keyword Arguments
+        -----------------
+            index_h, index_k, index_l: 1D numpy array of Miller indexes
+            orbit_index: result of calc_orbit_index (it is calculated if
+                it is not given)
+        """
+        if orbit_index is None:
+            orbit_index = self.calc_orbit_index(index_h, index_k, index_l)
+        ind_unique, ind_inverse, ind_symm, orbit_phase = orbit_index
+        f_nucl = self.calc_f_nucl(numpy.asarray(index_h)[ind_unique],
+                                  numpy.asarray(index_k)[ind_unique],
+                                  numpy.asarray(index_l)[ind_unique])
+        return f_nucl[ind_inverse]*orbit_phase
+
+    def calc_susceptibility_moment_tensor_by_orbit(
+            self, index_h, index_k, index_l, flag_only_orbital: bool = False,
+            orbit_index=None):
+        """
+        Calculate susceptibility tensor and moment tensor only for
+        representatives of orbits of symmetry-equivalent reflections.
+
+        The result is the same as the one of
+        calc_susceptibility_moment_tensor.
+
+        Keyword Arguments
+        -----------------
+            index_h, index_k, index_l: 1D numpy array of Miller indexes
+            flag_only_orbital: see calc_susceptibility_moment_tensor
+            orbit_index: result of calc_orbit_index (it is calculated if
+                it is not given)
+        """
+        if orbit_index is None:
+            orbit_index = self.calc_orbit_index(index_h, index_k, index_l)
+        ind_unique, ind_inverse, ind_symm, orbit_phase = orbit_index
+        chi_m = self.calc_susceptibility_moment_tensor(
+            numpy.asarray(index_h)[ind_unique],
+            numpy.asarray(index_k)[ind_unique],
+            numpy.asarray(index_l)[ind_unique],
+            flag_only_orbital=flag_only_orbital)
+        r_ij = self._get_orbit_symmetry()[0]
+        m_m = self.cell.m_m
+        return calc_tensor_by_orbit(
+            chi_m[:9], ind_inverse, ind_symm, orbit_phase, r_ij, m_m) + \
+            calc_tensor_by_orbit(
+                chi_m[9:], ind_inverse, ind_symm, orbit_phase, r_ij, m_m)
+
+    def calc_susceptibility_moment_basis(
+            self, index_h, index_k, index_l, flag_only_orbital: bool = False):
+        """
+        Calculate basis of susceptibility tensor and moment tensor.
+
+        The tensors given by calc_susceptibility_moment_tensor are linear in
+        the independent components of chi_ij and moment_ij (the ones left
+        after isotropic and space group constraints). The basis tensors are
+        calculated for unit values of the independent components, so they
+        depend only on the cell, symmetry, atom sites and form factors.
+
+        Keyword Arguments
+        -----------------
+            index_h, index_k, index_l: 1D numpy array of Miller indexes
+            flag_only_orbital: see calc_susceptibility_moment_tensor
+
+        Output
+        ------
+            basis_chi: complex array of shape (9, number of reflections,
+                number of independent components of chi_ij)
+            basis_moment: the same for moment_ij
+            l_index_name_chi, l_index_name_moment: independent components
+                given as (index of item of atom_site_susceptibility, name)
+        """
+        index_h = numpy.atleast_1d(numpy.array(index_h, dtype=float))
+        index_k = numpy.atleast_1d(numpy.array(index_k, dtype=float))
+        index_l = numpy.atleast_1d(numpy.array(index_l, dtype=float))
+        n_hkl = index_h.size
+
+        try:
+            atom_site_scat = self.atom_site_scat
+            atom_site_susceptibility = self.atom_site_susceptibility
+        except AttributeError:
+            basis = numpy.zeros(shape=(9, n_hkl, 0), dtype=complex)
+            return basis, basis.copy(), [], []
+
+        space_group = self.space_group
+        r_s_g_s = space_group.reduced_space_group_symop
+        cell = self.cell
+        sthovl = cell.calc_sthovl(index_h, index_k, index_l)
+
+        atom_site = self.atom_site
+        atom_site_scat.load_atom_type_scat_by_atom_site(atom_site)
+
+        np_x_y_z_occ_mult = numpy.array([(
+            atom_site[item.label].fract_x, atom_site[item.label].fract_y,
+            atom_site[item.label].fract_z, atom_site[item.label].occupancy,
+            atom_site[item.label].multiplicity)
+            for item in atom_site_susceptibility.items], dtype=float)
+        x = np_x_y_z_occ_mult[:, 0]
+        y = np_x_y_z_occ_mult[:, 1]
+        z = np_x_y_z_occ_mult[:, 2]
+        occ_mult = np_x_y_z_occ_mult[:, 3]*np_x_y_z_occ_mult[:, 4]
+        n_atom = occ_mult.size
+
+        r_ij = numpy.stack([
+            r_s_g_s.numpy_r_11, r_s_g_s.numpy_r_12, r_s_g_s.numpy_r_13,
+            r_s_g_s.numpy_r_21, r_s_g_s.numpy_r_22, r_s_g_s.numpy_r_23,
+            r_s_g_s.numpy_r_31, r_s_g_s.numpy_r_32, r_s_g_s.numpy_r_33],
+            axis=0).astype(float)
+        b_i = numpy.stack([r_s_g_s.numpy_b_1, r_s_g_s.numpy_b_2,
+                           r_s_g_s.numpy_b_3], axis=0).astype(float)
+        n_symm = r_ij.shape[1]
+
+        # dimensions: hkl, magnetic atoms, reduced symmetry operators
+        phase_3d = calc_phase_by_hkl_xyz_rb(
+            index_h, index_k, index_l, x, y, z, *r_ij, *b_i)
+
+        form_factor = [atom_site_scat[item.label].calc_form_factor(
+            sthovl, flag_only_orbital=flag_only_orbital)
+            for item in atom_site_susceptibility.items]
+        form_factor = numpy.array(list(zip(*form_factor)), dtype=float)
+
+        # unit tensors for the components (11, 22, 33, 12, 13, 23) rotated
+        # by symmetry operators: R * E * R^T
+        e_3d = numpy.zeros(shape=(6, 3, 3), dtype=float)
+        for i_comp, (i_1, i_2) in enumerate(
+                ((0, 0), (1, 1), (2, 2), (0, 1), (0, 2), (1, 2))):
+            e_3d[i_comp, i_1, i_2] = 1.
+            e_3d[i_comp, i_2, i_1] = 1.
+        r_3d = r_ij.transpose().reshape(n_symm, 3, 3)
+        rert = numpy.einsum("sij,cjk,slk->scil", r_3d, e_3d, r_3d).reshape(
+            n_symm, 54)
+
+        # dimensions: hkl, magnetic atoms, 6 components * 9 tensor elements
+        f_hkl_as = numpy.matmul(phase_3d, rert) * (
+            form_factor * occ_mult[numpy.newaxis, :] /
+            n_symm)[:, :, numpy.newaxis]
+        f_hkl = space_group.calc_f_hkl_by_f_hkl_as(
+            index_h, index_k, index_l, f_hkl_as.reshape(n_hkl, n_atom*54))
+        # chi in 10-12 cm; chim in muB (it is why here 0.2695)
+        hh = (0.2695*f_hkl).reshape(n_hkl, n_atom, 6, 9)
+        t_ij = numpy.stack(self._orto_matrix(
+            tuple([hh[:, :, :, i_elem] for i_elem in range(9)])), axis=0)
+
+        l_index_name_chi, matrix_chi = \
+            atom_site_susceptibility.calc_constraint_matrix(
+                atom_site, space_group, cell)
+        l_index_name_moment, matrix_moment = \
+            atom_site_susceptibility.calc_constraint_matrix(
+                atom_site, space_group, cell, flag_moment=True)
+
+        basis_chi = numpy.einsum("ijkl,klm->ijm", t_ij, matrix_chi)
+        basis_moment = numpy.einsum("ijkl,klm->ijm", t_ij, matrix_moment)
+        return basis_chi, basis_moment, l_index_name_chi, \
+            l_index_name_moment
+
+    def calc_susceptibility_moment_tensor_by_basis(
+            self, index_h, index_k, index_l, flag_only_orbital: bool = False,
+            orbit_index=None):
+        """
+        Calculate susceptibility tensor and moment tensor by the basis
+        (see calc_susceptibility_moment_basis).
+
+        The basis is kept and it is calculated again only when the
+        reflections, cell, symmetry, atom sites, form factors or types of
+        tensors are changed. So, when only chi_ij and moment_ij are refined
+        the tensors are given by matrix-vector products. The kept bases are
+        guarded by a lock, so the crystal can be calculated by several
+        threads at once.
+
+        The result is the same as the one of
+        calc_susceptibility_moment_tensor.
+
+        Keyword Arguments
+        -----------------
+            index_h, index_k, index_l: 1D numpy array of Miller indexes
+            flag_only_orbital: see calc_susceptibility_moment_tensor
+            orbit_index: if it is given (see calc_orbit_index) the basis
+                is calculated only for representatives of orbits of
+                reflections.
+        """
+        index_h = numpy.atleast_1d(numpy.array(index_h, dtype=float))
+        index_k = numpy.atleast_1d(numpy.array(index_k, dtype=float))
+        index_l = numpy.atleast_1d(numpy.array(index_l, dtype=float))
+        if orbit_index is not None:
+            ind_unique, ind_inverse, ind_symm, orbit_phase = orbit_index
+            index_h = index_h[ind_unique]
+            index_k = index_k[ind_unique]
+            index_l = index_l[ind_unique]
+
+        key_hkl = (index_h.tobytes(), index_k.tobytes(), index_l.tobytes(),
+                   flag_only_orbital)
+        key_basis = self._get_susceptibility_basis_key()
+        # the kept bases are shared by the threads calculating the crystal
+        with LOCK_SUSCEPTIBILITY_BASIS:
+            try:
+                d_internal_val = self.d_internal_val
+            except AttributeError:
+                d_internal_val = {}
+                self.d_internal_val = d_internal_val
+            d_basis = d_internal_val.setdefault("susceptibility_basis", {})
+            entry = d_basis.get(key_hkl, None)
+        if ((entry is not None) and (entry[0] == key_basis)):
+            basis = entry[1]
+        else:
+            basis = self.calc_susceptibility_moment_basis(
+                index_h, index_k, index_l,
+                flag_only_orbital=flag_only_orbital)
+            with LOCK_SUSCEPTIBILITY_BASIS:
+                d_basis.pop(key_hkl, None)
+                while len(d_basis) >= N_SUSCEPTIBILITY_BASIS:
+                    d_basis.pop(next(iter(d_basis)))
+                d_basis[key_hkl] = (key_basis, basis)
+        basis_chi, basis_moment, l_index_name_chi, l_index_name_moment = basis
+
+        chi_ij = numpy.matmul(basis_chi, self._get_susceptibility_components(
+            l_index_name_chi))
+        moment_ij = numpy.matmul(
+            basis_moment, self._get_susceptibility_components(
+                l_index_name_moment))
+        if orbit_index is None:
+            return tuple(chi_ij) + tuple(moment_ij)
+        r_ij = self._get_orbit_symmetry()[0]
+        m_m = self.cell.m_m
+        return calc_tensor_by_orbit(
+            tuple(chi_ij), ind_inverse, ind_symm, orbit_phase, r_ij, m_m) + \
+            calc_tensor_by_orbit(
+                tuple(moment_ij), ind_inverse, ind_symm, orbit_phase, r_ij,
+                m_m)
+
+    def _get_susceptibility_basis_key(self) -> tuple:
+        """
+        Give key of the basis of susceptibility and moment tensors.
+
+        It is given by versions of all items except atom_site_susceptibility
+        and by types of tensors of atom_site_susceptibility.
+        """
+        if not(self.is_attribute("atom_site_susceptibility")):
+            return (self.get_version(), )
+        atom_site_susceptibility = self.atom_site_susceptibility
+        name_susceptibility = atom_site_susceptibility.get_name()
+        names = tuple([item.get_name() for item in self.items
+                       if item.get_name() != name_susceptibility])
+        l_type = []
+        for item in atom_site_susceptibility.items:
+            l_type.append((
+                item.label,
+                item.chi_type if item.is_attribute("chi_type") else None,
+                item.moment_type if item.is_attribute("moment_type")
+                else None))
+        return (self.get_version(names), tuple(l_type))
+
+    def _get_susceptibility_components(self, l_index_name) -> numpy.ndarray:
+        """Give values of components of chi_ij or moment_ij."""
+        if len(l_index_name) == 0:
+            return numpy.zeros(shape=(0, ), dtype=float)
+        items = self.atom_site_susceptibility.items
+        l_value = []
+        for index, name in l_index_name:
+            item = items[index]
+            value = getattr(item, name) if item.is_attribute(name) else None
+            l_value.append(0. if value is None else value)
+        return numpy.array(l_value, dtype=float)
+
     def calc_refln_susceptibility(
             self, index_h, index_k, index_l, flag_internal: bool = True,
-            flag_only_orbital: bool = False):
+            flag_only_orbital: bool = False, orbit_index=None):
         """
         Calculate susceptibility tensor and moment tensor.
 
@@ -561,6 +1043,9 @@ class Crystal(DataN):
         Keyword Arguments:
         -----------------
             h, k, l: 1D numpy array of Miller indexes
+            orbit_index: if it is given (see calc_orbit_index) the tensors
+                         are calculated only for representatives of orbits
+                         of reflections.
 
         Output:
         -------
@@ -582,9 +1067,14 @@ class Crystal(DataN):
             index_k = numpy.array(index_k, dtype=float)
             index_l = numpy.array(index_l, dtype=float)
 
-        
-        CHI_M = self.calc_susceptibility_moment_tensor(
-            index_h, index_k, index_l, flag_only_orbital=flag_only_orbital)
+        if orbit_index is None:
+            CHI_M = self.calc_susceptibility_moment_tensor(
+                index_h, index_k, index_l,
+                flag_only_orbital=flag_only_orbital)
+        else:
+            CHI_M = self.calc_susceptibility_moment_tensor_by_orbit(
+                index_h, index_k, index_l,
+                flag_only_orbital=flag_only_orbital, orbit_index=orbit_index)
 
         s_11, s_12, s_13, s_21, s_22, s_23, s_31, s_32, s_33 = CHI_M[:9]
         sm_11, sm_12, sm_13, sm_21, sm_22, sm_23, sm_31, sm_32, sm_33 = \
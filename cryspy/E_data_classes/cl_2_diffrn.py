@@ -31,6 +31,8 @@ from cryspy.D_functions_item_loop.function_1_flip_ratio import \
     calc_flip_ratio, calc_fm_perp_loc, calc_e_up_loc
 
 from cryspy.E_data_classes.cl_1_crystal import Crystal
+from cryspy.E_data_classes.function_1_chi_sq import \
+    calc_experiment_chi_sq_batch
 
 
 class Diffrn(DataN):
@@ -46,6 +48,7 @@ class Diffrn(DataN):
         - calc_fr
         - calc_fm_perp_loc
         - calc_chi_sq
+        - calc_chi_sq_batch
         - params_to_cif
         - data_to_cif
         - calc_to_cif
@@ -157,20 +160,29 @@ class Diffrn(DataN):
             index_2k = 2 * index_k
             index_2l = 2 * index_l
 
+        # structure factors are calculated only for unique orbits of
+        # symmetry-equivalent reflections
+        orbit_index = crystal.calc_orbit_index(index_h, index_k, index_l)
+
         if flag_internal:
-            refln = crystal.calc_refln(index_h, index_k, index_l)
+            refln = crystal.calc_refln(index_h, index_k, index_l,
+                                       orbit_index=orbit_index)
             f_nucl = numpy.array(refln.f_calc, dtype=complex)
         else:
-            f_nucl = crystal.calc_f_nucl(index_h, index_k, index_l)
+            f_nucl = crystal.calc_f_nucl_by_orbit(
+                index_h, index_k, index_l, orbit_index=orbit_index)
 
         if flag_lambdaover2:
-            f_nucl_2hkl = crystal.calc_f_nucl(index_2h, index_2k, index_2l)
+            orbit_index_2hkl = crystal.calc_orbit_index(
+                index_2h, index_2k, index_2l)
+            f_nucl_2hkl = crystal.calc_f_nucl_by_orbit(
+                index_2h, index_2k, index_2l, orbit_index=orbit_index_2hkl)
         else:
             f_nucl_2hkl = None
 
         if flag_internal:
-            refln_s = crystal.calc_refln_susceptibility(index_h, index_k,
-                                                        index_l)
+            refln_s = crystal.calc_refln_susceptibility(
+                index_h, index_k, index_l, orbit_index=orbit_index)
             sft_ij = (refln_s.numpy_chi_11_calc,
                       refln_s.numpy_chi_12_calc,
                       refln_s.numpy_chi_13_calc,
@@ -191,8 +203,10 @@ class Diffrn(DataN):
                        refln_s.numpy_moment_32_calc,
                        refln_s.numpy_moment_33_calc)
         else:
-            chi_m = crystal.calc_susceptibility_moment_tensor(
-                index_h, index_k, index_l)
+            # the basis of tensors is kept by crystal while only chi_ij and
+            # moment_ij are changed
+            chi_m = crystal.calc_susceptibility_moment_tensor_by_basis(
+                index_h, index_k, index_l, orbit_index=orbit_index)
             sft_ij = chi_m[:9]
             sftm_ij = chi_m[9:]
 
@@ -200,8 +214,8 @@ class Diffrn(DataN):
                                        sftm_ij)
 
         if flag_lambdaover2:
-            chi_m_2hkl = crystal.calc_susceptibility_moment_tensor(
-                index_2h, index_2k, index_2l)
+            chi_m_2hkl = crystal.calc_susceptibility_moment_tensor_by_basis(
+                index_2h, index_2k, index_2l, orbit_index=orbit_index_2hkl)
             sft_ij_2hkl = chi_m_2hkl[:9]
             sftm_ij_2hkl = chi_m_2hkl[9:]
             fm_perp_loc_2hkl = calc_fm_perp_loc(e_up_loc, field_norm, k_loc_i,
@@ -407,6 +421,8 @@ class Diffrn(DataN):
             self.refine_ls = refine_ls
         return chi_sq_val, n
 
+    calc_chi_sq_batch = calc_experiment_chi_sq_batch
+
     def params_to_cif(self, separator="_") -> str:
         """Save parameters in cif format."""
         ls_out = []
@@ -7,11 +7,15 @@ from typing import NoReturn
 
 from cryspy.A_functions_base.function_2_crystallography_base import \
     calc_cos_ang
-from cryspy.A_functions_base.function_1_matrices import calc_mRmCmRT
+from cryspy.A_functions_base.function_1_precision import to_precision
+from cryspy.A_functions_base.function_2_powder_profile import \
+    calc_shape_profile_pd, calc_shape_profile_pd_windowed, \
+    calc_iint_by_susceptibility, calc_iint_by_f_mag_perp, L_IJ
 
 from cryspy.B_parent_classes.cl_1_item import ItemN
 from cryspy.B_parent_classes.cl_2_loop import LoopN
 from cryspy.B_parent_classes.cl_3_data import DataN
+from cryspy.B_parent_classes.cl_5_parameter_vector import ParameterVector
 
 from cryspy.C_item_loop_classes.cl_1_setup import Setup
 from cryspy.C_item_loop_classes.cl_1_diffrn_radiation import \
@@ -37,6 +41,24 @@ from cryspy.C_item_loop_classes.cl_1_exclude import ExcludeL
 
 from cryspy.E_data_classes.cl_1_crystal import Crystal
 from cryspy.E_data_classes.cl_1_mag_crystal import MagCrystal
+from cryspy.E_data_classes.function_1_chi_sq import set_linear_parameters, \
+    calc_experiment_chi_sq_batch
+
+
+# items of crystal which define the list of reflections
+L_NAME_HKL = ("cell", "space_group", "space_group_symop_magn_operation",
+              "space_group_symop_magn_centering")
+
+# parameters entering the profile linearly (prefix of loop, attribute)
+L_NAME_LINEAR = (("phase", "scale"), ("pd_background", "intensity"))
+
+
+def numpy_to_loop(loop_class, d_numpy: dict, loop_name: str = None):
+    """Create loop with attributes 'numpy_*' given by dictionary of arrays."""
+    loop = loop_class(loop_name=loop_name)
+    for name, value in d_numpy.items():
+        setattr(loop, f"numpy_{name:}", value)
+    return loop
 
 
 class Pd(DataN):
@@ -49,12 +71,19 @@ class Pd(DataN):
     Methods
     -------
         - calc_profile
+        - get_internal_val
+        - calc_profile_numpy
+        - add_calc_objects
         - calc_chi_sq
+        - calc_chi_sq_batch
+        - get_linear_variable_names
+        - refine_linear_parameters
+        - calc_linear_terms
         - simmulation
         - calc_iint
-        - _gauss_pd
-        - _lor_pd
+        - get_profile_parameters
         - calc_shape_profile
+        - calc_shape_profile_windowed
         - params_to_cif
         - data_to_cif
         - calc_to_cif
@@ -66,6 +95,16 @@ class Pd(DataN):
         - diffrn_radiation, chi2, range, extinction, pd_instr_reflex_asymmetry
           texture, exclude, pd_proc, pd_peak, refine_ls, refln_#phase_name
           refln_susceptibility_#phase_name (optional)
+        - peak_cutoff: if it is given the profile of each reflection is
+          calculated only within ttheta_hkl +- peak_cutoff*FWHM and is kept
+          as a sparse matrix (None by default, the profiles are calculated
+          over all points). Lorentzian tails outside of the windows are
+          lost, so the windows should be wide (tens of FWHM) for refinement.
+        - profile_table_step: if it is given the pseudo-Voigt shapes and the
+          asymmetry are interpolated by precalculated tables with the given
+          step in (ttheta-ttheta_hkl)/FWHM (None by default, the shapes are
+          calculated directly). The error is about 0.65*step**2 of the peak
+          height (see function_1_profile_table).
     """
 
     CLASSES_MANDATORY = (Setup, PdInstrResolution, PhaseL, PdBackgroundL,
@@ -80,7 +119,7 @@ class Pd(DataN):
     PREFIX = "pd"
 
     # default values for the parameters
-    D_DEFAULT = {}
+    D_DEFAULT = {"peak_cutoff": None, "profile_table_step": None}
 
     def __init__(self, data_name=None, **kwargs) -> NoReturn:
         super(Pd, self).__init__()
@@ -94,41 +133,77 @@ class Pd(DataN):
             setattr(self, key, attr)
 
     def calc_profile(self, tth, l_crystal, flag_internal: bool = True,
-                     flag_polarized: bool = True):
+                     flag_polarized: bool = True, d_internal_val: dict = None):
         """Calculate intensity for the given diffraction angles.
 
         Arguments
         ---------
             - tth: 1D numpy array of 2theta in degrees
             - l_crystal: a list of Crystal objects of cryspy library
-            - l_peak_in: precalculated data about integrated intensities
-              (used to speed up the calculations)
-            - l_refln_in: precalculated data about nuclear structure factors
-              (used to speed up the calculations)
-            - l_refln_susceptibility_in: precalculated data about
-              (used to speed up the calculations)
             - flag_internal: a flag to calculate or to use internal objects.
                    It should be True if user call the function.
                    It's True by default.
+            - d_internal_val: dictionary of cached results. If it is given
+              the experiment is not changed at flag_internal=False, so that
+              several threads can calculate it at once, each with its own
+              dictionary (by default the one of the experiment).
 
         Output
         ------
-            - proc: output profile
-            - l_peak: data about peaks
-            - l_refln: data about nuclear structure factor
+            - proc: output profile (PdProcL)
+        """
+        if d_internal_val is None:
+            d_internal_val = self.get_internal_val(flag_internal)
+        d_proc = self.calc_profile_numpy(
+            tth, l_crystal, flag_internal=flag_internal,
+            flag_polarized=flag_polarized, d_internal_val=d_internal_val)
+        if flag_internal:
+            return self.add_calc_objects(l_crystal, d_proc, d_internal_val)
+        return numpy_to_loop(PdProcL, d_proc)
+
+    def get_internal_val(self, flag_internal: bool = True) -> dict:
+        """
+        Give dictionary of cached results of the experiment.
+
+        A new dictionary is created at flag_internal=True.
         """
         if flag_internal:
             d_internal_val = {}
             self.d_internal_val = d_internal_val
-        else:
-            try:
-                d_internal_val = self.d_internal_val
-            except AttributeError:
-                d_internal_val = {}
-                self.d_internal_val = d_internal_val
+            return d_internal_val
+        try:
+            d_internal_val = self.d_internal_val
+        except AttributeError:
+            d_internal_val = {}
+            self.d_internal_val = d_internal_val
+        return d_internal_val
 
-        proc = PdProcL()
-        proc.numpy_ttheta = tth
+    def calc_profile_numpy(self, tth, l_crystal, flag_internal: bool = True,
+                           flag_polarized: bool = True,
+                           d_internal_val: dict = None) -> dict:
+        """
+        Calculate intensity for the given diffraction angles as arrays.
+
+        Objects of loops and items are not created (see calc_profile).
+
+        Arguments
+        ---------
+            - tth, l_crystal, flag_internal, flag_polarized, d_internal_val:
+              see calc_profile
+
+        Output
+        ------
+            - d_proc: dictionary of 1D numpy arrays with names of PdProcL
+              attributes as keys ("ttheta", "intensity_up_total", ...)
+
+        The data about peaks of each crystal are kept in d_internal_val
+        as dictionaries of 1D arrays with names of PdPeakL attributes as
+        keys (d_internal_val["peak_#crystal_name"]).
+        """
+        if d_internal_val is None:
+            d_internal_val = self.get_internal_val(flag_internal)
+
+        d_proc = {"ttheta": tth}
 
         try:
             background = self.pd_background
@@ -136,7 +211,7 @@ class Pd(DataN):
         except AttributeError:
             int_bkgd = 0.*tth
 
-        proc.numpy_intensity_bkg_calc = int_bkgd
+        d_proc["intensity_bkg_calc"] = int_bkgd
 
         setup = self.setup
         wavelength = float(setup.wavelength)
@@ -157,6 +232,10 @@ class Pd(DataN):
 
         res_u_1d = numpy.zeros(tth.shape[0], dtype=float)
         res_d_1d = numpy.zeros(tth.shape[0], dtype=float)
+        peak_cutoff = self.__dict__.get("peak_cutoff", None)
+        # profiles of phases at unit scale
+        l_profile_phase = []
+        d_internal_val["profile_phase"] = l_profile_phase
 
         phase = self.phase
 
@@ -206,38 +285,37 @@ class Pd(DataN):
 
             scale = phase_scale
 
-            try:
-                peak = d_internal_val[f"peak_{crystal.data_name:}"]
-                index_h = peak.numpy_index_h
-                index_k = peak.numpy_index_k
-                index_l = peak.numpy_index_l
-                mult = peak.numpy_index_multiplicity
-                cond_2 = True
-            except KeyError:
+            key_peak = (crystal.get_version(L_NAME_HKL),
+                        float(sthovl_min), float(sthovl_max), texture is None)
+            if (d_internal_val.get(f"key_peak_{crystal.data_name:}", None)
+                    == key_peak):
+                d_peak = d_internal_val[f"peak_{crystal.data_name:}"]
+                index_h = d_peak["index_h"]
+                index_k = d_peak["index_k"]
+                index_l = d_peak["index_l"]
+                mult = d_peak["index_multiplicity"]
+            else:
                 if texture is None:
                     index_h, index_k, index_l, mult = crystal.calc_hkl(
                         sthovl_min, sthovl_max)
                 else:
                     index_h, index_k, index_l, mult = \
                         crystal.calc_hkl_in_range(sthovl_min, sthovl_max)
-                peak = PdPeakL(loop_name=phase_label)
-                peak.numpy_index_h = numpy.array(index_h, dtype=int)
-                peak.numpy_index_k = numpy.array(index_k, dtype=int)
-                peak.numpy_index_l = numpy.array(index_l, dtype=int)
-                peak.numpy_index_multiplicity = numpy.array(mult, dtype=int)
-                d_internal_val[f"peak_{crystal.data_name:}"] = peak
-                cond_2 = False
-
-            cond_1 = not(crystal.is_variables())
-            if cond_1 & cond_2:
-                np_iint_u = peak.numpy_intensity_up
-                np_iint_d = peak.numpy_intensity_down
-            else:
-                np_iint_u, np_iint_d = self.calc_iint(
-                    index_h, index_k, index_l, crystal,
-                    flag_internal=flag_internal)
-                peak.numpy_intensity_up = np_iint_u
-                peak.numpy_intensity_down = np_iint_d
+                index_h = numpy.array(index_h, dtype=int)
+                index_k = numpy.array(index_k, dtype=int)
+                index_l = numpy.array(index_l, dtype=int)
+                mult = numpy.array(mult, dtype=int)
+                d_peak = {"index_h": index_h, "index_k": index_k,
+                          "index_l": index_l, "index_multiplicity": mult}
+                d_internal_val[f"peak_{crystal.data_name:}"] = d_peak
+                d_internal_val[f"key_peak_{crystal.data_name:}"] = key_peak
+            d_internal_val[f"peak_label_{crystal.data_name:}"] = phase_label
+
+            np_iint_u, np_iint_d = self.calc_iint(
+                index_h, index_k, index_l, crystal,
+                flag_internal=flag_internal, d_internal_val=d_internal_val)
+            d_peak["intensity_up"] = np_iint_u
+            d_peak["intensity_down"] = np_iint_d
 
             cell = crystal.cell
             sthovl_hkl = cell.calc_sthovl(index_h, index_k, index_l)
@@ -247,31 +325,56 @@ class Pd(DataN):
                                       numpy.pi)
             tth_hkl = tth_hkl_rad*180./numpy.pi
 
+            if peak_cutoff is not None:
+                profile, tth_zs, h_pv = self.calc_shape_profile_windowed(
+                    tth, tth_hkl, peak_cutoff, phase_igsize=phase_igsize,
+                    phase_u=phase_u, phase_v=phase_v, phase_w=phase_w,
+                    phase_x=phase_x, phase_y=phase_y)
+
+                d_peak["ttheta"] = tth_hkl+self.setup.offset_ttheta
+                d_peak["width_ttheta"] = h_pv
+
+                iint_u_1d = np_iint_u*mult
+                iint_d_1d = np_iint_d*mult
+                if texture is not None:
+                    cos_alpha_ax = calc_cos_ang(cell, h_ax, k_ax, l_ax,
+                                                index_h, index_k, index_l)
+                    texture_1d = g_2 + (1. - g_2) * (1./g_1 + (
+                        g_1**2 - 1./g_1) * cos_alpha_ax**2)**(-1.5)
+                    iint_u_1d = iint_u_1d*texture_1d
+                    iint_d_1d = iint_d_1d*texture_1d
+
+                # 0.5 to have the same meaning for scale factor as in FullProf
+                # (intensities in float64 give the sum in float64)
+                profile_u_1d = 0.5*profile.dot(
+                    numpy.asarray(iint_u_1d, dtype=numpy.float64))
+                profile_d_1d = 0.5*profile.dot(
+                    numpy.asarray(iint_d_1d, dtype=numpy.float64))
+                l_profile_phase.append((profile_u_1d, profile_d_1d))
+                res_u_1d += scale*profile_u_1d
+                res_d_1d += scale*profile_d_1d
+                continue
+
             profile_2d, tth_zs, h_pv = self.calc_shape_profile(
                 tth, tth_hkl, phase_igsize=phase_igsize, phase_u=phase_u,
                 phase_v=phase_v, phase_w=phase_w, phase_x=phase_x,
                 phase_y=phase_y)
 
-            peak.numpy_ttheta = tth_hkl+self.setup.offset_ttheta
-            peak.numpy_width_ttheta = h_pv
+            d_peak["ttheta"] = tth_hkl+self.setup.offset_ttheta
+            d_peak["width_ttheta"] = h_pv
 
-            np_iint_u_2d = numpy.meshgrid(tth, np_iint_u*mult,
-                                          indexing="ij")[1]
-            np_iint_d_2d = numpy.meshgrid(tth, np_iint_d*mult,
-                                          indexing="ij")[1]
+            np_iint_u_1d = to_precision(np_iint_u*mult)
+            np_iint_d_1d = to_precision(np_iint_d*mult)
 
             # texture
             if texture is not None:
-                cond_2 = ((not(texture.is_variables())) &
-                          (not(cell.is_variables())))
-                if cond_2:
-                    try:
-                        texture_2d = d_internal_val[
-                            f"texture_2d_{crystal.data_name:}"]
-                        cond_1 = False
-                    except KeyError:
-                        cond_1 = True
-                if cond_1:
+                key_texture = (key_peak, texture.get_version(),
+                               cell.get_version(), tth.shape)
+                if (d_internal_val.get(f"key_texture_{crystal.data_name:}",
+                                       None) == key_texture):
+                    texture_2d = d_internal_val[
+                        f"texture_2d_{crystal.data_name:}"]
+                else:
                     cos_alpha_ax = calc_cos_ang(cell, h_ax, k_ax, l_ax,
                                                 index_h, index_k, index_l)
                     c_help = 1.-cos_alpha_ax**2
@@ -287,60 +390,85 @@ class Pd(DataN):
                     cos_alpha_2d = cos_alpha_ax_2d*1.+sin_alpha_ax_2d*0.
                     texture_2d = g_2 + (1. - g_2) * (1./g_1 + (g_1**2 - 1./g_1)
                                                      * cos_alpha_2d**2)**(-1.5)
+                    texture_2d = to_precision(texture_2d)
                     d_internal_val[f"texture_2d_{crystal.data_name:}"] = \
                         texture_2d
+                    d_internal_val[f"key_texture_{crystal.data_name:}"] = \
+                        key_texture
 
                 profile_2d = profile_2d*texture_2d
 
-            res_u_2d = profile_2d*np_iint_u_2d
-            res_d_2d = profile_2d*np_iint_d_2d
+            # intensities are broadcasted over the points of the profile
+            res_u_2d = profile_2d*np_iint_u_1d[numpy.newaxis, :]
+            res_d_2d = profile_2d*np_iint_d_1d[numpy.newaxis, :]
 
             # 0.5 to have the same meaning for scale factor as in FullProf
-            res_u_1d += 0.5*scale*res_u_2d.sum(axis=1)
-            res_d_1d += 0.5*scale*res_d_2d.sum(axis=1)
-
-            if flag_internal:
-                peak.numpy_to_items()
-
-        proc.numpy_ttheta_corrected = tth_zs
-        proc.numpy_intensity_up_net = res_u_1d
-        proc.numpy_intensity_down_net = res_d_1d
-        proc.numpy_intensity_net = res_u_1d+res_d_1d
-        proc.numpy_intensity_diff_total = res_u_1d-res_d_1d
+            profile_u_1d = 0.5*res_u_2d.sum(axis=1, dtype=numpy.float64)
+            profile_d_1d = 0.5*res_d_2d.sum(axis=1, dtype=numpy.float64)
+            l_profile_phase.append((profile_u_1d, profile_d_1d))
+            res_u_1d += scale*profile_u_1d
+            res_d_1d += scale*profile_d_1d
+
+        d_proc["ttheta_corrected"] = tth_zs
+        d_proc["intensity_up_net"] = res_u_1d
+        d_proc["intensity_down_net"] = res_d_1d
+        d_proc["intensity_net"] = res_u_1d+res_d_1d
+        d_proc["intensity_diff_total"] = res_u_1d-res_d_1d
         if flag_polarized:
-            proc.numpy_intensity_up_total = res_u_1d+int_bkgd
-            proc.numpy_intensity_down_total = res_d_1d+int_bkgd
-            proc.numpy_intensity_total = res_u_1d+res_d_1d+int_bkgd+int_bkgd
+            d_proc["intensity_up_total"] = res_u_1d+int_bkgd
+            d_proc["intensity_down_total"] = res_d_1d+int_bkgd
+            d_proc["intensity_total"] = res_u_1d+res_d_1d+int_bkgd+int_bkgd
         else:
-            proc.numpy_intensity_up_total = res_u_1d+0.5*int_bkgd
-            proc.numpy_intensity_down_total = res_d_1d+0.5*int_bkgd
-            proc.numpy_intensity_total = res_u_1d+res_d_1d+int_bkgd
+            d_proc["intensity_up_total"] = res_u_1d+0.5*int_bkgd
+            d_proc["intensity_down_total"] = res_d_1d+0.5*int_bkgd
+            d_proc["intensity_total"] = res_u_1d+res_d_1d+int_bkgd
+        return d_proc
 
-        if flag_internal:
-            proc.numpy_to_items()
-            l_calc_objs = []
-            for crystal in l_crystal:
-                try:
-                    obj = d_internal_val[f"refln_{crystal.data_name:}"]
-                    l_calc_objs.append(obj)
-                except KeyError:
-                    pass
-                try:
-                    obj = d_internal_val[
-                        f"refln_susceptibility_{crystal.data_name:}"]
-                    l_calc_objs.append(obj)
-                except KeyError:
-                    pass
-                try:
-                    obj = d_internal_val[f"peak_{crystal.data_name:}"]
-                    l_calc_objs.append(obj)
-                except KeyError:
-                    pass
-            l_calc_objs.append(proc)
-            self.add_items(l_calc_objs)
+    def add_calc_objects(self, l_crystal, d_proc: dict,
+                         d_internal_val: dict) -> PdProcL:
+        """
+        Create calculated loops and add them to the experiment.
+
+        Arguments
+        ---------
+            - l_crystal: a list of Crystal objects of cryspy library
+            - d_proc: arrays of the profile given by calc_profile_numpy
+            - d_internal_val: dictionary of cached results
+
+        Output
+        ------
+            - proc: output profile (PdProcL)
+        """
+        proc = numpy_to_loop(PdProcL, d_proc)
+        proc.numpy_to_items()
+        l_calc_objs = []
+        for crystal in l_crystal:
+            try:
+                obj = d_internal_val[f"refln_{crystal.data_name:}"]
+                l_calc_objs.append(obj)
+            except KeyError:
+                pass
+            try:
+                obj = d_internal_val[
+                    f"refln_susceptibility_{crystal.data_name:}"]
+                l_calc_objs.append(obj)
+            except KeyError:
+                pass
+            try:
+                obj = numpy_to_loop(
+                    PdPeakL, d_internal_val[f"peak_{crystal.data_name:}"],
+                    loop_name=d_internal_val[
+                        f"peak_label_{crystal.data_name:}"])
+                obj.numpy_to_items()
+                l_calc_objs.append(obj)
+            except KeyError:
+                pass
+        l_calc_objs.append(proc)
+        self.add_items(l_calc_objs)
         return proc
 
-    def calc_chi_sq(self, l_crystal, flag_internal=True):
+    def calc_chi_sq(self, l_crystal, flag_internal=True,
+                    d_internal_val: dict = None, flag_residual: bool = False):
         """
         Calculate chi square.
 
@@ -349,13 +477,21 @@ class Pd(DataN):
             - l_crystal: a list of Crystal objects of cryspy library
             - flag_internal: a flag to calculate or to use internal objects.
                    It should be True if user call the function.
-                   It's True by default.
+                   It's True by default. At flag_internal=False objects of
+                   loops and items are not created (refinement mode).
+            - d_internal_val: dictionary of cached results (see
+              calc_profile)
+            - flag_residual: a flag to give the residual vector
+              (False by default)
 
         Output
         ------
             - chi_sq_val: chi square of flip ratio
               (Sum_i ((y_e_i - y_m_i) / sigma_i)**2)
             - n: number of measured reflections
+            - residual: 1D numpy array of (y_m_i - y_e_i) / sigma_i over the
+              points entering chi square, sum of its squares is chi_sq_val
+              (only at flag_residual=True)
         """
         meas = self.pd_meas
         flag_polarized = meas.is_polarized()
@@ -391,41 +527,43 @@ class Pd(DataN):
             int_exp_in = int_exp[cond_in]
             sint_exp_in = sint_exp[cond_in]
 
-        proc = self.calc_profile(
+        if d_internal_val is None:
+            d_internal_val = self.get_internal_val(flag_internal)
+        d_proc = self.calc_profile_numpy(
             tth_in, l_crystal, flag_internal=flag_internal,
-            flag_polarized=flag_polarized)
+            flag_polarized=flag_polarized, d_internal_val=d_internal_val)
 
         if flag_polarized:
-            proc.numpy_intensity_up = int_u_exp_in
-            proc.numpy_intensity_up_sigma = sint_u_exp_in
-            proc.numpy_intensity_down = int_d_exp_in
-            proc.numpy_intensity_down_sigma = sint_d_exp_in
-            proc.numpy_intensity = int_u_exp_in+int_d_exp_in
-            proc.numpy_intensity_sigma = numpy.sqrt(
+            d_proc["intensity_up"] = int_u_exp_in
+            d_proc["intensity_up_sigma"] = sint_u_exp_in
+            d_proc["intensity_down"] = int_d_exp_in
+            d_proc["intensity_down_sigma"] = sint_d_exp_in
+            d_proc["intensity"] = int_u_exp_in+int_d_exp_in
+            d_proc["intensity_sigma"] = numpy.sqrt(
                 numpy.square(sint_u_exp_in) + numpy.square(sint_d_exp_in))
         else:
-            proc.numpy_intensity = int_exp_in
-            proc.numpy_intensity_sigma = sint_exp_in
+            d_proc["intensity"] = int_exp_in
+            d_proc["intensity_sigma"] = sint_exp_in
 
-        int_u_mod = proc.numpy_intensity_up_total
-        int_d_mod = proc.numpy_intensity_down_total
+        int_u_mod = d_proc["intensity_up_total"]
+        int_d_mod = d_proc["intensity_down_total"]
 
         if flag_polarized:
             sint_sum_exp_in = (sint_u_exp_in**2 + sint_d_exp_in**2)**0.5
-            chi_sq_u = ((int_u_mod-int_u_exp_in)/sint_u_exp_in)**2
-            chi_sq_d = ((int_d_mod-int_d_exp_in)/sint_d_exp_in)**2
-            chi_sq_sum = ((int_u_mod+int_d_mod-int_u_exp_in-int_d_exp_in) /
-                          sint_sum_exp_in)**2
-            chi_sq_dif = ((int_u_mod-int_d_mod-int_u_exp_in+int_d_exp_in) /
-                          sint_sum_exp_in)**2
-
-            cond_u = numpy.logical_not(numpy.isnan(chi_sq_u))
-            cond_d = numpy.logical_not(numpy.isnan(chi_sq_d))
-            cond_sum = numpy.logical_not(numpy.isnan(chi_sq_sum))
-            cond_dif = numpy.logical_not(numpy.isnan(chi_sq_dif))
+            res_u = (int_u_mod-int_u_exp_in)/sint_u_exp_in
+            res_d = (int_d_mod-int_d_exp_in)/sint_d_exp_in
+            res_sum = ((int_u_mod+int_d_mod-int_u_exp_in-int_d_exp_in) /
+                       sint_sum_exp_in)
+            res_dif = ((int_u_mod-int_d_mod-int_u_exp_in+int_d_exp_in) /
+                       sint_sum_exp_in)
+
+            cond_u = numpy.logical_not(numpy.isnan(res_u))
+            cond_d = numpy.logical_not(numpy.isnan(res_d))
+            cond_sum = numpy.logical_not(numpy.isnan(res_sum))
+            cond_dif = numpy.logical_not(numpy.isnan(res_dif))
         else:
-            chi_sq_sum = ((int_u_mod+int_d_mod-int_exp_in)/sint_exp_in)**2
-            cond_sum = numpy.logical_not(numpy.isnan(chi_sq_sum))
+            res_sum = (int_u_mod+int_d_mod-int_exp_in)/sint_exp_in
+            cond_sum = numpy.logical_not(numpy.isnan(res_sum))
 
         # exclude region
         try:
@@ -449,45 +587,157 @@ class Pd(DataN):
         except AttributeError:
             pass
 
-        proc.numpy_excluded = numpy.logical_not(cond_sum)
-        chi_sq_sum_val = (chi_sq_sum[cond_sum]).sum()
-        n_sum = cond_sum.sum()
-
+        d_proc["excluded"] = numpy.logical_not(cond_sum)
+        # kept for refine_linear_parameters
+        d_internal_val["pd_proc"] = d_proc
         if flag_polarized:
-
-            chi_sq_u_val = (chi_sq_u[cond_u]).sum()
-            n_u = cond_u.sum()
-
-            chi_sq_d_val = (chi_sq_d[cond_d]).sum()
-            n_d = cond_d.sum()
-
-            chi_sq_dif_val = (chi_sq_dif[cond_dif]).sum()
-            n_dif = cond_dif.sum()
-
+            d_internal_val["chi_sq_conditions"] = (
+                cond_u, cond_d, cond_sum, cond_dif)
             chi2 = self.chi2
-
-            flag_u = chi2.up
-            flag_d = chi2.down
-            flag_sum = chi2.sum
-            flag_dif = chi2.diff
-
-            chi_sq_val = (int(flag_u)*chi_sq_u_val + int(flag_d)*chi_sq_d_val +
-                          int(flag_sum)*chi_sq_sum_val +
-                          int(flag_dif)*chi_sq_dif_val)
-            n = (int(flag_u)*n_u + int(flag_d)*n_d + int(flag_sum)*n_sum +
-                 int(flag_dif)*n_dif)
+            l_residual = [
+                res[cond] for res, cond, flag in zip(
+                    (res_u, res_d, res_sum, res_dif),
+                    (cond_u, cond_d, cond_sum, cond_dif),
+                    (chi2.up, chi2.down, chi2.sum, chi2.diff)) if flag]
         else:
-            chi_sq_val = chi_sq_sum_val
-            n = n_sum
+            d_internal_val["chi_sq_conditions"] = (None, None, cond_sum, None)
+            l_residual = [res_sum[cond_sum], ]
+
+        chi_sq_val = sum([numpy.square(res).sum() for res in l_residual])
+        n = sum([res.size for res in l_residual])
 
         if flag_internal:
+            self.add_calc_objects(l_crystal, d_proc, d_internal_val)
             refine_ls = RefineLs(number_reflns=n,
                                  goodness_of_fit_all=chi_sq_val/float(n),
                                  weighting_scheme="sigma")
             self.refine_ls = refine_ls
-            proc.numpy_to_items()
+        if flag_residual:
+            if len(l_residual) == 0:
+                return chi_sq_val, n, numpy.zeros((0, ), dtype=float)
+            return chi_sq_val, n, numpy.concatenate(l_residual, axis=0)
         return chi_sq_val, n
 
+    calc_chi_sq_batch = calc_experiment_chi_sq_batch
+
+    def get_linear_variable_names(self) -> list:
+        """
+        Give names of refined parameters entering the profile linearly.
+
+        They are scales of phases and intensities of background points.
+        """
+        return [name for name in self.get_variable_names()
+                if (name[-2][0], name[-1][0]) in L_NAME_LINEAR]
+
+    def refine_linear_parameters(self, l_crystal, flag_internal=False):
+        """
+        Refine parameters entering the profile linearly.
+
+        The refined scales of phases and intensities of background points
+        are found by weighted linear least squares at fixed other
+        parameters and they are set. The profile is calculated once.
+
+        Arguments
+        ---------
+            - l_crystal: a list of Crystal objects of cryspy library
+            - flag_internal: a flag to calculate internal objects and to
+              give sigmas of the linear parameters (False by default)
+
+        Output
+        ------
+            - chi_sq_val: chi square at found linear parameters
+            - n: number of measured points
+        """
+        l_name = self.get_linear_variable_names()
+        chi_sq_val, n = self.calc_chi_sq(l_crystal, flag_internal=False)
+        if len(l_name) == 0:
+            if flag_internal:
+                chi_sq_val, n = self.calc_chi_sq(l_crystal, flag_internal=True)
+            return chi_sq_val, n
+
+        l_term = self.calc_linear_terms(l_name)
+        chi_sq_val = set_linear_parameters(
+            ParameterVector(self, l_name), l_term, flag_sigma=flag_internal)
+        if flag_internal:
+            chi_sq_val, n = self.calc_chi_sq(l_crystal, flag_internal=True)
+        return chi_sq_val, n
+
+    def calc_linear_terms(self, l_name: list,
+                          d_internal_val: dict = None) -> list:
+        """
+        Give chi square terms over parameters entering the profile linearly.
+
+        The results of the last calc_chi_sq kept in d_internal_val are
+        used, the profile is not calculated.
+
+        Arguments
+        ---------
+            - l_name: names of linear parameters (see
+              get_linear_variable_names)
+            - d_internal_val: dictionary of cached results given to
+              calc_chi_sq (by default the one of the experiment)
+
+        Output
+        ------
+            - l_term: chi square terms (derivatives, model, experiment,
+              sigma, points), see set_linear_parameters
+        """
+        if d_internal_val is None:
+            d_internal_val = self.get_internal_val(flag_internal=False)
+        d_proc = d_internal_val["pd_proc"]
+        cond_u, cond_d, cond_sum, cond_dif = \
+            d_internal_val["chi_sq_conditions"]
+        l_profile_phase = d_internal_val["profile_phase"]
+        flag_polarized = cond_u is not None
+
+        # derivatives of up and down profiles over linear parameters
+        tth_in = d_proc["ttheta"]
+        coeff_bkgd = 1. if flag_polarized else 0.5
+        l_d_u, l_d_d = [], []
+        for name in l_name:
+            index = name[-1][1]
+            if name[-2][0] == "phase":
+                d_u, d_d = l_profile_phase[index]
+            else:
+                background = self.pd_background
+                tth_b = numpy.array(background.ttheta, dtype=float)
+                unit_b = numpy.zeros(tth_b.size, dtype=float)
+                unit_b[index] = coeff_bkgd
+                d_u = numpy.interp(tth_in, tth_b, unit_b)
+                d_d = d_u
+            l_d_u.append(d_u)
+            l_d_d.append(d_d)
+        d_u_2d = numpy.array(l_d_u, dtype=float).transpose()
+        d_d_2d = numpy.array(l_d_d, dtype=float).transpose()
+
+        int_u_mod = d_proc["intensity_up_total"]
+        int_d_mod = d_proc["intensity_down_total"]
+
+        # chi square terms: (derivatives, model, experiment, sigma, points)
+        l_term = []
+        if flag_polarized:
+            chi2 = self.chi2
+            sint_sum = d_proc["intensity_sigma"]
+            int_u_exp = d_proc["intensity_up"]
+            int_d_exp = d_proc["intensity_down"]
+            if chi2.up:
+                l_term.append((d_u_2d, int_u_mod, int_u_exp,
+                               d_proc["intensity_up_sigma"], cond_u))
+            if chi2.down:
+                l_term.append((d_d_2d, int_d_mod, int_d_exp,
+                               d_proc["intensity_down_sigma"], cond_d))
+            if chi2.sum:
+                l_term.append((d_u_2d+d_d_2d, int_u_mod+int_d_mod,
+                               int_u_exp+int_d_exp, sint_sum, cond_sum))
+            if chi2.diff:
+                l_term.append((d_u_2d-d_d_2d, int_u_mod-int_d_mod,
+                               int_u_exp-int_d_exp, sint_sum, cond_dif))
+        else:
+            l_term.append((d_u_2d+d_d_2d, int_u_mod+int_d_mod,
+                           d_proc["intensity"], d_proc["intensity_sigma"],
+                           cond_sum))
+        return l_term
+
     def simulation(self, l_crystal, ttheta_start: float = 4.,
                    ttheta_end: float = 120., ttheta_step: float = 0.1,
                    flag_polarized: bool = True) -> NoReturn:
@@ -502,7 +752,7 @@ class Pd(DataN):
         return
 
     def calc_iint(self, index_h, index_k, index_l, crystal: Crystal,
-                  flag_internal: bool = True):
+                  flag_internal: bool = True, d_internal_val: dict = None):
         """Calculate the integrated intensity for h, k, l reflections.
 
         Arguments
@@ -512,6 +762,8 @@ class Pd(DataN):
             - flag_internal: a flag to calculate or to use internal objects.
                    It should be True if user call the function.
                    It's True by default.
+            - d_internal_val: dictionary of cached results (by default the
+              one of the experiment)
 
         Output
         ------
@@ -521,15 +773,23 @@ class Pd(DataN):
             - refln_s: ReflnSusceptibilityL object of cryspy library
               (nuclear structure factor)
         """
-        if flag_internal:
+        if d_internal_val is None:
             try:
                 d_internal_val = self.d_internal_val
             except AttributeError:
                 d_internal_val = {}
                 self.d_internal_val = d_internal_val
-        else:
-            d_internal_val = {}
-            self.d_internal_val = d_internal_val
+
+        # structure factors are recalculated only if crystal or Miller
+        # indices are changed
+        key_crystal = (crystal.get_version(), flag_internal)
+        hkl = d_internal_val.get(f"hkl_{crystal.data_name:}", None)
+        flag_calc = not(
+            (d_internal_val.get(f"key_crystal_{crystal.data_name:}", None)
+             == key_crystal) and (hkl is not None) and
+            numpy.array_equal(hkl[0], index_h) and
+            numpy.array_equal(hkl[1], index_k) and
+            numpy.array_equal(hkl[2], index_l))
 
         setup = self.setup
         try:
@@ -546,7 +806,7 @@ class Pd(DataN):
             p_d = 0.0
 
         try:
-            if (not(flag_internal) | crystal.is_variables()):
+            if flag_calc:
                 raise KeyError
             refln = d_internal_val[f"refln_{crystal.data_name:}"]
         except KeyError:
@@ -554,11 +814,10 @@ class Pd(DataN):
                                        flag_internal=flag_internal)
             d_internal_val[f"refln_{crystal.data_name:}"] = refln
         f_nucl = refln.numpy_f_calc
-        f_nucl_sq = abs(f_nucl*f_nucl.conjugate())
 
         if isinstance(crystal, Crystal):
             try:
-                if (not(flag_internal) | crystal.is_variables()):
+                if flag_calc:
                     raise KeyError
                 refln_s = d_internal_val[
                     f"refln_susceptibility_{crystal.data_name:}"]
@@ -568,81 +827,53 @@ class Pd(DataN):
                 d_internal_val[f"refln_susceptibility_{crystal.data_name:}"] \
                     = refln_s
 
-            sft_11 = refln_s.numpy_chi_11_calc
-            sft_12 = refln_s.numpy_chi_12_calc
-            sft_13 = refln_s.numpy_chi_13_calc
-            sft_21 = refln_s.numpy_chi_21_calc
-            sft_22 = refln_s.numpy_chi_22_calc
-            sft_23 = refln_s.numpy_chi_23_calc
-            sft_31 = refln_s.numpy_chi_31_calc
-            sft_32 = refln_s.numpy_chi_32_calc
-            sft_33 = refln_s.numpy_chi_33_calc
-
-            sftm_11 = refln_s.numpy_moment_11_calc
-            sftm_12 = refln_s.numpy_moment_12_calc
-            sftm_13 = refln_s.numpy_moment_13_calc
-            sftm_21 = refln_s.numpy_moment_21_calc
-            sftm_22 = refln_s.numpy_moment_22_calc
-            sftm_23 = refln_s.numpy_moment_23_calc
-            sftm_31 = refln_s.numpy_moment_31_calc
-            sftm_32 = refln_s.numpy_moment_32_calc
-            sftm_33 = refln_s.numpy_moment_33_calc
-
-            _11, _12 = sftm_11+field*sft_11, sftm_12+field*sft_12
-            _21, _13 = sftm_21+field*sft_21, sftm_13+field*sft_13
-            _22, _23 = sftm_22+field*sft_22, sftm_23+field*sft_23
-            _31, _32 = sftm_31+field*sft_31, sftm_32+field*sft_32
-            _33 = sftm_33+field*sft_33
-            _ij = (_11, _12, _13, _21, _22, _23, _31, _32, _33)
-            cell = crystal.cell
-
-            # k_loc = cell.calc_k_loc(h, k, l)
-            t_ij = cell.calc_m_t(index_h, index_k, index_l)
-            # FIXME: I would like to recheck the expression for T
-            #        and expression SIGMA = T^T CHI T
-            t_tr_ij = (t_ij[0], t_ij[3], t_ij[6],
-                       t_ij[1], t_ij[4], t_ij[7],
-                       t_ij[2], t_ij[5], t_ij[8])
-            th_11, th_12, th_13, th_21, th_22, th_23, th_31, th_32, th_33 = \
-                calc_mRmCmRT(t_tr_ij, _ij)
-
-            # fm_p_sq = (field**2)*abs(0.5*(th_11*th_11.conjugate()+
-            #            th_22*th_22.conjugate())+th_12*th_12.conjugate())
-            # fm_p_field = field*0.5*(th_11+th_22)
-            fm_p_sq = abs(0.5 * (th_11 * th_11.conjugate() +
-                                 th_22 * th_22.conjugate()) +
-                          th_12 * th_12.conjugate())
-            fm_p_field = 0.5*(th_11 + th_22)
-            cross = 2.*(f_nucl.real*fm_p_field.real +
-                        f_nucl.imag*fm_p_field.imag)
-
-            iint_u = f_nucl_sq + fm_p_sq + p_u*cross
-            iint_d = f_nucl_sq + fm_p_sq - p_d*cross
+            chi_ij = tuple([getattr(refln_s, f"numpy_chi_{ij:}_calc")
+                            for ij in L_IJ])
+            moment_ij = tuple([getattr(refln_s, f"numpy_moment_{ij:}_calc")
+                               for ij in L_IJ])
+            t_ij = crystal.cell.calc_m_t(index_h, index_k, index_l)
+            iint_u, iint_d = calc_iint_by_susceptibility(
+                f_nucl, chi_ij, moment_ij, t_ij, field=field, p_u=p_u,
+                p_d=p_d)
         elif isinstance(crystal, MagCrystal):
             try:
-                if (not(flag_internal) | crystal.is_variables()):
+                if flag_calc:
                     raise KeyError
                 f_mag_perp = d_internal_val[f"f_mag_perp_{crystal.data_name:}"]
 
             except KeyError:
                 f_mag_perp = crystal.calc_f_mag_perp(index_h, index_k, index_l)
                 d_internal_val[f"f_mag_perp_{crystal.data_name:}"] = f_mag_perp
-            f_mag_perp_sq = abs(f_mag_perp*f_mag_perp.conjugate()).sum(axis=0)
-            iint_u = f_nucl_sq + f_mag_perp_sq
-            iint_d = f_nucl_sq + f_mag_perp_sq
+            iint_u, iint_d = calc_iint_by_f_mag_perp(f_nucl, f_mag_perp)
+
+        d_internal_val[f"key_crystal_{crystal.data_name:}"] = key_crystal
+        d_internal_val[f"hkl_{crystal.data_name:}"] = (
+            numpy.copy(index_h), numpy.copy(index_k), numpy.copy(index_l))
         return iint_u, iint_d
 
-    def _gauss_pd(self, tth_2d):
-        """One dimensional gauss powder diffraction."""
-        ag, bg = self.ag, self.bg
-        val_1 = bg*tth_2d**2
-        val_2 = numpy.where(val_1 < 5., numpy.exp(-val_1), 0.)
-        self.gauss_pd = ag*val_2
+    def get_profile_parameters(self):
+        """
+        Give parameters of profile kernels.
 
-    def _lor_pd(self, tth_2d):
-        """One dimensional lorentz powder diffraction."""
-        al, bl = self.al, self.bl
-        self.lor_pd = al*1./(1.+bl*tth_2d**2)
+        Output
+        ------
+            - resolution_parameters: (u, v, w, x, y) of instrument resolution
+            - asymmetry_parameters: (p1, p2, p3, p4) or None
+            - table_step: step of tables of shapes or None
+
+        See function_2_powder_profile.
+        """
+        resolution = self.pd_instr_resolution
+        resolution_parameters = (resolution.u, resolution.v, resolution.w,
+                                 resolution.x, resolution.y)
+        try:
+            asymmetry = self.asymmetry
+            asymmetry_parameters = (asymmetry.p1, asymmetry.p2, asymmetry.p3,
+                                    asymmetry.p4)
+        except AttributeError:
+            asymmetry_parameters = None
+        table_step = self.__dict__.get("profile_table_step", None)
+        return resolution_parameters, asymmetry_parameters, table_step
 
     def calc_shape_profile(
             self, tth, tth_hkl, phase_igsize: float = 0., phase_u: float = 0.,
@@ -655,47 +886,44 @@ class Pd(DataN):
         ttheta_hkl with i_g parameter by default equal to zero
 
         tth, tth_hkl in degrees
-        """
-        zero_shift = float(self.setup.offset_ttheta)
-        tth_zs = tth-zero_shift
 
-        resolution = self.pd_instr_resolution
-
-        h_pv, eta, h_g, h_l, a_g, b_g, a_l, b_l = resolution.calc_resolution(
-            tth_hkl, phase_igsize=phase_igsize, phase_u=phase_u,
-            phase_v=phase_v, phase_w=phase_w, phase_x=phase_x, phase_y=phase_y)
-
-        tth_2d, tth_hkl_2d = numpy.meshgrid(tth_zs, tth_hkl, indexing="ij")
-
-        self.ag = numpy.meshgrid(tth_zs, a_g, indexing="ij")[1]
-        self.bg = numpy.meshgrid(tth_zs, b_g, indexing="ij")[1]
-        self.al = numpy.meshgrid(tth_zs, a_l, indexing="ij")[1]
-        self.bl = numpy.meshgrid(tth_zs, b_l, indexing="ij")[1]
-        eta_2d = numpy.meshgrid(tth_zs, eta, indexing="ij")[1]
-        self.eta = eta_2d
-
-        self._gauss_pd(tth_2d-tth_hkl_2d)
-        self._lor_pd(tth_2d-tth_hkl_2d)
-        g_pd_2d = self.gauss_pd
-        l_pd_2d = self.lor_pd
-
-        np_shape_2d = eta_2d * l_pd_2d + (1.-eta_2d) * g_pd_2d
-
-        try:
-            asymmetry = self.asymmetry
-            np_ass_2d = asymmetry.calc_asymmetry(tth_zs, tth_hkl, h_pv)
-        except AttributeError:
-            np_ass_2d = numpy.ones(shape=np_shape_2d.shape)
-
-        # Lorentz factor
-        tth_rad = tth_zs*numpy.pi/180.
-        np_lor_1d = 1./(numpy.sin(tth_rad)*numpy.sin(0.5*tth_rad))
+        The profile is given in the precision set by cryspy.set_precision.
+        If profile_table_step is given the shapes are interpolated by
+        tables.
+        """
+        tth_zs = tth-float(self.setup.offset_ttheta)
+        resolution_parameters, asymmetry_parameters, table_step = \
+            self.get_profile_parameters()
+        profile_2d, h_pv = calc_shape_profile_pd(
+            tth_zs, tth_hkl, resolution_parameters,
+            phase_parameters=(phase_igsize, phase_u, phase_v, phase_w,
+                              phase_x, phase_y),
+            asymmetry_parameters=asymmetry_parameters, table_step=table_step)
+        return profile_2d, tth_zs, h_pv
 
-        np_lor_2d = numpy.meshgrid(np_lor_1d, tth_hkl, indexing="ij")[0]
+    def calc_shape_profile_windowed(
+            self, tth, tth_hkl, peak_cutoff: float, phase_igsize: float = 0.,
+            phase_u: float = 0., phase_v: float = 0., phase_w: float = 0.,
+            phase_x: float = 0., phase_y: float = 0.):
+        """
+        Calculate shape profile within windows around reflections.
 
-        profile_2d = np_shape_2d*np_ass_2d*np_lor_2d
+        The same profile as given by calc_shape_profile, but each reflection
+        is calculated only for the points within
+        ttheta_hkl +- peak_cutoff*FWHM. The profile is given as a sparse
+        matrix (CSR format) of shape (points, reflections).
 
-        return profile_2d, tth_zs, h_pv
+        tth, tth_hkl in degrees
+        """
+        tth_zs = tth-float(self.setup.offset_ttheta)
+        resolution_parameters, asymmetry_parameters, table_step = \
+            self.get_profile_parameters()
+        profile, h_pv = calc_shape_profile_pd_windowed(
+            tth_zs, tth_hkl, peak_cutoff, resolution_parameters,
+            phase_parameters=(phase_igsize, phase_u, phase_v, phase_w,
+                              phase_x, phase_y),
+            asymmetry_parameters=asymmetry_parameters, table_step=table_step)
+        return profile, tth_zs, h_pv
 
     def params_to_cif(self, separator="_", flag: bool = False,
                       flag_minimal: bool = True) -> str:
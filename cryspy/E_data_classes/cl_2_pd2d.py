@@ -8,10 +8,14 @@ from typing import List, NoReturn
 from cryspy.A_functions_base.function_2_crystallography_base import \
     calc_cos_ang
 from cryspy.A_functions_base.function_1_matrices import calc_mRmCmRT
+from cryspy.A_functions_base.function_1_precision import to_precision
+from cryspy.A_functions_base.function_2_powder_profile import \
+    calc_shape_profile_pd2d
 
 from cryspy.B_parent_classes.cl_1_item import ItemN
 from cryspy.B_parent_classes.cl_2_loop import LoopN
 from cryspy.B_parent_classes.cl_3_data import DataN
+from cryspy.B_parent_classes.cl_5_parameter_vector import ParameterVector
 
 from cryspy.C_item_loop_classes.cl_1_setup import Setup
 from cryspy.C_item_loop_classes.cl_1_diffrn_radiation import \
@@ -37,6 +41,16 @@ from cryspy.C_item_loop_classes.cl_1_texture import Texture
 from cryspy.C_item_loop_classes.cl_1_exclude import ExcludeL
 
 from cryspy.E_data_classes.cl_1_crystal import Crystal
+from cryspy.E_data_classes.cl_2_pd import L_NAME_HKL
+from cryspy.E_data_classes.function_1_chi_sq import set_linear_parameters, \
+    calc_experiment_chi_sq_batch
+
+# items of experiment which define the shapes of reflections
+L_NAME_SHAPE = ("setup", "pd2d_instr_resolution",
+                "pd2d_instr_reflex_asymmetry")
+
+# parameters entering the profile linearly (prefix, attribute)
+L_NAME_LINEAR = (("phase", "scale"), ("pd2d_background", "intensity"))
 
 
 class Pd2d(DataN):
@@ -51,7 +65,13 @@ class Pd2d(DataN):
         - calc_iint_u_d_flip_ratio
         - calc_fr
         - calc_fm_perp_loc
+        - calc_profile
+        - get_internal_val
         - calc_chi_sq
+        - calc_chi_sq_batch
+        - get_linear_variable_names
+        - refine_linear_parameters
+        - calc_linear_terms
         - params_to_cif
         - data_to_cif
         - calc_to_cif
@@ -104,31 +124,43 @@ class Pd2d(DataN):
         for key, attr in kwargs.items():
             setattr(self, key, attr)
 
-    def calc_profile(self, tth, phi, l_crystal: List[Crystal], l_peak_in=None,
-                     l_refln_in=None, l_refln_susceptibility_in=None,
-                     l_dd_in=None, flag_internal: bool = True):
-        """Calculate intensity for the given diffraction angle."""
-        proc = Pd2dProc()  # it is output
-        proc.ttheta = tth
-        proc.phi = phi
+    def calc_profile(self, tth, phi, l_crystal: List[Crystal],
+                     flag_internal: bool = True, d_internal_val: dict = None):
+        """
+        Calculate intensity for the given diffraction angles.
+
+        Arguments
+        ---------
+            - tth, phi: 1D numpy arrays of 2theta and phi in degrees
+            - l_crystal: a list of Crystal objects of cryspy library
+            - flag_internal: a flag to calculate or to use internal objects.
+                   It should be True if user call the function.
+                   It's True by default.
+            - d_internal_val: dictionary of cached results. If it is given
+              the experiment is not changed at flag_internal=False, so that
+              several threads can calculate it at once, each with its own
+              dictionary (by default the one of the experiment).
+
+        Output
+        ------
+            - proc: output profile (Pd2dProc)
+        """
+        if d_internal_val is None:
+            d_internal_val = self.get_internal_val(flag_internal)
 
         background = self.pd2d_background
         int_bkgd = background.interpolate_by_points(tth, phi)
-        proc.intensity_bkg_calc = int_bkgd
-
-        tth_rad = tth*numpy.pi/180.
-        phi_rad = phi*numpy.pi/180.
-        cos_theta_1d = numpy.cos(0.5*tth_rad)
-        sin_phi_1d = numpy.sin(phi_rad)
 
         setup = self.setup
-        wavelength = setup.wavelength
+        wavelength = float(setup.wavelength)
         diffrn_radiation = self.diffrn_radiation
-        if setup.offset_phi is None:
-            setup.offset_phi = 0.
-
         phi_0 = setup.offset_phi
+        if phi_0 is None:
+            phi_0 = 0.
+
+        tth_rad = tth*numpy.pi/180.
         phi_rad = (phi-phi_0)*numpy.pi/180.
+        cos_theta_1d = numpy.cos(0.5*tth_rad)
         sin_phi_1d = numpy.sin(phi_rad)
 
         p_u = float(diffrn_radiation.polarization)
@@ -142,8 +174,13 @@ class Pd2d(DataN):
         sthovl_min = numpy.sin(0.5*tth_min*numpy.pi/180.)/wavelength
         sthovl_max = numpy.sin(0.5*tth_max*numpy.pi/180.)/wavelength
 
+        # the 3d arrays are kept for the same points of the profile
+        key_points = (tth.tobytes(), phi.tobytes(), float(phi_0))
+        key_shape = (self.get_version(L_NAME_SHAPE), key_points)
+
         res_u_2d = numpy.zeros((tth.shape[0], phi.shape[0]), dtype=float)
         res_d_2d = numpy.zeros((tth.shape[0], phi.shape[0]), dtype=float)
+        tth_zs = tth-float(setup.offset_ttheta)
 
         try:
             texture = self.texture
@@ -153,34 +190,12 @@ class Pd2d(DataN):
         except AttributeError:
             texture = None
 
+        # profiles of phases at unit scale for refine_linear_parameters
+        l_profile_phase = []
+        d_internal_val["profile_phase"] = l_profile_phase
+
         phase = self.phase
-        _h = len(phase.label)
-        if l_peak_in is None:
-            l_peak_in = len(phase.label) * [None]
-        else:
-            if _h != len(l_peak_in):
-                l_peak_in = len(phase.label) * [None]
-        if l_refln_in is None:
-            l_refln_in = len(phase.label) * [None]
-        else:
-            if _h != len(l_refln_in):
-                l_refln_in = len(phase.label) * [None]
-        if l_refln_susceptibility_in is None:
-            l_refln_susceptibility_in = len(phase.label) * [None]
-        else:
-            if _h != len(l_refln_susceptibility_in):
-                l_refln_susceptibility_in = len(phase.label) * [None]
-        if l_dd_in is None:
-            l_dd_in = len(phase.label) * [None]
-        else:
-            if _h != len(l_dd_in):
-                l_dd_in = len(phase.label) * [None]
-
-        l_peak, l_dd_out = [], []
-        l_refln, l_refln_s = [], []
-        for item_phase, peak_in, refln_in, refln_susceptibility_in, dd_in in \
-                zip(phase.items, l_peak_in, l_refln_in,
-                    l_refln_susceptibility_in, l_dd_in):
+        for item_phase in phase.items:
             phase_label = item_phase.label
             phase_scale = item_phase.scale
             try:
@@ -214,7 +229,7 @@ class Pd2d(DataN):
             except AttributeError:
                 phase_y = 0.
 
-            dd_out = {}
+            ind_cry = None
             for i_crystal, crystal in enumerate(l_crystal):
                 if crystal.data_name.lower() == phase_label.lower():
                     ind_cry = i_crystal
@@ -222,77 +237,71 @@ class Pd2d(DataN):
             if ind_cry is None:
                 warn(f"Crystal with name '{phase_label:}' is not found.",
                      UserWarning)
-                return
+                l_profile_phase.append((numpy.zeros_like(res_u_2d),
+                                        numpy.zeros_like(res_d_2d)))
+                continue
 
             crystal = l_crystal[ind_cry]
-
             cell = crystal.cell
-            space_group = crystal.space_group
 
-            if peak_in is not None:
-                index_h = peak_in.numpy_index_h
-                index_k = peak_in.numpy_index_k
-                index_l = peak_in.numpy_index_l
-                mult = peak_in.numpy_index_mult
+            key_peak = (crystal.get_version(L_NAME_HKL),
+                        float(sthovl_min), float(sthovl_max), texture is None)
+            if (d_internal_val.get(f"key_peak_{crystal.data_name:}", None)
+                    == key_peak):
+                peak = d_internal_val[f"peak_{crystal.data_name:}"]
+                index_h = peak.numpy_index_h
+                index_k = peak.numpy_index_k
+                index_l = peak.numpy_index_l
+                mult = peak.numpy_index_mult
             else:
                 if texture is None:
-                    index_h, index_k, index_l, mult = cell.calc_hkl(
-                        space_group, sthovl_min, sthovl_max)
-                else:
-                    index_h, index_k, index_l, mult = cell.calc_hkl_in_range(
+                    index_h, index_k, index_l, mult = crystal.calc_hkl(
                         sthovl_min, sthovl_max)
-
-            peak = Pd2dPeakL(loop_name=phase_label)
-            peak.numpy_index_h = index_h
-            peak.numpy_index_k = index_k
-            peak.numpy_index_l = index_l
-            peak.numpy_index_mult = mult
-            peak.numpy_to_items()
-
-            cond_1 = len(crystal.get_variable_names()) == 0
-            cond_2 = (peak_in is not None) & (refln_in is not None)
-
-            if (cond_1 & cond_2):
-                f_nucl_sq = peak_in.numpy_f_nucl_sq
-                f_m_p_sin_sq = peak_in.numpy_f_m_p_sin_sq
-                f_m_p_cos_sq = peak_in.numpy_f_m_p_cos_sq
-                cross_sin = peak_in.numpy_cross_sin
-                refln = refln_in
-                refln_s = refln_susceptibility_in
-            else:
-                f_nucl_sq, f_m_p_sin_sq, f_m_p_cos_sq, cross_sin, refln, \
-                    refln_s = self.calc_for_iint(index_h, index_k, index_l,
-                                                 crystal)
-                refln.loop_name = phase_label
-                refln_s.loop_name = phase_label
-            l_refln.append(refln)
-            l_refln_s.append(refln_s)
+                else:
+                    index_h, index_k, index_l, mult = \
+                        crystal.calc_hkl_in_range(sthovl_min, sthovl_max)
+                peak = Pd2dPeakL(loop_name=phase_label)
+                peak.numpy_index_h = numpy.array(index_h, dtype=int)
+                peak.numpy_index_k = numpy.array(index_k, dtype=int)
+                peak.numpy_index_l = numpy.array(index_l, dtype=int)
+                peak.numpy_index_mult = numpy.array(mult, dtype=int)
+                d_internal_val[f"peak_{crystal.data_name:}"] = peak
+                d_internal_val[f"key_peak_{crystal.data_name:}"] = key_peak
+
+            f_nucl_sq, f_m_p_sin_sq, f_m_p_cos_sq, cross_sin, refln, \
+                refln_s = self.calc_for_iint(
+                    index_h, index_k, index_l, crystal,
+                    flag_internal=flag_internal,
+                    d_internal_val=d_internal_val)
 
             peak.numpy_f_nucl_sq = f_nucl_sq
             peak.numpy_f_m_p_sin_sq = f_m_p_sin_sq
             peak.numpy_f_m_p_cos_sq = f_m_p_cos_sq
             peak.numpy_cross_sin = cross_sin
 
-            cond_1 = dd_in is not None
-            cond_2 = ((len(crystal.get_variable_names()) == 0) &
-                      (not(diffrn_radiation.polarization_refinement)) &
-                      (not(diffrn_radiation.efficiency_refinement)))
-            if cond_1 & cond_2:
-                iint_u_3d, iint_d_3d = dd_in["iint_u_3d"], dd_in["iint_d_3d"]
-                cos_theta_3d = dd_in["cos_theta_3d"]
-                sin_phi_3d = dd_in["sin_phi_3d"]
+            key_iint = (
+                key_peak, d_internal_val[f"key_crystal_{crystal.data_name:}"],
+                float(setup.field), p_u, p_d, key_points)
+            if (d_internal_val.get(f"key_iint_3d_{crystal.data_name:}", None)
+                    == key_iint):
+                iint_u_3d, iint_d_3d, cos_theta_3d, sin_phi_3d = \
+                    d_internal_val[f"iint_3d_{crystal.data_name:}"]
             else:
                 cos_theta_3d, sin_phi_3d, mult_f_n_3d = numpy.meshgrid(
-                    cos_theta_1d, sin_phi_1d, mult*f_nucl_sq, indexing="ij")
+                    to_precision(cos_theta_1d), to_precision(sin_phi_1d),
+                    to_precision(mult*f_nucl_sq), indexing="ij")
 
                 mult_f_m_c_3d = numpy.meshgrid(
-                    tth_rad, phi_rad, mult*f_m_p_cos_sq, indexing="ij")[2]
+                    tth_rad, phi_rad, to_precision(mult*f_m_p_cos_sq),
+                    indexing="ij")[2]
 
                 hh_u_s_3d = numpy.meshgrid(
-                    tth_rad, phi_rad, mult*(f_m_p_sin_sq+p_u*cross_sin),
+                    tth_rad, phi_rad,
+                    to_precision(mult*(f_m_p_sin_sq+p_u*cross_sin)),
                     indexing="ij")[2]
                 hh_d_s_3d = numpy.meshgrid(
-                    tth_rad, phi_rad, mult*(f_m_p_sin_sq-p_d*cross_sin),
+                    tth_rad, phi_rad,
+                    to_precision(mult*(f_m_p_sin_sq-p_d*cross_sin)),
                     indexing="ij")[2]
 
                 c_a_sq_3d = (cos_theta_3d * sin_phi_3d)**2
@@ -301,10 +310,9 @@ class Pd2d(DataN):
                              mult_f_m_c_3d*c_a_sq_3d)
                 iint_d_3d = (mult_f_n_3d + hh_d_s_3d*s_a_sq_3d +
                              mult_f_m_c_3d*c_a_sq_3d)
-            dd_out["cos_theta_3d"] = cos_theta_3d
-            dd_out["sin_phi_3d"] = sin_phi_3d
-            dd_out["iint_u_3d"] = iint_u_3d
-            dd_out["iint_d_3d"] = iint_d_3d
+                d_internal_val[f"iint_3d_{crystal.data_name:}"] = (
+                    iint_u_3d, iint_d_3d, cos_theta_3d, sin_phi_3d)
+                d_internal_val[f"key_iint_3d_{crystal.data_name:}"] = key_iint
 
             sthovl_hkl = cell.calc_sthovl(index_h, index_k, index_l)
             tth_hkl_rad = numpy.where(sthovl_hkl*wavelength < 1.,
@@ -312,47 +320,38 @@ class Pd2d(DataN):
                                       numpy.pi)
             tth_hkl = tth_hkl_rad*180./numpy.pi
 
-            cond_1 = dd_in is not None
-            flag_phase_uvwxy_ref = (
-                item_phase.igsize_refinement | item_phase.u_refinement |
-                item_phase.v_refinement | item_phase.w_refinement |
-                item_phase.x_refinement | item_phase.y_refinement)
-            cond_2 = ((not(flag_phase_uvwxy_ref)) &
-                      (not(self.pd2d_instr_resolution.is_variables())) &
-                      (not(setup.is_variables())))
-            if cond_1 & cond_2:
-                profile_3d, tth_zs = dd_in["profile_3d"], dd_in["tth_zs"]
-                h_pv = dd_in["h_pv"]
+            phase_parameters = (phase_igsize, phase_u, phase_v, phase_w,
+                                phase_x, phase_y)
+            key_profile = (key_peak, cell.get_version(), phase_parameters,
+                           key_shape)
+            if (d_internal_val.get(f"key_profile_3d_{crystal.data_name:}",
+                                   None) == key_profile):
+                profile_3d, h_pv = d_internal_val[
+                    f"profile_3d_{crystal.data_name:}"]
             else:
                 profile_3d, tth_zs, h_pv = self.calc_shape_profile(
                     tth, phi, tth_hkl, phase_igsize=phase_igsize,
                     phase_u=phase_u, phase_v=phase_v, phase_w=phase_w,
                     phase_x=phase_x, phase_y=phase_y)
-            dd_out["profile_3d"] = profile_3d
-            dd_out["tth_zs"] = tth_zs
-            dd_out["h_pv"] = h_pv
+                d_internal_val[f"profile_3d_{crystal.data_name:}"] = (
+                    profile_3d, h_pv)
+                d_internal_val[f"key_profile_3d_{crystal.data_name:}"] = \
+                    key_profile
 
             peak.numpy_ttheta = tth_hkl + setup.offset_ttheta
-            peak.width_ttheta = h_pv
-            peak.numpy_to_items()
+            peak.numpy_width_ttheta = h_pv
 
             # texture
             if texture is not None:
-                cond_1 = dd_in is not None
-                cond_2 = ((not(setup.offset_phi_refinement)))
-                if cond_1 & cond_2:
-                    cos_alpha_ang_3d = dd_in["cos_alpha_ang_3d"]
-                    sin_alpha_ang_3d = dd_in["sin_alpha_ang_3d"]
+                key_texture = (key_peak, texture.get_version(),
+                               cell.get_version(), key_points)
+                if (d_internal_val.get(f"key_texture_{crystal.data_name:}",
+                                       None) == key_texture):
+                    texture_3d = d_internal_val[
+                        f"texture_3d_{crystal.data_name:}"]
                 else:
                     cos_alpha_ang_3d = cos_theta_3d * sin_phi_3d
                     sin_alpha_ang_3d = numpy.sqrt(1.-cos_alpha_ang_3d**2)
-                dd_out["cos_alpha_ang_3d"] = cos_alpha_ang_3d
-                dd_out["sin_alpha_ang_3d"] = sin_alpha_ang_3d
-                cond_2 = (cond_2 & (not(texture.is_variables())) &
-                          (not(cell.is_variables())))
-                if cond_1 & cond_2:
-                    texture_3d = dd_in["texture_3d"]
-                else:
                     cos_alpha_ax = calc_cos_ang(cell, h_ax, k_ax, l_ax,
                                                 index_h, index_k, index_l)
 
@@ -365,9 +364,12 @@ class Pd2d(DataN):
                                                      indexing="ij")[2]
                     cos_alpha_3d = cos_alpha_ax_3d*cos_alpha_ang_3d + \
                         sin_alpha_ax_3d*sin_alpha_ang_3d
-                    texture_3d = g_2 + (1.-g_2) * \
-                        (1./g_1 + (g_1**2-1./g_1)*cos_alpha_3d**2)**(-1.5)
-                dd_out["texture_3d"] = texture_3d
+                    texture_3d = to_precision(g_2 + (1.-g_2) * (
+                        1./g_1 + (g_1**2-1./g_1)*cos_alpha_3d**2)**(-1.5))
+                    d_internal_val[f"texture_3d_{crystal.data_name:}"] = \
+                        texture_3d
+                    d_internal_val[f"key_texture_{crystal.data_name:}"] = \
+                        key_texture
 
                 profile_3d = profile_3d*texture_3d
 
@@ -375,11 +377,19 @@ class Pd2d(DataN):
             res_d_3d = profile_3d*iint_d_3d
 
             # 0.5 to have the same meaning for scale factor as in FullProf
-            res_u_2d += 0.5*phase_scale*res_u_3d.sum(axis=2)
-            res_d_2d += 0.5*phase_scale*res_d_3d.sum(axis=2)
-            l_peak.append(peak)
-            l_dd_out.append(dd_out)
+            profile_u_2d = 0.5*res_u_3d.sum(axis=2, dtype=numpy.float64)
+            profile_d_2d = 0.5*res_d_3d.sum(axis=2, dtype=numpy.float64)
+            l_profile_phase.append((profile_u_2d, profile_d_2d))
+            res_u_2d += phase_scale*profile_u_2d
+            res_d_2d += phase_scale*profile_d_2d
+
+            if flag_internal:
+                peak.numpy_to_items()
 
+        proc = Pd2dProc()  # it is output
+        proc.ttheta = tth
+        proc.phi = phi
+        proc.intensity_bkg_calc = int_bkgd
         proc.ttheta_corrected = tth_zs
         proc.intensity_up_net = res_u_2d
         proc.intensity_down_net = res_d_2d
@@ -392,13 +402,37 @@ class Pd2d(DataN):
             proc.form_ttheta_phi_intensity_down_net()
             proc.form_ttheta_phi_intensity_up_total()
             proc.form_ttheta_phi_intensity_down_total()
-        l_calc_objs = l_refln + l_refln_s + l_peak
-        l_calc_objs.append(proc)
-        self.add_items(l_calc_objs)
+            l_calc_objs = []
+            for crystal in l_crystal:
+                for name in ("refln", "refln_susceptibility", "peak"):
+                    try:
+                        l_calc_objs.append(
+                            d_internal_val[f"{name:}_{crystal.data_name:}"])
+                    except KeyError:
+                        pass
+            l_calc_objs.append(proc)
+            self.add_items(l_calc_objs)
+        return proc
+
+    def get_internal_val(self, flag_internal: bool = True) -> dict:
+        """
+        Give dictionary of cached results of the experiment.
 
-        return proc, l_peak, l_refln, l_dd_out
+        A new dictionary is created at flag_internal=True.
+        """
+        if flag_internal:
+            d_internal_val = {}
+            self.d_internal_val = d_internal_val
+            return d_internal_val
+        try:
+            d_internal_val = self.d_internal_val
+        except AttributeError:
+            d_internal_val = {}
+            self.d_internal_val = d_internal_val
+        return d_internal_val
 
-    def calc_chi_sq(self, l_crystal, flag_internal: bool = True):
+    def calc_chi_sq(self, l_crystal, flag_internal: bool = True,
+                    d_internal_val: dict = None):
         """
         Calculate chi square.
 
@@ -407,6 +441,8 @@ class Pd2d(DataN):
             - l_crystal: a list of Crystal objects of cryspy library
             - flag_internal: a flag to calculate internal objects
               (default is True)
+            - d_internal_val: dictionary of cached results (see
+              calc_profile)
 
         Output arguments
         ----------------
@@ -423,30 +459,6 @@ class Pd2d(DataN):
         int_d_exp = meas.intensity_down
         sint_d_exp = meas.intensity_down_sigma
 
-        l_peak_in, l_refln_in = [], []
-        l_refln_susceptibility_in = []
-        l_dd_in = []
-        flag_1 = not(flag_internal)
-
-        try:
-            dd = self.dd
-            flag_2 = True
-        except AttributeError:
-            flag_2 = False
-        if (flag_1 & flag_2):
-            for phase_item in self.phase.items:
-                crystal = None
-                for cryst in l_crystal:
-                    if cryst.data_name.lower() == phase_item.label.lower():
-                        crystal = cryst
-                        break
-                attr_peak = f"pd2d_peak_{crystal.data_name:}"
-                attr_refln = f"refln_{crystal.data_name:}"
-                attr_refln_s = f"refln_susceptibility_{crystal.data_name:}"
-                l_peak_in.append(getattr(self, attr_peak))
-                l_refln_in.append(getattr(self, attr_refln))
-                l_refln_susceptibility_in.append(getattr(self, attr_refln_s))
-
         cond_tth_in = numpy.ones(tth.size, dtype=bool)
         cond_phi_in = numpy.ones(phi.size, dtype=bool)
         try:
@@ -471,21 +483,16 @@ class Pd2d(DataN):
         int_d_exp_in = int_d_exp[cond_tth_in, :][:, cond_phi_in]
         sint_d_exp_in = sint_d_exp[cond_tth_in, :][:, cond_phi_in]
 
-        proc, l_peak, l_refln, l_dd_out = self.calc_profile(
-            tth_in, phi_in, l_crystal, l_peak_in=l_peak_in,
-            l_refln_in=l_refln_in,
-            l_refln_susceptibility_in=l_refln_susceptibility_in,
-            l_dd_in=l_dd_in, flag_internal=flag_internal)
+        if d_internal_val is None:
+            d_internal_val = self.get_internal_val(flag_internal)
+        proc = self.calc_profile(
+            tth_in, phi_in, l_crystal, flag_internal=flag_internal,
+            d_internal_val=d_internal_val)
         proc.intensity_up = int_u_exp_in
         proc.intensity_up_sigma = sint_u_exp_in
         proc.intensity_down = int_d_exp_in
         proc.intensity_down_sigma = sint_d_exp_in
 
-        # self.proc = proc
-        # self.peaks = l_peak
-        # self.reflns = l_refln
-        self.dd = l_dd_out
-
         int_u_mod = proc.intensity_up_total
         int_d_mod = proc.intensity_down_total
 
@@ -525,6 +532,10 @@ class Pd2d(DataN):
                 cond_sum = numpy.logical_and(cond_sum, cond_12)
         except AttributeError:
             pass
+        # kept for refine_linear_parameters
+        d_internal_val["pd2d_proc"] = proc
+        d_internal_val["chi_sq_conditions"] = (cond_u, cond_d, cond_sum,
+                                               cond_dif)
 
         chi_sq_u_val = (chi_sq_u[cond_u]).sum()
         n_u = cond_u.sum()
@@ -565,15 +576,158 @@ class Pd2d(DataN):
             proc.form_ttheta_phi_intensity_down_sigma()
         return chi_sq_val, n
 
+    calc_chi_sq_batch = calc_experiment_chi_sq_batch
+
+    def get_linear_variable_names(self) -> list:
+        """
+        Give names of refined parameters entering the profile linearly.
+
+        They are scales of phases and intensities of background points.
+        """
+        return [name for name in self.get_variable_names()
+                if (name[-2][0], name[-1][0]) in L_NAME_LINEAR]
+
+    def refine_linear_parameters(self, l_crystal, flag_internal=False):
+        """
+        Refine parameters entering the profile linearly.
+
+        The refined scales of phases and intensities of background points
+        are found by weighted linear least squares at fixed other
+        parameters and they are set. The profile is calculated once.
+
+        Arguments
+        ---------
+            - l_crystal: a list of Crystal objects of cryspy library
+            - flag_internal: a flag to calculate internal objects and to
+              give sigmas of the linear parameters (False by default)
+
+        Output
+        ------
+            - chi_sq_val: chi square at found linear parameters
+            - n: number of measured points
+        """
+        l_name = self.get_linear_variable_names()
+        chi_sq_val, n = self.calc_chi_sq(l_crystal, flag_internal=False)
+        if len(l_name) == 0:
+            if flag_internal:
+                chi_sq_val, n = self.calc_chi_sq(l_crystal, flag_internal=True)
+            return chi_sq_val, n
+
+        l_term = self.calc_linear_terms(l_name)
+        chi_sq_val = set_linear_parameters(
+            ParameterVector(self, l_name), l_term, flag_sigma=flag_internal)
+        if flag_internal:
+            chi_sq_val, n = self.calc_chi_sq(l_crystal, flag_internal=True)
+        return chi_sq_val, n
+
+    def calc_linear_terms(self, l_name: list,
+                          d_internal_val: dict = None) -> list:
+        """
+        Give chi square terms over parameters entering the profile linearly.
+
+        The results of the last calc_chi_sq kept in d_internal_val are
+        used, the profile is not calculated.
+
+        Arguments
+        ---------
+            - l_name: names of linear parameters (see
+              get_linear_variable_names)
+            - d_internal_val: dictionary of cached results given to
+              calc_chi_sq (by default the one of the experiment)
+
+        Output
+        ------
+            - l_term: chi square terms (derivatives, model, experiment,
+              sigma, points), see set_linear_parameters
+        """
+        if d_internal_val is None:
+            d_internal_val = self.get_internal_val(flag_internal=False)
+        proc = d_internal_val["pd2d_proc"]
+        cond_u, cond_d, cond_sum, cond_dif = \
+            d_internal_val["chi_sq_conditions"]
+        l_profile_phase = d_internal_val["profile_phase"]
+
+        # derivatives of up and down profiles over linear parameters,
+        # the background point (i, j) gives the bilinear weights of it
+        weight_tth, weight_phi = \
+            self.pd2d_background.calc_interpolation_weights(proc.ttheta,
+                                                            proc.phi)
+        l_d_u, l_d_d = [], []
+        for name in l_name:
+            index = name[-1][1]
+            if name[-2][0] == "phase":
+                d_u, d_d = l_profile_phase[index]
+            else:
+                d_u = numpy.outer(weight_tth[:, index[0]],
+                                  weight_phi[:, index[1]])
+                d_d = d_u
+            l_d_u.append(d_u.flatten())
+            l_d_d.append(d_d.flatten())
+        d_u_2d = numpy.array(l_d_u, dtype=float).transpose()
+        d_d_2d = numpy.array(l_d_d, dtype=float).transpose()
+
+        int_u_mod = proc.intensity_up_total.flatten()
+        int_d_mod = proc.intensity_down_total.flatten()
+        int_u_exp = proc.intensity_up.flatten()
+        int_d_exp = proc.intensity_down.flatten()
+        sint_u = proc.intensity_up_sigma.flatten()
+        sint_d = proc.intensity_down_sigma.flatten()
+        sint_sum = numpy.sqrt(numpy.square(sint_u)+numpy.square(sint_d))
+
+        # chi square terms: (derivatives, model, experiment, sigma, points)
+        chi2 = self.chi2
+        l_term = []
+        if chi2.up:
+            l_term.append((d_u_2d, int_u_mod, int_u_exp, sint_u,
+                           cond_u.flatten()))
+        if chi2.down:
+            l_term.append((d_d_2d, int_d_mod, int_d_exp, sint_d,
+                           cond_d.flatten()))
+        if chi2.sum:
+            l_term.append((d_u_2d+d_d_2d, int_u_mod+int_d_mod,
+                           int_u_exp+int_d_exp, sint_sum, cond_sum.flatten()))
+        if chi2.diff:
+            l_term.append((d_u_2d-d_d_2d, int_u_mod-int_d_mod,
+                           int_u_exp-int_d_exp, sint_sum, cond_dif.flatten()))
+        return l_term
+
     def calc_for_iint(self, index_h, index_k, index_l, crystal,
-                      flag_internal: bool = True):
-        """Calculate the integral intensity for h, k, l reflections."""
+                      flag_internal: bool = True, d_internal_val: dict = None):
+        """
+        Calculate the integral intensity for h, k, l reflections.
+
+        The structure factors are kept in d_internal_val (by default the one
+        of the experiment) and they are recalculated only if crystal or
+        Miller indices are changed.
+        """
+        if d_internal_val is None:
+            d_internal_val = self.get_internal_val(flag_internal=False)
         setup = self.setup
         field = float(setup.field)
 
-        refln = crystal.calc_refln(index_h, index_k, index_l)
-
-        refln_s = crystal.calc_refln_susceptibility(index_h, index_k, index_l)
+        key_crystal = (crystal.get_version(), flag_internal)
+        hkl = d_internal_val.get(f"hkl_{crystal.data_name:}", None)
+        flag_calc = not(
+            (d_internal_val.get(f"key_crystal_{crystal.data_name:}", None)
+             == key_crystal) and (hkl is not None) and
+            numpy.array_equal(hkl[0], index_h) and
+            numpy.array_equal(hkl[1], index_k) and
+            numpy.array_equal(hkl[2], index_l))
+        if flag_calc:
+            refln = crystal.calc_refln(index_h, index_k, index_l,
+                                       flag_internal=flag_internal)
+            refln_s = crystal.calc_refln_susceptibility(
+                index_h, index_k, index_l, flag_internal=flag_internal)
+            d_internal_val[f"refln_{crystal.data_name:}"] = refln
+            d_internal_val[f"refln_susceptibility_{crystal.data_name:}"] = \
+                refln_s
+            d_internal_val[f"key_crystal_{crystal.data_name:}"] = key_crystal
+            d_internal_val[f"hkl_{crystal.data_name:}"] = (
+                numpy.copy(index_h), numpy.copy(index_k), numpy.copy(index_l))
+        else:
+            refln = d_internal_val[f"refln_{crystal.data_name:}"]
+            refln_s = d_internal_val[
+                f"refln_susceptibility_{crystal.data_name:}"]
 
         f_nucl = refln.numpy_f_calc
 
@@ -632,18 +786,6 @@ class Pd2d(DataN):
 
         return f_nucl_sq, f_m_p_sin_sq, f_m_p_cos_sq, cross_sin, refln, refln_s
 
-    def _gauss_pd(self, tth_2d):
-        """One dimensional gauss powder diffraction."""
-        ag, bg = self.ag, self.bg
-        val_1 = bg*tth_2d**2
-        val_2 = numpy.where(val_1 < 5., numpy.exp(-val_1), 0.)
-        self.gauss_pd = ag*val_2
-
-    def _lor_pd(self, tth_2d):
-        """One dimensional lorentz powder diffraction."""
-        al, bl = self.al, self.bl
-        self.lor_pd = al*1./(1.+bl*tth_2d**2)
-
     def calc_shape_profile(
             self, tth, phi, tth_hkl, phase_igsize: float = 0.,
             phase_u: float = 0., phase_v: float = 0., phase_w: float = 0.,
@@ -655,46 +797,26 @@ class Pd2d(DataN):
         ttheta_hkl with i_g parameter by default equal to zero
 
         tth, phi, tth_hkl in degrees
+
+        The profile is given in the precision set by cryspy.set_precision.
         """
-        setup = self.setup
-        zero_shift = float(setup.offset_ttheta)
-        tth_zs = tth-zero_shift
+        tth_zs = tth-float(self.setup.offset_ttheta)
 
         resolution = self.pd2d_instr_resolution
+        resolution_parameters = (resolution.u, resolution.v, resolution.w,
+                                 resolution.x, resolution.y)
+        try:
+            asymmetry = self.pd2d_instr_reflex_asymmetry
+            asymmetry_parameters = (asymmetry.p1, asymmetry.p2, asymmetry.p3,
+                                    asymmetry.p4)
+        except AttributeError:
+            asymmetry_parameters = None
 
-        h_pv, eta, h_g, h_l, a_g, b_g, a_l, b_l = resolution.calc_resolution(
-            tth_hkl, phase_igsize=phase_igsize, phase_u=phase_u,
-            phase_v=phase_v, phase_w=phase_w, phase_x=phase_x, phase_y=phase_y)
-
-        tth_3d, phi_3d, tth_hkl_3d = numpy.meshgrid(tth_zs, phi, tth_hkl,
-                                                    indexing="ij")
-
-        self.ag = numpy.meshgrid(tth_zs, phi, a_g, indexing="ij")[2]
-        self.bg = numpy.meshgrid(tth_zs, phi, b_g, indexing="ij")[2]
-        self.al = numpy.meshgrid(tth_zs, phi, a_l, indexing="ij")[2]
-        self.bl = numpy.meshgrid(tth_zs, phi, b_l, indexing="ij")[2]
-        eta_3d = numpy.meshgrid(tth_zs, phi, eta, indexing="ij")[2]
-        self.eta = eta_3d
-
-        self._gauss_pd(tth_3d-tth_hkl_3d)
-        self._lor_pd(tth_3d-tth_hkl_3d)
-        g_pd2d_3d = self.gauss_pd
-        l_pd2d_3d = self.lor_pd
-
-        np_shape_3d = eta_3d * l_pd2d_3d + (1.-eta_3d) * g_pd2d_3d
-
-        asymmetry = self.pd2d_instr_reflex_asymmetry
-        np_ass_2d = asymmetry.calc_asymmetry(tth_zs, tth_hkl, h_pv)
-        np_ass_3d = np_ass_2d[:, numpy.newaxis, :] * numpy.ones(
-            phi.size, dtype=float)[numpy.newaxis, :, numpy.newaxis]
-
-        # Lorentz factor
-        tth_rad = tth_zs*numpy.pi/180.
-        np_lor_1d = 1./(numpy.sin(tth_rad)*numpy.sin(0.5*tth_rad))
-        np_lor_3d = numpy.meshgrid(np_lor_1d, phi, tth_hkl, indexing="ij")[0]
-
-        profile_3d = np_shape_3d*np_ass_3d*np_lor_3d
-
+        profile_3d, h_pv = calc_shape_profile_pd2d(
+            tth_zs, phi, tth_hkl, resolution_parameters,
+            phase_parameters=(phase_igsize, phase_u, phase_v, phase_w,
+                              phase_x, phase_y),
+            asymmetry_parameters=asymmetry_parameters)
         return profile_3d, tth_zs, h_pv
 
     def params_to_cif(self, separator="_", flag: bool = False,
@@ -7,7 +7,9 @@ from typing import NoReturn
 
 from cryspy.A_functions_base.function_2_crystallography_base import \
     calc_cos_ang
-from cryspy.A_functions_base.function_1_matrices import calc_mRmCmRT
+from cryspy.A_functions_base.function_2_powder_profile import \
+    calc_iint_by_susceptibility, calc_iint_by_f_mag_perp, L_IJ
+from cryspy.A_functions_base.function_1_precision import to_precision
 
 from cryspy.B_parent_classes.cl_1_item import ItemN
 from cryspy.B_parent_classes.cl_2_loop import LoopN
@@ -37,6 +39,13 @@ from cryspy.C_item_loop_classes.cl_1_tof_profile import TOFProfile
 
 from cryspy.E_data_classes.cl_1_crystal import Crystal
 from cryspy.E_data_classes.cl_1_mag_crystal import MagCrystal
+from cryspy.E_data_classes.function_1_chi_sq import \
+    calc_experiment_chi_sq_batch
+
+
+# items of crystal which define the list of reflections
+L_NAME_HKL = ("cell", "space_group", "space_group_symop_magn_operation",
+              "space_group_symop_magn_centering")
 
 
 class TOF(DataN):
@@ -84,7 +93,7 @@ class TOF(DataN):
             setattr(self, key, attr)
 
     def calc_profile(self, time, l_crystal, flag_internal: bool = True,
-                     flag_polarized: bool = True):
+                     flag_polarized: bool = True, d_internal_val: dict = None):
         """Calculate intensity for the given diffraction angles.
 
         Arguments
@@ -100,6 +109,10 @@ class TOF(DataN):
             - flag_internal: a flag to calculate or to use internal objects.
                    It should be True if user call the function.
                    It's True by default.
+            - d_internal_val: dictionary of cached results. If it is given
+              the experiment is not changed at flag_internal=False, so that
+              several threads can calculate it at once, each with its own
+              dictionary (by default the one of the experiment).
 
         Output
         ------
@@ -107,7 +120,9 @@ class TOF(DataN):
             - l_peak: data about peaks
             - l_refln: data about nuclear structure factor
         """
-        if flag_internal:
+        if d_internal_val is not None:
+            pass
+        elif flag_internal:
             d_internal_val = {}
             self.d_internal_val = d_internal_val
         else:
@@ -169,14 +184,16 @@ class TOF(DataN):
 
             scale = phase_scale
 
-            try:
+            key_peak = (crystal.get_version(L_NAME_HKL),
+                        float(sthovl_min), float(sthovl_max), texture is None)
+            if (d_internal_val.get(f"key_peak_{crystal.data_name:}", None)
+                    == key_peak):
                 peak = d_internal_val[f"peak_{crystal.data_name:}"]
                 index_h = peak.numpy_index_h
                 index_k = peak.numpy_index_k
                 index_l = peak.numpy_index_l
                 mult = peak.numpy_index_multiplicity
-                cond_2 = True
-            except KeyError:
+            else:
                 if texture is None:
                     index_h, index_k, index_l, mult = crystal.calc_hkl(
                         sthovl_min, sthovl_max)
@@ -189,18 +206,13 @@ class TOF(DataN):
                 peak.numpy_index_l = numpy.array(index_l, dtype=int)
                 peak.numpy_index_multiplicity = numpy.array(mult, dtype=int)
                 d_internal_val[f"peak_{crystal.data_name:}"] = peak
-                cond_2 = False
+                d_internal_val[f"key_peak_{crystal.data_name:}"] = key_peak
 
-            cond_1 = not(crystal.is_variables())
-            if cond_1 & cond_2:
-                np_iint_u = peak.numpy_intensity_up
-                np_iint_d = peak.numpy_intensity_down
-            else:
-                np_iint_u, np_iint_d = self.calc_iint(
-                    index_h, index_k, index_l, crystal,
-                    flag_internal=flag_internal)
-                peak.numpy_intensity_up = np_iint_u
-                peak.numpy_intensity_down = np_iint_d
+            np_iint_u, np_iint_d = self.calc_iint(
+                index_h, index_k, index_l, crystal,
+                flag_internal=flag_internal, d_internal_val=d_internal_val)
+            peak.numpy_intensity_up = np_iint_u
+            peak.numpy_intensity_down = np_iint_d
 
             cell = crystal.cell
             sthovl_hkl = cell.calc_sthovl(index_h, index_k, index_l)
@@ -225,21 +237,20 @@ class TOF(DataN):
                 iint_u_0 = (1. - tof_extinction*iint_u_0)*mult*wavelength_4
                 iint_d_0 = (1. - tof_extinction*iint_d_0)*mult*wavelength_4
 
-            np_iint_u_2d = numpy.meshgrid(time, iint_u_0, indexing="ij")[1]
-            np_iint_d_2d = numpy.meshgrid(time, iint_d_0, indexing="ij")[1]
+            np_iint_u_2d = numpy.meshgrid(time, to_precision(iint_u_0),
+                                          indexing="ij")[1]
+            np_iint_d_2d = numpy.meshgrid(time, to_precision(iint_d_0),
+                                          indexing="ij")[1]
 
             # texture
             if texture is not None:
-                cond_2 = ((not(texture.is_variables())) &
-                          (not(cell.is_variables())))
-                if cond_2:
-                    try:
-                        texture_2d = d_internal_val[
-                            f"texture_2d_{crystal.data_name:}"]
-                        cond_1 = False
-                    except KeyError:
-                        cond_1 = True
-                if cond_1:
+                key_texture = (key_peak, texture.get_version(),
+                               cell.get_version(), time.shape)
+                if (d_internal_val.get(f"key_texture_{crystal.data_name:}",
+                                       None) == key_texture):
+                    texture_2d = d_internal_val[
+                        f"texture_2d_{crystal.data_name:}"]
+                else:
                     cos_alpha_ax = calc_cos_ang(cell, h_ax, k_ax, l_ax,
                                                 index_h, index_k, index_l)
                     c_help = 1.-cos_alpha_ax**2
@@ -255,8 +266,11 @@ class TOF(DataN):
                     cos_alpha_2d = cos_alpha_ax_2d*1.+sin_alpha_ax_2d*0.
                     texture_2d = g_2 + (1. - g_2) * (1./g_1 + (g_1**2 - 1./g_1)
                                                      * cos_alpha_2d**2)**(-1.5)
+                    texture_2d = to_precision(texture_2d)
                     d_internal_val[f"texture_2d_{crystal.data_name:}"] = \
                         texture_2d
+                    d_internal_val[f"key_texture_{crystal.data_name:}"] = \
+                        key_texture
 
                 profile_2d = profile_2d*texture_2d
 
@@ -264,8 +278,8 @@ class TOF(DataN):
             res_d_2d = profile_2d*np_iint_d_2d
 
             # 0.5 to have the same meaning for scale factor as in FullProf
-            res_u_1d += 0.5*scale*res_u_2d.sum(axis=1)
-            res_d_1d += 0.5*scale*res_d_2d.sum(axis=1)
+            res_u_1d += 0.5*scale*res_u_2d.sum(axis=1, dtype=numpy.float64)
+            res_d_1d += 0.5*scale*res_d_2d.sum(axis=1, dtype=numpy.float64)
 
             if flag_internal:
                 peak.numpy_to_items()
@@ -308,7 +322,8 @@ class TOF(DataN):
             self.add_items(l_calc_objs)
         return tof_proc
 
-    def calc_chi_sq(self, l_crystal, flag_internal=True):
+    def calc_chi_sq(self, l_crystal, flag_internal=True,
+                    d_internal_val: dict = None):
         """
         Calculate chi square.
 
@@ -318,6 +333,8 @@ class TOF(DataN):
             - flag_internal: a flag to calculate or to use internal objects.
                    It should be True if user call the function.
                    It's True by default.
+            - d_internal_val: dictionary of cached results (see
+              calc_profile)
 
         Output
         ------
@@ -361,7 +378,7 @@ class TOF(DataN):
 
         tof_proc = self.calc_profile(
             np_time_in, l_crystal, flag_internal=flag_internal,
-            flag_polarized=flag_polarized)
+            flag_polarized=flag_polarized, d_internal_val=d_internal_val)
 
         if flag_polarized:
             tof_proc.numpy_intensity_up = int_u_exp_in
@@ -469,8 +486,10 @@ class TOF(DataN):
     #                       flag_internal=True, flag_polarized=flag_polarized)
     #     return
 
+    calc_chi_sq_batch = calc_experiment_chi_sq_batch
+
     def calc_iint(self, index_h, index_k, index_l, crystal: Crystal,
-                  flag_internal: bool = True):
+                  flag_internal: bool = True, d_internal_val: dict = None):
         """Calculate the integrated intensity for h, k, l reflections.
 
         Arguments
@@ -480,6 +499,8 @@ class TOF(DataN):
             - flag_internal: a flag to calculate or to use internal objects.
                    It should be True if user call the function.
                    It's True by default.
+            - d_internal_val: dictionary of cached results (by default the
+              one of the experiment)
 
         Output
         ------
@@ -489,15 +510,23 @@ class TOF(DataN):
             - refln_s: ReflnSusceptibilityL object of cryspy library
               (nuclear structure factor)
         """
-        if flag_internal:
+        if d_internal_val is None:
             try:
                 d_internal_val = self.d_internal_val
             except AttributeError:
                 d_internal_val = {}
                 self.d_internal_val = d_internal_val
-        else:
-            d_internal_val = {}
-            self.d_internal_val = d_internal_val
+
+        # structure factors are recalculated only if crystal or Miller
+        # indices are changed
+        key_crystal = (crystal.get_version(), flag_internal)
+        hkl = d_internal_val.get(f"hkl_{crystal.data_name:}", None)
+        flag_calc = not(
+            (d_internal_val.get(f"key_crystal_{crystal.data_name:}", None)
+             == key_crystal) and (hkl is not None) and
+            numpy.array_equal(hkl[0], index_h) and
+            numpy.array_equal(hkl[1], index_k) and
+            numpy.array_equal(hkl[2], index_l))
 
         tof_parameters = self.tof_parameters
         try:
@@ -514,7 +543,7 @@ class TOF(DataN):
             p_d = 0.0
 
         try:
-            if (not(flag_internal) | crystal.is_variables()):
+            if flag_calc:
                 raise KeyError
             refln = d_internal_val[f"refln_{crystal.data_name:}"]
         except KeyError:
@@ -522,11 +551,10 @@ class TOF(DataN):
                                        flag_internal=flag_internal)
             d_internal_val[f"refln_{crystal.data_name:}"] = refln
         f_nucl = refln.numpy_f_calc
-        f_nucl_sq = abs(f_nucl*f_nucl.conjugate())
 
         if isinstance(crystal, Crystal):
             try:
-                if (not(flag_internal) | crystal.is_variables()):
+                if flag_calc:
                     raise KeyError
                 refln_s = d_internal_val[
                     f"refln_susceptibility_{crystal.data_name:}"]
@@ -536,84 +564,30 @@ class TOF(DataN):
                 d_internal_val[f"refln_susceptibility_{crystal.data_name:}"] \
                     = refln_s
 
-            sft_11 = refln_s.numpy_chi_11_calc
-            sft_12 = refln_s.numpy_chi_12_calc
-            sft_13 = refln_s.numpy_chi_13_calc
-            sft_21 = refln_s.numpy_chi_21_calc
-            sft_22 = refln_s.numpy_chi_22_calc
-            sft_23 = refln_s.numpy_chi_23_calc
-            sft_31 = refln_s.numpy_chi_31_calc
-            sft_32 = refln_s.numpy_chi_32_calc
-            sft_33 = refln_s.numpy_chi_33_calc
-
-            sftm_11 = refln_s.numpy_moment_11_calc
-            sftm_12 = refln_s.numpy_moment_12_calc
-            sftm_13 = refln_s.numpy_moment_13_calc
-            sftm_21 = refln_s.numpy_moment_21_calc
-            sftm_22 = refln_s.numpy_moment_22_calc
-            sftm_23 = refln_s.numpy_moment_23_calc
-            sftm_31 = refln_s.numpy_moment_31_calc
-            sftm_32 = refln_s.numpy_moment_32_calc
-            sftm_33 = refln_s.numpy_moment_33_calc
-
-            _11, _12 = sftm_11+field*sft_11, sftm_12+field*sft_12
-            _21, _13 = sftm_21+field*sft_21, sftm_13+field*sft_13
-            _22, _23 = sftm_22+field*sft_22, sftm_23+field*sft_23
-            _31, _32 = sftm_31+field*sft_31, sftm_32+field*sft_32
-            _33 = sftm_33+field*sft_33
-            _ij = (_11, _12, _13, _21, _22, _23, _31, _32, _33)
-            cell = crystal.cell
-
-            # k_loc = cell.calc_k_loc(h, k, l)
-            t_ij = cell.calc_m_t(index_h, index_k, index_l)
-            # FIXME: I would like to recheck the expression for T
-            #        and expression SIGMA = T^T CHI T
-            t_tr_ij = (t_ij[0], t_ij[3], t_ij[6],
-                       t_ij[1], t_ij[4], t_ij[7],
-                       t_ij[2], t_ij[5], t_ij[8])
-            th_11, th_12, th_13, th_21, th_22, th_23, th_31, th_32, th_33 = \
-                calc_mRmCmRT(t_tr_ij, _ij)
-
-            # fm_p_sq = (field**2)*abs(0.5*(th_11*th_11.conjugate()+
-            #            th_22*th_22.conjugate())+th_12*th_12.conjugate())
-            # fm_p_field = field*0.5*(th_11+th_22)
-            fm_p_sq = abs(0.5 * (th_11 * th_11.conjugate() +
-                                 th_22 * th_22.conjugate()) +
-                          th_12 * th_12.conjugate())
-            fm_p_field = 0.5*(th_11 + th_22)
-            cross = 2.*(f_nucl.real*fm_p_field.real +
-                        f_nucl.imag*fm_p_field.imag)
-
-            iint_u = f_nucl_sq + fm_p_sq + p_u*cross
-            iint_d = f_nucl_sq + fm_p_sq - p_d*cross
-
+            chi_ij = tuple([getattr(refln_s, f"numpy_chi_{ij:}_calc")
+                            for ij in L_IJ])
+            moment_ij = tuple([getattr(refln_s, f"numpy_moment_{ij:}_calc")
+                               for ij in L_IJ])
+            t_ij = crystal.cell.calc_m_t(index_h, index_k, index_l)
+            iint_u, iint_d = calc_iint_by_susceptibility(
+                f_nucl, chi_ij, moment_ij, t_ij, field=field, p_u=p_u,
+                p_d=p_d)
         elif isinstance(crystal, MagCrystal):
             try:
-                if (not(flag_internal) | crystal.is_variables()):
+                if flag_calc:
                     raise KeyError
                 f_mag_perp = d_internal_val[f"f_mag_perp_{crystal.data_name:}"]
 
             except KeyError:
                 f_mag_perp = crystal.calc_f_mag_perp(index_h, index_k, index_l)
                 d_internal_val[f"f_mag_perp_{crystal.data_name:}"] = f_mag_perp
-            f_mag_perp_sq = abs(f_mag_perp*f_mag_perp.conjugate()).sum(axis=0)
-            iint_u = f_nucl_sq + f_mag_perp_sq
-            iint_d = f_nucl_sq + f_mag_perp_sq
+            iint_u, iint_d = calc_iint_by_f_mag_perp(f_nucl, f_mag_perp)
 
+        d_internal_val[f"key_crystal_{crystal.data_name:}"] = key_crystal
+        d_internal_val[f"hkl_{crystal.data_name:}"] = (
+            numpy.copy(index_h), numpy.copy(index_k), numpy.copy(index_l))
         return iint_u, iint_d
 
-    def _gauss_pd(self, time_2d):
-        """One dimensional gauss powder diffraction."""
-        ag, bg = self.ag, self.bg
-        val_1 = bg*time_2d**2
-        val_2 = numpy.where(val_1 < 5., numpy.exp(-val_1), 0.)
-        self.gauss_pd = ag*val_2
-
-    def _lor_pd(self, time_2d):
-        """One dimensional lorentz powder diffraction."""
-        al, bl = self.al, self.bl
-        self.lor_pd = al*1./(1.+bl*time_2d**2)
-
     def calc_shape_profile(self, d, d_hkl, phase_igsize: float = 0.):
         """
         Calculate shape profile.
@@ -622,6 +596,10 @@ class TOF(DataN):
         time_hkl with i_g parameter by default equal to zero
 
         d, d_hkl in angstrems
+
+        The profile is given in the precision set by cryspy.set_precision.
+        The peak shape function is calculated in double precision as its
+        exponential factors overflow float32.
         """
         tof_parameters = self.tof_parameters
         tof_profile = self.tof_profile
@@ -638,7 +616,7 @@ class TOF(DataN):
         tth_rad = tof_parameters.ttheta_bank*numpy.pi/180.
         lorentz_factor = 1./(numpy.sin(tth_rad)*numpy.sin(0.5*tth_rad))
 
-        profile_2d = np_shape_2d*lorentz_factor
+        profile_2d = to_precision(np_shape_2d*lorentz_factor)
 
         return profile_2d
 
@@ -0,0 +1,143 @@
+"""Chi square of experiments for several sets of parameters.
+
+Functions
+---------
+    - set_linear_parameters
+    - calc_linear_chi_sq_batch
+    - calc_experiment_chi_sq_batch
+
+"""
+import numpy
+
+from cryspy.B_parent_classes.cl_5_parameter_vector import ParameterVector
+
+
+def set_linear_parameters(parameter_vector: ParameterVector, l_term: list,
+                          flag_sigma: bool = False) -> float:
+    """
+    Set linear parameters of profile by weighted linear least squares.
+
+    Arguments
+    ---------
+        - parameter_vector: linear parameters of experiment
+        - l_term: chi square terms (derivatives, model, experiment, sigma,
+          points). Derivatives of the model over the parameters are given
+          as 2D array (number of points, number of parameters), model,
+          experiment and sigma as 1D arrays and points as 1D boolean array
+          of points entering chi square.
+        - flag_sigma: a flag to set sigmas of the parameters
+
+    Output
+    ------
+        - chi_sq_val: chi square at found parameters
+    """
+    matrix = numpy.concatenate(
+        [d_2d[cond]/sigma[cond][:, numpy.newaxis]
+         for d_2d, mod, exp, sigma, cond in l_term], axis=0)
+    residual = numpy.concatenate(
+        [(exp[cond]-mod[cond])/sigma[cond]
+         for d_2d, mod, exp, sigma, cond in l_term], axis=0)
+    delta = numpy.linalg.lstsq(matrix, residual, rcond=None)[0]
+
+    parameter_vector.set_all(parameter_vector.get_all()+delta)
+    if flag_sigma:
+        covariance = numpy.linalg.pinv(numpy.matmul(matrix.transpose(),
+                                                    matrix))
+        parameter_vector.set_sigmas(numpy.sqrt(numpy.abs(
+            numpy.diag(covariance))))
+    return numpy.square(numpy.matmul(matrix, delta)-residual).sum()
+
+
+def calc_linear_chi_sq_batch(l_term: list, delta):
+    """
+    Calculate chi square for several shifts of linear parameters.
+
+    Arguments
+    ---------
+        - l_term: chi square terms (see set_linear_parameters)
+        - delta: (K, number of parameters) array of shifts of the linear
+          parameters from the values the terms are calculated at
+
+    Output
+    ------
+        - chi_sq: 1D array (K, ) of chi square
+        - n: number of points entering chi square
+    """
+    delta = numpy.atleast_2d(numpy.array(delta, dtype=float))
+    chi_sq = numpy.zeros(delta.shape[0], dtype=float)
+    n = 0
+    for d_2d, mod, exp, sigma, cond in l_term:
+        sigma_in = sigma[cond][:, numpy.newaxis]
+        # (number of points, K) residuals of all shifts at once
+        residual = ((mod[cond]-exp[cond])[:, numpy.newaxis] +
+                    numpy.matmul(d_2d[cond], delta.transpose()))/sigma_in
+        chi_sq += numpy.square(residual).sum(axis=0)
+        n += residual.shape[0]
+    return chi_sq, n
+
+
+def calc_experiment_chi_sq_batch(experiment, l_crystal, values,
+                                 names: list):
+    """
+    Calculate chi square of experiment for several sets of parameters.
+
+    It is used as method calc_chi_sq_batch of experiments (Pd, Pd2d, TOF,
+    Diffrn).
+
+    Keyword Arguments
+    -----------------
+        - experiment: experiment with method calc_chi_sq
+        - l_crystal: a list of Crystal objects of cryspy library
+        - values: (K, number of parameters) array of sets of parameters
+        - names: names of parameters of the experiment and the crystals
+
+    Output arguments
+    ----------------
+        - chi_sq: 1D array (K, ) of chi square
+        - n: 1D array (K, ) of numbers of points
+
+    The sets are grouped by the parameters entering the profile
+    nonlinearly and the experiment is calculated once for each group.
+    Within the group chi square over the parameters entering the profile
+    linearly (scales of phases, background intensities) is given for all
+    sets at once by calc_linear_terms of the experiment (Pd, Pd2d). For
+    other experiments all parameters are nonlinear, so equal sets are
+    calculated once.
+    """
+    values = numpy.atleast_2d(numpy.array(values, dtype=float))
+    parameter_vector = ParameterVector([experiment, ] + list(l_crystal),
+                                       names)
+    if hasattr(experiment, "calc_linear_terms"):
+        l_name_linear = experiment.get_linear_variable_names()
+    else:
+        l_name_linear = []
+    flag_linear = numpy.array([name in l_name_linear for name in names],
+                              dtype=bool)
+    l_name_linear = [name for name in names if name in l_name_linear]
+
+    chi_sq = numpy.zeros(values.shape[0], dtype=float)
+    n = numpy.zeros(values.shape[0], dtype=float)
+    d_group = {}
+    for i_k, values_k in enumerate(values):
+        key = values_k[numpy.logical_not(flag_linear)].tobytes()
+        d_group.setdefault(key, []).append(i_k)
+
+    values_0 = parameter_vector.get_all()
+    try:
+        for l_ind in d_group.values():
+            values_k = values[l_ind[0]]
+            parameter_vector.set_all(values_k)
+            for crystal in l_crystal:
+                crystal.apply_constraints()
+            experiment.apply_constraints()
+            chi_sq_k, n_k = experiment.calc_chi_sq(l_crystal,
+                                                   flag_internal=False)
+            if len(l_name_linear) == 0:
+                chi_sq[l_ind], n[l_ind] = chi_sq_k, n_k
+                continue
+            l_term = experiment.calc_linear_terms(l_name_linear)
+            delta = values[l_ind][:, flag_linear]-values_k[flag_linear]
+            chi_sq[l_ind], n[l_ind] = calc_linear_chi_sq_batch(l_term, delta)
+    finally:
+        parameter_vector.set_all(values_0)
+    return chi_sq, n
@@ -11,6 +11,8 @@ from cryspy.A_functions_base.function_1_matrices import calc_chi_sq, \
 from cryspy.A_functions_base.function_2_mem import calc_moment_perp, \
     calc_fm_by_density, transfer_to_density_3d, transfer_to_chi_3d
 
+from cryspy.B_parent_classes.cl_5_parameter_vector import ParameterVector
+
 from cryspy.C_item_loop_classes.cl_1_refine_ls import RefineLs
 from cryspy.C_item_loop_classes.cl_1_mem_parameters import MEMParameters
 
@@ -152,8 +154,10 @@ def maximize_entropy(crystal: Crystal, l_diffrn: List[Diffrn],
         ind_l = numpy.array(diffrn_refln.index_l, dtype=int)
         total_peaks += ind_h.size
 
-        chi_m = crystal.calc_susceptibility_moment_tensor(
-            ind_h, ind_k, ind_l, flag_only_orbital=True)
+        orbit_index = diffrn_refln.calc_orbit_index(crystal)
+        chi_m = crystal.calc_susceptibility_moment_tensor_by_orbit(
+            ind_h, ind_k, ind_l, flag_only_orbital=True,
+            orbit_index=orbit_index)
         sft_ij = chi_m[:9]
         sftm_ij = chi_m[9:]
 
@@ -170,7 +174,7 @@ def maximize_entropy(crystal: Crystal, l_diffrn: List[Diffrn],
                 chi_iso_ferro=chi_iso_ferro,
                 chi_iso_antiferro=chi_iso_antiferro,
                 flag_two_channel=flag_two_channel)
-        f_nucl = crystal.calc_f_nucl(*hkl)
+        f_nucl = crystal.calc_f_nucl_by_orbit(*hkl, orbit_index=orbit_index)
         l_f_nucl.append(f_nucl)
         l_v_2d_i.append((v_hkl_perp_2d_i, v_b_ferro, v_b_antiferro))
         l_fr_e.append(fr_e)
@@ -415,7 +419,7 @@ def refine_susceptibility(crystal: Crystal, l_diffrn: List[Diffrn],
         hkl = (index_h, index_k, index_l)
         fr_e = numpy.array(diffrn_refln.fr, dtype=float)
         fr_s = numpy.array(diffrn_refln.fr_sigma, dtype=float)
-        f_nucl = crystal.calc_f_nucl(*hkl)
+        f_nucl = crystal.calc_f_nucl_by_orbit(*hkl)
         k_hkl = cell.calc_k_loc(*hkl)
         phase_3d = density_point.calc_phase_3d(hkl, space_group_symop)
 
@@ -443,22 +447,13 @@ def refine_susceptibility(crystal: Crystal, l_diffrn: List[Diffrn],
         l_chi_perp_ferro.append(chi_perp_ferro)
         l_chi_perp_antiferro.append(chi_perp_aferro)
 
-    l_name_1 = atom_site_susceptibility.get_variable_names()
-    l_par_1_0 = [atom_site_susceptibility.get_variable_by_name(name) for name
-                 in l_name_1]
-
-    l_name_2 = mem_parameters.get_variable_names()
-    l_par_2_0 = [mem_parameters.get_variable_by_name(name) for name
-                 in l_name_2]
-    l_name = l_name_1 + l_name_2
-    l_par_0 = l_par_1_0 + l_par_2_0
+    parameter_vector = ParameterVector([atom_site_susceptibility,
+                                        mem_parameters])
+    l_name = parameter_vector.names
+    l_par_0 = parameter_vector.get_all()
 
     def temp_func(l_par):
-        for name, parameter in zip(l_name, l_par):
-            if name[0][0] == "atom_site_susceptibility":
-                atom_site_susceptibility.set_variable_by_name(name, parameter)
-            elif name[0][0] == "mem_parameters":
-                mem_parameters.set_variable_by_name(name, parameter)
+        parameter_vector.set_all(l_par)
 
         chi_iso_f = mem_parameters.chi_ferro
         chi_iso_af = mem_parameters.chi_antiferro
@@ -551,14 +546,8 @@ def refine_susceptibility(crystal: Crystal, l_diffrn: List[Diffrn],
         d_info["print"] = \
             f"Chi_sq/n after optimization {chi_sq_new/total_peaks:.5f}."
 
-    for name, parameter, sig in zip(l_name, l_param, sigma):
-        name_sig = name[:-1] + ((f"{name[-1][0]:}_sigma", name[-1][1]), )
-        if name[0][0] == "atom_site_susceptibility":
-            atom_site_susceptibility.set_variable_by_name(name, parameter)
-            atom_site_susceptibility.set_variable_by_name(name_sig, sig)
-        elif name[0][0] == "mem_parameters":
-            mem_parameters.set_variable_by_name(name, parameter)
-            mem_parameters.set_variable_by_name(name_sig, sig)
+    parameter_vector.set_all(l_param)
+    parameter_vector.set_sigmas(sigma)
 
     for diffrn in l_diffrn:
         diffrn.diffrn_refln.numpy_to_items()
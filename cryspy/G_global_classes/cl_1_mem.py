@@ -3,7 +3,6 @@ __author__ = 'ikibalin'
 __version__ = "2020_08_19"
 from typing import NoReturn
 import numpy
-import matplotlib.pyplot as plt
 
 from cryspy.A_functions_base.function_2_crystallography_base import \
     calc_atoms_in_unit_cell
@@ -185,7 +184,7 @@ class MEM(GlobalN):
             total_peaks += index_h.size
             hkl = (index_h, index_k, index_l)
 
-            f_nucl = crystal.calc_f_nucl(*hkl)
+            f_nucl = crystal.calc_f_nucl_by_orbit(*hkl)
             k_hkl = cell.calc_k_loc(*hkl)
             phase_3d = density_point.calc_phase_3d(hkl, space_group_symop)
 
@@ -323,6 +322,7 @@ class MEM(GlobalN):
     def plot_section(self):
         """Plot first section
         """
+        import matplotlib.pyplot as plt
         if not((self.is_attribute("section") &
                 self.is_attribute("density_point") &
                 self.is_attribute("mem_parameters") )):
@@ -15,6 +15,7 @@ from cryspy.A_functions_base.function_1_error_simplex import \
     error_estimation_simplex
 
 from cryspy.B_parent_classes.cl_4_global import GlobalN
+from cryspy.B_parent_classes.cl_5_parameter_vector import ParameterVector
 
 from cryspy.C_item_loop_classes.cl_1_inversed_hessian import InversedHessian
 
@@ -45,6 +46,9 @@ class RhoChi(GlobalN):
         - experiments()
         - refine()
         - calc_chi_sq
+        - calc_chi_sq_batch
+        - get_linear_variable_names
+        - refine_linear_parameters
         - params_to_cif
         - data_to_cif
         - calc_to_cif
@@ -133,6 +137,107 @@ class RhoChi(GlobalN):
 
         return chi_sq_res, n_res
 
+    def calc_chi_sq_batch(self, values, l_var_name: List[tuple] = None):
+        """
+        Calculate chi square for several sets of parameters.
+
+        Keyword Arguments
+        -----------------
+            - values: (K, number of parameters) array of sets of parameters
+            - l_var_name: names of parameters (by default the refined ones
+              given by get_variable_names)
+
+        Output arguments
+        ----------------
+            - chi_sq: 1D array (K, ) of chi square
+            - n: 1D array (K, ) of numbers of points
+
+        Each experiment is given the sets of its own parameters and of the
+        parameters of the crystals (see calc_chi_sq_batch of experiments).
+        So, the experiment is calculated once for the sets differing only
+        in parameters of other experiments, and once for the sets differing
+        only in scale factors and backgrounds of it.
+        """
+        if l_var_name is None:
+            l_var_name = self.get_variable_names()
+        values = numpy.atleast_2d(numpy.array(values, dtype=float))
+        l_crystal = self.crystals()
+        l_name_crystal = [(crystal.PREFIX, crystal.data_name)
+                          for crystal in l_crystal]
+
+        chi_sq = numpy.zeros(values.shape[0], dtype=float)
+        n = numpy.zeros(values.shape[0], dtype=float)
+        for experiment in self.experiments():
+            l_name_data = l_name_crystal + [
+                (experiment.PREFIX, experiment.data_name), ]
+            # parameters which chi square of experiment depends on
+            l_ind = [i_name for i_name, var_name in enumerate(l_var_name)
+                     if var_name[1] in l_name_data]
+            chi_sq_e, n_e = experiment.calc_chi_sq_batch(
+                l_crystal, values[:, l_ind],
+                [l_var_name[i_name][1:] for i_name in l_ind])
+            chi_sq += chi_sq_e
+            n += n_e
+        return chi_sq, n
+
+    def get_linear_variable_names(self) -> List[tuple]:
+        """
+        Give names of refined parameters entering the profiles linearly.
+
+        They are given by experiments having get_linear_variable_names
+        method (scales of phases and background intensities of powder
+        diffraction).
+        """
+        l_var_name = self.get_variable_names()
+        l_name_linear = []
+        for experiment in self.experiments():
+            if not hasattr(experiment, "get_linear_variable_names"):
+                continue
+            l_name_linear.extend(experiment.get_linear_variable_names())
+        return [var_name for var_name in l_var_name
+                if var_name[1:] in l_name_linear]
+
+    def refine_linear_parameters(self, flag_internal: bool = False):
+        """
+        Refine parameters entering the profiles linearly.
+
+        The parameters given by get_linear_variable_names are found by
+        linear least squares at fixed other parameters and they are set.
+
+        Keyword Arguments
+        -----------------
+            - flag_internal: a flag to calculate internal objects and
+              sigmas of linear parameters (default is False)
+
+        Output arguments
+        ----------------
+            - chi_sq_val: chi square at found linear parameters
+            - n: number of measured points
+        """
+        self.apply_constraint()
+
+        l_crystal = self.crystals()
+
+        chi_sq_res, n_res = 0., 0.
+        for experiment in self.experiments():
+            if hasattr(experiment, "refine_linear_parameters"):
+                chi_sq, n = experiment.refine_linear_parameters(
+                    l_crystal, flag_internal=flag_internal)
+            else:
+                chi_sq, n = experiment.calc_chi_sq(
+                    l_crystal, flag_internal=flag_internal)
+            experiment.chi_sq = chi_sq
+            experiment.n = n
+            chi_sq_res += chi_sq
+            n_res += n
+
+        if flag_internal:
+            refine_ls = RefineLs(goodness_of_fit_all=chi_sq_res/n_res,
+                                 number_reflns=n_res)
+            self.refine_ls = refine_ls
+
+        return chi_sq_res, n_res
+
     def estimate_inversed_hessian(self):
         """Estimate inversed Hessian matrix."""
         if self.is_attribute("inversed_hessian"):
@@ -140,15 +245,14 @@ class RhoChi(GlobalN):
 
         self.apply_constraint()
         l_var_name = self.get_variable_names()
+        parameter_vector = ParameterVector(self, l_var_name)
 
-        val_0 = numpy.array([self.get_variable_by_name(var_name)
-                             for var_name in l_var_name], dtype=float)
+        val_0 = parameter_vector.get_all()
 
         chi_sq, n = self.calc_chi_sq(flag_internal=True)
 
         def tempfunc(l_param):
-            for var_name, param in zip(l_var_name, l_param):
-                self.set_variable_by_name(var_name, param)
+            parameter_vector.set_all(l_param)
             chi_sq, n_points = self.calc_chi_sq(flag_internal=False)
             if n_points < n:
                 res_out = 1.0e+308
@@ -156,9 +260,13 @@ class RhoChi(GlobalN):
                 res_out = chi_sq
             return res_out
 
+        def tempfunc_batch(values):
+            chi_sq, n_points = self.calc_chi_sq_batch(values, l_var_name)
+            return numpy.where(n_points < n, 1.0e+308, chi_sq)
+
         l_label = [var_name[-1][0] for var_name in l_var_name]
         np_hessian, np_first_der = estimate_inversed_hessian_matrix(
-            tempfunc, val_0)
+            tempfunc, val_0, func_batch=tempfunc_batch)
         inv_hessian = InversedHessian()
         inv_hessian.set_labels(l_label)
         inv_hessian.set_inversed_hessian(np_hessian)
@@ -177,7 +285,7 @@ class RhoChi(GlobalN):
         #     self.set_variable_by_name(var_name_sigma, sigma)
 
     def refine(self, optimization_method: str = "BFGS", disp: bool = False,
-               d_info: dict = None):
+               d_info: dict = None, flag_variable_projection: bool = False):
         """
         Minimization procedure.
 
@@ -186,6 +294,12 @@ class RhoChi(GlobalN):
             - "BFGS" (default)
             - "simplex"
             - "basinhopping"
+
+        If flag_variable_projection is True the parameters entering the
+        profiles linearly (scales of phases and background intensities of
+        powder diffraction) are excluded from the minimization and they are
+        found by linear least squares at each step of the minimizer
+        (variable projection).
         """
         if self.is_attribute("inversed_hessian"):
             self.items.remove(self.inversed_hessian)
@@ -203,14 +317,28 @@ class RhoChi(GlobalN):
         self.apply_constraint()
         l_var_name = self.get_variable_names()
 
+        if flag_variable_projection:
+            l_var_name_linear = self.get_linear_variable_names()
+            flag_variable_projection = len(l_var_name_linear) != 0
+            l_var_name = [var_name for var_name in l_var_name
+                          if var_name not in l_var_name_linear]
+
+        if flag_variable_projection:
+            calc_chi_sq = self.refine_linear_parameters
+        else:
+            calc_chi_sq = self.calc_chi_sq
+
         if len(l_var_name) == 0:
-            chi_sq, n = self.calc_chi_sq()
+            if flag_variable_projection:
+                chi_sq, n = self.refine_linear_parameters(flag_internal=True)
+            else:
+                chi_sq, n = self.calc_chi_sq()
             # self._show_message(f"chi_sq/n {chi_sq/n:.2f} (n = {int(n):}).")
             dict_out = {"flag": flag, "res": None, "chi_sq": chi_sq, "n": n}
             return dict_out
 
-        val_0 = numpy.array([self.get_variable_by_name(var_name)
-                             for var_name in l_var_name], dtype=float)
+        parameter_vector = ParameterVector(self, l_var_name)
+        val_0 = parameter_vector.get_all()
 
         sign = 2*(numpy.array(val_0 >= 0., dtype=int)-0.5)
         param_0 = numpy.log(abs(val_0)*(numpy.e-1.)+1.)*sign
@@ -222,9 +350,8 @@ class RhoChi(GlobalN):
         chi_sq, n = self.calc_chi_sq(flag_internal=True)
 
         def tempfunc(l_param):
-            for var_name, param, coeff in zip(l_var_name, l_param, coeff_norm):
-                self.set_variable_by_name(var_name, param*coeff)
-            chi_sq, n_points = self.calc_chi_sq(flag_internal=False)
+            parameter_vector.set_all(l_param*coeff_norm)
+            chi_sq, n_points = calc_chi_sq(flag_internal=False)
             if n_points < n:
                 res_out = 1.0e+308
             else:
@@ -245,8 +372,19 @@ class RhoChi(GlobalN):
                     disp, coeff_norm, x, param_name=l_var_name, d_info=d_info),
                 options={"fatol": 0.01*n})
 
+            def tempfunc_batch(values):
+                chi_sq, n_points = self.calc_chi_sq_batch(
+                    values*coeff_norm[numpy.newaxis, :], l_var_name)
+                return numpy.where(n_points < n, 1.0e+308,
+                                   chi_sq/numpy.where(n_points == 0., 1.,
+                                                      n_points))
+
+            # chi square of variable projection is not calculated in batch
+            if flag_variable_projection:
+                tempfunc_batch = None
             m_error, dist_hh = error_estimation_simplex(
-                res["final_simplex"][0], res["final_simplex"][1], tempfunc)
+                res["final_simplex"][0], res["final_simplex"][1], tempfunc,
+                func_batch=tempfunc_batch)
 
             l_sigma = []
             for i, val_2 in zip(range(m_error.shape[0]), dist_hh):
@@ -267,17 +405,34 @@ class RhoChi(GlobalN):
             obj_hm.form_object()
             self.inversed_hessian = obj_hm
 
-            for var_name, sigma, coeff in \
-                    zip(l_var_name, l_sigma, coeff_norm):
-                hh = tuple((f"{var_name[-1][0]:}_sigma", ) + var_name[-1][1:])
-                var_name_sigma = tuple(var_name[:-1]+(hh, ))
-                self.set_variable_by_name(var_name_sigma, sigma*coeff)
+            parameter_vector.set_sigmas(numpy.array(l_sigma)*coeff_norm)
 
             _dict_out = {"flag": flag, "res": res}
         else:
             # BFGS
+            def tempfunc_jac(l_param):
+                # chi square and its forward differences (with the steps
+                # of scipy) are calculated by one batch
+                step = numpy.finfo(float).eps**0.5 * numpy.where(
+                    l_param >= 0., 1., -1.)*numpy.maximum(1., abs(l_param))
+                step = (l_param+step)-l_param
+                values = l_param[numpy.newaxis, :] + numpy.concatenate(
+                    [numpy.zeros((1, step.size), dtype=float),
+                     numpy.diag(step)], axis=0)
+                chi_sq, n_points = self.calc_chi_sq_batch(
+                    values*coeff_norm[numpy.newaxis, :], l_var_name)
+                res_out = numpy.where(
+                    n_points < n, 1.0e+308,
+                    chi_sq/numpy.where(n_points == 0., 1., n_points))
+                return res_out[0], (res_out[1:]-res_out[0])/step
+
+            # chi square of variable projection is not calculated in batch
+            if flag_variable_projection:
+                func, jac = tempfunc, None
+            else:
+                func, jac = tempfunc_jac, True
             res = scipy.optimize.minimize(
-                tempfunc, param_0, method='BFGS',
+                func, param_0, method='BFGS', jac=jac,
                 callback=lambda x: self._f_callback(
                     disp, coeff_norm, x, param_name=l_var_name, d_info=d_info),
                 options={"disp": disp})
@@ -298,14 +453,14 @@ class RhoChi(GlobalN):
             obj_hm.form_object()
             self.inversed_hessian = obj_hm
 
-            for var_name, sigma, param, coeff in \
-                    zip(l_var_name, l_sigma, l_param, coeff_norm):
-                hh = tuple((f"{var_name[-1][0]:}_sigma", ) + var_name[-1][1:])
-                var_name_sigma = tuple(var_name[:-1]+(hh, ))
-                self.set_variable_by_name(var_name_sigma, sigma)
-                self.set_variable_by_name(var_name, param*coeff)
+            parameter_vector.set_sigmas(l_sigma)
+            parameter_vector.set_all(l_param*coeff_norm)
 
-        chi_sq, n = self.calc_chi_sq(flag_internal=True)
+        if flag_variable_projection:
+            parameter_vector.set_all(res["x"]*coeff_norm)
+            chi_sq, n = self.refine_linear_parameters(flag_internal=True)
+        else:
+            chi_sq, n = self.calc_chi_sq(flag_internal=True)
 
         return _dict_out
 
@@ -3,9 +3,11 @@ import os
 import os.path
 from typing import List
 
-from pycifstar import Global, to_global, Items, Loop, Data
+from pycifstar import Global, Items, Loop, Data
 
 from cryspy.A_functions_base.function_1_strings import find_prefix
+from cryspy.A_functions_base.function_1_cif import str_to_global, \
+    file_to_global, str_to_data, get_prefix_position
 
 from cryspy.B_parent_classes.cl_1_item import ItemN
 from cryspy.B_parent_classes.cl_2_loop import LoopN
@@ -258,17 +260,17 @@ def file_to_globaln(file_name: str, item_classes=(), loop_classes=(),
     if not(os.path.isfile(file_name)):
         raise UserWarning(f"File '{file_name:}' is not found")
         return
-    s_cont = str(to_global(file_name))
-    res = str_to_globaln(s_cont, item_classes=item_classes,
-                         loop_classes=loop_classes, data_classes=data_classes,
-                         global_classes=global_classes)
+    global_cif = file_to_global(file_name)
+    res = global_to_globaln(global_cif, item_classes=item_classes,
+                            loop_classes=loop_classes,
+                            data_classes=data_classes,
+                            global_classes=global_classes)
     return res
 
 
 def str_to_items(s_cont: str, item_classes=(), loop_classes=()) -> list:
     """Transfer string of cif format to cryspy objects."""
-    data_cif = Data()
-    data_cif.take_from_string(s_cont)
+    data_cif = str_to_data(s_cont)
     l_item_class = L_ITEM_CLASS + list(item_classes)
     l_loop_class = L_LOOP_CLASS + list(loop_classes)
 
@@ -282,8 +284,17 @@ def str_to_items(s_cont: str, item_classes=(), loop_classes=()) -> list:
 def str_to_globaln(s_cont: str, item_classes=(), loop_classes=(),
                    data_classes=(), global_classes=()) -> GlobalN:
     """Transfer string of cif format to cryspy objects."""
-    global_cif = Global()
-    global_cif.take_from_string(s_cont)
+    global_cif = str_to_global(s_cont)
+    res = global_to_globaln(global_cif, item_classes=item_classes,
+                            loop_classes=loop_classes,
+                            data_classes=data_classes,
+                            global_classes=global_classes)
+    return res
+
+
+def global_to_globaln(global_cif: Global, item_classes=(), loop_classes=(),
+                      data_classes=(), global_classes=()) -> GlobalN:
+    """Transfer Global object (read from cif format) to cryspy objects."""
     l_global_item = []
     l_cls_global = []
     l_item_class = L_ITEM_CLASS + list(item_classes)
@@ -307,7 +318,6 @@ def str_to_globaln(s_cont: str, item_classes=(), loop_classes=(),
 
     for data_cif in global_cif.datas:
         flag = False
-        str_data = str(data_cif)
         for cls_data in l_data_class:
             # FIXME: it's bad solution as we loose information which are
             #        not specified as knonw in cryspy library.
@@ -321,7 +331,7 @@ def str_to_globaln(s_cont: str, item_classes=(), loop_classes=(),
                 l_flag.append(flag_t)
             if all(l_flag):
                 #print("all(l_flag): \n", all(l_flag), end="\n\n")
-                data_obj = cls_data.from_cif(str_data)
+                data_obj = cls_data.from_cif_data(data_cif)
                 if data_obj is not None:
                     l_global_item.append(data_obj)
                     if not(cls_data in l_cls_global):
@@ -443,7 +453,8 @@ def loop_to_loopn(loop_cif: Loop, l_loop_class: list) -> LoopN:
         l_loop_separator_in.append(separator)
 
 
-    s_loop_prefix_in = set(l_loop_prefix_in)
+    # prefixes are taken in the order of the loop names
+    s_loop_prefix_in = dict.fromkeys(l_loop_prefix_in)
     l_loopn = []
     for prefix in s_loop_prefix_in:
         item_cls = ItemN
@@ -481,12 +492,12 @@ def loop_to_loopn(loop_cif: Loop, l_loop_class: list) -> LoopN:
                 ll_val_cif.append(loop_cif[loop_name_type])
         ll_val_cif_t = [[ll_val_cif[i_2][i_1] for i_2 in range(len(
             ll_val_cif))] for i_1 in range(len(ll_val_cif[0]))]
-        obj = Loop(names=l_loop_name_cif, values=ll_val_cif_t)
-        loopn = loop_cls.from_cif(str(obj))
+        obj = Data(loops=[Loop(names=l_loop_name_cif, values=ll_val_cif_t)])
+        loopn = loop_cls.from_cif_data(obj)
 
         if loopn is None:
             loop_cls = LoopN
-            loopn = loop_cls.from_cif(str(obj))
+            loopn = loop_cls.from_cif_data(obj)
         # if len(loopn.items) == 0:
         #     print("obj:", loop_cls)
         #     print(obj)
@@ -566,13 +577,17 @@ def items_to_itemsn(items_cif: Items, l_item_class: list) -> List[ItemN]:
             items_small = items_cif.items_with_names(names)
             item_obj = ItemN.from_cif(str(items_small))
             l_item.append(item_obj)
+    # items are given in the order of the file
+    l_name_all = items_cif.names
+    l_item.sort(key=lambda item: get_prefix_position(l_name_all,
+                                                     item.PREFIX))
     return l_item
 
 
 def find_prefixes(l_name_cif):
     """Find prefix."""
-    l_short_prefix_cif = list(set([(name[1:]).split("_")[0]
-                                   for name in l_name_cif]))
+    l_short_prefix_cif = list(dict.fromkeys([(name[1:]).split("_")[0]
+                                             for name in l_name_cif]))
     l_prefix_cif = []
     for short_prefix_cif in l_short_prefix_cif:
         l_name_2_cif = [name for name in l_name_cif
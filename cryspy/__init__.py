@@ -45,105 +45,237 @@ __date__ = "14.04.2021"
 name = "cryspy"
 
 
-from cryspy.B_parent_classes.cl_1_item import ItemN
-from cryspy.B_parent_classes.cl_2_loop import LoopN
-from cryspy.B_parent_classes.cl_3_data import DataN
-from cryspy.B_parent_classes.cl_4_global import GlobalN
-
-
-from .A_functions_base.function_1_algebra import \
-    calc_scalar_product_by_vectors,\
-    calc_scalar_product_by_complex_vectors,\
-    calc_modulus_sq_by_complex_vector
-
-from .A_functions_base.function_1_atomic_vibrations import calc_beta_by_u, vibration_constraints, apply_constraint_on_cell_by_type_cell
-from .A_functions_base.function_1_error_simplex import error_estimation_simplex
-from .A_functions_base.function_1_gamma_nu import gammanu_to_tthphi, tthphi_to_gammanu, recal_int_to_tthphi_grid, recal_int_to_gammanu_grid
-
-from .A_functions_base.function_1_inversed_hessian import estimate_inversed_hessian_matrix
-from .A_functions_base.function_1_magnetic import get_j0_j2_by_symbol
-from .A_functions_base.function_1_markdown import md_to_html
-
-from .A_functions_base.function_1_matrices import \
-    calc_chi_sq, tri_linear_interpolation, transform_string_to_r_b, transform_string_to_digits,\
-    transform_fraction_with_label_to_string, transform_digits_to_string, transform_r_b_to_string, \
-    calc_mRmCmRT, calc_rotation_matrix_ij_by_euler_angles,\
-    calc_euler_angles_by_rotation_matrix_ij, calc_determinant_matrix_ij, \
-    calc_inverse_matrix_ij, calc_rotation_matrix_ij_around_axis, \
-    calc_product_matrices, calc_product_matrix_vector, calc_vector_angle,\
-    calc_vector_product, scalar_product, calc_rotation_matrix_by_two_vectors, \
-    ortogonalize_matrix, calc_moment_2d_by_susceptibility, calc_phase_3d
-from .A_functions_base.function_1_objects import get_functions_of_objet, \
-    variable_name_to_string, change_variable_name, get_table_html_for_variables
-from .A_functions_base.function_1_rhocif import transs, calc_GCF
-from .A_functions_base.function_1_roots import calc_roots
-from .A_functions_base.function_1_scat_length_neutron import \
-    apply_constraint_on_cell_by_type_cell, get_scat_length_neutron
-
-from .A_functions_base.function_1_strings import value_error_to_string, \
-    ciftext_to_html, find_prefix, common_string, string_to_value_error, \
-    transform_string_to_r_b, transform_string_to_digits,\
-    transform_fraction_with_label_to_string, transform_digits_to_string,\
-    transform_r_b_to_string
-
-from .A_functions_base.function_1_tof import tof_Jorgensen, \
-    tof_Jorgensen_VonDreele
-
-
-from .A_functions_base.function_2_crystallography_base import \
-    calc_volume_uc_by_abc_cosines,\
-    calc_volume_uc_by_abc_angles,\
-    calc_inverse_d_by_hkl_abc_cosines,\
-    calc_inverse_d_by_hkl_abc_angles,\
-    calc_sthovl_by_hkl_abc_cosines,\
-    calc_sthovl_by_hkl_abc_angles,\
-    calc_phase_3d,\
-    calc_moment_2d_by_susceptibility,\
-    ortogonalize_matrix
-
-from .A_functions_base.function_2_mem import \
-    calc_asymmetric_unit_cell_indexes, calc_index_atom_symmetry_closest_to_fract_xyz, \
-    calc_factor_in_front_of_density_for_fm, calc_moment_perp,\
-    transfer_to_density_3d, transfer_to_chi_3d
-
-from .A_functions_base.function_2_space_group import \
-    get_crystal_system_by_it_number, get_name_hm_short_by_it_number, \
-    get_name_schoenflies_by_it_number, get_name_hall_by_it_number, \
-    get_name_hm_extended_by_it_number_it_coordinate_system_code, \
-    get_name_hm_full_by_it_number
-
-from .A_functions_base.function_2_sym_elems import \
-    form_symm_elems_by_b_i_r_ij, transform_to_p1, get_string_by_symm_elem
-
-from .A_functions_base.function_3_den_file import \
-    read_den_file, save_to_den_file
-
-from .A_functions_base.function_3_extinction import \
-    calc_extinction,\
-    calc_extinction_2
-
-from .A_functions_base.function_3_mcif import \
-    calc_fract_by_sym_elem, calc_moment_by_sym_elem
-
-from .A_functions_base.function_4_flip_ratio import \
-    calc_f_plus_sq, calc_f_minus_sq, calc_flip_ratio
-
-from cryspy.D_functions_item_loop.function_1_section_from_density_point \
-    import calc_section_from_density_point
-
-
-from cryspy.D_functions_item_loop.function_1_report_magnetization_ellipsoid import \
-    magnetization_ellipsoid_by_u_ij, report_main_axes_of_magnetization_ellipsoids
-
-from cryspy.H_functions_global.function_1_cryspy_objects import \
-    str_to_globaln, file_to_globaln, str_to_items
-
-from cryspy.H_functions_global.function_1_cryspy_objects import \
-    file_to_globaln as load_file
-
-from cryspy.H_functions_global.function_1_cryspy_objects import \
-    L_GLOBAL_CLASS, L_DATA_CLASS, L_LOOP_CLASS, L_ITEM_CLASS, load_packages, \
-    add_package, packages, delete_package, L_FUNCTION_ADD
+import sys
+from importlib import import_module
+
+# Objects of the library are imported at first access (PEP 562), so that
+# "import cryspy" does not load all modules and data tables of the library.
+T_LAZY_IMPORT = (
+    ("cryspy.B_parent_classes.cl_1_item", (
+        "ItemN",)),
+    ("cryspy.B_parent_classes.cl_2_loop", (
+        "LoopN",)),
+    ("cryspy.B_parent_classes.cl_3_data", (
+        "DataN",)),
+    ("cryspy.B_parent_classes.cl_4_global", (
+        "GlobalN",)),
+    ("cryspy.B_parent_classes.cl_5_parameter_vector", (
+        "ParameterVector",)),
+    ("cryspy.A_functions_base.function_1_algebra", (
+        "calc_scalar_product_by_vectors",
+        "calc_scalar_product_by_complex_vectors",
+        "calc_modulus_sq_by_complex_vector")),
+    ("cryspy.A_functions_base.function_1_atomic_vibrations", (
+        "calc_beta_by_u", "vibration_constraints")),
+    ("cryspy.A_functions_base.function_1_error_simplex", (
+        "error_estimation_simplex",)),
+    ("cryspy.A_functions_base.function_1_gamma_nu", (
+        "gammanu_to_tthphi", "tthphi_to_gammanu",
+        "recal_int_to_tthphi_grid", "recal_int_to_gammanu_grid")),
+    ("cryspy.A_functions_base.function_1_inversed_hessian", (
+        "estimate_inversed_hessian_matrix",)),
+    ("cryspy.A_functions_base.function_1_magnetic", (
+        "get_j0_j2_by_symbol",)),
+    ("cryspy.A_functions_base.function_1_markdown", (
+        "md_to_html",)),
+    ("cryspy.A_functions_base.function_1_matrices", (
+        "calc_chi_sq", "tri_linear_interpolation", "calc_mRmCmRT",
+        "calc_rotation_matrix_ij_by_euler_angles",
+        "calc_euler_angles_by_rotation_matrix_ij",
+        "calc_determinant_matrix_ij", "calc_inverse_matrix_ij",
+        "calc_rotation_matrix_ij_around_axis", "calc_product_matrices",
+        "calc_product_matrix_vector", "calc_vector_angle",
+        "calc_vector_product", "scalar_product",
+        "calc_rotation_matrix_by_two_vectors")),
+    ("cryspy.A_functions_base.function_1_objects", (
+        "get_functions_of_objet", "variable_name_to_string",
+        "change_variable_name", "get_table_html_for_variables")),
+    ("cryspy.A_functions_base.function_1_precision", (
+        "set_precision", "get_precision")),
+    ("cryspy.A_functions_base.function_1_rhocif", (
+        "transs", "calc_GCF")),
+    ("cryspy.A_functions_base.function_1_roots", (
+        "calc_roots",)),
+    ("cryspy.A_functions_base.function_1_scat_length_neutron", (
+        "apply_constraint_on_cell_by_type_cell",
+        "get_scat_length_neutron")),
+    ("cryspy.A_functions_base.function_1_strings", (
+        "value_error_to_string", "ciftext_to_html", "find_prefix",
+        "common_string", "string_to_value_error",
+        "transform_string_to_r_b", "transform_string_to_digits",
+        "transform_fraction_with_label_to_string",
+        "transform_digits_to_string", "transform_r_b_to_string")),
+    ("cryspy.A_functions_base.function_1_tof", (
+        "tof_Jorgensen", "tof_Jorgensen_VonDreele")),
+    ("cryspy.A_functions_base.function_2_crystallography_base", (
+        "calc_volume_uc_by_abc_cosines", "calc_volume_uc_by_abc_angles",
+        "calc_inverse_d_by_hkl_abc_cosines",
+        "calc_inverse_d_by_hkl_abc_angles",
+        "calc_sthovl_by_hkl_abc_cosines", "calc_sthovl_by_hkl_abc_angles",
+        "calc_phase_3d", "calc_moment_2d_by_susceptibility",
+        "ortogonalize_matrix")),
+    ("cryspy.A_functions_base.function_2_mem", (
+        "calc_asymmetric_unit_cell_indexes",
+        "calc_index_atom_symmetry_closest_to_fract_xyz",
+        "calc_factor_in_front_of_density_for_fm", "calc_moment_perp",
+        "transfer_to_density_3d", "transfer_to_chi_3d")),
+    ("cryspy.A_functions_base.function_2_space_group", (
+        "get_crystal_system_by_it_number",
+        "get_name_hm_short_by_it_number",
+        "get_name_schoenflies_by_it_number", "get_name_hall_by_it_number",
+        "get_name_hm_extended_by_it_number_it_coordinate_system_code",
+        "get_name_hm_full_by_it_number")),
+    ("cryspy.A_functions_base.function_2_sym_elems", (
+        "form_symm_elems_by_b_i_r_ij", "transform_to_p1",
+        "get_string_by_symm_elem")),
+    ("cryspy.A_functions_base.function_3_den_file", (
+        "read_den_file", "save_to_den_file")),
+    ("cryspy.A_functions_base.function_3_extinction", (
+        "calc_extinction", "calc_extinction_2")),
+    ("cryspy.A_functions_base.function_3_mcif", (
+        "calc_fract_by_sym_elem", "calc_moment_by_sym_elem")),
+    ("cryspy.A_functions_base.function_4_flip_ratio", (
+        "calc_f_plus_sq", "calc_f_minus_sq", "calc_flip_ratio")),
+    ("cryspy.D_functions_item_loop.function_1_section_from_density_point", (
+        "calc_section_from_density_point",)),
+    ("cryspy.D_functions_item_loop.function_1_report_magnetization_ellipsoid", (
+        "magnetization_ellipsoid_by_u_ij",
+        "report_main_axes_of_magnetization_ellipsoids")),
+    ("cryspy.H_functions_global.function_1_cryspy_objects", (
+        "str_to_globaln", "file_to_globaln", "str_to_items",
+        "L_GLOBAL_CLASS", "L_DATA_CLASS", "L_LOOP_CLASS", "L_ITEM_CLASS",
+        "load_packages", "add_package", "packages", "delete_package",
+        "L_FUNCTION_ADD")),
+    # classes of L_ITEM_CLASS, L_LOOP_CLASS, L_DATA_CLASS and L_GLOBAL_CLASS
+    ("cryspy.C_item_loop_classes.cl_1_atom_electron_configuration", (
+        "AtomElectronConfiguration", "AtomElectronConfigurationL",)),
+    ("cryspy.C_item_loop_classes.cl_1_atom_local_axes", (
+        "AtomLocalAxes", "AtomLocalAxesL",)),
+    ("cryspy.C_item_loop_classes.cl_1_atom_site", (
+        "AtomSite", "AtomSiteL",)),
+    ("cryspy.C_item_loop_classes.cl_1_atom_site_aniso", (
+        "AtomSiteAniso", "AtomSiteAnisoL",)),
+    ("cryspy.C_item_loop_classes.cl_1_atom_site_moment", (
+        "AtomSiteMoment", "AtomSiteMomentL",)),
+    ("cryspy.C_item_loop_classes.cl_1_atom_site_susceptibility", (
+        "AtomSiteSusceptibility", "AtomSiteSusceptibilityL",)),
+    ("cryspy.C_item_loop_classes.cl_1_atom_type", (
+        "AtomType", "AtomTypeL",)),
+    ("cryspy.C_item_loop_classes.cl_1_atom_type_scat", (
+        "AtomTypeScat", "AtomTypeScatL",)),
+    ("cryspy.C_item_loop_classes.cl_1_cell", (
+        "Cell", "CellL",)),
+    ("cryspy.C_item_loop_classes.cl_1_chi2", (
+        "Chi2", "Chi2L",)),
+    ("cryspy.C_item_loop_classes.cl_1_diffrn_radiation", (
+        "DiffrnRadiation", "DiffrnRadiationL",)),
+    ("cryspy.C_item_loop_classes.cl_1_diffrn_refln", (
+        "DiffrnRefln", "DiffrnReflnL",)),
+    ("cryspy.C_item_loop_classes.cl_1_exclude", (
+        "Exclude", "ExcludeL",)),
+    ("cryspy.C_item_loop_classes.cl_1_extinction", (
+        "Extinction", "ExtinctionL",)),
+    ("cryspy.C_item_loop_classes.cl_1_inversed_hessian", (
+        "InversedHessian",)),
+    ("cryspy.C_item_loop_classes.cl_1_mem_parameters", (
+        "MEMParameters", "MEMParametersL",)),
+    ("cryspy.C_item_loop_classes.cl_1_pd2d_background", (
+        "Pd2dBackground",)),
+    ("cryspy.C_item_loop_classes.cl_1_pd2d_instr_reflex_asymmetry", (
+        "Pd2dInstrReflexAsymmetry", "Pd2dInstrReflexAsymmetryL",)),
+    ("cryspy.C_item_loop_classes.cl_1_pd2d_instr_resolution", (
+        "Pd2dInstrResolution", "Pd2dInstrResolutionL",)),
+    ("cryspy.C_item_loop_classes.cl_1_pd2d_meas", (
+        "Pd2dMeas",)),
+    ("cryspy.C_item_loop_classes.cl_1_pd2d_peak", (
+        "Pd2dPeak", "Pd2dPeakL",)),
+    ("cryspy.C_item_loop_classes.cl_1_pd2d_proc", (
+        "Pd2dProc",)),
+    ("cryspy.C_item_loop_classes.cl_1_pd_background", (
+        "PdBackground", "PdBackgroundL",)),
+    ("cryspy.C_item_loop_classes.cl_1_pd_instr_reflex_asymmetry", (
+        "PdInstrReflexAsymmetry", "PdInstrReflexAsymmetryL",)),
+    ("cryspy.C_item_loop_classes.cl_1_pd_instr_resolution", (
+        "PdInstrResolution", "PdInstrResolutionL",)),
+    ("cryspy.C_item_loop_classes.cl_1_pd_meas", (
+        "PdMeas", "PdMeasL",)),
+    ("cryspy.C_item_loop_classes.cl_1_pd_peak", (
+        "PdPeak", "PdPeakL",)),
+    ("cryspy.C_item_loop_classes.cl_1_pd_proc", (
+        "PdProc", "PdProcL",)),
+    ("cryspy.C_item_loop_classes.cl_1_phase", (
+        "Phase", "PhaseL",)),
+    ("cryspy.C_item_loop_classes.cl_1_range", (
+        "Range", "RangeL",)),
+    ("cryspy.C_item_loop_classes.cl_1_refine_ls", (
+        "RefineLs", "RefineLsL",)),
+    ("cryspy.C_item_loop_classes.cl_1_refln", (
+        "Refln", "ReflnL",)),
+    ("cryspy.C_item_loop_classes.cl_1_refln_susceptibility", (
+        "ReflnSusceptibility", "ReflnSusceptibilityL",)),
+    ("cryspy.C_item_loop_classes.cl_1_setup", (
+        "Setup", "SetupL",)),
+    ("cryspy.C_item_loop_classes.cl_1_space_group_symop", (
+        "SpaceGroupSymop", "SpaceGroupSymopL",)),
+    ("cryspy.C_item_loop_classes.cl_1_space_group_symop_magn_centering", (
+        "SpaceGroupSymopMagnCentering", "SpaceGroupSymopMagnCenteringL",)),
+    ("cryspy.C_item_loop_classes.cl_1_space_group_wyckoff", (
+        "SpaceGroupWyckoff", "SpaceGroupWyckoffL",)),
+    ("cryspy.C_item_loop_classes.cl_1_texture", (
+        "Texture", "TextureL",)),
+    ("cryspy.C_item_loop_classes.cl_1_tof_background", (
+        "TOFBackground", "TOFBackgroundL",)),
+    ("cryspy.C_item_loop_classes.cl_1_tof_intensity_incident", (
+        "TOFIntensityIncident", "TOFIntensityIncidentL",)),
+    ("cryspy.C_item_loop_classes.cl_1_tof_meas", (
+        "TOFMeas", "TOFMeasL",)),
+    ("cryspy.C_item_loop_classes.cl_1_tof_parameters", (
+        "TOFParameters", "TOFParametersL",)),
+    ("cryspy.C_item_loop_classes.cl_1_tof_peak", (
+        "TOFPeak", "TOFPeakL",)),
+    ("cryspy.C_item_loop_classes.cl_1_tof_proc", (
+        "TOFProc", "TOFProcL",)),
+    ("cryspy.C_item_loop_classes.cl_1_tof_profile", (
+        "TOFProfile", "TOFProfileL",)),
+    ("cryspy.C_item_loop_classes.cl_2_atom_rho_orbital_radial_slater", (
+        "AtomRhoOrbitalRadialSlater", "AtomRhoOrbitalRadialSlaterL",)),
+    ("cryspy.C_item_loop_classes.cl_2_atom_site_scat", (
+        "AtomSiteScat", "AtomSiteScatL",)),
+    ("cryspy.C_item_loop_classes.cl_2_diffrn_orient_matrix", (
+        "DiffrnOrientMatrix", "DiffrnOrientMatrixL",)),
+    ("cryspy.C_item_loop_classes.cl_2_section", (
+        "Section", "SectionL",)),
+    ("cryspy.C_item_loop_classes.cl_2_space_group", (
+        "SpaceGroup",)),
+    ("cryspy.C_item_loop_classes.cl_2_space_group_symop_magn_operation", (
+        "SpaceGroupSymopMagnOperation", "SpaceGroupSymopMagnOperationL",)),
+    ("cryspy.C_item_loop_classes.cl_3_density_point", (
+        "DensityPoint", "DensityPointL",)),
+    ("cryspy.E_data_classes.cl_1_crystal", (
+        "Crystal",)),
+    ("cryspy.E_data_classes.cl_1_mag_crystal", (
+        "MagCrystal",)),
+    ("cryspy.E_data_classes.cl_2_diffrn", (
+        "Diffrn",)),
+    ("cryspy.E_data_classes.cl_2_pd", (
+        "Pd",)),
+    ("cryspy.E_data_classes.cl_2_pd2d", (
+        "Pd2d",)),
+    ("cryspy.E_data_classes.cl_2_tof", (
+        "TOF",)),
+    ("cryspy.G_global_classes.cl_1_mem", (
+        "MEM",)),
+    ("cryspy.G_global_classes.cl_1_rhochi", (
+        "RhoChi",)),
+    )
+
+D_LAZY_IMPORT = {attr_name: module_name
+                 for module_name, l_name in T_LAZY_IMPORT
+                 for attr_name in l_name}
+
+D_ALIAS = {"load_file": "file_to_globaln"}
+
+MODULE_OBJECTS = "cryspy.H_functions_global.function_1_cryspy_objects"
 
 
 def repr_function(function, flag_long: bool = False):
@@ -185,69 +317,61 @@ def repr_function(function, flag_long: bool = False):
     return "\n".join(ls_out)
 
 
-L_FUNCTION = [
-    calc_scalar_product_by_vectors,
-    calc_scalar_product_by_complex_vectors,
-    calc_modulus_sq_by_complex_vector,
-    calc_beta_by_u, vibration_constraints, apply_constraint_on_cell_by_type_cell,
-    error_estimation_simplex,
-    gammanu_to_tthphi, tthphi_to_gammanu, recal_int_to_tthphi_grid, recal_int_to_gammanu_grid,
-    estimate_inversed_hessian_matrix,
-    get_j0_j2_by_symbol,
-    md_to_html,
-    calc_chi_sq, tri_linear_interpolation, transform_string_to_r_b, transform_string_to_digits,
-    transform_fraction_with_label_to_string, transform_digits_to_string, transform_r_b_to_string,
-    calc_mRmCmRT, calc_rotation_matrix_ij_by_euler_angles,
-    calc_euler_angles_by_rotation_matrix_ij, calc_determinant_matrix_ij,
-    calc_inverse_matrix_ij, calc_rotation_matrix_ij_around_axis,
-    calc_product_matrices, calc_product_matrix_vector, calc_vector_angle,
-    calc_vector_product, scalar_product, calc_rotation_matrix_by_two_vectors,
-    ortogonalize_matrix, calc_moment_2d_by_susceptibility, calc_phase_3d,
-    get_functions_of_objet,
-    variable_name_to_string, change_variable_name, get_table_html_for_variables,
-    transs, calc_GCF,
-    calc_roots,
-    apply_constraint_on_cell_by_type_cell, get_scat_length_neutron,
-    value_error_to_string, 
-    ciftext_to_html, find_prefix, common_string, string_to_value_error,
-    transform_string_to_r_b, transform_string_to_digits,
-    transform_fraction_with_label_to_string, transform_digits_to_string,
-    transform_r_b_to_string,
-    tof_Jorgensen,
-    tof_Jorgensen_VonDreele,
-    calc_volume_uc_by_abc_cosines,
-    calc_volume_uc_by_abc_angles,
-    calc_inverse_d_by_hkl_abc_cosines,
-    calc_inverse_d_by_hkl_abc_angles,
-    calc_sthovl_by_hkl_abc_cosines,
-    calc_sthovl_by_hkl_abc_angles,
-    calc_phase_3d,
-    calc_moment_2d_by_susceptibility,
-    ortogonalize_matrix,
-    calc_asymmetric_unit_cell_indexes, calc_index_atom_symmetry_closest_to_fract_xyz, 
-    calc_factor_in_front_of_density_for_fm, calc_moment_perp,
-    transfer_to_density_3d, transfer_to_chi_3d,
-    get_crystal_system_by_it_number, get_name_hm_short_by_it_number, 
-    get_name_schoenflies_by_it_number, get_name_hall_by_it_number, 
-    get_name_hm_extended_by_it_number_it_coordinate_system_code, 
-    get_name_hm_full_by_it_number,
-    form_symm_elems_by_b_i_r_ij, transform_to_p1, get_string_by_symm_elem,
-    read_den_file, save_to_den_file,
-    calc_extinction,
-    calc_extinction_2,
-    calc_fract_by_sym_elem, calc_moment_by_sym_elem,
-    calc_f_plus_sq, calc_f_minus_sq, calc_flip_ratio,
-    calc_section_from_density_point,
-    str_to_globaln, file_to_globaln, str_to_items,
-    load_file,
-    load_packages,
-    add_package, packages, delete_package,
-    repr_function,
-    magnetization_ellipsoid_by_u_ij,
-    report_main_axes_of_magnetization_ellipsoids]
+L_FUNCTION_NAME = (
+    "calc_scalar_product_by_vectors", "calc_scalar_product_by_complex_vectors",
+    "calc_modulus_sq_by_complex_vector", "calc_beta_by_u",
+    "vibration_constraints", "apply_constraint_on_cell_by_type_cell",
+    "error_estimation_simplex", "gammanu_to_tthphi", "tthphi_to_gammanu",
+    "recal_int_to_tthphi_grid", "recal_int_to_gammanu_grid",
+    "estimate_inversed_hessian_matrix", "get_j0_j2_by_symbol", "md_to_html",
+    "calc_chi_sq", "tri_linear_interpolation", "transform_string_to_r_b",
+    "transform_string_to_digits", "transform_fraction_with_label_to_string",
+    "transform_digits_to_string", "transform_r_b_to_string", "calc_mRmCmRT",
+    "calc_rotation_matrix_ij_by_euler_angles",
+    "calc_euler_angles_by_rotation_matrix_ij", "calc_determinant_matrix_ij",
+    "calc_inverse_matrix_ij", "calc_rotation_matrix_ij_around_axis",
+    "calc_product_matrices", "calc_product_matrix_vector", "calc_vector_angle",
+    "calc_vector_product", "scalar_product",
+    "calc_rotation_matrix_by_two_vectors", "ortogonalize_matrix",
+    "calc_moment_2d_by_susceptibility", "calc_phase_3d",
+    "get_functions_of_objet", "variable_name_to_string",
+    "change_variable_name", "get_table_html_for_variables", "transs",
+    "calc_GCF", "calc_roots", "apply_constraint_on_cell_by_type_cell",
+    "get_scat_length_neutron", "value_error_to_string", "ciftext_to_html",
+    "find_prefix", "common_string", "string_to_value_error",
+    "transform_string_to_r_b", "transform_string_to_digits",
+    "transform_fraction_with_label_to_string", "transform_digits_to_string",
+    "transform_r_b_to_string", "tof_Jorgensen", "tof_Jorgensen_VonDreele",
+    "calc_volume_uc_by_abc_cosines", "calc_volume_uc_by_abc_angles",
+    "calc_inverse_d_by_hkl_abc_cosines", "calc_inverse_d_by_hkl_abc_angles",
+    "calc_sthovl_by_hkl_abc_cosines", "calc_sthovl_by_hkl_abc_angles",
+    "calc_phase_3d", "calc_moment_2d_by_susceptibility", "ortogonalize_matrix",
+    "calc_asymmetric_unit_cell_indexes",
+    "calc_index_atom_symmetry_closest_to_fract_xyz",
+    "calc_factor_in_front_of_density_for_fm", "calc_moment_perp",
+    "transfer_to_density_3d", "transfer_to_chi_3d",
+    "get_crystal_system_by_it_number", "get_name_hm_short_by_it_number",
+    "get_name_schoenflies_by_it_number", "get_name_hall_by_it_number",
+    "get_name_hm_extended_by_it_number_it_coordinate_system_code",
+    "get_name_hm_full_by_it_number", "form_symm_elems_by_b_i_r_ij",
+    "transform_to_p1", "get_string_by_symm_elem", "read_den_file",
+    "save_to_den_file", "calc_extinction", "calc_extinction_2",
+    "calc_fract_by_sym_elem", "calc_moment_by_sym_elem", "calc_f_plus_sq",
+    "calc_f_minus_sq", "calc_flip_ratio", "calc_section_from_density_point",
+    "str_to_globaln", "file_to_globaln", "str_to_items", "load_file",
+    "load_packages", "add_package", "packages", "delete_package",
+    "repr_function", "magnetization_ellipsoid_by_u_ij",
+    "report_main_axes_of_magnetization_ellipsoids")
+
+
+def get_l_function() -> list:
+    """Give list of functions of the library (their modules are imported)."""
+    module = sys.modules[__name__]
+    return [getattr(module, name) for name in L_FUNCTION_NAME]
+
 
 def functions(s_name: str = "", flag_long: bool = False):
-    l_function = L_FUNCTION + L_FUNCTION_ADD
+    l_function = get_l_function() + __getattr__("L_FUNCTION_ADD")
     ls_out = []
     for function in l_function:
         cond_1 = function.__name__.lower().find(s_name.lower()) != -1
@@ -272,7 +396,8 @@ def repr_class(obj_class):
     return f"|{s_name:30}|{s_doc:70}|"
     
 def classes(s_name: str = ""):
-    l_class = L_GLOBAL_CLASS+L_DATA_CLASS+L_LOOP_CLASS+L_ITEM_CLASS
+    l_class = __getattr__("L_GLOBAL_CLASS") + __getattr__("L_DATA_CLASS") + \
+        __getattr__("L_LOOP_CLASS") + __getattr__("L_ITEM_CLASS")
     ls_out = ["|class                         |description                                                           |"]
     ls_out.append("|------------------------------|----------------------------------------------------------------------|")
     for class_ in l_class:
@@ -283,10 +408,38 @@ def classes(s_name: str = ""):
 
 
 def __getattr__(name):
-    for obj_class in L_ITEM_CLASS + L_LOOP_CLASS + L_DATA_CLASS + \
-            L_GLOBAL_CLASS + L_FUNCTION_ADD:
-        if name == obj_class.__name__:
-            return obj_class
-    raise AttributeError(f"module 'cryspy' has no attribute '{name:}'")
-
-    
\ No newline at end of file
+    if name in D_ALIAS.keys():
+        value = __getattr__(D_ALIAS[name])
+    elif name in D_LAZY_IMPORT.keys():
+        value = getattr(import_module(D_LAZY_IMPORT[name]), name)
+    elif name == "L_FUNCTION":
+        return get_l_function()
+    else:
+        # classes and functions of external packages are added only by
+        # the module of cryspy objects, it is not imported here
+        value = None
+        module = sys.modules.get(MODULE_OBJECTS, None)
+        if ((module is not None) and not(name.startswith("__"))):
+            for obj_class in module.L_ITEM_CLASS + module.L_LOOP_CLASS + \
+                    module.L_DATA_CLASS + module.L_GLOBAL_CLASS + \
+                    module.L_FUNCTION_ADD:
+                if name == obj_class.__name__:
+                    value = obj_class
+                    break
+        if value is None:
+            raise AttributeError(f"module 'cryspy' has no attribute '{name:}'")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals().keys()) | set(D_LAZY_IMPORT.keys()) |
+                  set(D_ALIAS.keys()))
+
+
+# "from cryspy import *" gives all objects of the library (they are imported)
+__all__ = sorted(D_LAZY_IMPORT) + sorted(D_ALIAS) + [
+    "A_functions_base", "B_parent_classes", "C_item_loop_classes",
+    "D_functions_item_loop", "E_data_classes", "F_functions_data",
+    "G_global_classes", "H_functions_global", "L_FUNCTION", "classes",
+    "functions", "name", "repr_class", "repr_function"]
@@ -0,0 +1,83 @@
+import numpy
+
+from cryspy.A_functions_base.function_1_reflection_cache import \
+    get_reflection_cache
+from cryspy.A_functions_base.function_2_crystallography_base import \
+    calc_hkl_by_symmetry, calc_hkl_by_laue_class
+from cryspy.C_item_loop_classes.cl_1_cell import Cell
+from cryspy.C_item_loop_classes.cl_2_space_group import SpaceGroup
+
+
+def calc_hkl_by_loops(cell, space_group, sthovl_min, sthovl_max):
+    """Reference implementation by loops over h, k, l."""
+    shift = numpy.array(space_group.shift, dtype=float)
+    r_s_g_s = space_group.reduced_space_group_symop
+    r_ij = numpy.array([r_s_g_s.r_11, r_s_g_s.r_12, r_s_g_s.r_13,
+                        r_s_g_s.r_21, r_s_g_s.r_22, r_s_g_s.r_23,
+                        r_s_g_s.r_31, r_s_g_s.r_32, r_s_g_s.r_33],
+                       dtype=float).round().astype(int)
+    h_max = int(2.*cell.length_a*sthovl_max)
+    k_max = int(2.*cell.length_b*sthovl_max)
+    l_max = int(2.*cell.length_c*sthovl_max)
+    l_hkl, l_mult = [], []
+    for h in range(0, h_max+1):
+        for k in range(-k_max, k_max+1):
+            for l in range(-l_max, l_max+1):
+                phase = 2.*numpy.pi*(shift[:, 0]*h+shift[:, 1]*k+shift[:, 2]*l)
+                if abs(numpy.exp(1j*phase).sum()) <= 0.00001:
+                    continue
+                l_hkl_s = [(int(h*r_ij[0, i]+k*r_ij[3, i]+l*r_ij[6, i]),
+                            int(h*r_ij[1, i]+k*r_ij[4, i]+l*r_ij[7, i]),
+                            int(h*r_ij[2, i]+k*r_ij[5, i]+l*r_ij[8, i]))
+                           for i in range(r_ij.shape[1])]
+                l_hkl_s.extend([(-x[0], -x[1], -x[2]) for x in l_hkl_s])
+                l_hkl_s.sort(key=lambda x: 10000*x[0]+100*x[1]+x[2])
+                if not(l_hkl_s[-1] in l_hkl):
+                    l_hkl.append(l_hkl_s[-1])
+                    l_mult.append(len(set(l_hkl_s)))
+    l_sthovl = [cell.calc_sthovl(*hkl) for hkl in l_hkl]
+    l_res = sorted(zip(l_sthovl, l_hkl, l_mult), key=lambda x: x[0])
+    l_res = [x for x in l_res if (sthovl_min < x[0] < sthovl_max)]
+    return [hkl for sthovl, hkl, mult in l_res], \
+        [mult for sthovl, hkl, mult in l_res]
+
+
+def test_calc_hkl():
+    get_reflection_cache().clear()
+    for it_number, code, abc_angles in (
+            (62, "abc", (8.5, 5.4, 7.0, 90., 90., 90.)),
+            (227, "2", (10.1, 10.1, 10.1, 90., 90., 90.)),
+            (166, "h", (5., 5., 13., 90., 90., 120.))):
+        space_group = SpaceGroup(it_number=it_number,
+                                 it_coordinate_system_code=code)
+        space_group.form_object()
+        a, b, c, alpha, beta, gamma = abc_angles
+        cell = Cell(length_a=a, length_b=b, length_c=c, angle_alpha=alpha,
+                    angle_beta=beta, angle_gamma=gamma)
+        h, k, l, mult = cell.calc_hkl(space_group, 0.05, 0.5)
+        l_hkl, l_mult = calc_hkl_by_loops(cell, space_group, 0.05, 0.5)
+        assert list(zip(h.tolist(), k.tolist(), l.tolist())) == l_hkl
+        assert mult.tolist() == l_mult
+
+
+def test_calc_hkl_by_laue_class():
+    for it_number, code in ((14, "b1"), (14, "c1"), (88, "1"), (148, "r"),
+                            (164, None), (175, None), (205, None)):
+        space_group = SpaceGroup(it_number=it_number,
+                                 it_coordinate_system_code=code)
+        space_group.form_object()
+        r_s_g_s = space_group.reduced_space_group_symop
+        r_ij = (r_s_g_s.r_11, r_s_g_s.r_12, r_s_g_s.r_13,
+                r_s_g_s.r_21, r_s_g_s.r_22, r_s_g_s.r_23,
+                r_s_g_s.r_31, r_s_g_s.r_32, r_s_g_s.r_33)
+        shift_i = tuple(zip(*space_group.shift))
+        res = calc_hkl_by_symmetry(6, 6, 6, r_ij, shift_i)
+        res_laue = calc_hkl_by_laue_class(space_group.laue_class, 6, 6, 6,
+                                          r_ij, shift_i, n_element=1000)
+        # reflections of the cube |h|, |k|, |l| <= 3 (the orbits of other
+        # reflections can be out of asymmetric unit of the box)
+        flag = numpy.all(numpy.abs(numpy.stack(res[:3])) <= 3, axis=0)
+        flag_laue = numpy.all(numpy.abs(numpy.stack(res_laue[:3])) <= 3,
+                              axis=0)
+        for array, array_laue in zip(res, res_laue):
+            assert numpy.array_equal(array[flag], array_laue[flag_laue])
@@ -0,0 +1,85 @@
+import os
+import numpy
+
+import cryspy
+
+DIR = os.path.dirname(__file__)
+F_MAIN = os.path.join(DIR, "PbSO4_unpol_powder_test", "main.rcif")
+
+
+def test_calc_chi_sq_batch():
+    rhochi = cryspy.file_to_globaln(F_MAIN)
+    l_var_name = rhochi.get_variable_names()
+    parameter_vector = cryspy.ParameterVector(rhochi, l_var_name)
+    val_0 = parameter_vector.get_all()
+    values = numpy.array([val_0, val_0*1.001, val_0, val_0*0.999])
+
+    chi_sq, n = rhochi.calc_chi_sq_batch(values)
+    assert numpy.all(parameter_vector.get_all() == val_0)
+    assert chi_sq[0] == chi_sq[2]
+
+    for values_k, chi_sq_k, n_k in zip(values, chi_sq, n):
+        parameter_vector.set_all(values_k)
+        rhochi.apply_constraint()
+        chi_sq_ref, n_ref = rhochi.calc_chi_sq(flag_internal=False)
+        assert numpy.isclose(chi_sq_k, chi_sq_ref, rtol=1e-10)
+        assert n_k == n_ref
+
+
+def test_calc_chi_sq_batch_pd():
+    rhochi = cryspy.file_to_globaln(F_MAIN)
+    l_crystal = [item for item in rhochi.items
+                 if isinstance(item, cryspy.Crystal)]
+    pd = [item for item in rhochi.items if isinstance(item, cryspy.Pd)][0]
+    l_var_name = pd.get_variable_names()
+    for crystal in l_crystal:
+        l_var_name.extend(crystal.get_variable_names())
+    parameter_vector = cryspy.ParameterVector([pd, ] + l_crystal, l_var_name)
+    val_0 = parameter_vector.get_all()
+    values = numpy.array([val_0, val_0*1.001, val_0])
+
+    chi_sq, n = pd.calc_chi_sq_batch(l_crystal, values, l_var_name)
+    assert numpy.all(parameter_vector.get_all() == val_0)
+    assert chi_sq[0] == chi_sq[2]
+    assert chi_sq[0] != chi_sq[1]
+
+    for values_k, chi_sq_k, n_k in zip(values, chi_sq, n):
+        parameter_vector.set_all(values_k)
+        chi_sq_ref, n_ref = pd.calc_chi_sq(l_crystal, flag_internal=True)
+        assert numpy.isclose(chi_sq_k, chi_sq_ref, rtol=1e-10)
+        assert n_k == n_ref
+
+
+def test_calc_chi_sq_batch_pd_linear():
+    rhochi = cryspy.file_to_globaln(F_MAIN)
+    l_crystal = rhochi.crystals()
+    pd = rhochi.experiments()[0]
+    l_var_name = pd.get_variable_names()
+    l_flag = [var_name in pd.get_linear_variable_names()
+              for var_name in l_var_name]
+    assert any(l_flag) and not all(l_flag)
+    parameter_vector = cryspy.ParameterVector([pd, ] + l_crystal, l_var_name)
+    val_0 = parameter_vector.get_all()
+    values = numpy.array([val_0, ]*4)
+    values[1:, l_flag] *= numpy.array([1.01, 0.98, 1.03])[:, numpy.newaxis]
+    values[3, numpy.logical_not(l_flag)] *= 1.001
+
+    l_call = []
+    calc_chi_sq = pd.calc_chi_sq
+
+    def calc_chi_sq_count(*argv, **kwargs):
+        l_call.append(1)
+        return calc_chi_sq(*argv, **kwargs)
+
+    pd.calc_chi_sq = calc_chi_sq_count
+    chi_sq, n = pd.calc_chi_sq_batch(l_crystal, values, l_var_name)
+    del pd.calc_chi_sq
+    # the sets differing only in linear parameters give one calculation
+    assert len(l_call) == 2
+    assert numpy.all(parameter_vector.get_all() == val_0)
+
+    for values_k, chi_sq_k, n_k in zip(values, chi_sq, n):
+        parameter_vector.set_all(values_k)
+        chi_sq_ref, n_ref = pd.calc_chi_sq(l_crystal, flag_internal=False)
+        assert numpy.isclose(chi_sq_k, chi_sq_ref, rtol=1e-10)
+        assert n_k == n_ref
@@ -0,0 +1,81 @@
+import os
+import numpy
+import pytest
+
+from pycifstar import to_global
+
+import cryspy
+from cryspy.A_functions_base.function_1_cif import file_to_global, \
+    str_to_global
+from cryspy.A_functions_base.function_1_strings import \
+    strings_to_values_errors
+
+DIR = os.path.dirname(__file__)
+F_MAIN = os.path.join(DIR, "PbSO4_unpol_powder_test", "main.rcif")
+
+
+def test_file_to_global():
+    global_1 = to_global(F_MAIN)
+    global_2 = file_to_global(F_MAIN)
+    assert global_1.name == global_2.name
+    assert [data.name for data in global_1.datas] == \
+        [data.name for data in global_2.datas]
+    for data_1, data_2 in zip(global_1.datas, global_2.datas):
+        assert str(data_1.items) == str(data_2.items)
+        assert [loop.names for loop in data_1.loops] == \
+            [loop.names for loop in data_2.loops]
+        assert [loop.values for loop in data_1.loops] == \
+            [loop.values for loop in data_2.loops]
+
+
+def test_str_to_global():
+    string = """global_
+_cell_length_a 5.0
+
+data_a
+_text 'a b'
+_text_2
+;
+line 1
+line 2
+;
+loop_
+_atom_site_label
+_atom_site_fract_x
+Fe 0.1 # comment
+"O 2" 0.2
+"""
+    global_ = str_to_global(string)
+    assert global_.items["_cell_length_a"].value == "5.0"
+    data = global_.datas[0]
+    assert data.name == "a"
+    assert data.items["_text"].value == "a b"
+    assert data.items["_text_2"].value == "line 1\nline 2"
+    assert data.loops[0]["_atom_site_label"] == ["Fe", "O 2"]
+
+
+def test_strings_to_values_errors():
+    values, errors = strings_to_values_errors(["1.5", "1.234(5)", ".", "2()"])
+    assert numpy.allclose(values[[0, 1, 3]], [1.5, 1.234, 2.])
+    assert numpy.isnan(values[2])
+    assert numpy.isclose(errors[1], 0.005)
+    assert errors[3] == 0.
+    assert numpy.isnan(errors[0]) and numpy.isnan(errors[2])
+
+
+def test_file_order_of_items():
+    rhochi = cryspy.file_to_globaln(F_MAIN)
+    assert [item.get_name() for item in rhochi.items] == ["pd_pd", "crystal_pbso4"]
+    pd = rhochi.items[0]
+    l_name = [item.get_name() for item in pd.items]
+    assert l_name[:6] == ["refine_ls", "range", "chi2", "pd_instr_resolution",
+                          "setup", "pd_instr_reflex_asymmetry"]
+    assert l_name[-3:] == ["exclude", "pd_background", "phase"]
+    assert rhochi.to_cif() == cryspy.file_to_globaln(F_MAIN).to_cif()
+
+
+def test_add_url_not_found():
+    with pytest.warns(UserWarning, match="is not found"):
+        global_ = str_to_global("_add_url not_existing_file.rcif\n"
+                                "data_a\n_cell_length_a 5.0\n", f_dir=DIR)
+    assert global_.datas[0].items["_cell_length_a"].value == "5.0"
@@ -0,0 +1,52 @@
+import os
+import numpy
+
+from cryspy.A_functions_base.function_1_strings import \
+    value_error_to_string, values_errors_to_strings
+from cryspy.C_item_loop_classes.cl_1_atom_site import AtomSiteL
+from cryspy.C_item_loop_classes.cl_1_pd_meas import PdMeasL
+
+DIR = os.path.dirname(__file__)
+F_PD_DATA = os.path.join(DIR, "PbSO4_unpol_powder_test", "pd_data.rcif")
+
+
+def test_values_errors_to_strings():
+    values = numpy.array([1.2345, -0.5, 123.4, 5., 0.012345, 1.5])
+    errors = numpy.array([0.0012, 0.031, 12.3, 0., 0.00021, numpy.nan])
+    l_string = values_errors_to_strings(values, errors)
+    for value, error, string in zip(values, errors, l_string):
+        if numpy.isnan(error):
+            error = None
+        assert string == value_error_to_string(float(value), error)
+
+
+def test_loop_to_cif():
+    with open(F_PD_DATA, "r") as fid:
+        pd_meas = PdMeasL.from_cif(fid.read())
+    pd_meas.to_items()
+    pd_meas.items[0].intensity_sigma = None
+    s_cif = pd_meas.to_cif()
+    l_line = s_cif.split("\n")
+    assert l_line[1:4] == ["_pd_meas_2theta", "_pd_meas_intensity",
+                           "_pd_meas_intensity_sigma"]
+    assert l_line[4].split() == [
+        pd_meas.items[0].ttheta_as_string,
+        pd_meas.items[0].intensity_as_string, "."]
+    pd_meas.to_columnar()
+    assert (pd_meas.to_cif() == s_cif)
+
+
+def test_loop_to_cif_sigma():
+    atom_site = AtomSiteL.from_cif("""loop_
+_atom_site_label
+_atom_site_type_symbol
+_atom_site_fract_x
+_atom_site_fract_y
+_atom_site_fract_z
+Fe Fe 0.125 0.1234(5) 0.
+O1 O 0.12(3) 0.5 0.25()
+""")
+    atom_site.to_items()
+    l_line = atom_site.to_cif().split("\n")
+    assert l_line[-2].split()[2:] == ["0.125000", "0.12340(50)", "0.000000"]
+    assert l_line[-1].split()[2:] == ["0.120(30)", "0.500000", "0.25()"]
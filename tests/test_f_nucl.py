@@ -0,0 +1,111 @@
+import numpy
+
+from cryspy.A_functions_base.function_2_crystallography_base import \
+    calc_phase_by_hkl_xyz_rb, calc_dwf
+from cryspy.E_data_classes.cl_1_crystal import Crystal
+
+S_CRYSTAL = """data_pbso4
+_space_group_IT_number 14
+_space_group_IT_coordinate_system_code b1
+_cell_length_a 8.47836
+_cell_length_b 5.39667
+_cell_length_c 6.95797
+_cell_angle_alpha 90.00
+_cell_angle_beta 101.2
+_cell_angle_gamma 90.00
+loop_
+_atom_site_label
+_atom_site_type_symbol
+_atom_site_fract_x
+_atom_site_fract_y
+_atom_site_fract_z
+_atom_site_occupancy
+_atom_site_adp_type
+_atom_site_B_iso_or_equiv
+_atom_site_multiplicity
+Pb   Pb3+   0.187490   0.250000   0.167190   1.0   Uani   0.  4
+S    S3+    0.065410   0.250000   0.683400   1.0   Biso   0.42052   4
+O1   O2-    0.907670   0.250000   0.595290   0.8   Biso   1.9879    4
+O3   O2-    0.081030   0.027080   0.809040   1.0   Uani   0.  4
+loop_
+_atom_site_aniso_label
+_atom_site_aniso_u_11
+_atom_site_aniso_u_22
+_atom_site_aniso_u_33
+_atom_site_aniso_u_12
+_atom_site_aniso_u_13
+_atom_site_aniso_u_23
+Pb 0.012 0.021 0.015 0.003 -0.002 0.001
+O3 0.022 0.011 0.017 -0.004 0.003 0.002
+"""
+
+
+def calc_f_nucl_by_meshgrid(crystal, index_h, index_k, index_l):
+    """Reference implementation by arrays (hkl, atoms, symmetry)."""
+    r_s_g_s = crystal.space_group.reduced_space_group_symop
+    atom_site = crystal.atom_site
+    x = numpy.array(atom_site.fract_x, dtype=float)
+    y = numpy.array(atom_site.fract_y, dtype=float)
+    z = numpy.array(atom_site.fract_z, dtype=float)
+    occ_mult = numpy.array(atom_site.occupancy, dtype=float) * \
+        numpy.array(atom_site.multiplicity, dtype=int)
+    b_scat = numpy.array(atom_site.scat_length_neutron, dtype=complex)
+    l_r = [getattr(r_s_g_s, f"numpy_r_{ij:}").astype(float) for ij in
+           (11, 12, 13, 21, 22, 23, 31, 32, 33)]
+    l_b = [getattr(r_s_g_s, f"numpy_b_{i:}").astype(float) for i in (1, 2, 3)]
+    phase_3d = calc_phase_by_hkl_xyz_rb(index_h, index_k, index_l, x, y, z,
+                                        *l_r, *l_b)
+    b_iso, beta = crystal.calc_b_iso_beta()
+    dwf_3d = calc_dwf(crystal.cell, index_h, index_k, index_l, b_iso, beta,
+                      *l_r)
+    f_hkl_as = ((phase_3d*dwf_3d).sum(axis=2)*b_scat*occ_mult).sum(axis=1) / \
+        l_r[0].size
+    return crystal.space_group.calc_f_hkl_by_f_hkl_as(
+        index_h, index_k, index_l, f_hkl_as)
+
+
+def test_calc_f_nucl():
+    crystal = Crystal.from_cif(S_CRYSTAL)
+    index_h, index_k, index_l, mult = crystal.calc_hkl(0., 0.6)
+    f_nucl = calc_f_nucl_by_meshgrid(crystal, index_h, index_k, index_l)
+    for n_element in (100, 1048576):
+        f_nucl_chunk = crystal.calc_f_nucl(index_h, index_k, index_l,
+                                           n_element=n_element)
+        assert numpy.allclose(f_nucl_chunk, f_nucl, rtol=1e-12, atol=1e-12)
+
+
+def test_calc_f_nucl_with_derivatives():
+    crystal = Crystal.from_cif(S_CRYSTAL)
+    index_h, index_k, index_l, mult = crystal.calc_hkl(0., 0.5)
+    params = [("O3", "fract_x"), ("O3", "fract_y"), ("O1", "occupancy"),
+              ("S", "b_iso"), ("Pb", "beta_12")]
+    f_nucl, d_f_nucl = crystal.calc_f_nucl_with_derivatives(
+        index_h, index_k, index_l, params=params, n_element=100)
+    assert numpy.allclose(f_nucl, crystal.calc_f_nucl(
+        index_h, index_k, index_l), rtol=1e-12, atol=1e-12)
+
+    delta = 1e-6
+    for label, name, attribute in (("O3", "fract_x", "fract_x"),
+                                   ("O3", "fract_y", "fract_y"),
+                                   ("O1", "occupancy", "occupancy"),
+                                   ("S", "b_iso", "b_iso_or_equiv")):
+        item = crystal.atom_site[label]
+        value = getattr(item, attribute)
+        l_f = []
+        for sign in (1., -1.):
+            setattr(item, attribute, value + sign*delta)
+            l_f.append(crystal.calc_f_nucl(index_h, index_k, index_l))
+        setattr(item, attribute, value)
+        d_f = (l_f[0] - l_f[1]) / (2.*delta)
+        assert numpy.allclose(d_f_nucl[(label, name)], d_f, atol=1e-5)
+
+    b_iso, beta = crystal.calc_b_iso_beta()
+    l_f = []
+    for sign in (1., -1.):
+        beta_delta = beta.copy()
+        beta_delta[0, 3] += sign*delta
+        crystal.__dict__["calc_b_iso_beta"] = lambda: (b_iso, beta_delta)
+        l_f.append(crystal.calc_f_nucl(index_h, index_k, index_l))
+    del crystal.__dict__["calc_b_iso_beta"]
+    d_f = (l_f[0] - l_f[1]) / (2.*delta)
+    assert numpy.allclose(d_f_nucl[("Pb", "beta_12")], d_f, atol=1e-5)
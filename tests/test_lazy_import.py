@@ -0,0 +1,39 @@
+import os
+import subprocess
+import sys
+
+DIR_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STATEMENT = """
+import sys
+import cryspy
+assert not(hasattr(cryspy, "__wrapped__"))
+assert not(hasattr(cryspy, "NotExistingClass"))
+assert "cryspy.B_parent_classes.cl_1_item" not in sys.modules
+cryspy.RhoChi
+import cryspy.A_functions_base.function_2_space_group as space_group
+import cryspy.A_functions_base.function_3_mcif as mcif
+assert "matplotlib" not in sys.modules
+assert "WYCKOFF" not in space_group.__dict__
+assert "ops_count" not in mcif.__dict__
+assert len(space_group.WYCKOFF) > 0
+"""
+
+
+def test_lazy_import():
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [DIR_ROOT, env.get("PYTHONPATH", "")])
+    subprocess.run([sys.executable, "-c", STATEMENT], check=True, env=env)
+
+
+def test_star_import():
+    import cryspy
+    d_name = {}
+    exec("from cryspy import *", d_name)
+    for name in ("file_to_globaln", "load_file", "RhoChi", "AtomSiteL",
+                 "Cell", "functions", "L_ITEM_CLASS", "C_item_loop_classes"):
+        assert name in d_name.keys()
+    assert all([obj_class.__name__ in cryspy.__all__ for obj_class in
+                cryspy.L_ITEM_CLASS + cryspy.L_LOOP_CLASS +
+                cryspy.L_DATA_CLASS + cryspy.L_GLOBAL_CLASS])
@@ -0,0 +1,113 @@
+import os
+import numpy
+
+import cryspy
+from cryspy.C_item_loop_classes.cl_1_pd_meas import PdMeas, PdMeasL
+from cryspy.C_item_loop_classes.cl_1_tof_meas import TOFMeas
+from cryspy.C_item_loop_classes.cl_1_atom_site import AtomSiteL
+
+DIR = os.path.dirname(__file__)
+F_PD_DATA = os.path.join(DIR, "PbSO4_unpol_powder_test", "pd_data.rcif")
+F_MAIN = os.path.join(DIR, "PbSO4_unpol_powder_test", "main.rcif")
+F_TOF = os.path.join(DIR, "tof", "tof_sigma.rcif")
+
+
+def test_columnar_from_cif():
+    with open(F_PD_DATA, "r") as fid:
+        string = fid.read()
+    pd_meas_c = PdMeasL.from_cif(string)
+    try:
+        PdMeasL.COLUMNAR = False
+        pd_meas = PdMeasL.from_cif(string)
+    finally:
+        PdMeasL.COLUMNAR = True
+    assert not(pd_meas.is_columnar())
+    assert pd_meas_c.is_columnar()
+    assert len(pd_meas_c.items) == len(pd_meas.items)
+    assert pd_meas_c.to_cif() == pd_meas.to_cif()
+    assert pd_meas_c.numpy_ttheta is pd_meas_c.numpy_ttheta
+    assert numpy.all(pd_meas_c.numpy_intensity == pd_meas.numpy_intensity)
+
+
+def test_columnar_rows():
+    with open(F_PD_DATA, "r") as fid:
+        pd_meas = PdMeasL.from_cif(fid.read())
+    pd_meas.to_columnar()
+    pd_meas.items[3].intensity = 5.
+    assert pd_meas.numpy_intensity[3] == 5.
+    pd_meas.numpy_intensity[4] = 7.
+    assert pd_meas.items[4].intensity == 7.
+    pd_meas.to_items()
+    assert not(pd_meas.is_columnar())
+    assert pd_meas.items[3].intensity == 5.
+
+
+def test_columnar_variables():
+    with open(F_MAIN, "r") as fid:
+        atom_site = AtomSiteL.from_cif(fid.read())
+    atom_site.set_variable("fract_x")
+    atom_site.set_variable("b_iso_or_equiv", index="Pb")
+    l_name = atom_site.get_variable_names()
+    s_cif = atom_site.to_cif()
+    atom_site.to_columnar()
+    assert atom_site.to_cif() == s_cif
+    assert atom_site.get_variable_names() == l_name
+    atom_site.set_variable_by_name(l_name[0], 0.3)
+    assert atom_site.get_variable_by_name(l_name[0]) == 0.3
+    assert atom_site["Pb"].fract_x == 0.3
+
+
+def test_columnar_items_as_list():
+    with open(F_PD_DATA, "r") as fid:
+        pd_meas = PdMeasL.from_cif(fid.read())
+    pd_meas.to_columnar()
+    ttheta = pd_meas.numpy_ttheta.copy()
+    n_row = len(pd_meas.items)
+    version = pd_meas.get_version()
+
+    item = PdMeasL.ITEM_CLASS(ttheta=200., intensity=5.,
+                              intensity_sigma=1.)
+    pd_meas.items.append(item)
+    assert pd_meas.get_version() != version
+    assert len(pd_meas.items) == n_row + 1
+    assert pd_meas.items[-1] is item
+    item.intensity = 9.
+    assert pd_meas.numpy_intensity[-1] == 9.
+
+    pd_meas.items[3].intensity = 4.
+    del pd_meas.items[0]
+    assert numpy.all(pd_meas.numpy_ttheta[:-1] == ttheta[1:])
+    assert pd_meas.items[2].intensity == 4.
+    assert pd_meas.items.pop() is item
+    pd_meas.items.insert(1, item)
+    assert pd_meas.items.index(item) == 1
+    assert pd_meas.numpy_ttheta[1] == 200.
+    pd_meas.items.remove(item)
+    assert item not in pd_meas.items
+    pd_meas.items.extend([item, ])
+    pd_meas.items.sort(key=lambda item_i: -item_i.ttheta)
+    assert pd_meas.items[0] is item
+    pd_meas.items[0] = PdMeasL.ITEM_CLASS(ttheta=1., intensity=2.,
+                                          intensity_sigma=1.)
+    pd_meas.items[1:3] = []
+    pd_meas.items.reverse()
+    assert numpy.all(pd_meas.numpy_ttheta[-1] == 1.)
+    assert len(pd_meas.items) == n_row - 2
+    pd_meas.items.clear()
+    assert len(pd_meas.items) == 0
+
+
+def test_columnar_meas_of_experiments():
+    pd = cryspy.file_to_globaln(F_MAIN).experiments()[0]
+    tof = cryspy.file_to_globaln(F_TOF).experiments()[0]
+    for loop, item in ((pd.pd_meas, PdMeas(ttheta=170., intensity=1.,
+                                           intensity_sigma=1.)),
+                       (tof.tof_meas, TOFMeas(time=1.e5, intensity=1.,
+                                              intensity_sigma=1.))):
+        assert loop.is_columnar()
+        n_row = len(loop.items)
+        loop.items.append(item)
+        assert loop.items[-1] is item
+        del loop.items[0]
+        assert len(loop.items) == n_row
+        assert loop.numpy_intensity.size == n_row
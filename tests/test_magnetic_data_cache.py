@@ -0,0 +1,50 @@
+import os
+import shutil
+import numpy
+
+from cryspy.A_functions_base import function_3_mcif
+
+
+def test_magnetic_data_cache(tmp_path):
+    f_name_cache = os.path.join(str(tmp_path), "magnetic_data.bin")
+    d_array = function_3_mcif.compile_magnetic_data(
+        f_name_cache=f_name_cache)
+    d_source, d_array_cache = function_3_mcif.read_magnetic_data_cache(
+        f_name_cache)
+    assert d_source["checksum"] == function_3_mcif.calc_file_checksum(
+        function_3_mcif.F_MAG_DATA)
+    assert isinstance(d_array_cache["ops_bns_trans"].base, numpy.memmap)
+    for name in function_3_mcif.MAGNETIC_DATA_NAMES:
+        if name in function_3_mcif.WYCKOFF_DATA_NAMES:
+            array = function_3_mcif.unpack_wyckoff_array(name, d_array_cache)
+        else:
+            array = d_array_cache[name]
+        assert numpy.array_equal(array, d_array[name])
+
+
+def test_magnetic_data_cache_touched_source(tmp_path, monkeypatch):
+    f_name = os.path.join(str(tmp_path), "magnetic_data.txt")
+    f_name_cache = os.path.join(str(tmp_path), "magnetic_data.bin")
+    shutil.copyfile(function_3_mcif.F_MAG_DATA, f_name)
+    d_array = function_3_mcif.compile_magnetic_data(f_name, f_name_cache)
+    stat = os.stat(f_name)
+    os.utime(f_name, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    l_call = []
+    calc_file_checksum = function_3_mcif.calc_file_checksum
+
+    def calc_file_checksum_counted(f_name):
+        l_call.append(f_name)
+        return calc_file_checksum(f_name)
+
+    monkeypatch.setattr(function_3_mcif, "calc_file_checksum",
+                        calc_file_checksum_counted)
+    function_3_mcif.read_magnetic_data(f_name, f_name_cache)
+    assert len(l_call) == 1
+    d_source, d_array_cache = function_3_mcif.read_magnetic_data_cache(
+        f_name_cache)
+    assert d_source["mtime_ns"] == os.stat(f_name).st_mtime_ns
+    assert numpy.array_equal(d_array_cache["ops_bns_trans"],
+                             d_array["ops_bns_trans"])
+    function_3_mcif.read_magnetic_data(f_name, f_name_cache)
+    assert len(l_call) == 1
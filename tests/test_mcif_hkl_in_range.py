@@ -0,0 +1,75 @@
+import numpy
+
+from cryspy.A_functions_base.function_3_mcif import calc_hkl_in_range, \
+    get_sym_elems_magn_centering_for_bns, calc_full_sym_elems
+from cryspy.C_item_loop_classes.cl_2_space_group import SpaceGroup
+
+
+def calc_hkl_in_range_brute_force(sym_elems, unit_cell_parameters,
+                                  sthovl_min, sthovl_max):
+    """Orbits of reflections of the box h >= 0 found one by one."""
+    length_a, length_b, length_c, alpha, beta, gamma = unit_cell_parameters
+    h_max = int(2.*length_a*sthovl_max)
+    k_max = int(2.*length_b*sthovl_max)
+    l_max = int(2.*length_c*sthovl_max)
+    l_r = [numpy.array(r_ij, dtype=int).reshape(3, 3)
+           for r_ij in numpy.transpose(sym_elems[4:13])]
+    metric = numpy.array([
+        [length_a**2, length_a*length_b*numpy.cos(gamma),
+         length_a*length_c*numpy.cos(beta)],
+        [length_a*length_b*numpy.cos(gamma), length_b**2,
+         length_b*length_c*numpy.cos(alpha)],
+        [length_a*length_c*numpy.cos(beta),
+         length_b*length_c*numpy.cos(alpha), length_c**2]])
+    metric_inv = numpy.linalg.inv(metric)
+    s_res = set()
+    for h in range(0, h_max+1):
+        for k in range(-k_max, k_max+1):
+            for l in range(-l_max, l_max+1):
+                hkl = numpy.array([h, k, l], dtype=int)
+                l_equiv = [tuple(numpy.matmul(hkl, r)) for r in l_r]
+                hkl_max = max(l_equiv,
+                              key=lambda x: 10000*x[0]+100*x[1]+x[2])
+                vector = numpy.array(hkl_max, dtype=float)
+                sthovl = 0.5*numpy.sqrt(numpy.matmul(
+                    vector, numpy.matmul(metric_inv, vector)))
+                if sthovl_min <= sthovl <= sthovl_max:
+                    s_res.add(hkl_max +
+                              (len(l_r)//l_equiv.count(hkl_max), ))
+    return s_res
+
+
+def test_calc_hkl_in_range_by_slabs():
+    space_group = SpaceGroup(it_number=227, it_coordinate_system_code="2")
+    space_group.form_object()
+    s_g_s = space_group.full_space_group_symop
+    sym_elems = numpy.zeros((13, len(s_g_s.r_11)), dtype=int)
+    sym_elems[4:13] = (s_g_s.r_11, s_g_s.r_12, s_g_s.r_13,
+                       s_g_s.r_21, s_g_s.r_22, s_g_s.r_23,
+                       s_g_s.r_31, s_g_s.r_32, s_g_s.r_33)
+    half_pi = 0.5*numpy.pi
+    unit_cell_parameters = (8.4, 8.4, 8.4, half_pi, half_pi, half_pi)
+
+    res = calc_hkl_in_range(sym_elems, unit_cell_parameters, 0.05, 0.6)
+    res_slab = calc_hkl_in_range(sym_elems, unit_cell_parameters, 0.05, 0.6,
+                                 n_element=1000)
+    for array, array_slab in zip(res, res_slab):
+        assert numpy.array_equal(array, array_slab)
+    # 100, 110, 111 (extinctions are not taken into account)
+    assert tuple(res[3][:3]) == (6, 12, 8)
+    assert set(zip(*res)) == calc_hkl_in_range_brute_force(
+        sym_elems, unit_cell_parameters, 0.05, 0.6)
+
+
+def test_calc_hkl_in_range_magnetic_groups():
+    rad = numpy.pi/180.
+    unit_cell_parameters = (6.1, 5.3, 7.2, 90.*rad, 101.*rad, 90.*rad)
+    for part_1, part_2 in ((1, 1), (2, 4), (14, 75), (62, 441), (71, 536)):
+        sym_elems, magn_centering = get_sym_elems_magn_centering_for_bns(
+            part_1, part_2)
+        full_sym_elems = calc_full_sym_elems(sym_elems, magn_centering)
+        h, k, l, mult = calc_hkl_in_range(
+            full_sym_elems, unit_cell_parameters, 0.02, 0.45, n_element=500)
+        assert set(zip(h, k, l, mult)) == calc_hkl_in_range_brute_force(
+            full_sym_elems, unit_cell_parameters, 0.02, 0.45)
+        assert len(set(zip(h, k, l))) == h.size
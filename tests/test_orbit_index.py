@@ -0,0 +1,70 @@
+import numpy
+
+from cryspy.E_data_classes.cl_1_crystal import Crystal
+
+S_CRYSTAL = """data_hex
+_space_group_name_H-M_ref 'P 63/m m c'
+_cell_length_a 6.1
+_cell_length_b 6.1
+_cell_length_c 7.3
+_cell_angle_alpha 90.0
+_cell_angle_beta 90.0
+_cell_angle_gamma 120.0
+loop_
+_atom_site_label
+_atom_site_type_symbol
+_atom_site_fract_x
+_atom_site_fract_y
+_atom_site_fract_z
+_atom_site_occupancy
+_atom_site_adp_type
+_atom_site_u_iso_or_equiv
+_atom_site_multiplicity
+Ho1 Ho3+ 0.13 0.27 0.41 1.0 Uiso 0.01 24
+O1 O2- 0.33192 0.125 0.725 1.0 Uiso 0.0 24
+loop_
+_atom_site_susceptibility_label
+_atom_site_susceptibility_chi_type
+_atom_site_susceptibility_moment_type
+_atom_site_susceptibility_chi_11
+_atom_site_susceptibility_chi_22
+_atom_site_susceptibility_chi_33
+_atom_site_susceptibility_chi_12
+_atom_site_susceptibility_chi_13
+_atom_site_susceptibility_chi_23
+_atom_site_susceptibility_moment_11
+_atom_site_susceptibility_moment_22
+_atom_site_susceptibility_moment_33
+_atom_site_susceptibility_moment_12
+_atom_site_susceptibility_moment_13
+_atom_site_susceptibility_moment_23
+Ho1 Cani Mani 2.5 3.1 1.7 0.4 -0.3 0.2 0.1 0.2 0.3 0.05 0.02 -0.04
+loop_
+_atom_site_scat_label
+_atom_site_scat_lande
+_atom_site_scat_kappa
+Ho1 1.25 1.0
+"""
+
+
+def test_orbit_index():
+    crystal = Crystal.from_cif(S_CRYSTAL)
+    index_h, index_k, index_l = numpy.random.default_rng(0).integers(
+        -2, 3, size=(3, 200))
+    orbit_index = crystal.calc_orbit_index(index_h, index_k, index_l)
+    ind_unique, ind_inverse = orbit_index[:2]
+    assert ind_unique.size < 30
+    assert numpy.array_equal(ind_inverse[ind_unique],
+                             numpy.arange(ind_unique.size))
+
+    f_nucl = crystal.calc_f_nucl(index_h, index_k, index_l)
+    f_nucl_orbit = crystal.calc_f_nucl_by_orbit(
+        index_h, index_k, index_l, orbit_index=orbit_index)
+    assert numpy.allclose(f_nucl_orbit, f_nucl, rtol=1e-12, atol=1e-12)
+
+    chi_m = numpy.array(crystal.calc_susceptibility_moment_tensor(
+        index_h, index_k, index_l))
+    chi_m_orbit = numpy.array(
+        crystal.calc_susceptibility_moment_tensor_by_orbit(
+            index_h, index_k, index_l, orbit_index=orbit_index))
+    assert numpy.allclose(chi_m_orbit, chi_m, rtol=1e-12, atol=1e-12)
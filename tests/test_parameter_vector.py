@@ -0,0 +1,38 @@
+import os
+import numpy
+
+import cryspy
+
+DIR = os.path.dirname(__file__)
+F_MAIN = os.path.join(DIR, "PbSO4_unpol_powder_test", "main.rcif")
+
+
+def test_parameter_vector():
+    rhochi = cryspy.file_to_globaln(F_MAIN)
+    crystal = [item for item in rhochi.items
+               if isinstance(item, cryspy.Crystal)][0]
+    crystal.atom_site.set_variable("fract_x")
+    crystal.cell.set_variable("length_a")
+    l_var_name = rhochi.get_variable_names()
+    parameter_vector = cryspy.ParameterVector(rhochi)
+    assert parameter_vector.names == l_var_name
+
+    val_0 = parameter_vector.get_all()
+    assert numpy.all(val_0 == numpy.array(
+        [rhochi.get_variable_by_name(name) for name in l_var_name]))
+
+    val_1 = val_0 + 0.001
+    parameter_vector.set_all(val_1)
+    assert numpy.allclose(
+        [rhochi.get_variable_by_name(name) for name in l_var_name], val_1)
+
+    parameter_vector.set_sigmas(0.01 + 0.*val_1)
+    assert numpy.allclose(parameter_vector.get_sigmas(), 0.01)
+    assert crystal.cell.length_a_sigma == 0.01
+
+    crystal.atom_site.to_columnar()
+    parameter_vector = cryspy.ParameterVector(rhochi)
+    parameter_vector.set_all(val_0)
+    assert numpy.allclose(parameter_vector.get_all(), val_0)
+    ind = [name[-1] for name in l_var_name].index(("fract_x", 0))
+    assert crystal.atom_site.items[0].fract_x == val_0[ind]
@@ -0,0 +1,101 @@
+import os
+import threading
+import numpy
+
+import cryspy
+from cryspy.A_functions_base.function_1_strings import \
+    ttheta_phi_intensity_to_string
+from cryspy.C_item_loop_classes.cl_1_pd2d_meas import Pd2dMeas
+from cryspy.E_data_classes.cl_2_pd2d import Pd2d
+
+DIR = os.path.dirname(__file__)
+F_MAIN = os.path.join(DIR, "Fe3O4_150K_6T_powder_2d_test", "main.rcif")
+
+
+def get_pd2d_crystals():
+    """Give experiment of main.rcif with simulated measurement."""
+    globaln = cryspy.file_to_globaln(F_MAIN)
+    l_crystal = [item for item in globaln.items
+                 if isinstance(item, cryspy.Crystal)]
+    data = [item for item in globaln.items if item.data_name == "pnd"][0]
+    pd2d = Pd2d(data_name="pnd")
+    pd2d.add_items(data.items)
+
+    tth = numpy.linspace(5., 60., 56)
+    phi = numpy.linspace(0., 40., 9)
+    proc = pd2d.calc_profile(tth, phi, l_crystal, flag_internal=False,
+                             d_internal_val={})
+    d_meas = {}
+    for name, intensity in (("up", 1.02*proc.intensity_up_total),
+                            ("down", 0.98*proc.intensity_down_total)):
+        d_meas[f"ttheta_phi_intensity_{name:}"] = \
+            ttheta_phi_intensity_to_string(tth, phi, intensity)
+        d_meas[f"ttheta_phi_intensity_{name:}_sigma"] = \
+            ttheta_phi_intensity_to_string(
+                tth, phi, numpy.sqrt(numpy.abs(intensity))+1.)
+    meas = Pd2dMeas(**d_meas)
+    meas.form_object()
+    pd2d.add_items([meas, ])
+    return pd2d, l_crystal
+
+
+def test_pd2d_calc_chi_sq_with_own_internal_val():
+    pd2d, l_crystal = get_pd2d_crystals()
+    chi_sq, n_points = pd2d.calc_chi_sq(l_crystal, flag_internal=True)
+    d_internal_val = pd2d.d_internal_val
+    l_key = sorted(d_internal_val.keys())
+    l_item = list(pd2d.items)
+
+    assert pd2d.calc_chi_sq(l_crystal, flag_internal=False) == \
+        (chi_sq, n_points)
+    d_own = {}
+    assert pd2d.calc_chi_sq(l_crystal, flag_internal=False,
+                            d_internal_val=d_own) == (chi_sq, n_points)
+    assert pd2d.d_internal_val is d_internal_val
+    assert sorted(d_internal_val.keys()) == l_key
+    assert sorted(d_own.keys()) == l_key
+    assert pd2d.items == l_item
+
+    l_result = [None, ] * 4
+
+    def calc(i_thread):
+        l_result[i_thread] = pd2d.calc_chi_sq(
+            l_crystal, flag_internal=False, d_internal_val={})[0]
+
+    l_thread = [threading.Thread(target=calc, args=(i_thread, ))
+                for i_thread in range(len(l_result))]
+    for thread in l_thread:
+        thread.start()
+    for thread in l_thread:
+        thread.join()
+    assert numpy.allclose(l_result, chi_sq, rtol=1e-12)
+
+    l_crystal[0].cell.length_a = 8.6
+    chi_sq_2 = pd2d.calc_chi_sq(l_crystal, flag_internal=False)[0]
+    assert chi_sq_2 != chi_sq
+    assert numpy.isclose(pd2d.calc_chi_sq(
+        l_crystal, flag_internal=False, d_internal_val={})[0], chi_sq_2,
+        rtol=1e-12)
+
+
+def test_pd2d_refine_linear_parameters():
+    pd2d, l_crystal = get_pd2d_crystals()
+    phase = pd2d.phase.items[0]
+    background = pd2d.pd2d_background
+    phase.scale_refinement = True
+    background.intensity_refinement[1, :] = True
+    chi_sq_0, n_0 = pd2d.calc_chi_sq(l_crystal, flag_internal=False)
+
+    phase.scale = 1.3*phase.scale
+    background.intensity[1, :] = 0.8*background.intensity[1, :]
+    l_var_name = pd2d.get_linear_variable_names()
+    assert len(l_var_name) == 1 + background.intensity.shape[1]
+
+    chi_sq, n = pd2d.refine_linear_parameters(l_crystal)
+    assert chi_sq <= chi_sq_0
+    assert n == n_0
+    chi_sq_ref, n_ref = pd2d.calc_chi_sq(l_crystal, flag_internal=False)
+    assert numpy.isclose(chi_sq, chi_sq_ref, rtol=1e-8)
+
+    pd2d.refine_linear_parameters(l_crystal, flag_internal=True)
+    assert phase.scale_sigma > 0.
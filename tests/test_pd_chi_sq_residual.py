@@ -0,0 +1,25 @@
+import os
+import numpy
+
+import cryspy
+
+DIR = os.path.dirname(__file__)
+F_MAIN = os.path.join(DIR, "PbSO4_unpol_powder_test", "main.rcif")
+
+
+def test_calc_chi_sq_residual():
+    rhochi = cryspy.file_to_globaln(F_MAIN)
+    pd = rhochi.experiments()[0]
+    l_crystal = rhochi.crystals()
+    l_item = list(pd.items)
+
+    chi_sq, n, residual = pd.calc_chi_sq(
+        l_crystal, flag_internal=False, flag_residual=True)
+    assert residual.shape == (n, )
+    assert numpy.isclose(numpy.square(residual).sum(), chi_sq, rtol=1e-12)
+    # no calculated loops are created or replaced
+    assert all([item_1 is item_2 for item_1, item_2 in zip(pd.items, l_item)])
+    assert len(pd.items) == len(l_item)
+
+    assert pd.calc_chi_sq(l_crystal) == (chi_sq, n)
+    assert len(pd.pd_proc.items) == pd.pd_meas.numpy_ttheta.size
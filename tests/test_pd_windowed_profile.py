@@ -0,0 +1,34 @@
+import os
+import numpy
+
+import cryspy
+
+DIR = os.path.dirname(__file__)
+F_MAIN = os.path.join(DIR, "PbSO4_unpol_powder_test", "main.rcif")
+
+
+def test_calc_profile_windowed():
+    rhochi = cryspy.file_to_globaln(F_MAIN)
+    pd = rhochi.experiments()[0]
+    l_crystal = rhochi.crystals()
+    tth = pd.pd_meas.numpy_ttheta
+    intensity = pd.calc_profile(
+        tth, l_crystal, flag_internal=False).numpy_intensity_total
+    chi_sq = rhochi.calc_chi_sq(flag_internal=False)[0]
+
+    pd.peak_cutoff = 1e4
+    intensity_w = pd.calc_profile(
+        tth, l_crystal, flag_internal=False).numpy_intensity_total
+    assert numpy.allclose(intensity_w, intensity, rtol=1e-10, atol=1e-10)
+    assert numpy.isclose(rhochi.calc_chi_sq(flag_internal=False)[0], chi_sq,
+                         rtol=1e-10)
+
+    pd.peak_cutoff = 20.
+    peak = pd.d_internal_val[f"peak_{l_crystal[0].data_name:}"]
+    tth_hkl = peak["ttheta"] - pd.setup.offset_ttheta
+    profile = pd.calc_shape_profile_windowed(tth, tth_hkl, 20.)[0]
+    assert profile.format == "csr"
+    assert profile.nnz < 0.5*tth.size*tth_hkl.size
+    intensity_w = pd.calc_profile(
+        tth, l_crystal, flag_internal=False).numpy_intensity_total
+    assert numpy.allclose(intensity_w, intensity, rtol=0.02)
@@ -0,0 +1,103 @@
+import os
+import threading
+import numpy
+
+import cryspy
+from cryspy.A_functions_base.function_1_reflection_cache import \
+    get_reflection_cache
+from cryspy.A_functions_base.function_2_powder_profile import \
+    calc_shape_profile_pd
+
+DIR = os.path.dirname(__file__)
+F_MAIN = os.path.join(DIR, "PbSO4_unpol_powder_test", "main.rcif")
+
+
+def test_calc_shape_profile_pd():
+    rhochi = cryspy.file_to_globaln(F_MAIN)
+    pd = rhochi.experiments()[0]
+    tth = pd.pd_meas.numpy_ttheta
+    tth_hkl = numpy.linspace(10., 100., 20)
+    profile, tth_zs, h_pv = pd.calc_shape_profile(tth, tth_hkl)
+    resolution_parameters, asymmetry_parameters, table_step = \
+        pd.get_profile_parameters()
+    profile_k, h_pv_k = calc_shape_profile_pd(
+        tth_zs, tth_hkl, resolution_parameters,
+        asymmetry_parameters=asymmetry_parameters, table_step=table_step)
+    assert numpy.allclose(profile_k, profile, rtol=1e-12, atol=0.)
+    assert numpy.allclose(h_pv_k, h_pv, rtol=1e-12, atol=0.)
+
+
+def test_calc_chi_sq_with_own_internal_val():
+    rhochi = cryspy.file_to_globaln(F_MAIN)
+    pd = rhochi.experiments()[0]
+    l_crystal = rhochi.crystals()
+    chi_sq, n_points = pd.calc_chi_sq(l_crystal, flag_internal=False)
+    d_internal_val = pd.d_internal_val
+    l_key = sorted(d_internal_val.keys())
+
+    d_own = {}
+    assert pd.calc_chi_sq(l_crystal, flag_internal=False,
+                          d_internal_val=d_own) == (chi_sq, n_points)
+    assert pd.d_internal_val is d_internal_val
+    assert sorted(d_internal_val.keys()) == l_key
+    assert "pd_proc" in d_own.keys()
+
+    l_result = [None, ] * 4
+
+    def calc(i_thread):
+        l_result[i_thread] = pd.calc_chi_sq(
+            l_crystal, flag_internal=False, d_internal_val={})[0]
+
+    l_thread = [threading.Thread(target=calc, args=(i_thread, ))
+                for i_thread in range(len(l_result))]
+    for thread in l_thread:
+        thread.start()
+    for thread in l_thread:
+        thread.join()
+    assert numpy.allclose(l_result, chi_sq, rtol=1e-12)
+
+
+def test_calc_profile_threads_different_ranges():
+    rhochi = cryspy.file_to_globaln(F_MAIN)
+    pd = rhochi.experiments()[0]
+    l_crystal = rhochi.crystals()
+    l_tth = [numpy.linspace(10.+2.*i, 40.+5.*i, 200) for i in range(8)]
+    l_ref = [pd.calc_profile(tth, l_crystal, flag_internal=False,
+                             d_internal_val={}).numpy_intensity_up_total
+             for tth in l_tth]
+    # the lists of reflections are added to the cache by the threads
+    get_reflection_cache().clear()
+
+    l_error = []
+
+    def calc(i_thread):
+        try:
+            for i in range(len(l_tth)):
+                i_tth = (i + 3*i_thread) % len(l_tth)
+                proc = pd.calc_profile(l_tth[i_tth], l_crystal,
+                                       flag_internal=False, d_internal_val={})
+                if not numpy.allclose(proc.numpy_intensity_up_total,
+                                      l_ref[i_tth], rtol=1e-12):
+                    l_error.append(i_tth)
+        except Exception as error:
+            l_error.append(error)
+
+    l_thread = [threading.Thread(target=calc, args=(i_thread, ))
+                for i_thread in range(4)]
+    for thread in l_thread:
+        thread.start()
+    for thread in l_thread:
+        thread.join()
+    assert l_error == []
+
+
+def test_calc_resolution_without_state():
+    rhochi = cryspy.file_to_globaln(F_MAIN)
+    pd = rhochi.experiments()[0]
+    resolution = pd.pd_instr_resolution
+    l_key = sorted(resolution.__dict__.keys())
+    tth_hkl = numpy.linspace(10., 100., 20)
+    h_pv, eta, h_g, h_l, a_g, b_g, a_l, b_l = resolution.calc_resolution(
+        tth_hkl)
+    assert sorted(resolution.__dict__.keys()) == l_key
+    assert numpy.all(h_pv > 0.)
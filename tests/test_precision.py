@@ -0,0 +1,35 @@
+import os
+import numpy
+import pytest
+
+import cryspy
+from cryspy.A_functions_base.function_2_crystallography_base import \
+    calc_phase_3d
+
+DIR = os.path.dirname(__file__)
+F_MAIN = os.path.join(DIR, "PbSO4_unpol_powder_test", "main.rcif")
+
+
+def test_set_precision():
+    l_chi_sq = []
+    try:
+        for precision in ("double", "single"):
+            cryspy.set_precision(precision)
+            assert cryspy.get_precision() == precision
+            rhochi = cryspy.file_to_globaln(F_MAIN)
+            chi_sq, n = rhochi.calc_chi_sq()
+            assert isinstance(chi_sq, float)
+            l_chi_sq.append(chi_sq)
+
+            hkl = numpy.array([[1, 2], [0, 1], [3, 1]], dtype=int)
+            r_ij = numpy.eye(3).reshape(9, 1)
+            b_i = numpy.zeros((3, 1), dtype=float)
+            fract_xyz = numpy.array([[0.1, 0.2, 0.3]], dtype=float)
+            phase_3d = calc_phase_3d(hkl, r_ij, b_i, fract_xyz)
+            assert phase_3d.dtype == {"double": numpy.complex128,
+                                      "single": numpy.complex64}[precision]
+        with pytest.raises(ValueError):
+            cryspy.set_precision("half")
+    finally:
+        cryspy.set_precision("double")
+    assert abs(l_chi_sq[1]-l_chi_sq[0]) < 1e-4*l_chi_sq[0]
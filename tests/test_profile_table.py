@@ -0,0 +1,43 @@
+import os
+import numpy
+
+import cryspy
+from cryspy.A_functions_base.function_1_profile_table import \
+    calc_pseudo_voigt_by_table, calc_asymmetry_functions_by_table
+
+DIR = os.path.dirname(__file__)
+F_MAIN = os.path.join(DIR, "PbSO4_unpol_powder_test", "main.rcif")
+
+
+def test_calc_pseudo_voigt_by_table():
+    x = numpy.linspace(-30., 30., 60001)
+    eta = 0.3
+    gauss = 2.*(numpy.log(2.)/numpy.pi)**0.5 * numpy.where(
+        4.*numpy.log(2.)*x**2 < 5., numpy.exp(-4.*numpy.log(2.)*x**2), 0.)
+    lorentz = 2./(numpy.pi*(1.+4.*x**2))
+    pv = calc_pseudo_voigt_by_table(x, eta)
+    assert numpy.allclose(pv, eta*lorentz+(1.-eta)*gauss, rtol=0., atol=1e-6)
+
+    f_a, f_b = calc_asymmetry_functions_by_table(x)
+    f_a_ref = 2.*x*numpy.exp(-x**2)
+    assert numpy.allclose(f_a, f_a_ref, rtol=0., atol=1e-6)
+    assert numpy.allclose(f_b, 2.*(2.*x**2-3.)*f_a_ref, rtol=0., atol=1e-5)
+
+
+def test_pd_profile_table_step():
+    rhochi = cryspy.file_to_globaln(F_MAIN)
+    pd = rhochi.experiments()[0]
+    l_crystal = rhochi.crystals()
+    tth = pd.pd_meas.numpy_ttheta
+    intensity = pd.calc_profile(
+        tth, l_crystal, flag_internal=False).numpy_intensity_total
+
+    pd.profile_table_step = 1e-3
+    intensity_t = pd.calc_profile(
+        tth, l_crystal, flag_internal=False).numpy_intensity_total
+    assert numpy.allclose(intensity_t, intensity, rtol=1e-5)
+
+    pd.peak_cutoff = 1e4
+    intensity_w = pd.calc_profile(
+        tth, l_crystal, flag_internal=False).numpy_intensity_total
+    assert numpy.allclose(intensity_w, intensity_t, rtol=1e-10)
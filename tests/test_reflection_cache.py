@@ -0,0 +1,112 @@
+import sys
+import threading
+import numpy
+
+from cryspy.A_functions_base.function_1_reflection_cache import \
+    get_reflection_cache
+from cryspy.C_item_loop_classes.cl_1_cell import Cell
+from cryspy.C_item_loop_classes.cl_2_space_group import SpaceGroup
+
+
+def test_reflection_cache():
+    space_group = SpaceGroup(it_number=62, it_coordinate_system_code="abc")
+    space_group.form_object()
+    cell = Cell(length_a=8.5, length_b=5.4, length_c=7.0, angle_alpha=90.,
+                angle_beta=90., angle_gamma=90.)
+    reflection_cache = get_reflection_cache()
+    reflection_cache.clear()
+
+    h, k, l, mult = cell.calc_hkl(space_group, 0.1, 0.6)
+    assert (reflection_cache.n_hit, reflection_cache.n_miss) == (0, 1)
+    h_2, k_2, l_2, mult_2 = cell.calc_hkl(space_group, 0.2, 0.5)
+    assert (reflection_cache.n_hit, reflection_cache.n_miss) == (1, 1)
+
+    sthovl = cell.calc_sthovl(h, k, l)
+    flag = (sthovl > 0.2) & (sthovl < 0.5)
+    assert set(zip(h_2, k_2, l_2, mult_2)) == \
+        set(zip(h[flag], k[flag], l[flag], mult[flag]))
+
+    reflection_cache.clear()
+    h_3, k_3, l_3, mult_3 = cell.calc_hkl(space_group, 0.2, 0.5)
+    assert set(zip(h_3, k_3, l_3, mult_3)) == set(zip(h_2, k_2, l_2, mult_2))
+
+    cell.length_a = 8.7
+    h_3, k_3, l_3, mult_3 = cell.calc_hkl(space_group, 0.2, 0.5)
+    assert reflection_cache.n_miss == 2
+    sthovl_3 = cell.calc_sthovl(h_3, k_3, l_3)
+    assert numpy.all(numpy.diff(sthovl_3) >= 0.)
+
+    reflection_cache.clear()
+    h_4, k_4, l_4, mult_4 = cell.calc_hkl(space_group, 0.2, 0.5)
+    assert set(zip(h_3, k_3, l_3, mult_3)) == set(zip(h_4, k_4, l_4, mult_4))
+
+
+def test_reflection_cache_cell_refinement():
+    space_group = SpaceGroup(it_number=62, it_coordinate_system_code="abc")
+    space_group.form_object()
+    cell = Cell(length_a=8.5, length_b=5.4, length_c=7.0, angle_alpha=90.,
+                angle_beta=90., angle_gamma=90.)
+    reflection_cache = get_reflection_cache()
+    reflection_cache.clear()
+    cell.calc_hkl(space_group, 0.1, 0.6)
+    cell.calc_hkl_in_range(0., 0.4)
+
+    cell.length_a, cell.length_c = 8.55, 6.98
+    h, k, l, mult = cell.calc_hkl(space_group, 0.1, 0.6)
+    h_2, k_2, l_2, mult_2 = cell.calc_hkl_in_range(0., 0.4)
+    assert (reflection_cache.n_hit, reflection_cache.n_miss) == (2, 2)
+
+    reflection_cache.clear()
+    h_3, k_3, l_3, mult_3 = cell.calc_hkl(space_group, 0.1, 0.6)
+    h_4, k_4, l_4, mult_4 = cell.calc_hkl_in_range(0., 0.4)
+    assert set(zip(h, k, l, mult)) == set(zip(h_3, k_3, l_3, mult_3))
+    assert set(zip(h_2, k_2, l_2)) == set(zip(h_4, k_4, l_4))
+
+    cell.length_a = 9.5
+    cell.calc_hkl(space_group, 0.1, 0.6)
+    assert reflection_cache.n_miss == 3
+
+
+def test_reflection_cache_threads():
+    space_group = SpaceGroup(it_number=62, it_coordinate_system_code="abc")
+    space_group.form_object()
+    l_cell = [Cell(length_a=8.5+0.01*i_cell, length_b=5.4, length_c=7.0,
+                   angle_alpha=90., angle_beta=90., angle_gamma=90.)
+              for i_cell in range(8)]
+    l_range = [(0.05*i_range, 0.3+0.05*i_range) for i_range in range(8)]
+    reflection_cache = get_reflection_cache()
+
+    # small cache and frequent switching of threads to force concurrent
+    # insertions and evictions
+    max_size = reflection_cache.max_size
+    switch_interval = sys.getswitchinterval()
+    reflection_cache.max_size = 3
+    reflection_cache.clear()
+    sys.setswitchinterval(1e-6)
+    l_error, l_result = [], [[] for range_ in l_range]
+
+    def calc(i_thread):
+        try:
+            for i_repeat in range(20):
+                i_range = (i_thread + i_repeat) % len(l_range)
+                l_result[i_thread].append((i_range, l_cell[i_thread].calc_hkl(
+                    space_group, *l_range[i_range])))
+        except Exception as error:
+            l_error.append(error)
+
+    l_thread = [threading.Thread(target=calc, args=(i_thread, ))
+                for i_thread in range(len(l_cell))]
+    for thread in l_thread:
+        thread.start()
+    for thread in l_thread:
+        thread.join()
+    sys.setswitchinterval(switch_interval)
+    reflection_cache.max_size = max_size
+    reflection_cache.clear()
+    assert l_error == []
+    for i_thread, l_res in enumerate(l_result):
+        cell = l_cell[i_thread]
+        for i_range, (h, k, l, mult) in l_res:
+            h_e, k_e, l_e, mult_e = cell.calc_hkl(space_group,
+                                                  *l_range[i_range])
+            assert set(zip(h, k, l, mult)) == set(zip(h_e, k_e, l_e, mult_e))
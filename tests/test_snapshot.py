@@ -0,0 +1,44 @@
+import os
+import json
+import numpy
+import pytest
+
+from cryspy import file_to_globaln
+from cryspy.B_parent_classes.cl_4_global import GlobalN
+
+DIR = os.path.dirname(__file__)
+F_MAIN = os.path.join(DIR, "PbSO4_unpol_powder_test", "main.rcif")
+
+
+def test_snapshot(tmp_path):
+    rhochi = file_to_globaln(F_MAIN)
+    f_dir = os.path.join(str(tmp_path), "snapshot")
+    rhochi.save_snapshot(f_dir)
+    rhochi_2 = GlobalN.load_snapshot(f_dir)
+    assert type(rhochi_2) is type(rhochi)
+    flag_cif = rhochi_2.to_cif() == rhochi.to_cif()
+    assert flag_cif
+
+    pd_2 = rhochi_2.experiments()[0]
+    ttheta = pd_2.pd_meas.items.columns["ttheta"]
+    assert isinstance(ttheta.base, numpy.memmap)
+    chi_sq, n_point = rhochi.calc_chi_sq()
+    chi_sq_2, n_point_2 = rhochi_2.calc_chi_sq()
+    assert numpy.isclose(chi_sq, chi_sq_2)
+    assert n_point == n_point_2
+
+
+def test_snapshot_foreign_class(tmp_path):
+    rhochi = file_to_globaln(F_MAIN)
+    f_dir = os.path.join(str(tmp_path), "snapshot")
+    rhochi.save_snapshot(f_dir)
+    f_manifest = os.path.join(f_dir, "manifest.json")
+    with open(f_manifest, "r") as fid:
+        d_manifest = json.load(fid)
+    for name in ("subprocess.Popen", "cryspy.A_functions_base.\
+function_1_snapshot.SnapshotArrays", "numpy"):
+        d_manifest["object"]["class"] = name
+        with open(f_manifest, "w") as fid:
+            json.dump(d_manifest, fid)
+        with pytest.raises(UserWarning, match="can not be restored"):
+            GlobalN.load_snapshot(f_dir)
@@ -0,0 +1,111 @@
+import sys
+import threading
+import numpy
+
+from cryspy.E_data_classes.cl_1_crystal import Crystal
+
+S_CRYSTAL = """data_Ho2Ti2O7
+_space_group_name_H-M_alt 'F d -3 m'
+_space_group_it_coordinate_system_code 2
+_cell_length_a 10.1
+_cell_length_b 10.1
+_cell_length_c 10.1
+_cell_angle_alpha 90.0
+_cell_angle_beta 90.0
+_cell_angle_gamma 90.0
+loop_
+_atom_site_label
+_atom_site_type_symbol
+_atom_site_fract_x
+_atom_site_fract_y
+_atom_site_fract_z
+_atom_site_occupancy
+_atom_site_adp_type
+_atom_site_b_iso_or_equiv
+Ho Ho3+ 0.5 0.5 0.5 1.0 Biso 0.0
+Ti Ti3+ 0.0 0.0 0.0 1.0 Biso 0.0
+O1 O2- 0.328 0.125 0.125 1.0 Biso 0.0
+loop_
+_atom_site_susceptibility_label
+_atom_site_susceptibility_chi_type
+_atom_site_susceptibility_moment_type
+_atom_site_susceptibility_chi_11
+_atom_site_susceptibility_chi_22
+_atom_site_susceptibility_chi_33
+_atom_site_susceptibility_chi_12
+_atom_site_susceptibility_chi_13
+_atom_site_susceptibility_chi_23
+_atom_site_susceptibility_moment_11
+_atom_site_susceptibility_moment_22
+_atom_site_susceptibility_moment_33
+_atom_site_susceptibility_moment_12
+_atom_site_susceptibility_moment_13
+_atom_site_susceptibility_moment_23
+Ho Cani Mani -3.6 -3.6 -3.6 2.1 2.1 2.1 0.7 0.7 0.7 0. 0. 0.
+Ti Ciso Miso 0.5 0.5 0.5 0. 0. 0. 0. 0. 0. 0. 0. 0.
+loop_
+_atom_site_scat_label
+_atom_site_scat_lande
+_atom_site_scat_kappa
+Ho 1.25 1.0
+Ti 2.0 1.0
+"""
+
+
+def test_susceptibility_basis():
+    crystal = Crystal.from_cif(S_CRYSTAL)
+    index_h, index_k, index_l = numpy.random.default_rng(0).integers(
+        -4, 5, size=(3, 100))
+    basis_chi, basis_moment, l_index_name_chi, l_index_name_moment = \
+        crystal.calc_susceptibility_moment_basis(index_h, index_k, index_l)
+    assert l_index_name_chi == [(0, "chi_11"), (0, "chi_12"), (1, "chi_11")]
+    assert basis_chi.shape == (9, 100, 3)
+    assert basis_moment.shape == (9, 100, 3)
+
+    orbit_index = crystal.calc_orbit_index(index_h, index_k, index_l)
+    for chi_11 in (-3.6, -2.9):
+        crystal.atom_site_susceptibility["Ho"].chi_11 = chi_11
+        crystal.apply_constraints()
+        chi_m = numpy.array(crystal.calc_susceptibility_moment_tensor(
+            index_h, index_k, index_l))
+        chi_m_basis = numpy.array(
+            crystal.calc_susceptibility_moment_tensor_by_basis(
+                index_h, index_k, index_l, orbit_index=orbit_index))
+        assert numpy.allclose(chi_m_basis, chi_m, rtol=1e-12, atol=1e-12)
+    assert len(crystal.d_internal_val["susceptibility_basis"]) == 1
+
+
+def test_susceptibility_basis_threads():
+    crystal = Crystal.from_cif(S_CRYSTAL)
+    rng = numpy.random.default_rng(1)
+    l_hkl = [tuple(rng.integers(-4, 5, size=(3, 8))) for i in range(16)]
+    l_chi_m = [numpy.array(crystal.calc_susceptibility_moment_tensor(*hkl))
+               for hkl in l_hkl]
+    l_error = []
+
+    def calc(i_thread):
+        try:
+            for i in range(4*len(l_hkl)):
+                i_hkl = (i + 5*i_thread) % len(l_hkl)
+                chi_m = numpy.array(
+                    crystal.calc_susceptibility_moment_tensor_by_basis(
+                        *l_hkl[i_hkl]))
+                if not numpy.allclose(chi_m, l_chi_m[i_hkl], rtol=1e-12,
+                                      atol=1e-12):
+                    l_error.append(i_hkl)
+        except Exception as error:
+            l_error.append(error)
+
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        l_thread = [threading.Thread(target=calc, args=(i_thread, ))
+                    for i_thread in range(4)]
+        for thread in l_thread:
+            thread.start()
+        for thread in l_thread:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+    assert l_error == []
+    assert len(crystal.d_internal_val["susceptibility_basis"]) <= 8
@@ -0,0 +1,30 @@
+import os
+import numpy
+
+import cryspy
+
+DIR = os.path.dirname(__file__)
+F_MAIN = os.path.join(DIR, "PbSO4_unpol_powder_test", "main.rcif")
+
+
+def test_refine_linear_parameters():
+    rhochi = cryspy.file_to_globaln(F_MAIN)
+    pd = rhochi.experiments()[0]
+    pd.phase.items[0].scale_refinement = True
+    chi_sq_0, n_0 = rhochi.calc_chi_sq(flag_internal=False)
+
+    pd.phase.items[0].scale = 1.3*pd.phase.items[0].scale
+    for item in pd.pd_background.items:
+        item.intensity = 0.8*item.intensity
+
+    l_var_name = rhochi.get_linear_variable_names()
+    assert len(l_var_name) == 1 + len(pd.pd_background.items)
+
+    chi_sq, n = rhochi.refine_linear_parameters()
+    assert chi_sq <= chi_sq_0
+    assert n == n_0
+    chi_sq_ref, n_ref = rhochi.calc_chi_sq(flag_internal=False)
+    assert numpy.isclose(chi_sq, chi_sq_ref, rtol=1e-8)
+
+    rhochi.refine_linear_parameters(flag_internal=True)
+    assert pd.phase.items[0].scale_sigma > 0.
@@ -0,0 +1,96 @@
+import os
+import sys
+import threading
+
+import cryspy
+from cryspy.B_parent_classes.cl_1_item import get_new_version
+
+DIR = os.path.dirname(__file__)
+F_MAIN = os.path.join(DIR, "PbSO4_unpol_powder_test", "main.rcif")
+
+
+def test_versions():
+    rhochi = cryspy.file_to_globaln(F_MAIN)
+    crystal = [item for item in rhochi.items
+               if isinstance(item, cryspy.Crystal)][0]
+    cell, atom_site = crystal.cell, crystal.atom_site
+
+    version = crystal.get_version()
+    cell.length_a = cell.length_a
+    assert crystal.get_version() == version
+
+    cell.length_a = cell.length_a + 0.01
+    assert cell.get_version() > version
+    assert crystal.get_version() == cell.get_version()
+    assert crystal.get_version(("atom_site", )) < cell.get_version()
+
+    version = atom_site.get_version()
+    atom_site.items[0].fract_x = 0.3
+    assert atom_site.get_version() > version
+    assert crystal.get_versions()["atom_site"] == atom_site.get_version()
+
+
+def test_cache_refinement():
+    rhochi = cryspy.file_to_globaln(F_MAIN)
+    crystal = [item for item in rhochi.items
+               if isinstance(item, cryspy.Crystal)][0]
+    chi_sq_1, n_1 = rhochi.calc_chi_sq()
+    crystal.atom_site.items[0].fract_x += 0.01
+    chi_sq_2, n_2 = rhochi.calc_chi_sq()
+    rhochi_2 = cryspy.file_to_globaln(F_MAIN)
+    crystal_2 = [item for item in rhochi_2.items
+                 if isinstance(item, cryspy.Crystal)][0]
+    crystal_2.atom_site.items[0].fract_x += 0.01
+    chi_sq_3, n_3 = rhochi_2.calc_chi_sq()
+    assert chi_sq_1 != chi_sq_2
+    assert chi_sq_2 == chi_sq_3
+
+
+def test_loop_items_changed_in_place():
+    rhochi = cryspy.file_to_globaln(F_MAIN)
+    crystal = [item for item in rhochi.items
+               if isinstance(item, cryspy.Crystal)][0]
+    atom_site = crystal.atom_site
+    atom_site.to_items()
+    fract_x = atom_site.numpy_fract_x
+    n_atom = fract_x.size
+
+    version = atom_site.get_version()
+    atom_site.items.reverse()
+    assert atom_site.get_version() > version
+    assert (atom_site.numpy_fract_x == fract_x[::-1]).all()
+
+    version = atom_site.get_version()
+    item = atom_site.items.pop()
+    assert atom_site.get_version() > version
+    assert atom_site.numpy_fract_x.size == n_atom - 1
+
+    del atom_site.items[0]
+    assert atom_site.numpy_fract_x.size == n_atom - 2
+
+    atom_site.items.append(item)
+    item.fract_x = 0.123
+    assert atom_site.numpy_fract_x[-1] == 0.123
+    assert crystal.get_version() == atom_site.get_version()
+
+
+def test_new_versions_threads():
+    ll_version = [[] for i_thread in range(4)]
+
+    def calc(l_version):
+        for i in range(20000):
+            l_version.append(get_new_version())
+
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        l_thread = [threading.Thread(target=calc, args=(l_version, ))
+                    for l_version in ll_version]
+        for thread in l_thread:
+            thread.start()
+        for thread in l_thread:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+    l_version = sum(ll_version, [])
+    assert len(set(l_version)) == len(l_version)